@@ -9,7 +9,7 @@ from datetime import datetime
 import logging
 
 from ..services.sparc.adventure_service import (
-    get_adventure_service, AdventureProgress, SceneType, OutcomeType
+    get_adventure_service, AdventureProgress, SceneType, OutcomeType, MAX_CONTENT_BATCH_ITEMS
 )
 from ..services.auth import get_current_user
 
@@ -161,6 +161,48 @@ async def generate_dynamic_content(
         raise HTTPException(status_code=500, detail="Failed to generate content")
 
 
+@router.post("/content/generate/batch")
+async def generate_dynamic_content_batch(
+    batch_request: Dict[str, Any],
+    user_id: str = Depends(get_current_user)
+) -> Dict[str, Any]:
+    """
+    Generate a bundle of content for a scene in one call.
+    
+    Body: {"session_id": ..., "items": [{"content_type": ..., "context": {...}, "id": optional}]}
+    Items are generated concurrently. A failed item is reported in its result
+    without failing the rest; "complete" is true only when every item succeeded.
+    """
+    try:
+        session_id = batch_request.get("session_id")
+        items = batch_request.get("items")
+        
+        if not session_id or not isinstance(items, list) or not items:
+            raise HTTPException(status_code=400, detail="Session ID and a non-empty items list are required")
+        if len(items) > MAX_CONTENT_BATCH_ITEMS:
+            raise HTTPException(status_code=400, detail=f"At most {MAX_CONTENT_BATCH_ITEMS} items per batch")
+        if not all(isinstance(item, dict) for item in items):
+            raise HTTPException(status_code=400, detail="Each item must be an object")
+        
+        adventure_service = await get_adventure_service()
+        try:
+            batch = await adventure_service.generate_content_batch(session_id, items)
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        
+        return {
+            "success": batch["succeeded"] > 0,
+            "session_id": session_id,
+            **batch
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to generate content batch: {e}")
+        raise HTTPException(status_code=500, detail="Failed to generate content")
+
+
 @router.get("/templates")
 async def get_adventure_templates() -> Dict[str, Any]:
     """Get available adventure templates."""
@@ -248,15 +290,14 @@ async def get_adventure_progress(
     try:
         adventure_service = await get_adventure_service()
         
-        if session_id not in adventure_service.active_adventures:
+        progress = await adventure_service.progress_store.get(session_id)
+        if progress is None:
             return {
                 "success": True,
                 "progress": None,
                 "message": "No active adventure found for session"
             }
         
-        progress = adventure_service.active_adventures[session_id]
-        
         return {
             "success": True,
             "progress": {
@@ -310,21 +351,19 @@ async def get_active_sessions(
         adventure_service = await get_adventure_service()
         
         active_sessions = []
-        for session_id, progress in adventure_service.active_adventures.items():
-            # Only include sessions that haven't been idle too long
-            idle_minutes = (datetime.now() - progress.last_activity).total_seconds() / 60
-            if idle_minutes < 120:  # 2 hours
-                active_sessions.append({
-                    "session_id": session_id,
-                    "adventure_id": progress.adventure_id,
-                    "current_scene_id": progress.current_scene_id,
-                    "progress_percentage": (len(progress.completed_scenes) / 
-                                          len(adventure_service.adventure_templates[progress.adventure_id].scenes)) * 100,
-                    "confidence_score": progress.confidence_score,
-                    "time_spent_minutes": progress.time_spent_minutes,
-                    "last_activity": progress.last_activity.isoformat(),
-                    "is_completed": progress.is_completed
-                })
+        # Only include sessions that haven't been idle too long (2 hours)
+        for progress in await adventure_service.progress_store.list_active(max_idle_minutes=120):
+            active_sessions.append({
+                "session_id": progress.session_id,
+                "adventure_id": progress.adventure_id,
+                "current_scene_id": progress.current_scene_id,
+                "progress_percentage": (len(progress.completed_scenes) / 
+                                      len(adventure_service.adventure_templates[progress.adventure_id].scenes)) * 100,
+                "confidence_score": progress.confidence_score,
+                "time_spent_minutes": progress.time_spent_minutes,
+                "last_activity": progress.last_activity.isoformat(),
+                "is_completed": progress.is_completed
+            })
         
         return {
             "success": True,
@@ -346,12 +385,12 @@ async def end_adventure_session(
     try:
         adventure_service = await get_adventure_service()
         
-        if session_id in adventure_service.active_adventures:
+        if await adventure_service.progress_store.get(session_id) is not None:
             # Get final analytics before cleanup
             final_analytics = await adventure_service.get_adventure_analytics(session_id)
             
-            # Remove from active adventures
-            del adventure_service.active_adventures[session_id]
+            # Remove from memory and the progress database
+            await adventure_service.progress_store.delete(session_id)
             
             return {
                 "success": True,
@@ -379,9 +418,11 @@ async def adventure_health_check() -> Dict[str, Any]:
         return {
             "success": True,
             "service_healthy": True,
-            "active_adventures": len(adventure_service.active_adventures),
+            "active_adventures": len(adventure_service.progress_store),
+            "progress_store": adventure_service.progress_store.get_stats(),
             "available_templates": len(adventure_service.adventure_templates),
             "cache_entries": len(adventure_service.scene_transition_cache),
+            "scene_cache": adventure_service.get_scene_cache_stats(),
             "timestamp": datetime.now().isoformat()
         }
         
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi.responses import StreamingResponse
 from typing import Dict, List, Optional, Any
 from pydantic import BaseModel
+import json
 import time
 from datetime import datetime
 
@@ -87,6 +89,54 @@ async def get_seer_advice(
         }
 
 
+@router.post("/seer-advice/stream")
+async def stream_seer_advice(request: Dict[str, Any]) -> StreamingResponse:
+    """
+    Stream AI Seer advice as server-sent events.
+    
+    Emits "token" events as the advice is generated and a final "done"
+    event with the complete advice (or fallback guidance).
+    """
+    query = request.get("query", "")
+    context = request.get("context", {})
+    request_type = request.get("request_type", "general")
+    max_response_time_ms = request.get("max_response_time_ms", 3000)
+    
+    if not query:
+        raise HTTPException(status_code=400, detail="Query is required")
+    
+    ai_seer = await get_enhanced_ai_seer()
+    
+    async def event_stream():
+        try:
+            async for event in ai_seer.stream_contextual_advice(
+                query=query,
+                context=context,
+                request_type=request_type,
+                max_time_ms=max_response_time_ms
+            ):
+                payload = {key: value for key, value in event.items() if key != "event"}
+                yield f"event: {event['event']}\ndata: {json.dumps(payload, default=str)}\n\n"
+        except Exception as e:
+            print(f"ERROR: AI Seer stream failed: {str(e)}")
+            fallback = {
+                "advice": {
+                    "type": "general",
+                    "title": "General GM Guidance",
+                    "content": "Keep the story moving and ask players what they want to do.",
+                    "confidence": 0.5,
+                    "fallback": True
+                }
+            }
+            yield f"event: done\ndata: {json.dumps(fallback)}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.post("/contextual-suggestions", response_model=Dict[str, Any])
 async def get_contextual_suggestions(request: Dict[str, Any]) -> Dict[str, Any]:
     """Get contextual suggestions based on current game state."""
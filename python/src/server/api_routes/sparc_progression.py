@@ -3,93 +3,114 @@ API endpoints for SPARC Progression Tracking System.
 Provides automatic progression tracking and analytics for player development.
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Response, status
 from typing import Dict, List, Optional, Any
 from datetime import datetime
+import asyncio
 import logging
 
 from ..services.sparc.progression_tracker import (
     get_progression_tracker, SkillArea, ProgressionMilestone
 )
+from ..services.sparc.progression_leaderboard import (
+    OVERALL_METRIC, DEFAULT_SKILL_LEVEL, DEFAULT_SKILL_CONFIDENCE
+)
+from ..services.sparc.progression_fleet_analytics import load_latest_fleet_summary
+from ..services.sparc.progression_events import (
+    get_progression_event_pipeline, ADVENTURE_COMPLETED, SCENE_OUTCOME
+)
 from ..services.auth import get_current_user
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/progression", tags=["sparc_progression"])
 
 
-@router.post("/track/adventure")
+@router.post("/track/adventure", status_code=status.HTTP_202_ACCEPTED)
 async def track_adventure_completion(
     completion_data: Dict[str, Any],
     user_id: str = Depends(get_current_user)
 ) -> Dict[str, Any]:
-    """Track completion of an adventure and update player progression."""
+    """Queue an adventure completion; progression is updated in the background."""
     try:
-        progression_tracker = await get_progression_tracker()
-        
         adventure_data = completion_data.get("adventure_data", {})
         session_progress = completion_data.get("session_progress", {})
         
         if not adventure_data or not session_progress:
             raise HTTPException(status_code=400, detail="Adventure data and session progress are required")
         
-        result = await progression_tracker.track_adventure_completion(
-            user_id=user_id,
-            adventure_data=adventure_data,
-            session_progress=session_progress
-        )
+        pipeline = await get_progression_event_pipeline()
+        job = await pipeline.publish(user_id, ADVENTURE_COMPLETED, {
+            "adventure_data": adventure_data,
+            "session_progress": session_progress
+        })
         
         return {
             "success": True,
             "user_id": user_id,
-            "progression_update": result["progression_update"],
-            "adventure_summary": {
-                "adventure_id": result["adventure_summary"].adventure_id,
-                "title": result["adventure_summary"].title,
-                "final_confidence": result["adventure_summary"].final_confidence_score,
-                "progress_points": result["adventure_summary"].total_progress_points,
-                "completion_time": result["adventure_summary"].total_time_minutes,
-                "scenes_completed": f"{result['adventure_summary'].scenes_completed}/{result['adventure_summary'].total_scenes}"
-            }
+            "job_id": job.job_id,
+            "sequence": job.sequence,
+            "status": job.status
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to track adventure completion for {user_id}: {e}")
         raise HTTPException(status_code=500, detail="Failed to track adventure completion")
 
 
-@router.post("/track/scene")
+@router.post("/track/scene", status_code=status.HTTP_202_ACCEPTED)
 async def track_scene_outcome(
     scene_data: Dict[str, Any],
     user_id: str = Depends(get_current_user)
 ) -> Dict[str, Any]:
-    """Track individual scene outcomes for granular progression analysis."""
+    """Queue a scene outcome; skill progression is updated in the background."""
     try:
-        progression_tracker = await get_progression_tracker()
-        
         scene_info = scene_data.get("scene_data", {})
         outcome_data = scene_data.get("outcome_data", {})
         
         if not scene_info or not outcome_data:
             raise HTTPException(status_code=400, detail="Scene data and outcome data are required")
         
-        result = await progression_tracker.track_scene_outcome(
-            user_id=user_id,
-            scene_data=scene_info,
-            outcome_data=outcome_data
-        )
+        pipeline = await get_progression_event_pipeline()
+        job = await pipeline.publish(user_id, SCENE_OUTCOME, {
+            "scene_data": scene_info,
+            "outcome_data": outcome_data
+        })
         
         return {
             "success": True,
             "user_id": user_id,
-            "skills_developed": result["skills_developed"],
-            "current_skill_levels": result["current_skill_levels"]
+            "job_id": job.job_id,
+            "sequence": job.sequence,
+            "status": job.status
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to track scene outcome for {user_id}: {e}")
         raise HTTPException(status_code=500, detail="Failed to track scene outcome")
 
 
+@router.get("/jobs/{job_id}")
+async def get_tracking_job(
+    job_id: str,
+    user_id: str = Depends(get_current_user)
+) -> Dict[str, Any]:
+    """Get the status and result of a queued progression update."""
+    pipeline = await get_progression_event_pipeline()
+    job = pipeline.get_job(job_id)
+    
+    if job is None or (job.user_id != user_id and not await _is_admin(user_id)):
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return {
+        "success": True,
+        "job": job.to_dict()
+    }
+
+
 @router.get("/player/{user_id}")
 async def get_player_progression(
     user_id: str,
@@ -125,16 +146,34 @@ async def get_player_progression(
 
 @router.get("/analytics")
 async def get_progression_analytics(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),  # ETag header
     user_id: str = Depends(get_current_user)
 ) -> Dict[str, Any]:
-    """Get detailed analytics about current user's progression."""
+    """Get detailed analytics about current user's progression.
+    
+    Analytics are materialized when progression is tracked; pollers send the
+    last ETag back and get 304 Not Modified until the next tracked event.
+    """
     try:
         progression_tracker = await get_progression_tracker()
-        analytics = await progression_tracker.get_progression_analytics(user_id)
+        snapshot = await progression_tracker.get_analytics_snapshot(user_id)
         
+        if snapshot is None:
+            return {
+                "success": True,
+                "analytics": {"error": "No progression data found"}
+            }
+        
+        if if_none_match == snapshot.etag:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": snapshot.etag})
+        
+        response.headers["ETag"] = snapshot.etag
         return {
             "success": True,
-            "analytics": analytics
+            "analytics": snapshot.body,
+            "revision": snapshot.revision,
+            "computed_at": snapshot.computed_at.isoformat()
         }
         
     except Exception as e:
@@ -265,72 +304,93 @@ async def get_progression_milestones() -> Dict[str, Any]:
 @router.get("/leaderboard")
 async def get_progression_leaderboard(
     skill_area: Optional[str] = None,
-    limit: int = 10
+    limit: int = Query(10, ge=1, le=100)
 ) -> Dict[str, Any]:
     """Get leaderboard of top players by overall level or specific skill."""
     try:
         progression_tracker = await get_progression_tracker()
+        leaderboard = progression_tracker.leaderboard
         
-        # Get all player progressions
-        all_progressions = []
-        for user_id, player in progression_tracker.player_progressions.items():
-            player_data = {
-                "user_id": user_id,
-                "overall_level": player.overall_level,
-                "total_adventures": player.total_adventures,
-                "total_play_time_hours": player.total_play_time_hours,
-                "milestones_count": len(player.milestone_achievements)
-            }
-            
-            if skill_area and skill_area in [skill.value for skill in SkillArea]:
-                skill_enum = SkillArea(skill_area)
-                if skill_enum in player.skill_progress:
-                    player_data["skill_level"] = player.skill_progress[skill_enum].current_level
-                    player_data["skill_confidence"] = player.skill_progress[skill_enum].confidence_in_skill
-                else:
-                    player_data["skill_level"] = 1.0
-                    player_data["skill_confidence"] = 5.0
-            
-            all_progressions.append(player_data)
-        
-        # Sort by appropriate metric
+        if skill_area and skill_area not in [skill.value for skill in SkillArea]:
+            raise HTTPException(status_code=400, detail=f"Unknown skill area: {skill_area}")
+        
+        # Ranked index is maintained as progression is tracked
+        metric = skill_area or OVERALL_METRIC
+        top_user_ids = leaderboard.top(metric, limit=limit)
         if skill_area:
-            all_progressions.sort(key=lambda x: (x["skill_level"], x["skill_confidence"]), reverse=True)
             sort_metric = f"{skill_area.replace('_', ' ').title()} Level"
         else:
-            all_progressions.sort(key=lambda x: (x["overall_level"], x["milestones_count"]), reverse=True)
             sort_metric = "Overall Level"
         
-        # Limit results
-        top_players = all_progressions[:limit]
+        # Bounded by the limit; uncached players are hydrated from storage concurrently
+        top_players = await asyncio.gather(*[progression_tracker.get_player(player_id) for player_id in top_user_ids])
+        
+        players = []
+        for player_id, player in zip(top_user_ids, top_players):
+            if player is None:
+                continue
+            player_data = {
+                "rank": len(players) + 1,
+                "user_id": player_id[:8] + "..." if len(player_id) > 8 else player_id,  # Anonymized
+                "overall_level": player.overall_level,
+                "total_adventures": player.total_adventures,
+                "play_time_hours": round(player.total_play_time_hours, 1),
+                "milestones": len(player.milestone_achievements),
+                "skill_level": None,
+                "skill_confidence": None
+            }
+            if skill_area:
+                skill_progress = player.skill_progress.get(SkillArea(skill_area))
+                player_data["skill_level"] = skill_progress.current_level if skill_progress else DEFAULT_SKILL_LEVEL
+                player_data["skill_confidence"] = (
+                    skill_progress.confidence_in_skill if skill_progress else DEFAULT_SKILL_CONFIDENCE
+                )
+            players.append(player_data)
         
         return {
             "success": True,
             "leaderboard": {
                 "sort_metric": sort_metric,
                 "skill_area": skill_area,
-                "total_players": len(all_progressions),
-                "players": [
-                    {
-                        "rank": idx + 1,
-                        "user_id": player["user_id"][:8] + "..." if len(player["user_id"]) > 8 else player["user_id"],  # Anonymized
-                        "overall_level": player["overall_level"],
-                        "total_adventures": player["total_adventures"],
-                        "play_time_hours": round(player["total_play_time_hours"], 1),
-                        "milestones": player["milestones_count"],
-                        "skill_level": player.get("skill_level"),
-                        "skill_confidence": player.get("skill_confidence")
-                    }
-                    for idx, player in enumerate(top_players)
-                ]
+                "total_players": len(leaderboard),
+                "players": players
             }
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get progression leaderboard: {e}")
         raise HTTPException(status_code=500, detail="Failed to get leaderboard")
 
 
+@router.get("/leaderboard/rank")
+async def get_leaderboard_rank(
+    skill_area: Optional[str] = None,
+    user_id: str = Depends(get_current_user)
+) -> Dict[str, Any]:
+    """Get the current player's leaderboard rank by overall level or specific skill."""
+    try:
+        progression_tracker = await get_progression_tracker()
+        leaderboard = progression_tracker.leaderboard
+        
+        if skill_area and skill_area not in [skill.value for skill in SkillArea]:
+            raise HTTPException(status_code=400, detail=f"Unknown skill area: {skill_area}")
+        
+        return {
+            "success": True,
+            "skill_area": skill_area,
+            "rank": leaderboard.rank(user_id, skill_area or OVERALL_METRIC),
+            "total_players": len(leaderboard)
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to get leaderboard rank for {user_id}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to get leaderboard rank")
+
+
 @router.get("/recommendations")
 async def get_progression_recommendations(
     user_id: str = Depends(get_current_user)
@@ -339,7 +399,8 @@ async def get_progression_recommendations(
     try:
         progression_tracker = await get_progression_tracker()
         
-        if user_id not in progression_tracker.player_progressions:
+        player = await progression_tracker.get_player(user_id)
+        if player is None:
             return {
                 "success": True,
                 "recommendations": [
@@ -353,7 +414,6 @@ async def get_progression_recommendations(
                 ]
             }
         
-        player = progression_tracker.player_progressions[user_id]
         recommendations = await progression_tracker._generate_recommendations(player)
         
         return {
@@ -374,9 +434,7 @@ async def reset_player_progression(
     try:
         progression_tracker = await get_progression_tracker()
         
-        if user_id in progression_tracker.player_progressions:
-            del progression_tracker.player_progressions[user_id]
-            
+        if await progression_tracker.remove_player(user_id):
             return {
                 "success": True,
                 "message": "Player progression data reset successfully",
@@ -394,6 +452,39 @@ async def reset_player_progression(
         raise HTTPException(status_code=500, detail="Failed to reset progression")
 
 
+@router.get("/admin/fleet-analytics")
+async def get_fleet_analytics(
+    current_user: str = Depends(get_current_user)
+) -> Dict[str, Any]:
+    """Get the latest platform-wide progression summary (admin only)."""
+    try:
+        if not await _is_admin(current_user):
+            raise HTTPException(status_code=403, detail="Access denied")
+        
+        progression_tracker = await get_progression_tracker()
+        if progression_tracker.store.pool is None:
+            raise HTTPException(status_code=503, detail="Progression database is not configured")
+        
+        summary = await load_latest_fleet_summary(progression_tracker.store.pool)
+        if summary is None:
+            return {
+                "success": True,
+                "fleet_analytics": None,
+                "message": "No fleet analytics run has completed yet"
+            }
+        
+        return {
+            "success": True,
+            "fleet_analytics": summary
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to get fleet progression analytics: {e}")
+        raise HTTPException(status_code=500, detail="Failed to get fleet analytics")
+
+
 # Health check endpoint
 @router.get("/health")
 async def progression_health_check() -> Dict[str, Any]:
@@ -401,9 +492,10 @@ async def progression_health_check() -> Dict[str, Any]:
     try:
         progression_tracker = await get_progression_tracker()
         
-        total_players = len(progression_tracker.player_progressions)
+        # Every stored player is ranked; only cached players are checked for recent activity
+        total_players = len(progression_tracker.leaderboard)
         active_players = sum(
-            1 for player in progression_tracker.player_progressions.values()
+            1 for player in progression_tracker.store.resident_players()
             if (datetime.now() - player.last_activity).days < 7
         )
         
@@ -414,6 +506,8 @@ async def progression_health_check() -> Dict[str, Any]:
             "active_players_week": active_players,
             "skill_areas_available": len(SkillArea),
             "milestones_available": len(ProgressionMilestone),
+            "progression_store": progression_tracker.store.get_stats(),
+            "event_pipeline": (await get_progression_event_pipeline()).get_stats(),
             "timestamp": datetime.now().isoformat()
         }
         
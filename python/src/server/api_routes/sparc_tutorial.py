@@ -3,7 +3,7 @@ API endpoints for SPARC Tutorial and Onboarding system.
 Supports 10-minute Seer training with 80%+ confidence rating.
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Header, Response, status
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 import logging
@@ -12,12 +12,20 @@ from ..services.sparc.tutorial_service import (
     get_tutorial_service, TutorialStep, OnboardingStage, 
     ConfidenceArea, TutorialProgress, OnboardingMetrics
 )
+from ..services.sparc.tutorial_content import StaticPayload, get_tutorial_content
 from ..services.auth import get_current_user
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/tutorial", tags=["sparc_tutorial"])
 
 
+def _static_response(payload: StaticPayload, if_none_match: Optional[str]) -> Response:
+    """Serve precompiled JSON, or 304 when the client already has it."""
+    if payload.matches(if_none_match):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=payload.headers)
+    return Response(content=payload.body, media_type="application/json", headers=payload.headers)
+
+
 @router.post("/seer/start")
 async def start_seer_tutorial(
     user_id: str = Depends(get_current_user)
@@ -85,23 +93,18 @@ async def advance_tutorial_step(
 
 
 @router.get("/seer/step/{step}/content")
-async def get_step_content(step: str) -> Dict[str, Any]:
-    """Get content for a specific tutorial step."""
+async def get_step_content(
+    step: str,
+    if_none_match: Optional[str] = Header(None)  # ETag header
+) -> Response:
+    """Get content for a specific tutorial step (precompiled, cacheable)."""
     try:
-        tutorial_service = await get_tutorial_service()
-        
         try:
             step_enum = TutorialStep(step)
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid tutorial step")
         
-        content = tutorial_service.get_step_content(step_enum)
-        
-        return {
-            "success": True,
-            "step": step,
-            "content": content
-        }
+        return _static_response(get_tutorial_content().step(step_enum), if_none_match)
         
     except HTTPException:
         raise
@@ -319,26 +322,12 @@ async def get_tutorial_analytics() -> Dict[str, Any]:
 
 
 @router.get("/scenarios")
-async def get_available_scenarios() -> Dict[str, Any]:
-    """Get list of available practice scenarios."""
+async def get_available_scenarios(
+    if_none_match: Optional[str] = Header(None)  # ETag header
+) -> Response:
+    """Get list of available practice scenarios (precompiled, cacheable)."""
     try:
-        tutorial_service = await get_tutorial_service()
-        
-        scenarios = []
-        for scenario in tutorial_service.seer_scenarios:
-            scenarios.append({
-                "id": scenario.id,
-                "title": scenario.title,
-                "description": scenario.description,
-                "difficulty_level": scenario.difficulty_level,
-                "time_limit_minutes": scenario.time_limit_minutes,
-                "character_count": len(scenario.player_characters)
-            })
-        
-        return {
-            "success": True,
-            "scenarios": scenarios
-        }
+        return _static_response(get_tutorial_content().scenario_list, if_none_match)
         
     except Exception as e:
         logger.error(f"Failed to get scenarios: {e}")
@@ -346,30 +335,17 @@ async def get_available_scenarios() -> Dict[str, Any]:
 
 
 @router.get("/scenarios/{scenario_id}")
-async def get_scenario_details(scenario_id: str) -> Dict[str, Any]:
-    """Get detailed information about a specific scenario."""
+async def get_scenario_details(
+    scenario_id: str,
+    if_none_match: Optional[str] = Header(None)  # ETag header
+) -> Response:
+    """Get detailed information about a specific scenario (precompiled, cacheable)."""
     try:
-        tutorial_service = await get_tutorial_service()
-        
-        scenario = next((s for s in tutorial_service.seer_scenarios if s.id == scenario_id), None)
-        if not scenario:
+        payload = get_tutorial_content().scenario(scenario_id)
+        if payload is None:
             raise HTTPException(status_code=404, detail="Scenario not found")
         
-        return {
-            "success": True,
-            "scenario": {
-                "id": scenario.id,
-                "title": scenario.title,
-                "description": scenario.description,
-                "setup": scenario.setup,
-                "player_characters": scenario.player_characters,
-                "decision_points": scenario.decision_points,
-                "expected_actions": scenario.expected_actions,
-                "success_criteria": scenario.success_criteria,
-                "time_limit_minutes": scenario.time_limit_minutes,
-                "difficulty_level": scenario.difficulty_level
-            }
-        }
+        return _static_response(payload, if_none_match)
         
     except HTTPException:
         raise
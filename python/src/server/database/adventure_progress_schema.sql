@@ -0,0 +1,33 @@
+-- SPARC Adventure Progress Schema
+-- Checkpointed adventure progress; live sessions are held in memory and flushed in batches
+
+CREATE TABLE IF NOT EXISTS adventure_progress (
+    session_id VARCHAR(255) PRIMARY KEY,           -- Game session ID
+    adventure_id VARCHAR(255) NOT NULL,            -- Adventure template ID
+    current_scene_id VARCHAR(255) NOT NULL,        -- Scene the party is in
+    completed_scenes JSONB NOT NULL DEFAULT '[]',  -- Ordered list of completed scene IDs
+    scene_outcomes JSONB NOT NULL DEFAULT '{}',    -- Scene ID -> outcome type
+    total_progress_points INTEGER NOT NULL DEFAULT 0,
+    confidence_score REAL NOT NULL DEFAULT 5.0,
+    time_spent_minutes INTEGER NOT NULL DEFAULT 0,
+    started_at TIMESTAMPTZ NOT NULL,
+    last_activity TIMESTAMPTZ NOT NULL,
+    player_notes JSONB NOT NULL DEFAULT '[]',
+    gm_interventions INTEGER NOT NULL DEFAULT 0,
+    is_completed BOOLEAN NOT NULL DEFAULT FALSE,
+    player_count INTEGER NOT NULL DEFAULT 2,       -- Party size, used to render scenes
+    checkpointed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Active session listing (/adventure/sessions/active)
+CREATE INDEX IF NOT EXISTS idx_adventure_progress_activity
+ON adventure_progress (last_activity DESC);
+
+-- Cleanup of abandoned, unfinished adventures
+CREATE INDEX IF NOT EXISTS idx_adventure_progress_open
+ON adventure_progress (last_activity)
+WHERE is_completed = FALSE;
+
+COMMENT ON TABLE adventure_progress IS 'Checkpointed SPARC adventure progress, reloaded on demand after idle eviction or restart';
+COMMENT ON COLUMN adventure_progress.scene_outcomes IS 'JSON object of scene ID to outcome type value';
+COMMENT ON COLUMN adventure_progress.checkpointed_at IS 'When the row was last flushed from memory';
@@ -0,0 +1,24 @@
+-- SPARC Player Progression Schema
+-- One JSON document per player; hot players are cached per worker and writes are coalesced
+
+CREATE TABLE IF NOT EXISTS player_progression (
+    user_id VARCHAR(255) PRIMARY KEY,
+    overall_level DOUBLE PRECISION NOT NULL DEFAULT 1.0,   -- Leaderboard column
+    milestones_count INTEGER NOT NULL DEFAULT 0,           -- Leaderboard tie-breaker
+    skill_levels JSONB NOT NULL DEFAULT '{}',              -- Skill area -> [level, confidence]
+    data JSONB NOT NULL,                                   -- Full PlayerProgression document
+    last_activity TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    version BIGINT NOT NULL DEFAULT 1,                     -- Incremented on every write
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Overall leaderboard rebuilds and weekly activity reporting
+CREATE INDEX IF NOT EXISTS idx_player_progression_level
+ON player_progression (overall_level DESC, milestones_count DESC);
+
+CREATE INDEX IF NOT EXISTS idx_player_progression_activity
+ON player_progression (last_activity DESC);
+
+COMMENT ON TABLE player_progression IS 'SPARC player progression, hydrated lazily by each worker';
+COMMENT ON COLUMN player_progression.data IS 'Skills, milestones, confidence trend and adventure summaries';
+COMMENT ON COLUMN player_progression.version IS 'Compared by workers to refresh stale cached progression and to reject writes based on stale copies';
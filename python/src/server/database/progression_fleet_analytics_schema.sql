@@ -0,0 +1,20 @@
+-- SPARC Fleet Progression Analytics Schema
+-- Summary tables written by the fleet analytics batch job (services/sparc/progression_fleet_analytics.py)
+
+CREATE TABLE IF NOT EXISTS progression_fleet_runs (
+    run_id BIGSERIAL PRIMARY KEY,
+    started_at TIMESTAMPTZ NOT NULL,
+    finished_at TIMESTAMPTZ NOT NULL,
+    players_processed INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS progression_fleet_stats (
+    run_id BIGINT NOT NULL REFERENCES progression_fleet_runs (run_id) ON DELETE CASCADE,
+    section VARCHAR(64) NOT NULL,          -- overview, skill_levels, adventure_milestones, cohort_confidence
+    key VARCHAR(255) NOT NULL,             -- Skill area, adventure id or signup month
+    stats JSONB NOT NULL,
+    PRIMARY KEY (run_id, section, key)
+);
+
+COMMENT ON TABLE progression_fleet_runs IS 'One row per completed fleet progression analytics run';
+COMMENT ON TABLE progression_fleet_stats IS 'Mergeable sketch summaries read by the admin fleet analytics route';
@@ -32,6 +32,64 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Service lifecycle
+@app.on_event("startup")
+async def startup_services():
+    """Open pooled connections and warm AI caches before the first request."""
+    from .services.sparc.openai_client import get_openai_client
+    from .services.sparc.ai_cache_service import get_ai_cache_service
+    from .services.sparc.ai_advice_precompute import load_warm_tier_entries
+    from .services.sparc.ai_cache_snapshot import get_ai_cache_snapshotter
+    from .services.sparc.adventure_progress_store import get_adventure_progress_store
+    from .services.sparc.progression_tracker import get_progression_tracker
+    from .services.sparc.progression_events import get_progression_event_pipeline
+    
+    openai_client = await get_openai_client()
+    await openai_client.start()
+    await openai_client.warm_up()
+    
+    ai_cache = await get_ai_cache_service()
+    ai_cache.load_warm_tier(load_warm_tier_entries())
+    
+    snapshotter = await get_ai_cache_snapshotter()
+    snapshotter.restore()
+    snapshotter.start()
+    
+    progress_store = await get_adventure_progress_store()
+    progress_store.start()
+    
+    progression_tracker = await get_progression_tracker()
+    await progression_tracker.load_leaderboard()
+    progression_tracker.start()
+    
+    event_pipeline = await get_progression_event_pipeline()
+    event_pipeline.start()
+
+@app.on_event("shutdown")
+async def shutdown_services():
+    """Snapshot AI caches, checkpoint adventure and player progress and close pooled connections."""
+    from .services.sparc.openai_client import get_openai_client
+    from .services.sparc.ai_cache_snapshot import get_ai_cache_snapshotter
+    from .services.sparc.adventure_progress_store import get_adventure_progress_store
+    from .services.sparc.progression_tracker import get_progression_tracker
+    from .services.sparc.progression_events import get_progression_event_pipeline
+    
+    progress_store = await get_adventure_progress_store()
+    await progress_store.stop()
+    
+    # Apply queued progression events before the store's final flush
+    event_pipeline = await get_progression_event_pipeline()
+    await event_pipeline.stop()
+    
+    progression_tracker = await get_progression_tracker()
+    await progression_tracker.stop()
+    
+    snapshotter = await get_ai_cache_snapshotter()
+    await snapshotter.stop()
+    
+    openai_client = await get_openai_client()
+    await openai_client.close()
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
@@ -0,0 +1,473 @@
+"""
+Adventure Compiler for SPARC RPG.
+Turns adventure definitions into validated, indexed scene graphs.
+"""
+
+import argparse
+import json
+import os
+import re
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from .adventure_models import (
+    AdventureScene, AdventureTemplate, DifficultyLevel, OutcomeType, SceneOutcome, SceneType
+)
+
+try:
+    import yaml
+    YAML_AVAILABLE = True
+except ImportError:
+    yaml = None
+    YAML_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+COMPILED_FORMAT_VERSION = 1
+DEFAULT_MARKDOWN_DIR = Path(__file__).resolve().parents[5] / "adventures-chopped"
+
+
+class AdventureCompileError(ValueError):
+    """Raised when an adventure definition is invalid."""
+
+
+@dataclass
+class CompiledAdventure:
+    """An adventure template with its scene graph indexed for O(1) transitions."""
+    template: AdventureTemplate
+    scene_index: Dict[str, AdventureScene]
+    default_next: Dict[str, Optional[str]]
+    adjacency: Dict[str, Tuple[str, ...]]
+    reachable: FrozenSet[str]
+    warnings: List[str] = field(default_factory=list)
+
+    @property
+    def id(self) -> str:
+        return self.template.id
+
+    @property
+    def start_scene_id(self) -> str:
+        return self.template.scenes[0].id
+
+    def get_scene(self, scene_id: str) -> Optional[AdventureScene]:
+        """Look up a scene by id."""
+        return self.scene_index.get(scene_id)
+
+    def next_scene_id(self, scene_id: str, target: Optional[str]) -> Optional[str]:
+        """Resolve an outcome's target, falling through to the default next scene."""
+        if target in self.scene_index:
+            return target
+        return self.default_next.get(scene_id)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize template and precomputed graph."""
+        return {
+            "version": COMPILED_FORMAT_VERSION,
+            "template": template_to_dict(self.template),
+            "default_next": self.default_next,
+            "adjacency": {scene_id: list(targets) for scene_id, targets in self.adjacency.items()},
+            "reachable": sorted(self.reachable),
+            "warnings": self.warnings
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CompiledAdventure':
+        """Rebuild a compiled adventure without recomputing its graph."""
+        template = template_from_dict(data["template"])
+        return cls(
+            template=template,
+            scene_index={scene.id: scene for scene in template.scenes},
+            default_next=data["default_next"],
+            adjacency={scene_id: tuple(targets) for scene_id, targets in data["adjacency"].items()},
+            reachable=frozenset(data["reachable"]),
+            warnings=data.get("warnings", [])
+        )
+
+
+def _outcome_to_dict(outcome: SceneOutcome) -> Dict[str, Any]:
+    return {
+        "outcome_type": outcome.outcome_type.value,
+        "description": outcome.description,
+        "consequence": outcome.consequence,
+        "next_scene_id": outcome.next_scene_id,
+        "progress_points": outcome.progress_points,
+        "confidence_impact": outcome.confidence_impact
+    }
+
+
+def _outcome_from_dict(data: Dict[str, Any]) -> SceneOutcome:
+    return SceneOutcome(
+        outcome_type=OutcomeType(data["outcome_type"]),
+        description=data["description"],
+        consequence=data["consequence"],
+        next_scene_id=data.get("next_scene_id"),
+        progress_points=data["progress_points"],
+        confidence_impact=data["confidence_impact"]
+    )
+
+
+def template_to_dict(template: AdventureTemplate) -> Dict[str, Any]:
+    """Convert a template to plain JSON-serializable data."""
+    return {
+        "id": template.id,
+        "title": template.title,
+        "description": template.description,
+        "theme": template.theme,
+        "difficulty_level": template.difficulty_level.value,
+        "total_time_minutes": template.total_time_minutes,
+        "target_players": template.target_players,
+        "learning_objectives": template.learning_objectives,
+        "required_materials": template.required_materials,
+        "success_criteria": template.success_criteria,
+        "scenes": [
+            {
+                "id": scene.id,
+                "title": scene.title,
+                "scene_type": scene.scene_type.value,
+                "description": scene.description,
+                "setup_text": scene.setup_text,
+                "decision_prompt": scene.decision_prompt,
+                "available_actions": scene.available_actions,
+                "outcomes": {action_id: _outcome_to_dict(outcome) for action_id, outcome in scene.outcomes.items()},
+                "time_estimate_minutes": scene.time_estimate_minutes,
+                "difficulty_hints": scene.difficulty_hints,
+                "gm_notes": scene.gm_notes,
+                "required_dice_rolls": scene.required_dice_rolls
+            }
+            for scene in template.scenes
+        ]
+    }
+
+
+def template_from_dict(data: Dict[str, Any]) -> AdventureTemplate:
+    """Build a template from plain data, raising AdventureCompileError on schema problems."""
+    try:
+        scenes = [
+            AdventureScene(
+                id=scene["id"],
+                title=scene["title"],
+                scene_type=SceneType(scene["scene_type"]),
+                description=scene.get("description", ""),
+                setup_text=scene.get("setup_text", ""),
+                decision_prompt=scene.get("decision_prompt", ""),
+                available_actions=scene.get("available_actions", []),
+                outcomes={
+                    action_id: _outcome_from_dict(outcome)
+                    for action_id, outcome in scene.get("outcomes", {}).items()
+                },
+                time_estimate_minutes=scene.get("time_estimate_minutes", 5),
+                difficulty_hints=scene.get("difficulty_hints", []),
+                gm_notes=scene.get("gm_notes", ""),
+                required_dice_rolls=scene.get("required_dice_rolls", [])
+            )
+            for scene in data["scenes"]
+        ]
+        return AdventureTemplate(
+            id=data["id"],
+            title=data["title"],
+            description=data.get("description", ""),
+            theme=data.get("theme", ""),
+            difficulty_level=DifficultyLevel(data.get("difficulty_level", DifficultyLevel.NEWCOMER.value)),
+            total_time_minutes=data.get("total_time_minutes", 60),
+            target_players=data.get("target_players", 2),
+            scenes=scenes,
+            learning_objectives=data.get("learning_objectives", []),
+            required_materials=data.get("required_materials", []),
+            success_criteria=data.get("success_criteria", {})
+        )
+    except (KeyError, TypeError, ValueError, AttributeError) as e:
+        raise AdventureCompileError(f"Invalid adventure definition {data.get('id', '?')}: {e}") from e
+
+
+def compile_adventure(template: AdventureTemplate, strict: bool = False) -> CompiledAdventure:
+    """
+    Validate a template and precompute its scene graph.
+
+    Outcomes leading to unknown scenes fall through to the default next scene and are
+    reported as warnings, or rejected when strict is set.
+
+    Raises:
+        AdventureCompileError: if the template has no scenes or duplicate scene ids
+    """
+    if not template.id:
+        raise AdventureCompileError("Adventure is missing an id")
+    if not template.scenes:
+        raise AdventureCompileError(f"Adventure {template.id} has no scenes")
+
+    scene_index: Dict[str, AdventureScene] = {}
+    for scene in template.scenes:
+        if scene.id in scene_index:
+            raise AdventureCompileError(f"Adventure {template.id} has duplicate scene id {scene.id}")
+        scene_index[scene.id] = scene
+
+    # Unmatched or target-less outcomes fall through to the next scene in order
+    scene_ids = [scene.id for scene in template.scenes]
+    default_next = {
+        scene_id: scene_ids[position + 1] if position + 1 < len(scene_ids) else None
+        for position, scene_id in enumerate(scene_ids)
+    }
+
+    warnings: List[str] = []
+    adjacency: Dict[str, Tuple[str, ...]] = {}
+    for scene in template.scenes:
+        targets: List[Optional[str]] = [default_next[scene.id]]
+        for action_id, outcome in scene.outcomes.items():
+            if outcome.next_scene_id is None or outcome.next_scene_id in scene_index:
+                targets.append(outcome.next_scene_id)
+                continue
+            message = f"Outcome {action_id} of scene {scene.id} leads to unknown scene {outcome.next_scene_id}"
+            if strict:
+                raise AdventureCompileError(f"Adventure {template.id}: {message}")
+            warnings.append(message)
+        adjacency[scene.id] = tuple(dict.fromkeys(target for target in targets if target))
+
+    reachable = {scene_ids[0]}
+    queue = deque([scene_ids[0]])
+    while queue:
+        for target in adjacency[queue.popleft()]:
+            if target not in reachable:
+                reachable.add(target)
+                queue.append(target)
+
+    warnings.extend(
+        f"Scene {scene_id} is unreachable from {scene_ids[0]}"
+        for scene_id in scene_ids if scene_id not in reachable
+    )
+    if warnings:
+        logger.warning(f"Adventure {template.id} compiled with {len(warnings)} warnings: {warnings[0]}")
+
+    return CompiledAdventure(
+        template=template,
+        scene_index=scene_index,
+        default_next=default_next,
+        adjacency=adjacency,
+        reachable=frozenset(reachable),
+        warnings=warnings
+    )
+
+
+def compile_adventures(templates: Iterable[AdventureTemplate], strict: bool = False) -> Dict[str, CompiledAdventure]:
+    """Compile several templates, rejecting duplicate adventure ids."""
+    compiled: Dict[str, CompiledAdventure] = {}
+    for template in templates:
+        if template.id in compiled:
+            raise AdventureCompileError(f"Duplicate adventure id {template.id}")
+        compiled[template.id] = compile_adventure(template, strict=strict)
+    return compiled
+
+
+def write_compiled_adventure(adventure: CompiledAdventure, path: Path) -> None:
+    """Write a compiled adventure as compact JSON the adventure loader reads directly."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(adventure.to_dict(), f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+# Markdown node files (adventures-chopped/*-nodes.md, see CHOPPING-TEMPLATE.md)
+
+_YAML_BLOCK_PATTERN = re.compile(r"```yaml\n(.*?)```", re.DOTALL)
+_SUMMARY_PATTERN = re.compile(r"^\*\*([\w ]+):\*\*\s*(.+)$", re.MULTILINE)
+
+_NODE_SCENE_TYPES = {
+    "story": SceneType.EXPLORATION,
+    "decision": SceneType.SOCIAL,
+    "skill_check": SceneType.CHALLENGE,
+    "puzzle": SceneType.CHALLENGE,
+    "combat": SceneType.COMBAT,
+    "reward": SceneType.RESOLUTION,
+    "rest": SceneType.RESOLUTION
+}
+
+_NODE_DIFFICULTIES = {
+    "newcomer": DifficultyLevel.NEWCOMER,
+    "beginner": DifficultyLevel.BEGINNER,
+    "intermediate": DifficultyLevel.INTERMEDIATE,
+    "advanced": DifficultyLevel.INTERMEDIATE
+}
+
+_FAILURE_CONDITIONS = {"failure", "defeat"}
+
+# Node files use the tabletop attributes; scenes use the stat names of the native adventures
+_NODE_STATS = {
+    "might": "strength", "str": "strength",
+    "grace": "dexterity", "dex": "dexterity",
+    "wit": "intelligence", "int": "intelligence",
+    "heart": "charisma", "cha": "charisma"
+}
+
+# Node difficulties are target numbers on a d6; scenes use 1d6 + stat against Easy (8) to Very Hard (20)
+_NODE_TARGET_NUMBERS = range(1, 7)
+_DEFAULT_ROLL_DIFFICULTY = 12  # Medium
+
+
+def _node_difficulty_to_sparc(target_number: int) -> int:
+    """Scale a d6 target number (3 = medium) onto SPARC difficulties (12 = medium)."""
+    return 6 + 2 * target_number
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", text.lower()).strip("_") or "continue"
+
+
+def _condition_label(condition: str) -> str:
+    """Readable action text for a connection condition such as "success" or "!flag:met_ernesh"."""
+    negated = condition.startswith("!")
+    condition = condition.lstrip("!")
+    if condition.startswith("flag:"):
+        return f"If {'not ' if negated else ''}{condition[len('flag:'):].replace('_', ' ')}"
+    return condition.replace("_", " ").capitalize()
+
+
+def _node_stat(node: Dict[str, Any]) -> str:
+    stat = str(node["properties"]["stat"]).strip().lower()
+    if stat not in _NODE_STATS:
+        raise AdventureCompileError(f"Node {node['node_id']} uses unknown stat: {node['properties']['stat']}")
+    return _NODE_STATS[stat]
+
+
+def _node_roll_difficulty(node: Dict[str, Any]) -> int:
+    target_number = node["properties"].get("difficulty")
+    if target_number is None:
+        return _DEFAULT_ROLL_DIFFICULTY
+    if isinstance(target_number, bool) or not isinstance(target_number, int) or target_number not in _NODE_TARGET_NUMBERS:
+        raise AdventureCompileError(
+            f"Node {node['node_id']} difficulty must be a d6 target number from 1 to 6, got {target_number!r}"
+        )
+    return _node_difficulty_to_sparc(target_number)
+
+
+def _node_to_scene(node: Dict[str, Any], titles: Dict[str, str], minutes: int) -> AdventureScene:
+    """Map one chopped node onto the AdventureScene schema."""
+    properties = node.get("properties") or {}
+    content = (node.get("content") or "").strip()
+
+    actions: List[Dict[str, Any]] = []
+    outcomes: Dict[str, SceneOutcome] = {}
+    for connection in node.get("connections") or []:
+        target = connection["target"]
+        condition = connection.get("condition")
+        if connection.get("label") or condition:
+            label = connection.get("label") or _condition_label(condition)
+            action_id = _slug(label)
+        else:
+            label = f"Continue to {titles.get(target, target)}"
+            action_id = "continue"
+        while action_id in outcomes:
+            action_id += "_alt"
+
+        failed = condition in _FAILURE_CONDITIONS
+        actions.append({"id": action_id, "text": label, "difficulty": "medium" if condition else "easy"})
+        outcomes[action_id] = SceneOutcome(
+            OutcomeType.FAILURE if failed else OutcomeType.SUCCESS,
+            properties.get("failure_text" if failed else "success_text") or label,
+            f"The story moves to {titles.get(target, target)}",
+            target,
+            5 if failed else 10,
+            0.0 if failed else 0.5
+        )
+
+    dice_rolls = []
+    if "stat" in properties:
+        dice_rolls.append({
+            "type": _node_stat(node),
+            "difficulty": _node_roll_difficulty(node),
+            "purpose": properties.get("description", node.get("title", ""))
+        })
+
+    return AdventureScene(
+        id=node["node_id"],
+        title=node.get("title", node["node_id"]),
+        scene_type=_NODE_SCENE_TYPES.get(node.get("type"), SceneType.EXPLORATION),
+        description=content.split("\n")[0],
+        setup_text=content,
+        decision_prompt=properties.get("prompt") or properties.get("description") or "What do you do?",
+        available_actions=actions,
+        outcomes=outcomes,
+        time_estimate_minutes=minutes,
+        difficulty_hints=list(properties.get("hints", [])),
+        gm_notes=properties.get("secret") or properties.get("solution") or "",
+        required_dice_rolls=dice_rolls
+    )
+
+
+def import_node_markdown(path: Path) -> AdventureTemplate:
+    """Build a template from a chopped adventure node file."""
+    if not YAML_AVAILABLE:
+        raise AdventureCompileError("PyYAML is required to import adventure node files")
+
+    text = Path(path).read_text(encoding="utf-8")
+    metadata: Dict[str, Any] = {}
+    nodes: List[Dict[str, Any]] = []
+    for block in _YAML_BLOCK_PATTERN.findall(text):
+        try:
+            data = yaml.safe_load(block)
+        except yaml.YAMLError as e:
+            raise AdventureCompileError(f"Invalid YAML block in {path}: {e}") from e
+        if not isinstance(data, dict):
+            continue
+        if "node_id" in data:
+            nodes.append(data)
+        elif "title" in data and not metadata:
+            metadata = data
+
+    if not nodes:
+        raise AdventureCompileError(f"No nodes found in {path}")
+
+    summary = {key.lower(): value.strip() for key, value in _SUMMARY_PATTERN.findall(text)}
+    total_minutes = int(metadata.get("duration", 60))
+    party_size = re.match(r"\d+", str(metadata.get("party_size", "2")))
+    titles = {node["node_id"]: node.get("title", node["node_id"]) for node in nodes}
+    minutes = max(1, total_minutes // len(nodes))
+
+    scenes = [_node_to_scene(node, titles, minutes) for node in nodes]
+    scenes[0].scene_type = SceneType.INTRODUCTION
+
+    return AdventureTemplate(
+        id=_slug(Path(path).name.replace("-nodes.md", "").replace(".md", "")),
+        title=metadata.get("title", scenes[0].title),
+        description=summary.get("objective") or summary.get("hook") or "",
+        theme=metadata.get("theme", ""),
+        difficulty_level=_NODE_DIFFICULTIES.get(str(metadata.get("difficulty", "")).lower(), DifficultyLevel.BEGINNER),
+        total_time_minutes=total_minutes,
+        target_players=int(party_size.group()) if party_size else 2,
+        scenes=scenes,
+        learning_objectives=[],
+        required_materials=["d6 dice", "character sheets"],
+        success_criteria={
+            key: summary[key] for key in ("hook", "objective", "reward", "fail condition") if key in summary
+        }
+    )
+
+
+def import_markdown_adventures(markdown_dir: Path, output_dir: Path) -> int:
+    """Compile every node file under markdown_dir into output_dir, returning the number written."""
+    written = 0
+    for node_file in sorted(markdown_dir.rglob("*-nodes.md")):
+        try:
+            adventure = compile_adventure(import_node_markdown(node_file))
+        except AdventureCompileError as e:
+            logger.error(f"Skipping {node_file}: {e}")
+            continue
+        write_compiled_adventure(adventure, output_dir / f"{adventure.id}.json")
+        written += 1
+    return written
+
+
+if __name__ == "__main__":
+    from .adventure_loader import get_adventure_dir
+
+    parser = argparse.ArgumentParser(description="Compile chopped adventure node files into the adventure directory")
+    parser.add_argument("--markdown-dir", type=Path, default=DEFAULT_MARKDOWN_DIR, help="Chopped adventure node files")
+    parser.add_argument("--output-dir", type=Path, default=None, help="Adventure directory to write")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    output_dir = args.output_dir or get_adventure_dir()
+    count = import_markdown_adventures(args.markdown_dir, output_dir)
+    logger.info(f"Wrote {count} compiled adventures to {output_dir}")
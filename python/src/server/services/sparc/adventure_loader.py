@@ -0,0 +1,226 @@
+"""
+Adventure Loader for SPARC RPG.
+Loads adventure definitions from JSON/YAML files on demand, with an LRU and hot reload.
+"""
+
+import json
+import os
+import time
+import logging
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from .adventure_compiler import (
+    COMPILED_FORMAT_VERSION, AdventureCompileError, CompiledAdventure, compile_adventure, template_from_dict
+)
+from .adventure_models import AdventureTemplate
+
+try:
+    import yaml
+    YAML_AVAILABLE = True
+except ImportError:
+    yaml = None
+    YAML_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_ADVENTURE_DIR = Path(__file__).resolve().parents[2] / "data" / "adventures"
+ADVENTURE_FILE_SUFFIXES = (".json", ".yaml", ".yml")
+
+
+def get_adventure_dir() -> Path:
+    """Directory of adventure definition files (ADVENTURE_DIR overrides)."""
+    return Path(os.getenv("ADVENTURE_DIR", str(DEFAULT_ADVENTURE_DIR)))
+
+
+@dataclass
+class _LoadedAdventure:
+    """A compiled adventure and the file version it was loaded from."""
+    adventure: CompiledAdventure
+    mtime_ns: int
+    checked_at: float
+
+
+class AdventureTemplateView(Mapping):
+    """Read-only adventure_id -> AdventureTemplate view over a loader."""
+
+    def __init__(self, loader: "AdventureLoader"):
+        self._loader = loader
+
+    def __getitem__(self, adventure_id: str) -> AdventureTemplate:
+        return self._loader[adventure_id].template
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._loader)
+
+    def __len__(self) -> int:
+        return len(self._loader)
+
+    def __contains__(self, adventure_id: object) -> bool:
+        return adventure_id in self._loader
+
+
+class AdventureLoader(Mapping):
+    """
+    Catalogue of adventures backed by a directory of definition files.
+
+    Features:
+    - One file per adventure (<adventure_id>.json, .yaml or .yml), validated and compiled on first use
+    - Accepts plain definitions and precompiled documents from the adventure compiler
+    - LRU of compiled adventures bounds worker memory for large catalogues
+    - Hot reload: changed, new and deleted files are picked up without a restart
+    - An invalid edit keeps the last good version in service
+    """
+
+    def __init__(self, directory: Path, max_cached: int = 32, reload_check_seconds: float = 2.0):
+        self.directory = Path(directory)
+        self.max_cached = max_cached
+        self.reload_check_seconds = reload_check_seconds
+
+        self._files: Dict[str, Path] = {}
+        self._scanned_at: Optional[float] = None
+        self._cache: "OrderedDict[str, _LoadedAdventure]" = OrderedDict()
+        self._invalid: Dict[str, int] = {}
+        self.stats = {
+            'hits': 0,
+            'loads': 0,
+            'reloads': 0,
+            'evictions': 0,
+            'errors': 0
+        }
+
+    def _scan(self, force: bool = False):
+        """Index definition files by adventure id, at most once per reload interval."""
+        now = time.monotonic()
+        if not force and self._scanned_at is not None and now - self._scanned_at < self.reload_check_seconds:
+            return
+        self._scanned_at = now
+
+        files: Dict[str, Path] = {}
+        if self.directory.is_dir():
+            for path in sorted(self.directory.iterdir()):
+                if path.suffix not in ADVENTURE_FILE_SUFFIXES or path.name.startswith("."):
+                    continue
+                if path.suffix != ".json" and not YAML_AVAILABLE:
+                    logger.warning(f"Skipping {path}: PyYAML is not installed")
+                    continue
+                if path.stem in files:
+                    logger.warning(f"Skipping {path}: adventure {path.stem} is already defined by {files[path.stem]}")
+                    continue
+                files[path.stem] = path
+
+        for adventure_id in set(self._cache) - set(files):
+            del self._cache[adventure_id]
+        self._files = files
+
+    def _parse(self, path: Path) -> CompiledAdventure:
+        """Read, validate and compile one definition file."""
+        text = path.read_text(encoding="utf-8")
+        if path.suffix == ".json":
+            data: Any = json.loads(text)
+        else:
+            try:
+                data = yaml.safe_load(text)
+            except yaml.YAMLError as e:
+                raise AdventureCompileError(f"Invalid YAML in {path.name}: {e}") from e
+        if not isinstance(data, dict):
+            raise AdventureCompileError(f"{path.name} does not contain an adventure definition")
+
+        if "template" in data:
+            if data.get("version") != COMPILED_FORMAT_VERSION:
+                raise AdventureCompileError(f"{path.name} has unsupported compiled version {data.get('version')}")
+            adventure = CompiledAdventure.from_dict(data)
+        else:
+            adventure = compile_adventure(template_from_dict(data))
+
+        if adventure.id != path.stem:
+            raise AdventureCompileError(f"{path.name} defines adventure {adventure.id}, expected {path.stem}")
+        return adventure
+
+    def get(self, adventure_id: str, default: Any = None) -> Optional[CompiledAdventure]:
+        """Get a compiled adventure, loading or reloading its file if needed."""
+        self._scan()
+        path = self._files.get(adventure_id)
+        if path is None:
+            return default
+
+        now = time.monotonic()
+        entry = self._cache.get(adventure_id)
+        if entry is not None and now - entry.checked_at < self.reload_check_seconds:
+            self._cache.move_to_end(adventure_id)
+            self.stats['hits'] += 1
+            return entry.adventure
+
+        try:
+            mtime_ns = path.stat().st_mtime_ns
+        except OSError:
+            self._scan(force=True)
+            return default
+
+        if entry is None and self._invalid.get(adventure_id) == mtime_ns:
+            return default
+        if entry is not None and entry.mtime_ns == mtime_ns:
+            entry.checked_at = now
+            self._cache.move_to_end(adventure_id)
+            self.stats['hits'] += 1
+            return entry.adventure
+
+        try:
+            adventure = self._parse(path)
+        except (OSError, ValueError) as e:
+            self.stats['errors'] += 1
+            logger.error(f"Failed to load adventure {adventure_id} from {path}: {e}")
+            if entry is None:
+                self._invalid[adventure_id] = mtime_ns
+                return default
+            # Keep serving the last good version until the file is fixed
+            entry.mtime_ns = mtime_ns
+            entry.checked_at = now
+            return entry.adventure
+
+        self._invalid.pop(adventure_id, None)
+        self.stats['reloads' if entry is not None else 'loads'] += 1
+        self._cache[adventure_id] = _LoadedAdventure(adventure, mtime_ns, now)
+        self._cache.move_to_end(adventure_id)
+        while len(self._cache) > self.max_cached:
+            self._cache.popitem(last=False)
+            self.stats['evictions'] += 1
+        return adventure
+
+    def __getitem__(self, adventure_id: str) -> CompiledAdventure:
+        adventure = self.get(adventure_id)
+        if adventure is None:
+            raise KeyError(adventure_id)
+        return adventure
+
+    def __iter__(self) -> Iterator[str]:
+        self._scan()
+        return iter(list(self._files))
+
+    def __len__(self) -> int:
+        self._scan()
+        return len(self._files)
+
+    def __contains__(self, adventure_id: object) -> bool:
+        self._scan()
+        return adventure_id in self._files
+
+    @property
+    def templates(self) -> AdventureTemplateView:
+        """Adventure templates by id, loaded on access."""
+        return AdventureTemplateView(self)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get loader statistics for monitoring."""
+        self._scan()
+        return {
+            **self.stats,
+            'catalogue_size': len(self._files),
+            'cached': len(self._cache),
+            'max_cached': self.max_cached,
+            'directory': str(self.directory)
+        }
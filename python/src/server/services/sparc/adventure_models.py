@@ -0,0 +1,91 @@
+"""
+Adventure data model for SPARC RPG.
+Scene, outcome, template and progress types shared by adventure services.
+"""
+
+from typing import Dict, List, Optional, Any
+from datetime import datetime
+from dataclasses import dataclass
+from enum import Enum
+
+
+class SceneType(Enum):
+    INTRODUCTION = "introduction"
+    EXPLORATION = "exploration"
+    SOCIAL = "social"
+    CHALLENGE = "challenge"
+    COMBAT = "combat"
+    RESOLUTION = "resolution"
+
+
+class OutcomeType(Enum):
+    SUCCESS = "success"
+    PARTIAL_SUCCESS = "partial_success"
+    FAILURE = "failure"
+    CRITICAL_SUCCESS = "critical_success"
+    CRITICAL_FAILURE = "critical_failure"
+
+
+class DifficultyLevel(Enum):
+    NEWCOMER = "newcomer"
+    BEGINNER = "beginner"
+    INTERMEDIATE = "intermediate"
+
+
+@dataclass
+class SceneOutcome:
+    outcome_type: OutcomeType
+    description: str
+    consequence: str
+    next_scene_id: Optional[str]
+    progress_points: int
+    confidence_impact: float
+
+
+@dataclass
+class AdventureScene:
+    id: str
+    title: str
+    scene_type: SceneType
+    description: str
+    setup_text: str
+    decision_prompt: str
+    available_actions: List[Dict[str, Any]]
+    outcomes: Dict[str, SceneOutcome]
+    time_estimate_minutes: int
+    difficulty_hints: List[str]
+    gm_notes: str
+    required_dice_rolls: List[Dict[str, Any]]
+
+
+@dataclass
+class AdventureTemplate:
+    id: str
+    title: str
+    description: str
+    theme: str
+    difficulty_level: DifficultyLevel
+    total_time_minutes: int
+    target_players: int
+    scenes: List[AdventureScene]
+    learning_objectives: List[str]
+    required_materials: List[str]
+    success_criteria: Dict[str, Any]
+
+
+@dataclass
+class AdventureProgress:
+    session_id: str
+    adventure_id: str
+    current_scene_id: str
+    completed_scenes: List[str]
+    scene_outcomes: Dict[str, OutcomeType]
+    total_progress_points: int
+    confidence_score: float
+    time_spent_minutes: int
+    started_at: datetime
+    last_activity: datetime
+    player_notes: List[str]
+    gm_interventions: int
+    is_completed: bool
+    player_count: int = 2
@@ -0,0 +1,351 @@
+"""
+Adventure Progress Store for SPARC RPG.
+Keeps live adventure progress in memory, checkpoints it to Postgres in batches and evicts idle sessions.
+"""
+
+import asyncio
+import json
+import os
+import time
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Set
+
+import asyncpg
+
+from .adventure_models import AdventureProgress, OutcomeType
+
+logger = logging.getLogger(__name__)
+
+
+UPSERT_PROGRESS_SQL = """
+    INSERT INTO adventure_progress (
+        session_id, adventure_id, current_scene_id, completed_scenes, scene_outcomes,
+        total_progress_points, confidence_score, time_spent_minutes, started_at,
+        last_activity, player_notes, gm_interventions, is_completed, player_count, checkpointed_at
+    ) VALUES ($1, $2, $3, $4::jsonb, $5::jsonb, $6, $7, $8, $9, $10, $11::jsonb, $12, $13, $14, NOW())
+    ON CONFLICT (session_id) DO UPDATE SET
+        current_scene_id = EXCLUDED.current_scene_id,
+        completed_scenes = EXCLUDED.completed_scenes,
+        scene_outcomes = EXCLUDED.scene_outcomes,
+        total_progress_points = EXCLUDED.total_progress_points,
+        confidence_score = EXCLUDED.confidence_score,
+        time_spent_minutes = EXCLUDED.time_spent_minutes,
+        last_activity = EXCLUDED.last_activity,
+        player_notes = EXCLUDED.player_notes,
+        gm_interventions = EXCLUDED.gm_interventions,
+        is_completed = EXCLUDED.is_completed,
+        player_count = EXCLUDED.player_count,
+        checkpointed_at = NOW()
+"""
+
+SELECT_PROGRESS_SQL = "SELECT * FROM adventure_progress WHERE session_id = $1"
+
+SELECT_ACTIVE_SQL = """
+    SELECT * FROM adventure_progress
+    WHERE last_activity > $1
+    ORDER BY last_activity DESC
+    LIMIT $2
+"""
+
+DELETE_PROGRESS_SQL = "DELETE FROM adventure_progress WHERE session_id = $1"
+
+
+def _to_db_time(value: datetime) -> datetime:
+    """Progress uses naive local times; store them timezone-aware."""
+    return value.astimezone()
+
+
+def _from_db_time(value: datetime) -> datetime:
+    return value.astimezone().replace(tzinfo=None) if value.tzinfo else value
+
+
+def progress_to_row(progress: AdventureProgress) -> List[Any]:
+    """Parameters for UPSERT_PROGRESS_SQL."""
+    return [
+        progress.session_id,
+        progress.adventure_id,
+        progress.current_scene_id,
+        json.dumps(progress.completed_scenes),
+        json.dumps({scene_id: outcome.value for scene_id, outcome in progress.scene_outcomes.items()}),
+        progress.total_progress_points,
+        progress.confidence_score,
+        progress.time_spent_minutes,
+        _to_db_time(progress.started_at),
+        _to_db_time(progress.last_activity),
+        json.dumps(progress.player_notes),
+        progress.gm_interventions,
+        progress.is_completed,
+        progress.player_count
+    ]
+
+
+def _json_column(value: Any) -> Any:
+    return json.loads(value) if isinstance(value, str) else value
+
+
+def progress_from_row(row: Any) -> AdventureProgress:
+    """Rebuild progress from an adventure_progress row."""
+    return AdventureProgress(
+        session_id=row['session_id'],
+        adventure_id=row['adventure_id'],
+        current_scene_id=row['current_scene_id'],
+        completed_scenes=list(_json_column(row['completed_scenes'])),
+        scene_outcomes={
+            scene_id: OutcomeType(outcome) for scene_id, outcome in _json_column(row['scene_outcomes']).items()
+        },
+        total_progress_points=row['total_progress_points'],
+        confidence_score=row['confidence_score'],
+        time_spent_minutes=row['time_spent_minutes'],
+        started_at=_from_db_time(row['started_at']),
+        last_activity=_from_db_time(row['last_activity']),
+        player_notes=list(_json_column(row['player_notes'])),
+        gm_interventions=row['gm_interventions'],
+        is_completed=row['is_completed'],
+        player_count=row['player_count']
+    )
+
+
+class AdventureProgressStore:
+    """
+    Working set of adventure progress backed by Postgres.
+
+    Features:
+    - Resident sessions ordered by last access, which doubles as the active-session index
+    - Mutations mark sessions dirty; dirty sessions are upserted in batches
+    - Idle sessions are checkpointed and evicted; later access reloads them lazily
+    - Memory-only without a pool: idle eviction still bounds abandoned adventures
+    """
+
+    def __init__(
+        self,
+        pool: Optional[asyncpg.Pool] = None,
+        idle_timeout_seconds: float = 3600.0,
+        checkpoint_interval_seconds: float = 5.0,
+        checkpoint_batch_size: int = 200
+    ):
+        self.pool = pool
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.checkpoint_interval_seconds = checkpoint_interval_seconds
+        self.checkpoint_batch_size = checkpoint_batch_size
+
+        self._resident: "OrderedDict[str, AdventureProgress]" = OrderedDict()
+        self._accessed_at: Dict[str, float] = {}
+        self._dirty: Set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {
+            'hits': 0,
+            'reloads': 0,
+            'misses': 0,
+            'checkpoints': 0,
+            'rows_checkpointed': 0,
+            'checkpoint_failures': 0,
+            'evictions': 0,
+            'dropped_without_database': 0
+        }
+
+    def _touch(self, session_id: str):
+        self._resident.move_to_end(session_id)
+        self._accessed_at[session_id] = time.monotonic()
+
+    def add(self, progress: AdventureProgress):
+        """Track a new or replaced adventure."""
+        self._resident[progress.session_id] = progress
+        self._touch(progress.session_id)
+        self._dirty.add(progress.session_id)
+
+    def mark_dirty(self, progress: AdventureProgress):
+        """Record that a session changed and needs checkpointing."""
+        session_id = progress.session_id
+        if self._resident.get(session_id) is not progress:
+            # Evicted or reloaded while the change was being made; the changed copy wins
+            self._resident[session_id] = progress
+        self._touch(session_id)
+        self._dirty.add(session_id)
+
+    def __contains__(self, session_id: object) -> bool:
+        return session_id in self._resident
+
+    def __len__(self) -> int:
+        return len(self._resident)
+
+    async def get(self, session_id: str) -> Optional[AdventureProgress]:
+        """Get progress, reloading it from the database if it was evicted."""
+        progress = self._resident.get(session_id)
+        if progress is not None:
+            self._touch(session_id)
+            self.stats['hits'] += 1
+            return progress
+
+        if self.pool is None:
+            self.stats['misses'] += 1
+            return None
+
+        try:
+            row = await self.pool.fetchrow(SELECT_PROGRESS_SQL, session_id)
+        except Exception as e:
+            logger.error(f"Failed to load adventure progress for {session_id}: {e}")
+            return None
+        if row is None:
+            self.stats['misses'] += 1
+            return None
+
+        # Another request may have loaded the session while we waited
+        if session_id not in self._resident:
+            self._resident[session_id] = progress_from_row(row)
+            self.stats['reloads'] += 1
+        self._touch(session_id)
+        return self._resident[session_id]
+
+    async def delete(self, session_id: str) -> bool:
+        """Remove a session from memory and the database."""
+        removed = self._resident.pop(session_id, None) is not None
+        self._accessed_at.pop(session_id, None)
+        self._dirty.discard(session_id)
+
+        if self.pool is not None:
+            try:
+                result = await self.pool.execute(DELETE_PROGRESS_SQL, session_id)
+                removed = removed or result.endswith(" 1")
+            except Exception as e:
+                logger.error(f"Failed to delete adventure progress for {session_id}: {e}")
+        return removed
+
+    async def list_active(self, max_idle_minutes: float = 120, limit: int = 100) -> List[AdventureProgress]:
+        """Sessions with activity in the last max_idle_minutes, most recent first."""
+        cutoff = datetime.now() - timedelta(minutes=max_idle_minutes)
+        access_cutoff = time.monotonic() - max_idle_minutes * 60
+
+        active: Dict[str, AdventureProgress] = {}
+        # Every mutation touches the session, so nothing older in access order can be active
+        for session_id in reversed(self._resident):
+            if self._accessed_at[session_id] < access_cutoff or len(active) >= limit:
+                break
+            progress = self._resident[session_id]
+            if progress.last_activity > cutoff:
+                active[session_id] = progress
+
+        if self.pool is not None and len(active) < limit:
+            try:
+                rows = await self.pool.fetch(SELECT_ACTIVE_SQL, _to_db_time(cutoff), limit)
+            except Exception as e:
+                logger.error(f"Failed to query active adventures: {e}")
+                rows = []
+            for row in rows:
+                if row['session_id'] not in active and row['session_id'] not in self._resident:
+                    active[row['session_id']] = progress_from_row(row)
+
+        return sorted(active.values(), key=lambda progress: progress.last_activity, reverse=True)[:limit]
+
+    async def checkpoint(self) -> int:
+        """Upsert dirty sessions in batches, returning the number written."""
+        if self.pool is None or not self._dirty:
+            return 0
+
+        written = 0
+        while self._dirty:
+            batch = list(self._dirty)[:self.checkpoint_batch_size]
+            self._dirty.difference_update(batch)
+            rows = [progress_to_row(self._resident[session_id]) for session_id in batch if session_id in self._resident]
+            try:
+                await self.pool.executemany(UPSERT_PROGRESS_SQL, rows)
+            except Exception as e:
+                logger.error(f"Adventure progress checkpoint failed for {len(rows)} sessions: {e}")
+                self._dirty.update(batch)
+                self.stats['checkpoint_failures'] += 1
+                break
+            written += len(rows)
+
+        if written:
+            self.stats['checkpoints'] += 1
+            self.stats['rows_checkpointed'] += written
+        return written
+
+    async def evict_idle(self) -> int:
+        """Checkpoint and drop sessions idle longer than the timeout."""
+        cutoff = time.monotonic() - self.idle_timeout_seconds
+        idle = []
+        for session_id in self._resident:
+            if self._accessed_at[session_id] >= cutoff:
+                break
+            idle.append(session_id)
+        if not idle:
+            return 0
+
+        await self.checkpoint()
+
+        evicted = 0
+        for session_id in idle:
+            if self._accessed_at.get(session_id, cutoff) >= cutoff:
+                continue  # used again while the checkpoint was in flight
+            if self.pool is not None and session_id in self._dirty:
+                continue  # checkpoint failed; keep it until the next attempt
+            self._resident.pop(session_id, None)
+            self._accessed_at.pop(session_id, None)
+            self._dirty.discard(session_id)
+            evicted += 1
+
+        self.stats['evictions'] += evicted
+        if self.pool is None:
+            self.stats['dropped_without_database'] += evicted
+        return evicted
+
+    async def _maintenance_loop(self) -> None:
+        """Checkpoint and evict on a fixed interval."""
+        while True:
+            await asyncio.sleep(self.checkpoint_interval_seconds)
+            try:
+                await self.checkpoint()
+                await self.evict_idle()
+            except Exception as e:
+                logger.error(f"Adventure progress maintenance failed: {e}")
+
+    def start(self) -> None:
+        """Start the background checkpoint loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._maintenance_loop())
+
+    async def stop(self) -> None:
+        """Stop the checkpoint loop and flush dirty sessions."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.checkpoint()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get store statistics for monitoring."""
+        return {
+            **self.stats,
+            'resident_sessions': len(self._resident),
+            'dirty_sessions': len(self._dirty),
+            'persistent': self.pool is not None,
+            'running': self._task is not None and not self._task.done()
+        }
+
+
+# Global adventure progress store
+_adventure_progress_store: Optional[AdventureProgressStore] = None
+
+
+async def get_adventure_progress_store() -> AdventureProgressStore:
+    """Get or create the adventure progress store (ADVENTURE_DATABASE_URL enables Postgres)."""
+    global _adventure_progress_store
+    if _adventure_progress_store is None:
+        pool = None
+        database_url = os.getenv("ADVENTURE_DATABASE_URL")
+        if database_url:
+            try:
+                pool = await asyncpg.create_pool(database_url, min_size=1, max_size=5, command_timeout=10)
+            except Exception as e:
+                logger.error(f"Adventure progress database unavailable, keeping progress in memory only: {e}")
+
+        _adventure_progress_store = AdventureProgressStore(
+            pool=pool,
+            idle_timeout_seconds=float(os.getenv("ADVENTURE_PROGRESS_IDLE_SECONDS", "3600"))
+        )
+    return _adventure_progress_store
@@ -3,105 +3,68 @@ Adventure Content System for SPARC RPG.
 Provides structured 1-hour adventures with branching paths and progression tracking.
 """
 
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Mapping, Optional, Any, Tuple
 from datetime import datetime, timedelta
-from dataclasses import dataclass
-from enum import Enum
 import logging
 import json
+import os
 import asyncio
+from collections import OrderedDict
+from dataclasses import replace
 from pathlib import Path
 
-logger = logging.getLogger(__name__)
-
-
-class SceneType(Enum):
-    INTRODUCTION = "introduction"
-    EXPLORATION = "exploration"
-    SOCIAL = "social"
-    CHALLENGE = "challenge"
-    COMBAT = "combat"
-    RESOLUTION = "resolution"
-
-
-class OutcomeType(Enum):
-    SUCCESS = "success"
-    PARTIAL_SUCCESS = "partial_success"
-    FAILURE = "failure"
-    CRITICAL_SUCCESS = "critical_success"
-    CRITICAL_FAILURE = "critical_failure"
-
-
-class DifficultyLevel(Enum):
-    NEWCOMER = "newcomer"
-    BEGINNER = "beginner"
-    INTERMEDIATE = "intermediate"
+from .adventure_models import (
+    SceneType, OutcomeType, DifficultyLevel, SceneOutcome, AdventureScene, AdventureTemplate, AdventureProgress
+)
+from .adventure_compiler import CompiledAdventure
+from .adventure_loader import AdventureLoader, get_adventure_dir
+from .adventure_progress_store import AdventureProgressStore, get_adventure_progress_store
+from .content_generator import ContentType, DynamicContentGenerator, GenerationRequest, get_content_generator
 
+logger = logging.getLogger(__name__)
 
-@dataclass
-class SceneOutcome:
-    outcome_type: OutcomeType
-    description: str
-    consequence: str
-    next_scene_id: Optional[str]
-    progress_points: int
-    confidence_impact: float
-
-
-@dataclass
-class AdventureScene:
-    id: str
-    title: str
-    scene_type: SceneType
-    description: str
-    setup_text: str
-    decision_prompt: str
-    available_actions: List[Dict[str, Any]]
-    outcomes: Dict[str, SceneOutcome]
-    time_estimate_minutes: int
-    difficulty_hints: List[str]
-    gm_notes: str
-    required_dice_rolls: List[Dict[str, Any]]
-
+SceneCacheKey = Tuple[str, str, str, int]
 
-@dataclass
-class AdventureTemplate:
-    id: str
-    title: str
-    description: str
-    theme: str
-    difficulty_level: DifficultyLevel
-    total_time_minutes: int
-    target_players: int
-    scenes: List[AdventureScene]
-    learning_objectives: List[str]
-    required_materials: List[str]
-    success_criteria: Dict[str, Any]
+MAX_CONTENT_BATCH_ITEMS = 16
 
 
-@dataclass
-class AdventureProgress:
-    session_id: str
-    adventure_id: str
-    current_scene_id: str
-    completed_scenes: List[str]
-    scene_outcomes: Dict[str, OutcomeType]
-    total_progress_points: int
-    confidence_score: float
-    time_spent_minutes: int
-    started_at: datetime
-    last_activity: datetime
-    player_notes: List[str]
-    gm_interventions: int
-    is_completed: bool
+def _difficulty_band(confidence_score: float) -> str:
+    """Bucket confidence into the bands that change how a scene is rendered."""
+    if confidence_score < 4.0:
+        return "struggling"
+    if confidence_score > 7.0:
+        return "excelling"
+    return "standard"
 
 
 class AdventureContentService:
-    def __init__(self):
-        self.active_adventures: Dict[str, AdventureProgress] = {}
-        self.adventure_templates: Dict[str, AdventureTemplate] = {}
-        self.scene_transition_cache: Dict[str, Dict[str, Any]] = {}
-        self._load_adventure_templates()
+    def __init__(
+        self,
+        adventure_loader: Optional[AdventureLoader] = None,
+        progress_store: Optional[AdventureProgressStore] = None,
+        content_generator: Optional[DynamicContentGenerator] = None
+    ):
+        self.progress_store = progress_store if progress_store is not None else AdventureProgressStore()
+        self.content_generator = content_generator if content_generator is not None else DynamicContentGenerator()
+        self.content_timeout_seconds = float(os.getenv("ADVENTURE_CONTENT_TIMEOUT_SECONDS", "10"))
+        # (adventure_id, scene_id, difficulty band, party size) -> (compiled adventure, rendered scene)
+        self.scene_transition_cache: "OrderedDict[SceneCacheKey, Tuple[CompiledAdventure, Dict[str, Any]]]" = OrderedDict()
+        self.scene_cache_size = int(os.getenv("ADVENTURE_SCENE_CACHE_SIZE", "1024"))
+        self.scene_cache_stats = {
+            'hits': 0,
+            'misses': 0,
+            'prewarmed': 0,
+            'evictions': 0
+        }
+        self.adventure_loader = adventure_loader if adventure_loader is not None else AdventureLoader(
+            get_adventure_dir(),
+            max_cached=int(os.getenv("ADVENTURE_CACHE_SIZE", "32"))
+        )
+
+    @property
+    def adventure_templates(self) -> Mapping[str, AdventureTemplate]:
+        """Adventure templates by id, loaded from the adventure directory on access."""
+        return self.adventure_loader.templates
 
     async def start_adventure(
         self,
@@ -110,16 +73,14 @@ class AdventureContentService:
         player_count: int = 2
     ) -> AdventureProgress:
         """Start a new adventure session."""
-        if adventure_id not in self.adventure_templates:
+        compiled = self.adventure_loader.get(adventure_id)
+        if compiled is None:
             raise ValueError(f"Adventure template {adventure_id} not found")
 
-        template = self.adventure_templates[adventure_id]
-        first_scene = template.scenes[0]
-
         progress = AdventureProgress(
             session_id=session_id,
             adventure_id=adventure_id,
-            current_scene_id=first_scene.id,
+            current_scene_id=compiled.start_scene_id,
             completed_scenes=[],
             scene_outcomes={},
             total_progress_points=0,
@@ -129,46 +90,32 @@ class AdventureContentService:
             last_activity=datetime.now(),
             player_notes=[],
             gm_interventions=0,
-            is_completed=False
+            is_completed=False,
+            player_count=player_count
         )
 
-        self.active_adventures[session_id] = progress
+        self.progress_store.add(progress)
         logger.info(f"Started adventure {adventure_id} for session {session_id}")
         return progress
 
     async def get_current_scene(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Get the current scene for an active adventure."""
-        if session_id not in self.active_adventures:
+        progress = await self.progress_store.get(session_id)
+        if progress is None:
             return None
 
-        progress = self.active_adventures[session_id]
-        template = self.adventure_templates[progress.adventure_id]
-        
-        current_scene = next(
-            (scene for scene in template.scenes if scene.id == progress.current_scene_id),
-            None
+        compiled = self.adventure_loader[progress.adventure_id]
+        template = compiled.template
+
+        # Rendered scenes are shared between sessions with the same band and party size
+        scene_payload = self._get_rendered_scene(
+            compiled, progress.current_scene_id, _difficulty_band(progress.confidence_score), progress.player_count
         )
-        
-        if not current_scene:
+        if scene_payload is None:
             return None
-
-        # Calculate dynamic difficulty adjustments based on progress
-        adjusted_scene = self._adjust_scene_difficulty(current_scene, progress)
         
         return {
-            "scene": {
-                "id": adjusted_scene.id,
-                "title": adjusted_scene.title,
-                "scene_type": adjusted_scene.scene_type.value,
-                "description": adjusted_scene.description,
-                "setup_text": adjusted_scene.setup_text,
-                "decision_prompt": adjusted_scene.decision_prompt,
-                "available_actions": adjusted_scene.available_actions,
-                "time_estimate_minutes": adjusted_scene.time_estimate_minutes,
-                "difficulty_hints": adjusted_scene.difficulty_hints,
-                "gm_notes": adjusted_scene.gm_notes,
-                "required_dice_rolls": adjusted_scene.required_dice_rolls
-            },
+            "scene": scene_payload,
             "progress": {
                 "scenes_completed": len(progress.completed_scenes),
                 "total_scenes": len(template.scenes),
@@ -187,16 +134,14 @@ class AdventureContentService:
         player_narrative: Optional[str] = None
     ) -> Dict[str, Any]:
         """Process the outcome of a scene action and advance the adventure."""
-        if session_id not in self.active_adventures:
+        progress = await self.progress_store.get(session_id)
+        if progress is None:
             raise ValueError(f"No active adventure found for session {session_id}")
 
-        progress = self.active_adventures[session_id]
-        template = self.adventure_templates[progress.adventure_id]
+        compiled = self.adventure_loader[progress.adventure_id]
+        template = compiled.template
         
-        current_scene = next(
-            (scene for scene in template.scenes if scene.id == progress.current_scene_id),
-            None
-        )
+        current_scene = compiled.get_scene(progress.current_scene_id)
         
         if not current_scene:
             raise ValueError(f"Current scene {progress.current_scene_id} not found")
@@ -215,7 +160,7 @@ class AdventureContentService:
             progress.player_notes.append(f"Scene {progress.current_scene_id}: {player_narrative}")
 
         # Determine next scene
-        next_scene_id = outcome.next_scene_id or self._get_default_next_scene(current_scene, template)
+        next_scene_id = compiled.next_scene_id(current_scene.id, outcome.next_scene_id)
         
         if next_scene_id:
             progress.current_scene_id = next_scene_id
@@ -223,6 +168,10 @@ class AdventureContentService:
             progress.is_completed = True
             await self._finalize_adventure(progress, template)
 
+        self.progress_store.mark_dirty(progress)
+        if next_scene_id:
+            self._prewarm_scenes(compiled, next_scene_id, progress)
+
         return {
             "outcome": {
                 "type": outcome.outcome_type.value,
@@ -247,16 +196,66 @@ class AdventureContentService:
         context: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Generate dynamic content based on adventure progress and context."""
-        if session_id not in self.active_adventures:
+        progress = await self.progress_store.get(session_id)
+        if progress is None:
             raise ValueError(f"No active adventure found for session {session_id}")
 
-        progress = self.active_adventures[session_id]
-        
+        return await self._generate_for_progress(progress, content_type, context)
+
+    async def generate_content_batch(
+        self,
+        session_id: str,
+        items: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Generate a bundle of content for a scene in one call.
+        Items run concurrently; each reports its own success or error.
+        """
+        progress = await self.progress_store.get(session_id)
+        if progress is None:
+            raise ValueError(f"No active adventure found for session {session_id}")
+
+        async def generate_item(item: Dict[str, Any]) -> Dict[str, Any]:
+            return await asyncio.wait_for(
+                self._generate_for_progress(progress, item.get("content_type"), item.get("context", {})),
+                timeout=self.content_timeout_seconds
+            )
+
+        outcomes = await asyncio.gather(*(generate_item(item) for item in items), return_exceptions=True)
+
+        results = []
+        for index, (item, outcome) in enumerate(zip(items, outcomes)):
+            result = {"index": index, "id": item.get("id"), "content_type": item.get("content_type")}
+            if isinstance(outcome, asyncio.TimeoutError):
+                result.update(success=False, error="Content generation timed out")
+            elif isinstance(outcome, Exception):
+                logger.warning(f"Batch content item {index} failed for session {session_id}: {outcome}")
+                result.update(success=False, error=str(outcome))
+            else:
+                result.update(success=True, content=outcome)
+            results.append(result)
+
+        failed = sum(1 for result in results if not result["success"])
+        return {
+            "results": results,
+            "succeeded": len(results) - failed,
+            "failed": failed,
+            "complete": failed == 0
+        }
+
+    async def _generate_for_progress(
+        self,
+        progress: AdventureProgress,
+        content_type: str,
+        context: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Run the generator for one content type against loaded progress."""
         generators = {
             "npc_dialogue": self._generate_npc_dialogue,
             "scene_description": self._generate_scene_description,
             "challenge_variation": self._generate_challenge_variation,
-            "reward_description": self._generate_reward_description
+            "reward_description": self._generate_reward_description,
+            "consequence_narrative": self._generate_consequence_narrative
         }
         
         if content_type not in generators:
@@ -266,10 +265,10 @@ class AdventureContentService:
 
     async def get_adventure_analytics(self, session_id: str) -> Dict[str, Any]:
         """Get detailed analytics for an adventure session."""
-        if session_id not in self.active_adventures:
+        progress = await self.progress_store.get(session_id)
+        if progress is None:
             return {"error": "No active adventure found"}
 
-        progress = self.active_adventures[session_id]
         template = self.adventure_templates[progress.adventure_id]
         
         return {
@@ -293,551 +292,96 @@ class AdventureContentService:
             "recommendations": self._generate_recommendations(progress, template)
         }
 
-    def _load_adventure_templates(self):
-        """Load adventure templates with structured 1-hour content."""
-        
-        # The Haunted Mill - Newcomer Adventure
-        haunted_mill_scenes = [
-            AdventureScene(
-                id="intro_village",
-                title="The Village of Millhaven",
-                scene_type=SceneType.INTRODUCTION,
-                description="A peaceful farming village with a concerning problem",
-                setup_text="You arrive in Millhaven as the sun sets. The village elder approaches with worry in her eyes.",
-                decision_prompt="The elder explains that strange noises come from the old mill at night. What do you do?",
-                available_actions=[
-                    {"id": "investigate_immediately", "text": "Head to the mill right now", "difficulty": "medium"},
-                    {"id": "gather_information", "text": "Ask villagers about the mill", "difficulty": "easy"},
-                    {"id": "wait_until_morning", "text": "Wait and investigate at dawn", "difficulty": "easy"}
-                ],
-                outcomes={
-                    "investigate_immediately": SceneOutcome(
-                        OutcomeType.PARTIAL_SUCCESS, 
-                        "You bravely head out, but it's very dark", 
-                        "You'll face the mill unprepared but show courage",
-                        "mill_exterior_night",
-                        10,
-                        0.5
-                    ),
-                    "gather_information": SceneOutcome(
-                        OutcomeType.SUCCESS,
-                        "Villagers share helpful details about the mill's history",
-                        "You learn the mill was abandoned after a tragic accident",
-                        "mill_exterior_prepared",
-                        15,
-                        1.0
-                    ),
-                    "wait_until_morning": SceneOutcome(
-                        OutcomeType.SUCCESS,
-                        "You rest well and approach refreshed",
-                        "Daylight reveals important details about the mill",
-                        "mill_exterior_day",
-                        12,
-                        0.8
-                    )
-                },
-                time_estimate_minutes=8,
-                difficulty_hints=["Gathering information is usually helpful", "Sometimes patience pays off"],
-                gm_notes="Establish the village atmosphere and the mystery. Let players feel the weight of decision-making.",
-                required_dice_rolls=[]
-            ),
-            
-            AdventureScene(
-                id="mill_exterior_prepared",
-                title="The Old Mill - Well Prepared",
-                scene_type=SceneType.EXPLORATION,
-                description="The abandoned mill looms before you, but you know its history",
-                setup_text="Armed with knowledge from the villagers, you approach the mill with confidence.",
-                decision_prompt="You see an open door and a broken window. How do you enter?",
-                available_actions=[
-                    {"id": "front_door", "text": "Walk through the front door boldly", "difficulty": "medium"},
-                    {"id": "window_stealthily", "text": "Climb through the window quietly", "difficulty": "medium"},
-                    {"id": "call_out_first", "text": "Call out to see if anyone responds", "difficulty": "easy"}
-                ],
-                outcomes={
-                    "front_door": SceneOutcome(
-                        OutcomeType.SUCCESS,
-                        "You enter confidently and avoid a loose floorboard",
-                        "Your preparation helps you notice dangers",
-                        "mill_interior_safe",
-                        20,
-                        1.2
-                    ),
-                    "window_stealthily": SceneOutcome(
-                        OutcomeType.PARTIAL_SUCCESS,
-                        "You climb in but make some noise",
-                        "You're inside but may have alerted whatever is here",
-                        "mill_interior_alert",
-                        15,
-                        0.8
-                    ),
-                    "call_out_first": SceneOutcome(
-                        OutcomeType.SUCCESS,
-                        "A weak voice responds from inside - someone needs help!",
-                        "You've found the source of the 'haunting' - a trapped person",
-                        "rescue_scene",
-                        25,
-                        1.5
-                    )
-                },
-                time_estimate_minutes=10,
-                difficulty_hints=["Sometimes the direct approach works best", "Communication can reveal surprising solutions"],
-                gm_notes="Reward their preparation with better outcomes. Show how knowledge gives advantages.",
-                required_dice_rolls=[
-                    {"type": "perception", "difficulty": 12, "purpose": "Notice environmental details"}
-                ]
-            ),
-            
-            AdventureScene(
-                id="rescue_scene",
-                title="The 'Ghost' Revealed",
-                scene_type=SceneType.SOCIAL,
-                description="Inside the mill, you find an injured traveler who's been trapped",
-                setup_text="A young merchant lies with a broken leg, too weak to call for help during the day.",
-                decision_prompt="The merchant needs help getting out. How do you assist them?",
-                available_actions=[
-                    {"id": "carry_immediately", "text": "Carry them out right away", "difficulty": "hard"},
-                    {"id": "make_stretcher", "text": "Make a stretcher from mill materials", "difficulty": "medium"},
-                    {"id": "get_village_help", "text": "Run to get help from the village", "difficulty": "easy"}
-                ],
-                outcomes={
-                    "carry_immediately": SceneOutcome(
-                        OutcomeType.PARTIAL_SUCCESS,
-                        "You manage to help but strain yourself",
-                        "The merchant is grateful but you're both exhausted",
-                        "resolution_tired",
-                        15,
-                        0.5
-                    ),
-                    "make_stretcher": SceneOutcome(
-                        OutcomeType.SUCCESS,
-                        "You create a clever stretcher and move them safely",
-                        "Your resourcefulness impresses everyone",
-                        "resolution_heroic",
-                        25,
-                        1.5
-                    ),
-                    "get_village_help": SceneOutcome(
-                        OutcomeType.SUCCESS,
-                        "You organize a proper rescue with the villagers",
-                        "The community comes together to help",
-                        "resolution_community",
-                        20,
-                        1.2
-                    )
-                },
-                time_estimate_minutes=12,
-                difficulty_hints=["Think about what resources are available", "Sometimes the best solution involves others"],
-                gm_notes="This reveals the mystery and shows how problems can have human solutions.",
-                required_dice_rolls=[
-                    {"type": "crafting", "difficulty": 14, "purpose": "Create makeshift stretcher"},
-                    {"type": "strength", "difficulty": 15, "purpose": "Carry the merchant"}
-                ]
-            )
-        ]
+    def _render_scene(self, scene: AdventureScene, band: str) -> Dict[str, Any]:
+        """Render the scene payload served to clients."""
+        adjusted_scene = self._adjust_scene_difficulty(scene, band)
 
-        self.adventure_templates["haunted_mill"] = AdventureTemplate(
-            id="haunted_mill",
-            title="The Haunted Mill",
-            description="A mysterious haunting that isn't what it seems - perfect for newcomers",
-            theme="Mystery with a human solution",
-            difficulty_level=DifficultyLevel.NEWCOMER,
-            total_time_minutes=60,
-            target_players=2,
-            scenes=haunted_mill_scenes,
-            learning_objectives=[
-                "Decision-making has consequences",
-                "Gathering information is valuable",
-                "Creative solutions often work best",
-                "Not all mysteries have supernatural answers"
-            ],
-            required_materials=["2d6 dice", "character sheets", "paper for notes"],
-            success_criteria={
-                "primary_objective": "Solve the mystery of the haunted mill",
-                "learning_goals": "Make meaningful decisions and see their impact",
-                "confidence_target": 7.0
-            }
-        )
+        return {
+            "id": adjusted_scene.id,
+            "title": adjusted_scene.title,
+            "scene_type": adjusted_scene.scene_type.value,
+            "description": adjusted_scene.description,
+            "setup_text": adjusted_scene.setup_text,
+            "decision_prompt": adjusted_scene.decision_prompt,
+            "available_actions": adjusted_scene.available_actions,
+            "time_estimate_minutes": adjusted_scene.time_estimate_minutes,
+            "difficulty_hints": adjusted_scene.difficulty_hints,
+            "gm_notes": adjusted_scene.gm_notes,
+            "required_dice_rolls": adjusted_scene.required_dice_rolls
+        }
 
-        # The Dragon's Riddle - Beginner Adventure
-        dragons_riddle_scenes = [
-            AdventureScene(
-                id="crossroads_encounter",
-                title="The Crossroads Guardian",
-                scene_type=SceneType.INTRODUCTION,
-                description="A majestic dragon blocks the path, but seems more interested in conversation than conflict",
-                setup_text="At the crossroads, a shimmering dragon appears, not threatening, but clearly waiting for something.",
-                decision_prompt="The dragon speaks: 'Answer my riddle correctly, and pass safely. Fail, and face a challenge of wit!' What do you do?",
-                available_actions=[
-                    {"id": "accept_riddle", "text": "Accept the riddle challenge", "difficulty": "medium"},
-                    {"id": "try_to_negotiate", "text": "Ask if there are other options", "difficulty": "easy"},
-                    {"id": "attempt_to_pass", "text": "Try to walk around the dragon", "difficulty": "hard"}
-                ],
-                outcomes={
-                    "accept_riddle": SceneOutcome(
-                        OutcomeType.SUCCESS,
-                        "The dragon nods approvingly at your courage",
-                        "You've impressed the dragon with your boldness",
-                        "riddle_challenge",
-                        20,
-                        1.2
-                    ),
-                    "try_to_negotiate": SceneOutcome(
-                        OutcomeType.SUCCESS,
-                        "The dragon appreciates your diplomatic approach",
-                        "Your wisdom in seeking understanding is rewarded",
-                        "dragon_conversation",
-                        18,
-                        1.0
-                    ),
-                    "attempt_to_pass": SceneOutcome(
-                        OutcomeType.PARTIAL_SUCCESS,
-                        "The dragon allows your attempt but finds it amusing",
-                        "Your boldness is noted, though perhaps not the wisest choice",
-                        "riddle_challenge",
-                        12,
-                        0.5
-                    )
-                },
-                time_estimate_minutes=10,
-                difficulty_hints=["Dragons are often more reasonable than they appear", "Consider what the dragon might really want"],
-                gm_notes="This dragon is wise and patient, more teacher than threat. Emphasize curiosity over fear.",
-                required_dice_rolls=[
-                    {"type": "charisma", "difficulty": 13, "purpose": "Make a good first impression"}
-                ]
-            ),
-            
-            AdventureScene(
-                id="riddle_challenge",
-                title="The Ancient Riddle",
-                scene_type=SceneType.CHALLENGE,
-                description="The dragon poses an ancient riddle that tests wisdom rather than mere cleverness",
-                setup_text="'Here is my riddle,' says the dragon, eyes twinkling with ancient wisdom.",
-                decision_prompt="'I have cities, but no houses. I have mountains, but no trees. I have water, but no fish. What am I?' How do you approach this?",
-                available_actions=[
-                    {"id": "think_carefully", "text": "Take time to think through the riddle", "difficulty": "medium"},
-                    {"id": "guess_quickly", "text": "Go with your first instinct", "difficulty": "hard"},
-                    {"id": "ask_for_hint", "text": "Politely ask for a hint", "difficulty": "easy"}
-                ],
-                outcomes={
-                    "think_carefully": SceneOutcome(
-                        OutcomeType.SUCCESS,
-                        "Your careful consideration leads to the answer: 'A map!'",
-                        "The dragon beams with pride at your logical thinking",
-                        "dragons_wisdom",
-                        30,
-                        2.0
-                    ),
-                    "guess_quickly": SceneOutcome(
-                        OutcomeType.PARTIAL_SUCCESS,
-                        "Your quick thinking shows promise, though you need a second try",
-                        "The dragon appreciates your confidence but encourages patience",
-                        "riddle_second_chance",
-                        15,
-                        0.8
-                    ),
-                    "ask_for_hint": SceneOutcome(
-                        OutcomeType.SUCCESS,
-                        "The dragon smiles: 'Think of something that shows the world but contains none of it'",
-                        "Your humility in seeking help is wisdom itself",
-                        "riddle_with_hint",
-                        25,
-                        1.5
-                    )
-                },
-                time_estimate_minutes=12,
-                difficulty_hints=["Think about representations rather than reality", "What shows places without being a place?"],
-                gm_notes="The answer is 'a map'. Allow creative interpretations and reward the thinking process over just getting it right.",
-                required_dice_rolls=[
-                    {"type": "intelligence", "difficulty": 14, "purpose": "Solve the riddle through logic"}
-                ]
-            ),
-            
-            AdventureScene(
-                id="dragons_wisdom",
-                title="The Dragon's Gift",
-                scene_type=SceneType.RESOLUTION,
-                description="Having proven your wisdom, the dragon shares ancient knowledge",
-                setup_text="'Well done!' the dragon exclaims. 'Your wisdom has earned you something precious.'",
-                decision_prompt="The dragon offers three gifts: ancient knowledge, a magical blessing, or a future favor. What do you choose?",
-                available_actions=[
-                    {"id": "choose_knowledge", "text": "Request ancient knowledge", "difficulty": "easy"},
-                    {"id": "choose_blessing", "text": "Accept the magical blessing", "difficulty": "easy"},
-                    {"id": "choose_favor", "text": "Ask for the future favor", "difficulty": "medium"}
-                ],
-                outcomes={
-                    "choose_knowledge": SceneOutcome(
-                        OutcomeType.SUCCESS,
-                        "The dragon shares wisdom about reading people and situations",
-                        "You gain valuable insight that will help in future social encounters",
-                        None,
-                        35,
-                        2.5
-                    ),
-                    "choose_blessing": SceneOutcome(
-                        OutcomeType.SUCCESS,
-                        "The dragon grants you luck that will aid you when most needed",
-                        "You feel more confident knowing fortune favors you",
-                        None,
-                        30,
-                        2.0
-                    ),
-                    "choose_favor": SceneOutcome(
-                        OutcomeType.SUCCESS,
-                        "The dragon promises to aid you once when you truly need help",
-                        "You've gained a powerful ally through wisdom and respect",
-                        None,
-                        40,
-                        3.0
-                    )
-                },
-                time_estimate_minutes=8,
-                difficulty_hints=["Each choice has value", "Consider what would help you most as an adventurer"],
-                gm_notes="All choices are equally valid. This rewards the player's problem-solving and teaches that wisdom has many forms.",
-                required_dice_rolls=[]
-            )
-        ]
+    def _get_rendered_scene(
+        self,
+        compiled: CompiledAdventure,
+        scene_id: str,
+        band: str,
+        player_count: int,
+        prewarm: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Get a rendered scene from the transition cache, rendering it on a miss."""
+        key = (compiled.id, scene_id, band, player_count)
+        entry = self.scene_transition_cache.get(key)
+        # A hot-reloaded adventure is a new compiled object, so stale renders are skipped
+        if entry is not None and entry[0] is compiled:
+            self.scene_transition_cache.move_to_end(key)
+            if not prewarm:
+                self.scene_cache_stats['hits'] += 1
+            return entry[1]
+
+        scene = compiled.get_scene(scene_id)
+        if scene is None:
+            return None
 
-        self.adventure_templates["dragons_riddle"] = AdventureTemplate(
-            id="dragons_riddle",
-            title="The Dragon's Riddle",
-            description="A wise dragon tests your wits and rewards wisdom - perfect for building confidence",
-            theme="Wisdom and respect triumph over force",
-            difficulty_level=DifficultyLevel.BEGINNER,
-            total_time_minutes=60,
-            target_players=2,
-            scenes=dragons_riddle_scenes,
-            learning_objectives=[
-                "Not all encounters need violence",
-                "Patience and thought often win over haste",
-                "Seeking help shows wisdom, not weakness",
-                "Respect can turn enemies into allies"
-            ],
-            required_materials=["2d6 dice", "character sheets", "paper for notes"],
-            success_criteria={
-                "primary_objective": "Successfully interact with the dragon",
-                "learning_goals": "Understand that intelligence and wisdom are powerful tools",
-                "confidence_target": 8.0
-            }
-        )
+        payload = self._render_scene(scene, band)
+        self.scene_transition_cache[key] = (compiled, payload)
+        self.scene_cache_stats['prewarmed' if prewarm else 'misses'] += 1
+        while len(self.scene_transition_cache) > self.scene_cache_size:
+            self.scene_transition_cache.popitem(last=False)
+            self.scene_cache_stats['evictions'] += 1
+        return payload
+
+    def _prewarm_scenes(self, compiled: CompiledAdventure, scene_id: str, progress: AdventureProgress):
+        """Render the scene a session just entered and the scenes reachable from it."""
+        band = _difficulty_band(progress.confidence_score)
+        for target in (scene_id, *compiled.adjacency.get(scene_id, ())):
+            self._get_rendered_scene(compiled, target, band, progress.player_count, prewarm=True)
+
+    def get_scene_cache_stats(self) -> Dict[str, Any]:
+        """Get scene transition cache statistics for monitoring."""
+        lookups = self.scene_cache_stats['hits'] + self.scene_cache_stats['misses']
+        return {
+            **self.scene_cache_stats,
+            'entries': len(self.scene_transition_cache),
+            'max_entries': self.scene_cache_size,
+            'hit_rate': self.scene_cache_stats['hits'] / lookups if lookups else 0.0
+        }
 
-        # The Merchant's Dilemma - Intermediate Adventure
-        merchants_dilemma_scenes = [
-            AdventureScene(
-                id="market_square",
-                title="Trouble in the Market",
-                scene_type=SceneType.INTRODUCTION,
-                description="The usually bustling market square is tense with an unfolding conflict",
-                setup_text="You arrive to find two merchants in heated argument, with concerned citizens gathering around.",
-                decision_prompt="One merchant accuses the other of selling cursed goods. The crowd grows restless. How do you intervene?",
-                available_actions=[
-                    {"id": "investigate_claims", "text": "Investigate the cursed goods claim", "difficulty": "medium"},
-                    {"id": "calm_the_crowd", "text": "Try to calm the situation first", "difficulty": "medium"},
-                    {"id": "separate_merchants", "text": "Separate the arguing merchants", "difficulty": "easy"},
-                    {"id": "examine_evidence", "text": "Ask to see the 'cursed' goods", "difficulty": "hard"}
-                ],
-                outcomes={
-                    "investigate_claims": SceneOutcome(
-                        OutcomeType.SUCCESS,
-                        "Your methodical investigation reveals important clues",
-                        "The merchants respect your thorough approach",
-                        "investigation_path",
-                        25,
-                        1.5
-                    ),
-                    "calm_the_crowd": SceneOutcome(
-                        OutcomeType.SUCCESS,
-                        "Your diplomatic words defuse the immediate tension",
-                        "With cooler heads, the real problem can be addressed",
-                        "mediation_path",
-                        20,
-                        1.2
-                    ),
-                    "separate_merchants": SceneOutcome(
-                        OutcomeType.PARTIAL_SUCCESS,
-                        "You create space between them, but the core issue remains",
-                        "At least no one will come to blows while you think",
-                        "careful_approach",
-                        15,
-                        0.8
-                    ),
-                    "examine_evidence": SceneOutcome(
-                        OutcomeType.SUCCESS,
-                        "Your bold request to examine the goods shows confidence",
-                        "Direct action cuts through the confusion",
-                        "evidence_examination",
-                        30,
-                        2.0
-                    )
-                },
-                time_estimate_minutes=12,
-                difficulty_hints=["Complex situations often have multiple valid approaches", "Consider what information you need most"],
-                gm_notes="This scenario has multiple branching paths. All approaches can lead to success with different lessons learned.",
-                required_dice_rolls=[
-                    {"type": "insight", "difficulty": 15, "purpose": "Read the situation accurately"}
-                ]
-            ),
-            
-            AdventureScene(
-                id="investigation_path",
-                title="Unraveling the Mystery",
-                scene_type=SceneType.EXPLORATION,
-                description="Your investigation reveals the situation is more complex than it first appeared",
-                setup_text="As you examine the goods and question witnesses, a clearer picture emerges.",
-                decision_prompt="You discover the 'cursed' items were actually stolen from a third party. How do you proceed with this sensitive information?",
-                available_actions=[
-                    {"id": "confront_privately", "text": "Speak privately with the accused merchant", "difficulty": "medium"},
-                    {"id": "reveal_publicly", "text": "Share your findings with everyone", "difficulty": "hard"},
-                    {"id": "seek_full_truth", "text": "Investigate further before deciding", "difficulty": "hard"},
-                    {"id": "mediate_solution", "text": "Try to find a solution that helps everyone", "difficulty": "medium"}
-                ],
-                outcomes={
-                    "confront_privately": SceneOutcome(
-                        OutcomeType.SUCCESS,
-                        "The private conversation reveals the merchant's desperate circumstances",
-                        "Understanding the full story opens paths to real solutions",
-                        "compassionate_resolution",
-                        35,
-                        2.2
-                    ),
-                    "reveal_publicly": SceneOutcome(
-                        OutcomeType.PARTIAL_SUCCESS,
-                        "The truth helps, but public shame complicates things",
-                        "Justice is served, but mercy might have been wiser",
-                        "public_resolution",
-                        25,
-                        1.0
-                    ),
-                    "seek_full_truth": SceneOutcome(
-                        OutcomeType.SUCCESS,
-                        "Your thorough investigation uncovers the whole network",
-                        "Complete understanding allows for the best possible outcome",
-                        "complete_resolution",
-                        40,
-                        2.8
-                    ),
-                    "mediate_solution": SceneOutcome(
-                        OutcomeType.SUCCESS,
-                        "Your focus on solutions rather than blame impresses everyone",
-                        "True leadership means finding ways for everyone to win",
-                        "mediated_resolution",
-                        38,
-                        2.5
-                    )
-                },
-                time_estimate_minutes=15,
-                difficulty_hints=["Consider the consequences of your approach", "Sometimes the best solution helps everyone involved"],
-                gm_notes="This tests the players' ability to handle complex moral situations with multiple valid approaches.",
-                required_dice_rolls=[
-                    {"type": "investigation", "difficulty": 16, "purpose": "Uncover the full truth"},
-                    {"type": "empathy", "difficulty": 14, "purpose": "Understand everyone's motivations"}
-                ]
-            ),
-            
-            AdventureScene(
-                id="compassionate_resolution",
-                title="Understanding and Solutions",
-                scene_type=SceneType.RESOLUTION,
-                description="Your compassionate approach reveals the path to a solution that helps everyone",
-                setup_text="The merchant's story touches your heart - desperation drove them to poor choices, but they want to make it right.",
-                decision_prompt="With understanding comes opportunity. How do you help resolve this situation positively for all involved?",
-                available_actions=[
-                    {"id": "arrange_payment_plan", "text": "Arrange a payment plan for restitution", "difficulty": "easy"},
-                    {"id": "find_honest_work", "text": "Help find honest work for the desperate merchant", "difficulty": "medium"},
-                    {"id": "community_support", "text": "Rally community support for those in need", "difficulty": "hard"},
-                    {"id": "systemic_solution", "text": "Address the underlying causes of desperation", "difficulty": "hard"}
+    def _adjust_scene_difficulty(self, scene: AdventureScene, band: str) -> AdventureScene:
+        """Adjust scene difficulty for a difficulty band without touching the shared template."""
+        # If player is struggling (low confidence), make hints more obvious
+        if band == "struggling":
+            return replace(
+                scene,
+                difficulty_hints=scene.difficulty_hints + [
+                    "Remember, there's no single 'right' answer",
+                    "Think about what your character would naturally do"
                 ],
-                outcomes={
-                    "arrange_payment_plan": SceneOutcome(
-                        OutcomeType.SUCCESS,
-                        "Your practical solution allows dignity while ensuring justice",
-                        "Everyone respects an approach that balances fairness with compassion",
-                        None,
-                        45,
-                        3.0
-                    ),
-                    "find_honest_work": SceneOutcome(
-                        OutcomeType.SUCCESS,
-                        "By addressing root causes, you prevent future problems",
-                        "True problem-solving looks beyond immediate issues",
-                        None,
-                        50,
-                        3.5
-                    ),
-                    "community_support": SceneOutcome(
-                        OutcomeType.CRITICAL_SUCCESS,
-                        "Your leadership inspires the whole community to help",
-                        "You've not just solved a problem, but strengthened social bonds",
-                        None,
-                        60,
-                        4.0
-                    ),
-                    "systemic_solution": SceneOutcome(
-                        OutcomeType.CRITICAL_SUCCESS,
-                        "Your wisdom addresses not just this case but future ones",
-                        "True leaders think beyond individual problems to systemic solutions",
-                        None,
-                        65,
-                        4.5
-                    )
-                },
-                time_estimate_minutes=13,
-                difficulty_hints=["Think about solutions that address causes, not just symptoms", "The best outcomes help everyone involved"],
-                gm_notes="This finale rewards players who think systemically and compassionately. All outcomes are positive, but some show greater wisdom.",
+                # Reduce dice roll difficulties
                 required_dice_rolls=[
-                    {"type": "leadership", "difficulty": 15, "purpose": "Inspire others to positive action"}
+                    {**dice_roll, "difficulty": max(10, dice_roll["difficulty"] - 2)}
+                    if isinstance(dice_roll.get("difficulty"), (int, float)) else dice_roll
+                    for dice_roll in scene.required_dice_rolls
                 ]
             )
-        ]
-
-        self.adventure_templates["merchants_dilemma"] = AdventureTemplate(
-            id="merchants_dilemma",
-            title="The Merchant's Dilemma",
-            description="A complex social conflict that tests wisdom, empathy, and leadership skills",
-            theme="Understanding and compassion lead to the best solutions",
-            difficulty_level=DifficultyLevel.INTERMEDIATE,
-            total_time_minutes=60,
-            target_players=2,
-            scenes=merchants_dilemma_scenes,
-            learning_objectives=[
-                "Complex problems rarely have simple solutions",
-                "Understanding motivations is key to resolution",
-                "The best solutions often help everyone involved",
-                "Leadership means thinking beyond immediate problems"
-            ],
-            required_materials=["2d6 dice", "character sheets", "paper for notes"],
-            success_criteria={
-                "primary_objective": "Resolve the merchant conflict positively",
-                "learning_goals": "Develop skills in empathy, investigation, and systemic thinking",
-                "confidence_target": 8.5
-            }
-        )
-
-        logger.info(f"Loaded {len(self.adventure_templates)} adventure templates")
-
-    def _adjust_scene_difficulty(
-        self, 
-        scene: AdventureScene, 
-        progress: AdventureProgress
-    ) -> AdventureScene:
-        """Dynamically adjust scene difficulty based on player progress."""
-        adjusted_scene = scene
-        
-        # If player is struggling (low confidence), make hints more obvious
-        if progress.confidence_score < 4.0:
-            adjusted_scene.difficulty_hints.extend([
-                "Remember, there's no single 'right' answer",
-                "Think about what your character would naturally do"
-            ])
-            # Reduce dice roll difficulties
-            for dice_roll in adjusted_scene.required_dice_rolls:
-                dice_roll["difficulty"] = max(10, dice_roll["difficulty"] - 2)
         
         # If player is excelling, add optional complexity
-        elif progress.confidence_score > 7.0:
-            adjusted_scene.gm_notes += " Consider adding extra details or consequences for advanced players."
+        if band == "excelling":
+            return replace(
+                scene,
+                gm_notes=scene.gm_notes + " Consider adding extra details or consequences for advanced players."
+            )
         
-        return adjusted_scene
+        return scene
 
     def _determine_scene_outcome(
         self,
@@ -882,22 +426,6 @@ class AdventureContentService:
         
         return base_outcome
 
-    def _get_default_next_scene(
-        self, 
-        current_scene: AdventureScene, 
-        template: AdventureTemplate
-    ) -> Optional[str]:
-        """Get the default next scene when outcome doesn't specify one."""
-        current_index = next(
-            (i for i, scene in enumerate(template.scenes) if scene.id == current_scene.id),
-            -1
-        )
-        
-        if current_index >= 0 and current_index < len(template.scenes) - 1:
-            return template.scenes[current_index + 1].id
-        
-        return None
-
     async def _finalize_adventure(
         self,
         progress: AdventureProgress,
@@ -980,6 +508,21 @@ class AdventureContentService:
             "mechanical_benefit": f"+{context.get('points', 10)} progress points"
         }
 
+    async def _generate_consequence_narrative(
+        self,
+        progress: AdventureProgress,
+        context: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Generate a consequence narrative, seeded by the session so it can be replayed."""
+        return await self.content_generator.generate_content(GenerationRequest(
+            content_type=ContentType.CONSEQUENCE_NARRATIVE,
+            context=context,
+            player_history={"confidence_score": progress.confidence_score},
+            scene_metadata={"adventure_id": progress.adventure_id, "scene_id": progress.current_scene_id},
+            customization_hints=[],
+            session_id=progress.session_id
+        ))
+
     def _assess_learning_objectives(
         self,
         progress: AdventureProgress,
@@ -1032,5 +575,8 @@ async def get_adventure_service() -> AdventureContentService:
     """Get the global adventure service instance."""
     global _adventure_service
     if _adventure_service is None:
-        _adventure_service = AdventureContentService()
+        _adventure_service = AdventureContentService(
+            progress_store=await get_adventure_progress_store(),
+            content_generator=await get_content_generator()
+        )
     return _adventure_service
\ No newline at end of file
@@ -0,0 +1,263 @@
+"""
+AI Admission Controller for SPARC outbound OpenAI calls.
+Keeps live Seer advice inside provider rate limits during large events.
+"""
+
+import asyncio
+import heapq
+import itertools
+import os
+import time
+import logging
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Dict, List, Optional
+
+from .ai_request_scheduler import Deadline
+
+logger = logging.getLogger(__name__)
+
+
+class RequestPriority(IntEnum):
+    """Priority classes for outbound AI calls (lower value is served first)."""
+    LIVE_ADVICE = 0
+    RULE_CLARIFICATION = 1
+    BACKGROUND = 2
+
+
+@dataclass
+class AdmissionConfig:
+    """Admission limits tuned for a single API server process."""
+    max_concurrent_requests: int = 16
+    requests_per_minute: int = 3500
+    tokens_per_minute: int = 90000
+    max_queue_size: int = 500
+    min_service_time_ms: float = 150.0  # Budget a request needs after leaving the queue
+
+    @classmethod
+    def from_env(cls) -> "AdmissionConfig":
+        """Load limits from OPENAI_* environment overrides."""
+        return cls(
+            max_concurrent_requests=int(os.getenv("OPENAI_MAX_CONCURRENCY", cls.max_concurrent_requests)),
+            requests_per_minute=int(os.getenv("OPENAI_RPM_LIMIT", cls.requests_per_minute)),
+            tokens_per_minute=int(os.getenv("OPENAI_TPM_LIMIT", cls.tokens_per_minute))
+        )
+
+
+class TokenBucket:
+    """Token bucket refilled continuously up to a per-minute capacity."""
+
+    def __init__(self, capacity_per_minute: float):
+        self.capacity = float(capacity_per_minute)
+        self.refill_rate = self.capacity / 60.0  # Tokens per second
+        self.tokens = self.capacity
+        self._last_refill = time.perf_counter()
+
+    def _refill(self) -> None:
+        now = time.perf_counter()
+        self.tokens = min(self.capacity, self.tokens + (now - self._last_refill) * self.refill_rate)
+        self._last_refill = now
+
+    def time_until_available(self, amount: float) -> float:
+        """Seconds until amount tokens are available (0 if available now)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.refill_rate
+
+    def consume(self, amount: float) -> None:
+        """Take tokens from the bucket."""
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+    def refund(self, amount: float) -> None:
+        """Return unused tokens to the bucket."""
+        if amount > 0:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+
+@dataclass
+class AdmissionTicket:
+    """Grant for one outbound AI call."""
+    priority: RequestPriority
+    estimated_tokens: int
+    queued_ms: float
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    sequence: int
+    estimated_tokens: int = field(compare=False)
+    enqueued_at: float = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+
+class AIAdmissionController:
+    """
+    Admission control for outbound AI calls.
+
+    Features:
+    - Per-process concurrency limit
+    - Requests-per-minute and tokens-per-minute token buckets
+    - Strict priority queue so live advice is admitted before background work
+    - Fail-fast rejection when the queue wait would blow the caller's deadline
+    - Queue-time metrics per priority class
+    """
+
+    def __init__(self, config: Optional[AdmissionConfig] = None):
+        self.config = config or AdmissionConfig()
+        self.request_bucket = TokenBucket(self.config.requests_per_minute)
+        self.token_bucket = TokenBucket(self.config.tokens_per_minute)
+
+        self.in_flight = 0
+        self._queue: List[_Waiter] = []
+        self._sequence = itertools.count()
+        self._wakeup_handle: Optional[asyncio.TimerHandle] = None
+
+        self._queue_times_ms: Dict[RequestPriority, List[float]] = {p: [] for p in RequestPriority}
+        self.stats = {
+            'admitted': 0,
+            'queued': 0,
+            'rejected_deadline': 0,
+            'rejected_queue_full': 0
+        }
+
+    def _rate_wait_seconds(self, estimated_tokens: int) -> float:
+        """Seconds until both rate buckets can cover a request."""
+        return max(
+            self.request_bucket.time_until_available(1),
+            self.token_bucket.time_until_available(estimated_tokens)
+        )
+
+    def _can_admit_now(self, estimated_tokens: int) -> bool:
+        return (self.in_flight < self.config.max_concurrent_requests
+                and self._rate_wait_seconds(estimated_tokens) == 0.0)
+
+    def _grant(self, priority: RequestPriority, estimated_tokens: int, queued_ms: float) -> AdmissionTicket:
+        """Consume capacity and issue a ticket."""
+        self.request_bucket.consume(1)
+        self.token_bucket.consume(estimated_tokens)
+        self.in_flight += 1
+        self.stats['admitted'] += 1
+
+        queue_times = self._queue_times_ms[priority]
+        queue_times.append(queued_ms)
+        if len(queue_times) > 100:
+            queue_times.pop(0)
+
+        return AdmissionTicket(priority=priority, estimated_tokens=estimated_tokens, queued_ms=queued_ms)
+
+    async def acquire(
+        self,
+        priority: RequestPriority,
+        estimated_tokens: int,
+        deadline: Deadline
+    ) -> Optional[AdmissionTicket]:
+        """
+        Wait for admission of one outbound call.
+
+        Returns None if the call can't be admitted before the deadline, so the
+        caller can go straight to its fallback.
+        """
+        # Nothing queued ahead of us: admit immediately if capacity allows
+        if not self._queue and self._can_admit_now(estimated_tokens):
+            return self._grant(priority, estimated_tokens, 0.0)
+
+        usable_ms = deadline.remaining_ms() - self.config.min_service_time_ms
+        if usable_ms <= 0 or self._rate_wait_seconds(estimated_tokens) * 1000 > usable_ms:
+            self.stats['rejected_deadline'] += 1
+            return None
+
+        if len(self._queue) >= self.config.max_queue_size:
+            self.stats['rejected_queue_full'] += 1
+            return None
+
+        waiter = _Waiter(
+            priority=int(priority),
+            sequence=next(self._sequence),
+            estimated_tokens=estimated_tokens,
+            enqueued_at=time.perf_counter(),
+            future=asyncio.get_running_loop().create_future()
+        )
+        heapq.heappush(self._queue, waiter)
+        self.stats['queued'] += 1
+        self._dispatch()
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(waiter.future), timeout=usable_ms / 1000.0)
+        except asyncio.TimeoutError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Admitted just as the wait timed out; hand the slot back
+                self.release(waiter.future.result())
+            waiter.future.cancel()
+            self.stats['rejected_deadline'] += 1
+            return None
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                self.release(waiter.future.result())
+            waiter.future.cancel()
+            raise
+
+    def release(self, ticket: AdmissionTicket, actual_tokens: Optional[int] = None) -> None:
+        """Return a concurrency slot and refund over-estimated tokens."""
+        self.in_flight = max(0, self.in_flight - 1)
+        if actual_tokens is not None:
+            self.token_bucket.refund(ticket.estimated_tokens - actual_tokens)
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Admit queued waiters in priority order while capacity allows."""
+        while self._queue:
+            waiter = self._queue[0]
+            if waiter.future.done():
+                heapq.heappop(self._queue)
+                continue
+
+            if self.in_flight >= self.config.max_concurrent_requests:
+                return  # A release will dispatch again
+
+            wait_seconds = self._rate_wait_seconds(waiter.estimated_tokens)
+            if wait_seconds > 0:
+                self._schedule_wakeup(wait_seconds)
+                return
+
+            heapq.heappop(self._queue)
+            queued_ms = (time.perf_counter() - waiter.enqueued_at) * 1000
+            waiter.future.set_result(
+                self._grant(RequestPriority(waiter.priority), waiter.estimated_tokens, queued_ms)
+            )
+
+    def _schedule_wakeup(self, delay_seconds: float) -> None:
+        """Re-run dispatch once the rate buckets have refilled."""
+        if self._wakeup_handle is not None and not self._wakeup_handle.cancelled():
+            return
+
+        def wakeup():
+            self._wakeup_handle = None
+            self._dispatch()
+
+        self._wakeup_handle = asyncio.get_running_loop().call_later(delay_seconds, wakeup)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get admission statistics for monitoring."""
+        queue_times = {}
+        for priority, times in self._queue_times_ms.items():
+            if times:
+                sorted_times = sorted(times)
+                queue_times[priority.name.lower()] = {
+                    "avg_ms": round(sum(sorted_times) / len(sorted_times), 2),
+                    "p95_ms": round(sorted_times[int(len(sorted_times) * 0.95)], 2)
+                }
+
+        return {
+            **self.stats,
+            'in_flight': self.in_flight,
+            'queue_depth': sum(1 for waiter in self._queue if not waiter.future.done()),
+            'max_concurrent_requests': self.config.max_concurrent_requests,
+            'requests_available': round(self.request_bucket.tokens, 1),
+            'tokens_available': round(self.token_bucket.tokens, 1),
+            'queue_time_by_priority': queue_times
+        }
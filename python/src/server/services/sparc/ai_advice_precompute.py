@@ -0,0 +1,219 @@
+"""
+Offline AI Seer Advice Precomputation for SPARC adventures.
+Generates scene advice ahead of time so live requests hit a warm cache tier.
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from .adventure_service import AdventureContentService, AdventureScene, AdventureTemplate
+from .enhanced_ai_seer import EnhancedAISeerService
+from .ai_admission_controller import RequestPriority
+
+logger = logging.getLogger(__name__)
+
+
+WARM_TIER_FORMAT_VERSION = 2
+# Generated by this job, so kept out of the source tree (python/var, ignored by git)
+DEFAULT_WARM_TIER_PATH = Path(__file__).resolve().parents[4] / "var" / "seer_warm_tier.json.gz"
+DEFAULT_PARTY_SIZES = (2, 3, 4)
+
+
+def get_warm_tier_path() -> Path:
+    """Location of the precomputed advice file (SEER_WARM_TIER_PATH overrides)."""
+    return Path(os.getenv("SEER_WARM_TIER_PATH", str(DEFAULT_WARM_TIER_PATH)))
+
+
+def build_scene_context(template: AdventureTemplate, scene: AdventureScene, party_size: int) -> Dict[str, Any]:
+    """Build the Seer context a live session sends while in this scene."""
+    return {
+        "adventure_id": template.id,
+        "current_scene": scene.id,
+        "scene_type": scene.scene_type.value,
+        "difficulty_level": template.difficulty_level.value,
+        "characters": [{"name": f"Player {i + 1}"} for i in range(party_size)],
+        "player_count": party_size,
+        "scene_energy": "medium"
+    }
+
+
+@dataclass
+class PrecomputeRequest:
+    """One piece of advice to generate ahead of time."""
+    adventure_id: str
+    scene_id: str
+    party_size: int
+    query: str
+    context: Dict[str, Any]
+
+
+class SeerAdvicePrecomputeJob:
+    """
+    Batch job that walks every adventure scene × action × outcome × party size,
+    generates advice through the normal Seer pipeline and writes a warm-tier file.
+    """
+
+    def __init__(
+        self,
+        adventure_service: AdventureContentService,
+        seer: EnhancedAISeerService,
+        party_sizes: Iterable[int] = DEFAULT_PARTY_SIZES,
+        concurrency: int = 4,
+        max_time_ms: int = 20000
+    ):
+        self.adventure_service = adventure_service
+        self.seer = seer
+        self.party_sizes = tuple(party_sizes)
+        self.concurrency = concurrency
+        self.max_time_ms = max_time_ms
+        self.stats = {'requested': 0, 'generated': 0, 'skipped_not_ai': 0, 'failed': 0}
+
+    def _scene_queries(self, scene: AdventureScene) -> List[str]:
+        """Questions GMs commonly ask while running a scene."""
+        queries = [
+            f"What should happen next in {scene.title}?",
+            f"How do I run {scene.title} for new players?",
+            f"The players are stuck: {scene.decision_prompt}"
+        ]
+
+        for action in scene.available_actions:
+            queries.append(f"The players chose to {action['text'].lower()}. How should I handle it?")
+            outcome = scene.outcomes.get(action["id"])
+            if outcome:
+                queries.append(
+                    f"{outcome.description}. {outcome.consequence}. What should I describe next?"
+                )
+
+        return queries
+
+    def build_requests(self) -> List[PrecomputeRequest]:
+        """Enumerate all advice to precompute."""
+        requests = []
+        for template in self.adventure_service.adventure_templates.values():
+            for scene in template.scenes:
+                queries = self._scene_queries(scene)
+                for party_size in self.party_sizes:
+                    context = build_scene_context(template, scene, party_size)
+                    for query in queries:
+                        requests.append(PrecomputeRequest(template.id, scene.id, party_size, query, context))
+        return requests
+
+    async def _generate(self, request: PrecomputeRequest, semaphore: asyncio.Semaphore) -> Optional[Dict[str, Any]]:
+        """Generate one piece of advice, keeping it only if the model wrote it."""
+        async with semaphore:
+            try:
+                advice = await self.seer.generate_contextual_advice(
+                    query=request.query,
+                    context=request.context,
+                    request_type="scene_guidance",
+                    max_time_ms=self.max_time_ms,
+                    priority=RequestPriority.BACKGROUND
+                )
+            except Exception as e:
+                logger.warning(f"Precompute failed for {request.scene_id}: {e}")
+                self.stats['failed'] += 1
+                return None
+
+        # Quick, rule-based and fallback advice would otherwise be pinned in the warm tier
+        if advice.get("type") != "ai_generated" or advice.get("fallback") or advice.get("error"):
+            self.stats['skipped_not_ai'] += 1
+            return None
+
+        response = {
+            key: value for key, value in advice.items()
+            if key not in ("response_time_ms", "from_cache")
+        }
+        self.stats['generated'] += 1
+        return {
+            "adventure_id": request.adventure_id,
+            "scene_id": request.scene_id,
+            "party_size": request.party_size,
+            "prompt": request.query,
+            "context": {
+                "adventure_id": request.adventure_id,
+                "current_scene": request.scene_id,
+                "player_count": request.party_size
+            },
+            "response": response
+        }
+
+    async def run(self) -> List[Dict[str, Any]]:
+        """Generate all advice and return warm-tier entries."""
+        requests = self.build_requests()
+        self.stats['requested'] = len(requests)
+        logger.info(f"Precomputing {len(requests)} Seer advice entries")
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results = await asyncio.gather(*[self._generate(request, semaphore) for request in requests])
+        return [entry for entry in results if entry]
+
+
+def write_warm_tier(entries: List[Dict[str, Any]], path: Path) -> None:
+    """Write warm-tier entries as gzipped JSON."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "version": WARM_TIER_FORMAT_VERSION,
+        "generated_at": datetime.now().isoformat(),
+        "entries": entries
+    }
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump(payload, f, separators=(",", ":"), default=str)
+
+
+def load_warm_tier_entries(path: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """Read warm-tier entries, returning [] if the file is missing or unreadable."""
+    path = path or get_warm_tier_path()
+    if not path.exists():
+        return []
+
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            payload = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.error(f"Failed to read Seer warm tier {path}: {e}")
+        return []
+
+    if payload.get("version") != WARM_TIER_FORMAT_VERSION:
+        logger.warning(f"Ignoring Seer warm tier {path} with unsupported version {payload.get('version')}")
+        return []
+    return payload.get("entries", [])
+
+
+async def run_precompute(output_path: Optional[Path] = None, party_sizes: Iterable[int] = DEFAULT_PARTY_SIZES) -> int:
+    """Run the precompute job end to end and write the warm-tier file."""
+    from .adventure_service import get_adventure_service
+    from .enhanced_ai_seer import get_enhanced_ai_seer
+    from .openai_client import get_openai_client
+
+    job = SeerAdvicePrecomputeJob(
+        adventure_service=await get_adventure_service(),
+        seer=await get_enhanced_ai_seer(),
+        party_sizes=party_sizes
+    )
+    try:
+        entries = await job.run()
+    finally:
+        await (await get_openai_client()).close()
+
+    output_path = output_path or get_warm_tier_path()
+    write_warm_tier(entries, output_path)
+    logger.info(f"Wrote {len(entries)} Seer warm-tier entries to {output_path} ({job.stats})")
+    return len(entries)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute AI Seer advice for adventure scenes")
+    parser.add_argument("--output", type=Path, default=None, help="Warm-tier file to write")
+    parser.add_argument("--party-sizes", type=int, nargs="+", default=list(DEFAULT_PARTY_SIZES))
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_precompute(args.output, args.party_sizes))
@@ -13,6 +13,9 @@ from enum import Enum
 from dataclasses import dataclass, asdict
 
 from ..cache_service import get_cache_service, CacheType
+from .ai_similarity_index import PromptSimilarityIndex
+from .ai_intent_classifier import get_intent_classifier
+from .unified_ai_cache import AICacheEntry, UnifiedAICache, canonical_cache_key, get_unified_ai_cache
 
 logger = logging.getLogger(__name__)
 
@@ -54,11 +57,15 @@ class CachedAIResponse:
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'CachedAIResponse':
-        metadata_dict = data['metadata']
-        metadata_dict['generated_at'] = datetime.fromisoformat(metadata_dict['generated_at'])
-        if metadata_dict.get('last_used'):
+        metadata_dict = dict(data['metadata'])
+        # Memory fallback keeps datetimes, Redis round-trips them as strings
+        if isinstance(metadata_dict['generated_at'], str):
+            metadata_dict['generated_at'] = datetime.fromisoformat(metadata_dict['generated_at'])
+        if isinstance(metadata_dict.get('last_used'), str):
             metadata_dict['last_used'] = datetime.fromisoformat(metadata_dict['last_used'])
         
+        metadata_dict['prompt_type'] = AIPromptType(metadata_dict['prompt_type'])
+        
         return cls(
             response_data=data['response_data'],
             metadata=AIResponseMetadata(**metadata_dict)
@@ -72,33 +79,33 @@ class AIResponseCacheService:
     Features:
     - Context-aware prompt hashing
     - Response relevance scoring and aging
-    - Hot cache for frequently requested prompts
+    - In-memory hot tier shared with the other AI layers via the unified cache
+    - Near-duplicate prompt matching via local MinHash/LSH index
+    - Read-only warm tier of precomputed scene advice
     - Intelligent cache invalidation
     - Performance analytics for <3s target
     """
     
-    def __init__(self):
+    def __init__(self, similarity_threshold: float = 0.6, hot_cache: Optional[UnifiedAICache] = None):
         self.cache_service = None
-        self.hot_cache: Dict[str, CachedAIResponse] = {}  # Memory cache for frequent prompts
+        # Memory tier shared with the OpenAI client and the Seer
+        self.hot_cache = hot_cache if hot_cache is not None else get_unified_ai_cache()
+        self.similarity_index = PromptSimilarityIndex(similarity_threshold=similarity_threshold)
+        
+        # Precomputed advice keyed by adventure, scene and party size, never evicted
+        self.warm_tier: Dict[str, Dict[str, Any]] = {}
+        self.warm_tier_index = PromptSimilarityIndex(similarity_threshold=similarity_threshold, max_entries=100000)
         self.performance_stats = {
             'total_requests': 0,
             'cache_hits': 0,
             'cache_misses': 0,
             'avg_response_time_ms': 0.0,
             'hot_cache_hits': 0,
+            'near_duplicate_hits': 0,
+            'warm_tier_hits': 0,
             'cache_saves_ms': 0.0  # Time saved by caching
         }
         
-        # Common prompts that should stay in hot cache
-        self.hot_cache_prompts = {
-            "what are the basic rules for combat",
-            "how do dice rolls work in this game", 
-            "what should happen next in this scene",
-            "suggest tactical options for combat",
-            "how do I make this more engaging",
-            "what are good story hooks for beginners"
-        }
-        
         self._initialize_cache()
     
     async def _initialize_cache(self):
@@ -108,50 +115,82 @@ class AIResponseCacheService:
         except Exception as e:
             logger.error(f"Failed to initialize AI cache service: {e}")
     
-    def _generate_prompt_hash(self, prompt: str, context: Dict[str, Any], prompt_type: AIPromptType) -> str:
-        """Generate context-aware hash for prompt caching."""
-        # Normalize prompt for consistent hashing
-        normalized_prompt = prompt.lower().strip()
-        
-        # Create context signature based on prompt type
-        context_signature = ""
+    def _get_context_signature(self, context: Dict[str, Any], prompt_type: AIPromptType) -> str:
+        """Build the part of the context a cached response depends on."""
         if prompt_type == AIPromptType.RULE_CLARIFICATION:
             # Rules don't depend on session context
-            context_signature = "static_rules"
+            return "static_rules"
         elif prompt_type == AIPromptType.SCENE_SUGGESTION:
             # Scene suggestions depend on current scene and characters
-            context_signature = f"scene_{context.get('current_scene', 'unknown')}"
+            return f"scene_{context.get('current_scene', 'unknown')}"
         elif prompt_type == AIPromptType.TACTICAL_ADVICE:
             # Tactical advice depends on current situation
-            context_signature = f"tactical_{context.get('combat_state', 'unknown')}"
+            return f"tactical_{context.get('combat_state', 'unknown')}"
         else:
             # Generic context hash for other types
             context_str = json.dumps(context, sort_keys=True, default=str)
-            context_signature = hashlib.md5(context_str.encode()).hexdigest()[:16]
-        
-        # Combine prompt, context, and type for unique hash
-        hash_input = f"{normalized_prompt}|{context_signature}|{prompt_type.value}"
+            return hashlib.md5(context_str.encode()).hexdigest()[:16]
+    
+    def _generate_prompt_hash(self, prompt: str, context: Dict[str, Any]) -> str:
+        """Generate the canonical cache key shared with the other AI layers."""
+        return canonical_cache_key(prompt, context)
+    
+    def _get_similarity_scope(self, context: Dict[str, Any], prompt_type: AIPromptType) -> Tuple[str, str]:
+        """Scope near-duplicate matching to the same prompt type and context."""
+        return (prompt_type.value, self._get_context_signature(context, prompt_type))
+    
+    def _get_warm_tier_scope(self, context: Dict[str, Any]) -> Optional[Tuple[str, str, int]]:
+        """Adventure, scene and party size that precomputed advice is keyed by."""
+        adventure_id = context.get('adventure_id')
+        scene_id = context.get('current_scene')
+        if not adventure_id or not scene_id:
+            return None
+        party_size = context.get('player_count') or len(context.get('characters', [])) or 2
+        return (str(adventure_id), str(scene_id), int(party_size))
+    
+    def _generate_warm_tier_key(self, prompt: str, scope: Tuple[str, str, int]) -> str:
+        """Generate the exact-match key for a warm-tier entry."""
+        hash_input = f"{prompt.lower().strip()}|{scope[0]}|{scope[1]}|{scope[2]}"
         return hashlib.sha256(hash_input.encode()).hexdigest()[:32]
     
-    def _classify_prompt_type(self, prompt: str, context: Dict[str, Any]) -> AIPromptType:
-        """Intelligently classify prompt type for optimal caching."""
-        prompt_lower = prompt.lower()
+    def load_warm_tier(self, entries: List[Dict[str, Any]]) -> int:
+        """Load precomputed advice entries into the read-only warm tier."""
+        loaded = 0
+        for entry in entries:
+            scope = self._get_warm_tier_scope(entry.get('context', {}))
+            if scope is None or not entry.get('prompt') or not entry.get('response'):
+                continue
+            
+            key = self._generate_warm_tier_key(entry['prompt'], scope)
+            self.warm_tier[key] = entry['response']
+            self.warm_tier_index.add(key, entry['prompt'], scope=scope)
+            loaded += 1
         
-        # Rule-based classification
-        if any(word in prompt_lower for word in ['rule', 'how do', 'what are', 'explain']):
-            return AIPromptType.RULE_CLARIFICATION
-        elif any(word in prompt_lower for word in ['scene', 'story', 'narrative', 'next']):
-            return AIPromptType.SCENE_SUGGESTION
-        elif any(word in prompt_lower for word in ['combat', 'attack', 'defend', 'tactical']):
-            return AIPromptType.TACTICAL_ADVICE
-        elif any(word in prompt_lower for word in ['character', 'player', 'action']):
-            return AIPromptType.CHARACTER_ACTION
-        elif any(word in prompt_lower for word in ['difficulty', 'easier', 'harder', 'challenge']):
-            return AIPromptType.DIFFICULTY_ADJUSTMENT
-        elif any(word in prompt_lower for word in ['encounter', 'enemy', 'monster', 'generate']):
-            return AIPromptType.ENCOUNTER_GENERATION
-        else:
-            return AIPromptType.STORY_CONTINUATION
+        logger.info(f"Loaded {loaded} precomputed AI responses into warm tier")
+        return loaded
+    
+    def _lookup_warm_tier(self, prompt: str, context: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Find precomputed advice for this scene by exact or near-duplicate prompt."""
+        if not self.warm_tier:
+            return None
+        
+        scope = self._get_warm_tier_scope(context)
+        if scope is None:
+            return None
+        
+        key = self._generate_warm_tier_key(prompt, scope)
+        if key not in self.warm_tier:
+            match = self.warm_tier_index.find_similar(prompt, scope=scope)
+            if not match:
+                return None
+            key = match.key
+        
+        # Copy so callers can't modify the read-only tier
+        return dict(self.warm_tier[key])
+    
+    def _classify_prompt_type(self, prompt: str, context: Dict[str, Any]) -> AIPromptType:
+        """Classify prompt type for optimal caching."""
+        return AIPromptType(get_intent_classifier().classify(prompt).prompt_type)
     
     def _calculate_relevance_score(self, metadata: AIResponseMetadata) -> float:
         """Calculate relevance score based on age and usage."""
@@ -185,30 +224,57 @@ class AIResponseCacheService:
         start_time = time.perf_counter()
         self.performance_stats['total_requests'] += 1
         
+        # Precomputed scene advice is memory-only and fastest
+        warm_response = self._lookup_warm_tier(prompt, context)
+        if warm_response is not None:
+            self.performance_stats['cache_hits'] += 1
+            self.performance_stats['warm_tier_hits'] += 1
+            duration_ms = (time.perf_counter() - start_time) * 1000
+            self.performance_stats['cache_saves_ms'] += max(0, 2000 - duration_ms)
+            return warm_response
+        
         # Auto-classify prompt type if not provided
         if prompt_type is None:
             prompt_type = self._classify_prompt_type(prompt, context)
         
-        prompt_hash = self._generate_prompt_hash(prompt, context, prompt_type)
+        prompt_hash = self._generate_prompt_hash(prompt, context)
         
-        # Check hot cache first (in-memory)
-        if prompt_hash in self.hot_cache:
-            cached_response = self.hot_cache[prompt_hash]
+        response_data = await self._lookup_cached_response(prompt_hash, start_time)
+        if response_data is not None:
+            return response_data
+        
+        # Fall back to a rephrased version of the same question
+        match = self.similarity_index.find_similar(
+            prompt,
+            scope=self._get_similarity_scope(context, prompt_type),
+            exclude_key=prompt_hash
+        )
+        if match:
+            response_data = await self._lookup_cached_response(match.key, start_time)
+            if response_data is not None:
+                self.performance_stats['near_duplicate_hits'] += 1
+                logger.debug(f"Near-duplicate AI cache hit (similarity {match.score:.2f})")
+                return response_data
+            
+            # Underlying entry expired, stop matching against it
+            self.similarity_index.remove(match.key)
+        
+        # Cache miss
+        self.performance_stats['cache_misses'] += 1
+        return None
+    
+    async def _lookup_cached_response(self, prompt_hash: str, start_time: float) -> Optional[Dict[str, Any]]:
+        """Look up a cached response by hash in the hot cache, then Redis."""
+        # Check hot cache first (in-memory, shared with the other AI layers)
+        entry = self.hot_cache.get_entry(prompt_hash, layer="ai_cache")
+        if entry is not None and self.entry_relevance(entry) > 0.3:  # Minimum relevance threshold
+            self.performance_stats['cache_hits'] += 1
+            self.performance_stats['hot_cache_hits'] += 1
             
-            # Check if still relevant
-            relevance_score = self._calculate_relevance_score(cached_response.metadata)
-            if relevance_score > 0.3:  # Minimum relevance threshold
-                # Update usage statistics
-                cached_response.metadata.usage_count += 1
-                cached_response.metadata.last_used = datetime.now()
-                
-                self.performance_stats['cache_hits'] += 1
-                self.performance_stats['hot_cache_hits'] += 1
-                
-                duration_ms = (time.perf_counter() - start_time) * 1000
-                self.performance_stats['cache_saves_ms'] += max(0, 2000 - duration_ms)  # Assume 2s saved
-                
-                return cached_response.response_data
+            duration_ms = (time.perf_counter() - start_time) * 1000
+            self.performance_stats['cache_saves_ms'] += max(0, 2000 - duration_ms)  # Assume 2s saved
+            
+            return dict(entry.value)
         
         # Check Redis cache
         if self.cache_service:
@@ -225,7 +291,7 @@ class AIResponseCacheService:
                         cached_response.metadata.last_used = datetime.now()
                         
                         if cached_response.metadata.usage_count >= 3:
-                            self.hot_cache[prompt_hash] = cached_response
+                            self._add_to_hot_cache(prompt_hash, cached_response)
                         
                         # Update cache with new metadata
                         await self.cache_service.cache_ai_response(prompt_hash, cached_response.to_dict())
@@ -239,8 +305,6 @@ class AIResponseCacheService:
             except Exception as e:
                 logger.error(f"Error retrieving cached AI response: {e}")
         
-        # Cache miss
-        self.performance_stats['cache_misses'] += 1
         return None
     
     async def cache_response(
@@ -259,7 +323,7 @@ class AIResponseCacheService:
         if prompt_type is None:
             prompt_type = self._classify_prompt_type(prompt, context)
         
-        prompt_hash = self._generate_prompt_hash(prompt, context, prompt_type)
+        prompt_hash = self._generate_prompt_hash(prompt, context)
         context_hash = hashlib.md5(json.dumps(context, sort_keys=True, default=str).encode()).hexdigest()[:16]
         
         # Create cached response with metadata
@@ -282,21 +346,11 @@ class AIResponseCacheService:
             # Cache in Redis
             success = await self.cache_service.cache_ai_response(prompt_hash, cached_response.to_dict())
             
-            # Add to hot cache for certain prompt types or common prompts
-            prompt_lower = prompt.lower().strip()
-            if (prompt_type in [AIPromptType.RULE_CLARIFICATION, AIPromptType.TACTICAL_ADVICE] or
-                any(common in prompt_lower for common in self.hot_cache_prompts)):
-                self.hot_cache[prompt_hash] = cached_response
-                
-                # Limit hot cache size
-                if len(self.hot_cache) > 50:
-                    # Remove least relevant entries
-                    sorted_items = sorted(
-                        self.hot_cache.items(), 
-                        key=lambda x: self._calculate_relevance_score(x[1].metadata)
-                    )
-                    for key, _ in sorted_items[:10]:  # Remove 10 least relevant
-                        del self.hot_cache[key]
+            # Index the prompt so rephrasings of it can reuse this response
+            self.similarity_index.add(prompt_hash, prompt, scope=self._get_similarity_scope(context, prompt_type))
+            
+            # Share with the other AI layers through the unified hot cache
+            self._add_to_hot_cache(prompt_hash, cached_response)
             
             return success
             
@@ -304,19 +358,41 @@ class AIResponseCacheService:
             logger.error(f"Failed to cache AI response: {e}")
             return False
     
+    def _add_to_hot_cache(self, key: str, cached_response: CachedAIResponse) -> None:
+        """Store a response in the shared in-memory tier."""
+        metadata = cached_response.metadata
+        self.hot_cache.put(
+            key,
+            cached_response.response_data,
+            layer="ai_cache",
+            ttl_seconds=self.cache_service.config.ttl_ai_response if self.cache_service else None,
+            metadata={
+                'prompt_type': metadata.prompt_type.value,
+                'context_hash': metadata.context_hash,
+                'response_time_ms': metadata.response_time_ms
+            }
+        )
+    
+    def entry_relevance(self, entry: AICacheEntry) -> float:
+        """Relevance score of a shared hot cache entry."""
+        return self._calculate_relevance_score(AIResponseMetadata(
+            prompt_type=AIPromptType(entry.metadata.get('prompt_type', AIPromptType.STORY_CONTINUATION.value)),
+            generated_at=datetime.fromtimestamp(entry.created_at),
+            context_hash=entry.metadata.get('context_hash', ''),
+            response_time_ms=entry.metadata.get('response_time_ms', 0.0),
+            usage_count=entry.hits + 1,
+            last_used=datetime.fromtimestamp(entry.last_used)
+        ))
+    
     async def invalidate_context_cache(self, context_pattern: str):
         """Invalidate cached responses matching context pattern."""
         # Clear matching entries from hot cache
-        keys_to_remove = []
-        for key, cached_response in self.hot_cache.items():
-            if context_pattern in cached_response.metadata.context_hash:
-                keys_to_remove.append(key)
-        
-        for key in keys_to_remove:
-            del self.hot_cache[key]
+        removed = self.hot_cache.remove_where(
+            lambda entry: context_pattern in entry.metadata.get('context_hash', '')
+        )
         
         # TODO: Implement Redis pattern-based invalidation
-        logger.info(f"Invalidated {len(keys_to_remove)} cached AI responses matching pattern: {context_pattern}")
+        logger.info(f"Invalidated {removed} cached AI responses matching pattern: {context_pattern}")
     
     def get_cache_effectiveness_report(self) -> Dict[str, Any]:
         """Generate cache effectiveness report."""
@@ -334,7 +410,12 @@ class AIResponseCacheService:
             'total_requests': total_requests,
             'cache_hits': cache_hits,
             'hot_cache_hits': self.performance_stats['hot_cache_hits'],
+            'near_duplicate_hits': self.performance_stats['near_duplicate_hits'],
+            'warm_tier_hits': self.performance_stats['warm_tier_hits'],
+            'warm_tier_size': len(self.warm_tier),
             'hot_cache_size': len(self.hot_cache),
+            'shared_cache': self.hot_cache.get_stats(),
+            'similarity_index': self.similarity_index.get_stats(),
             'time_saved_seconds': time_saved_seconds,
             'meets_performance_target': hit_rate > 0.3,  # 30% hit rate target
             'estimated_cost_savings': time_saved_seconds * 0.01  # Assume $0.01 per second of AI processing
@@ -342,17 +423,8 @@ class AIResponseCacheService:
     
     async def cleanup_expired_cache(self):
         """Remove expired and low-relevance cached responses."""
-        cleaned_count = 0
-        
         # Clean hot cache
-        keys_to_remove = []
-        for key, cached_response in self.hot_cache.items():
-            if self._calculate_relevance_score(cached_response.metadata) < 0.1:
-                keys_to_remove.append(key)
-        
-        for key in keys_to_remove:
-            del self.hot_cache[key]
-            cleaned_count += 1
+        cleaned_count = self.hot_cache.remove_where(lambda entry: self.entry_relevance(entry) < 0.1)
         
         logger.info(f"Cleaned up {cleaned_count} expired AI cache entries")
 
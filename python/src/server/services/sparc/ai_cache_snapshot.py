@@ -0,0 +1,164 @@
+"""
+AI Cache Snapshot Service for SPARC Seer Assistant.
+Persists the hottest AI cache entries to disk so caches survive deploys.
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from .ai_cache_service import get_ai_cache_service
+from .unified_ai_cache import AICacheEntry, UnifiedAICache, get_unified_ai_cache
+
+logger = logging.getLogger(__name__)
+
+
+SNAPSHOT_FORMAT_VERSION = 2
+# Written at runtime, so kept out of the source tree (python/var, ignored by git)
+DEFAULT_SNAPSHOT_PATH = Path(__file__).resolve().parents[4] / "var" / "ai_cache_snapshot.json.gz"
+
+
+def get_snapshot_path() -> Path:
+    """Location of the AI cache snapshot file (AI_CACHE_SNAPSHOT_PATH overrides)."""
+    return Path(os.getenv("AI_CACHE_SNAPSHOT_PATH", str(DEFAULT_SNAPSHOT_PATH)))
+
+
+class AICacheSnapshotter:
+    """
+    Periodically snapshots the in-memory AI cache and restores it on boot.
+
+    Features:
+    - Hottest entries ranked by relevance score
+    - Compact gzipped JSON written atomically
+    - Stale entries dropped on restore
+    - Background snapshot loop with a final snapshot on shutdown
+    """
+
+    def __init__(
+        self,
+        cache: UnifiedAICache,
+        path: Optional[Path] = None,
+        interval_seconds: float = 300.0,
+        max_entries: int = 1000,
+        rank_key: Optional[Callable[[AICacheEntry], float]] = None
+    ):
+        self.cache = cache
+        self.rank_key = rank_key
+        self.path = path or get_snapshot_path()
+        self.interval_seconds = interval_seconds
+        self.max_entries = max_entries
+
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {
+            'snapshots_written': 0,
+            'snapshot_failures': 0,
+            'last_snapshot_entries': 0,
+            'restored_entries': 0
+        }
+
+    def collect(self) -> Dict[str, Any]:
+        """Gather the hottest cache entries."""
+        return {
+            "version": SNAPSHOT_FORMAT_VERSION,
+            "saved_at": datetime.now().isoformat(),
+            "entries": self.cache.export(self.max_entries, rank_key=self.rank_key)
+        }
+
+    def save(self) -> int:
+        """Write a snapshot, returning the number of entries saved."""
+        snapshot = self.collect()
+        entry_count = len(snapshot["entries"])
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_name(self.path.name + ".tmp")
+            with gzip.open(temp_path, "wt", encoding="utf-8") as f:
+                json.dump(snapshot, f, separators=(",", ":"), default=str)
+            # Replace atomically so a crash mid-write never leaves a corrupt snapshot
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.error(f"Failed to write AI cache snapshot {self.path}: {e}")
+            self.stats['snapshot_failures'] += 1
+            return 0
+
+        self.stats['snapshots_written'] += 1
+        self.stats['last_snapshot_entries'] = entry_count
+        return entry_count
+
+    def restore(self) -> int:
+        """Load the last snapshot into the cache, returning entries restored."""
+        if not self.path.exists():
+            return 0
+
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to read AI cache snapshot {self.path}: {e}")
+            return 0
+
+        if snapshot.get("version") != SNAPSHOT_FORMAT_VERSION:
+            logger.warning(f"Ignoring AI cache snapshot with unsupported version {snapshot.get('version')}")
+            return 0
+
+        restored = self.cache.restore(snapshot.get("entries", []))
+        self.stats['restored_entries'] += restored
+        logger.info(f"Restored {restored} AI cache entries from snapshot saved at {snapshot.get('saved_at')}")
+        return restored
+
+    async def _snapshot_loop(self) -> None:
+        """Write snapshots on a fixed interval."""
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                self.save()
+            except Exception as e:
+                logger.error(f"AI cache snapshot failed: {e}")
+                self.stats['snapshot_failures'] += 1
+
+    def start(self) -> None:
+        """Start the background snapshot loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._snapshot_loop())
+
+    async def stop(self) -> None:
+        """Stop the snapshot loop and write a final snapshot."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.save()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get snapshot statistics for monitoring."""
+        return {
+            **self.stats,
+            'path': str(self.path),
+            'interval_seconds': self.interval_seconds,
+            'running': self._task is not None and not self._task.done()
+        }
+
+
+# Global snapshot service
+_ai_cache_snapshotter: Optional[AICacheSnapshotter] = None
+
+
+async def get_ai_cache_snapshotter() -> AICacheSnapshotter:
+    """Get or create the AI cache snapshotter."""
+    global _ai_cache_snapshotter
+    if _ai_cache_snapshotter is None:
+        ai_cache = await get_ai_cache_service()
+        _ai_cache_snapshotter = AICacheSnapshotter(
+            cache=get_unified_ai_cache(),
+            interval_seconds=float(os.getenv("AI_CACHE_SNAPSHOT_INTERVAL_SECONDS", "300")),
+            rank_key=ai_cache.entry_relevance
+        )
+    return _ai_cache_snapshotter
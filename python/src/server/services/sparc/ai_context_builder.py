@@ -0,0 +1,257 @@
+"""
+AI Context Builder for SPARC Seer prompts.
+Compacts session context into token-budgeted prompts with a rolling event digest.
+"""
+
+import json
+import hashlib
+import logging
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate tokens locally (~4 characters per token for English prompts)."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _event_key(event: Any) -> str:
+    """Stable identity of a session event, so re-sent events are only counted once."""
+    if isinstance(event, dict) and event.get("id"):
+        return str(event["id"])
+    return hashlib.sha1(json.dumps(event, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def _describe_event(event: Any) -> Tuple[str, str]:
+    """Return (kind, short description) for a session event."""
+    if not isinstance(event, dict):
+        return "events", str(event)
+
+    if "roll_type" in event:
+        outcome = {True: "success", False: "failure"}.get(event.get("is_success"), "")
+        who = event.get("character") or event.get("character_name") or ""
+        parts = [who, f"{event['roll_type']} roll", str(event.get("total", "")), outcome]
+        return "rolls", " ".join(part for part in parts if part)
+
+    kind = str(event.get("type", "event"))
+    description = event.get("description") or event.get("text") or kind
+    return f"{kind}s" if not kind.endswith("s") else kind, str(description)
+
+
+def summarize_characters(characters: List[Any]) -> List[str]:
+    """One short descriptor per distinct character, dropping repeated entries."""
+    seen = set()
+    descriptors = []
+    for character in characters:
+        if not isinstance(character, dict):
+            continue
+        name = character.get("name")
+        character_class = character.get("class") or character.get("character_class")
+        key = character.get("id") or name or json.dumps(character, sort_keys=True, default=str)
+        if key in seen:
+            continue
+        seen.add(key)
+
+        details = []
+        if character_class:
+            details.append(str(character_class))
+        hp = character.get("hp_percentage")
+        if hp is None and character.get("max_hp"):
+            hp = character.get("current_hp", 0) / character["max_hp"]
+        if hp is not None and hp < 1.0:
+            details.append(f"{int(hp * 100)}% HP")
+
+        if name or details:
+            descriptors.append(f"{name or 'Unnamed'} ({', '.join(details)})" if details else str(name))
+    return descriptors
+
+
+@dataclass
+class SessionContextState:
+    """Rolling per-session event window plus a digest of everything older."""
+    recent: "OrderedDict[str, Tuple[str, str]]" = field(default_factory=OrderedDict)
+    digested_count: int = 0
+    digest_counts: Dict[str, int] = field(default_factory=dict)
+    digest_highlights: Deque[str] = field(default_factory=lambda: deque(maxlen=3))
+    seen: "OrderedDict[str, None]" = field(default_factory=OrderedDict)
+
+    def digest(self) -> Optional[str]:
+        """Compact summary of events that have left the recent window."""
+        if not self.digested_count:
+            return None
+        counts = sorted(self.digest_counts.items(), key=lambda item: item[1], reverse=True)
+        text = f"Earlier: {self.digested_count} events ({', '.join(f'{n} {kind}' for kind, n in counts[:4])})"
+        if self.digest_highlights:
+            text += f"; last: {'; '.join(self.digest_highlights)}"
+        return text
+
+
+@dataclass
+class BuiltPrompt:
+    """A user prompt fitted to its token budget."""
+    text: str
+    tokens: int
+    dropped_sections: List[str] = field(default_factory=list)
+
+
+class AIContextBuilder:
+    """
+    Builds Seer user prompts that stay within a per-request token budget.
+
+    Features:
+    - Local token estimation, no tokenizer dependency
+    - Rolling digest per session: recent events verbatim, older events summarized
+    - Repeated character entries deduplicated into one descriptor each
+    - Lower-priority sections shrunk or dropped to fit the budget
+    - Prompt size metrics for monitoring
+    """
+
+    def __init__(
+        self,
+        max_prompt_tokens: int = 600,
+        recent_event_limit: int = 5,
+        max_sessions: int = 1000,
+        max_seen_events: int = 500
+    ):
+        self.max_prompt_tokens = max_prompt_tokens
+        self.recent_event_limit = recent_event_limit
+        self.max_sessions = max_sessions
+        self.max_seen_events = max_seen_events
+
+        self._sessions: "OrderedDict[str, SessionContextState]" = OrderedDict()
+        self._prompt_tokens: Deque[int] = deque(maxlen=200)
+        self.stats = {
+            'prompts_built': 0,
+            'prompts_compacted': 0,
+            'events_digested': 0
+        }
+
+    def _get_session_state(self, session_id: Optional[str]) -> SessionContextState:
+        """Per-session state, kept for the most recently active sessions."""
+        if not session_id:
+            return SessionContextState()
+
+        state = self._sessions.get(session_id)
+        if state is None:
+            state = SessionContextState()
+            self._sessions[session_id] = state
+            if len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        else:
+            self._sessions.move_to_end(session_id)
+        return state
+
+    def record_events(self, session_id: Optional[str], events: List[Any]) -> SessionContextState:
+        """Add new session events, folding ones that leave the recent window into the digest."""
+        state = self._get_session_state(session_id)
+        for event in events:
+            key = _event_key(event)
+            if key in state.seen:
+                continue
+            state.seen[key] = None
+            if len(state.seen) > self.max_seen_events:
+                state.seen.popitem(last=False)
+
+            kind, description = _describe_event(event)
+            state.recent[key] = (kind, description[:80])
+            if len(state.recent) > self.recent_event_limit:
+                _, (old_kind, old_description) = state.recent.popitem(last=False)
+                state.digested_count += 1
+                state.digest_counts[old_kind] = state.digest_counts.get(old_kind, 0) + 1
+                state.digest_highlights.append(old_description)
+                self.stats['events_digested'] += 1
+        return state
+
+    def _context_signals(self, context: Dict[str, Any]) -> str:
+        """Short description of table state."""
+        characters = context.get("characters", [])
+        player_engagement = context.get("player_engagement", 5)
+        scene_energy = context.get("scene_energy", "medium")
+
+        context_parts = []
+        if characters:
+            context_parts.append(f"{len(summarize_characters(characters)) or len(characters)} active characters")
+        if player_engagement < 6:
+            context_parts.append("players seem disengaged")
+        elif player_engagement > 8:
+            context_parts.append("players highly engaged")
+        if scene_energy == "low":
+            context_parts.append("scene needs energy")
+        elif scene_energy == "high":
+            context_parts.append("scene has high energy")
+
+        return ", ".join(context_parts) if context_parts else "standard situation"
+
+    def _truncate(self, text: str, max_tokens: int) -> str:
+        """Cut text to a token allowance."""
+        if estimate_tokens(text) <= max_tokens:
+            return text
+        return text[:max(max_tokens * CHARS_PER_TOKEN - 3, 0)].rstrip() + "..."
+
+    def build_user_prompt(self, prompt: str, context: Dict[str, Any], reserved_tokens: int = 0) -> BuiltPrompt:
+        """
+        Build the user prompt for a request.
+
+        Args:
+            prompt: The GM's question or situation
+            context: Game context sent with the request
+            reserved_tokens: Tokens already used by the system prompt
+        """
+        budget = max(self.max_prompt_tokens - reserved_tokens, 0)
+        situation = self._truncate(f"Situation: {prompt}", budget // 2)
+        closing = "\n\nWhat should the GM do right now?"
+        used = estimate_tokens(situation) + estimate_tokens(closing)
+
+        events = list(context.get("recent_events", [])) + list(context.get("recent_rolls", []))
+        state = self.record_events(context.get("session_id"), events)
+
+        party = summarize_characters(context.get("characters", []))
+        recent_events = [description for _, description in state.recent.values()]
+
+        # Optional sections in priority order; each shrinks before it is dropped
+        candidates = [
+            ("context", [f"Context: {self._context_signals(context)}"]),
+            ("party", [f"Party: {', '.join(party)}", f"Party: {', '.join(d.split(' (')[0] for d in party)}"] if party else []),
+            ("recent_events", [f"Recent: {'; '.join(recent_events[i:])}" for i in range(len(recent_events))]),
+            ("digest", [state.digest()] if state.digest() else [])
+        ]
+
+        lines = [situation]
+        dropped = []
+        for name, variants in candidates:
+            for variant in variants:
+                tokens = estimate_tokens("\n" + variant)
+                if used + tokens <= budget:
+                    lines.append(variant)
+                    used += tokens
+                    break
+            else:
+                if variants:
+                    dropped.append(name)
+
+        text = "\n".join(lines) + closing
+        total_tokens = estimate_tokens(text) + reserved_tokens
+
+        self.stats['prompts_built'] += 1
+        if dropped:
+            self.stats['prompts_compacted'] += 1
+        self._prompt_tokens.append(total_tokens)
+        return BuiltPrompt(text=text, tokens=total_tokens, dropped_sections=dropped)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get prompt size statistics for monitoring."""
+        sizes = sorted(self._prompt_tokens)
+        return {
+            **self.stats,
+            'token_budget': self.max_prompt_tokens,
+            'tracked_sessions': len(self._sessions),
+            'avg_prompt_tokens': round(sum(sizes) / len(sizes), 1) if sizes else 0.0,
+            'p95_prompt_tokens': sizes[int(len(sizes) * 0.95)] if sizes else 0,
+            'max_prompt_tokens': sizes[-1] if sizes else 0
+        }
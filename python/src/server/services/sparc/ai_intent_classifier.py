@@ -0,0 +1,192 @@
+"""
+AI Intent Classifier for SPARC Seer requests.
+Routes a query to an intent, request type and quick response in one regex pass.
+"""
+
+import re
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+
+# Words that carry no intent and don't count against match coverage
+_FILLER_WORDS = frozenset({
+    "a", "an", "the", "and", "or", "but", "of", "to", "in", "on", "at", "for", "with",
+    "is", "are", "was", "be", "do", "does", "did", "i", "me", "my", "we", "our", "they",
+    "their", "it", "this", "that", "what", "how", "should", "can", "now", "so", "just"
+})
+
+
+@dataclass(frozen=True)
+class IntentRule:
+    """An intent with its weighted cue phrases and routing targets."""
+    intent: str
+    cues: Tuple[Tuple[str, float], ...]
+    request_type: str
+    prompt_type: str
+    quick_response_key: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class IntentMatch:
+    """Result of classifying a query."""
+    intent: Optional[str]
+    request_type: str
+    prompt_type: str
+    quick_response_key: Optional[str]
+    confidence: float
+    scores: Dict[str, float] = field(default_factory=dict)
+    content_words: int = 0
+    covered_words: int = 0
+
+
+# Earlier rules win ties; quick-response cues carry more weight than generic topic words
+DEFAULT_INTENT_RULES: Tuple[IntentRule, ...] = (
+    IntentRule(
+        "rules",
+        (("rule", 1.0), ("how do", 1.0), ("how does", 1.0), ("what are", 1.0), ("explain", 1.0)),
+        request_type="rule_clarification", prompt_type="rule_clarification"
+    ),
+    IntentRule(
+        "skill_check",
+        (("skill check", 2.0), ("roll", 1.5), ("dice", 1.5)),
+        request_type="rule_clarification", prompt_type="rule_clarification", quick_response_key="skill_check"
+    ),
+    IntentRule(
+        "combat_start",
+        (("initiative", 3.0), ("combat", 2.0), ("fight", 2.0), ("attack", 1.0), ("defend", 1.0), ("tactical", 1.0)),
+        request_type="scene_guidance", prompt_type="tactical_advice", quick_response_key="combat_start"
+    ),
+    IntentRule(
+        "player_confused",
+        (("what do i do", 3.0), ("what should i do", 3.0), ("confused", 2.0), ("help", 1.5)),
+        request_type="player_help", prompt_type="character_action", quick_response_key="player_confused"
+    ),
+    IntentRule(
+        "story_stall",
+        (("i'm stuck", 3.0), ("scene ideas", 3.0), ("stuck", 2.0), ("stall", 2.0), ("boring", 2.0)),
+        request_type="scene_guidance", prompt_type="scene_suggestion", quick_response_key="story_stall"
+    ),
+    IntentRule(
+        "scene",
+        (("scene", 1.0), ("story", 1.0), ("narrative", 1.0), ("next", 1.0)),
+        request_type="scene_guidance", prompt_type="scene_suggestion"
+    ),
+    IntentRule(
+        "character",
+        (("character", 1.0), ("player", 1.0), ("action", 1.0)),
+        request_type="player_help", prompt_type="character_action"
+    ),
+    IntentRule(
+        "difficulty",
+        (("difficulty", 1.0), ("easier", 1.0), ("harder", 1.0), ("challenge", 1.0)),
+        request_type="scene_guidance", prompt_type="difficulty_adjustment"
+    ),
+    IntentRule(
+        "encounter",
+        (("encounter", 1.0), ("enemy", 1.0), ("enemies", 1.0), ("monster", 1.0), ("generate", 1.0)),
+        request_type="scene_guidance", prompt_type="encounter_generation"
+    ),
+)
+
+
+class IntentClassifier:
+    """
+    Classifies Seer queries with a single compiled alternation regex.
+
+    Features:
+    - All cue phrases matched in one pass, longest phrase first
+    - Weighted scoring per intent with table-order tie breaking
+    - Confidence from how dominant the top intent is and how much of the query it covers
+    - Quick-response routing only for confident, short queries whose every word is a cue;
+      anything more specific goes to the model
+    """
+
+    def __init__(
+        self,
+        rules: Tuple[IntentRule, ...] = DEFAULT_INTENT_RULES,
+        confidence_threshold: float = 0.6,
+        quick_max_words: int = 4
+    ):
+        self.rules = {rule.intent: rule for rule in rules}
+        self.confidence_threshold = confidence_threshold
+        self.quick_max_words = quick_max_words
+        self._rule_order = {rule.intent: position for position, rule in enumerate(rules)}
+
+        # One capture group per cue; m.lastindex identifies which cue matched
+        cues: List[Tuple[str, str, float]] = sorted(
+            ((phrase, rule.intent, weight) for rule in rules for phrase, weight in rule.cues),
+            key=lambda cue: len(cue[0]),
+            reverse=True
+        )
+        self._cues = [(intent, weight, len(phrase.split())) for phrase, intent, weight in cues]
+        alternation = "|".join(f"({re.escape(phrase)})" for phrase, _, _ in cues)
+        self._pattern = re.compile(rf"\b(?:{alternation})(?:s|es)?\b")
+
+    def classify(self, query: str) -> IntentMatch:
+        """Map a query to its most likely intent."""
+        text = query.lower()
+        scores: Dict[str, float] = {}
+        matched_words = 0
+
+        for match in self._pattern.finditer(text):
+            intent, weight, word_count = self._cues[match.lastindex - 1]
+            scores[intent] = scores.get(intent, 0.0) + weight
+            matched_words += word_count
+
+        if not scores:
+            return IntentMatch(
+                intent=None,
+                request_type="general",
+                prompt_type="story_continuation",
+                quick_response_key=None,
+                confidence=0.0
+            )
+
+        best = max(scores, key=lambda intent: (scores[intent], -self._rule_order[intent]))
+        dominance = scores[best] / sum(scores.values())
+
+        # Cues covering at least half of the meaningful words count as full coverage
+        content_words = [word for word in _TOKEN_PATTERN.findall(text) if word not in _FILLER_WORDS]
+        coverage = min(1.0, 2 * matched_words / max(len(content_words), 1))
+
+        rule = self.rules[best]
+        return IntentMatch(
+            intent=best,
+            request_type=rule.request_type,
+            prompt_type=rule.prompt_type,
+            quick_response_key=rule.quick_response_key,
+            confidence=round(dominance * coverage, 3),
+            scores=scores,
+            content_words=len(content_words),
+            covered_words=matched_words
+        )
+
+    def is_quick(self, match: IntentMatch) -> bool:
+        """Whether a match is short, fully covered by cues and confident enough for a quick response."""
+        return (
+            match.quick_response_key is not None
+            and match.confidence >= self.confidence_threshold
+            and match.content_words <= self.quick_max_words
+            and match.covered_words >= match.content_words
+        )
+
+    def is_confident(self, match: IntentMatch) -> bool:
+        """Whether a match is confident enough to route by its request type."""
+        return match.intent is not None and match.confidence >= self.confidence_threshold
+
+
+# Global intent classifier, compiled once at startup
+_intent_classifier: Optional[IntentClassifier] = None
+
+
+def get_intent_classifier() -> IntentClassifier:
+    """Get the global intent classifier."""
+    global _intent_classifier
+    if _intent_classifier is None:
+        _intent_classifier = IntentClassifier()
+    return _intent_classifier
@@ -0,0 +1,174 @@
+"""
+AI Micro-Batcher for SPARC Seer requests.
+Coalesces near-simultaneous prompts into one multi-part OpenAI request at peak load.
+"""
+
+import asyncio
+import json
+import re
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .ai_request_scheduler import Deadline
+from .ai_admission_controller import RequestPriority
+
+logger = logging.getLogger(__name__)
+
+
+# send_batch(system_prompt, user_prompts, deadline, priority) -> one answer per prompt, or None
+BatchSender = Callable[[str, List[str], Deadline, RequestPriority], Awaitable[Optional[List[str]]]]
+
+_CODE_FENCE_PATTERN = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+
+@dataclass
+class _BatchItem:
+    user_prompt: str
+    deadline: Deadline
+    priority: RequestPriority
+    future: asyncio.Future
+
+
+@dataclass
+class _PendingBatch:
+    items: List[_BatchItem] = field(default_factory=list)
+    flush_handle: Optional[asyncio.TimerHandle] = None
+
+
+def build_batch_prompt(user_prompts: List[str]) -> str:
+    """Combine user prompts into one numbered multi-part prompt."""
+    parts = [
+        f"Answer each of the following {len(user_prompts)} numbered GM situations separately.",
+        f"Respond with ONLY a JSON array of {len(user_prompts)} strings, one answer per situation, in order.",
+        ""
+    ]
+    for number, user_prompt in enumerate(user_prompts, start=1):
+        parts.append(f"{number}. {user_prompt}")
+        parts.append("")
+    return "\n".join(parts).strip()
+
+
+def parse_batch_response(content: str, expected_count: int) -> Optional[List[str]]:
+    """Split a multi-part response back into per-prompt answers."""
+    cleaned = _CODE_FENCE_PATTERN.sub("", content.strip())
+    try:
+        answers = json.loads(cleaned)
+    except (TypeError, ValueError):
+        return None
+
+    if not isinstance(answers, list) or len(answers) != expected_count:
+        return None
+    return [str(answer).strip() for answer in answers]
+
+
+class AIMicroBatcher:
+    """
+    Collects prompts that share a system prompt over a short window and
+    dispatches them as one multi-part request, then demultiplexes the answers.
+
+    Features:
+    - Per-system-prompt batching window with a max batch size
+    - Per-request deadlines: each waiter gives up on its own deadline
+    - Batches take the highest priority of their members
+    - Batch/parse statistics for monitoring
+    """
+
+    def __init__(self, send_batch: BatchSender, window_ms: float = 15.0, max_batch_size: int = 8):
+        self.send_batch = send_batch
+        self.window_ms = window_ms
+        self.max_batch_size = max_batch_size
+
+        self._pending: Dict[str, _PendingBatch] = {}
+        self._inflight_tasks: set = set()
+        self.stats = {
+            'requests': 0,
+            'batches_sent': 0,
+            'batched_requests': 0,
+            'failed_batches': 0,
+            'deadline_expired': 0,
+            'dropped_requests': 0
+        }
+
+    async def submit(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        deadline: Deadline,
+        priority: RequestPriority = RequestPriority.LIVE_ADVICE
+    ) -> Optional[str]:
+        """Queue a prompt for the next batch and wait for its answer (None on failure or deadline)."""
+        self.stats['requests'] += 1
+        loop = asyncio.get_running_loop()
+        item = _BatchItem(user_prompt, deadline, priority, loop.create_future())
+
+        batch = self._pending.get(system_prompt)
+        if batch is None:
+            batch = _PendingBatch()
+            self._pending[system_prompt] = batch
+            batch.flush_handle = loop.call_later(self.window_ms / 1000.0, self._flush, system_prompt)
+        batch.items.append(item)
+
+        if len(batch.items) >= self.max_batch_size:
+            self._flush(system_prompt)
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(item.future), timeout=deadline.remaining_seconds())
+        except asyncio.TimeoutError:
+            self.stats['deadline_expired'] += 1
+            return None
+        finally:
+            # Cancelled callers (e.g. losing hedges) and expired ones are dropped when the batch flushes
+            if not item.future.done():
+                item.future.cancel()
+
+    def _flush(self, system_prompt: str) -> None:
+        """Dispatch the pending batch for a system prompt."""
+        batch = self._pending.pop(system_prompt, None)
+        if batch is None:
+            return
+        if batch.flush_handle is not None:
+            batch.flush_handle.cancel()
+
+        # Drop members that already gave up or were cancelled
+        items = [item for item in batch.items if not item.future.done() and not item.deadline.expired]
+        self.stats['dropped_requests'] += len(batch.items) - len(items)
+        if not items:
+            return
+
+        task = asyncio.ensure_future(self._send(system_prompt, items))
+        self._inflight_tasks.add(task)
+        task.add_done_callback(self._inflight_tasks.discard)
+
+    async def _send(self, system_prompt: str, items: List[_BatchItem]) -> None:
+        """Send one batch and resolve each member's future."""
+        batch_deadline = max((item.deadline for item in items), key=lambda d: d.expires_at)
+        priority = min(item.priority for item in items)
+
+        self.stats['batches_sent'] += 1
+        self.stats['batched_requests'] += len(items)
+
+        try:
+            answers = await self.send_batch(system_prompt, [item.user_prompt for item in items], batch_deadline, priority)
+        except Exception as e:
+            logger.warning(f"AI micro-batch of {len(items)} failed: {e}")
+            answers = None
+
+        if answers is None or len(answers) != len(items):
+            self.stats['failed_batches'] += 1
+            answers = [None] * len(items)
+
+        for item, answer in zip(items, answers):
+            if not item.future.done():
+                item.future.set_result(answer)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batching statistics for monitoring."""
+        batches = self.stats['batches_sent']
+        return {
+            **self.stats,
+            'avg_batch_size': round(self.stats['batched_requests'] / batches, 2) if batches else 0.0,
+            'pending_batches': len(self._pending),
+            'window_ms': self.window_ms,
+            'max_batch_size': self.max_batch_size
+        }
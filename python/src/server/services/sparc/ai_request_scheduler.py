@@ -0,0 +1,194 @@
+"""
+Deadline-aware AI Request Scheduler for SPARC.
+Hedges slow OpenAI calls to keep AI P99 under the <3 second target.
+"""
+
+import asyncio
+import time
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Set, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class Deadline:
+    """Absolute deadline propagated through the AI request path."""
+    expires_at: float  # time.perf_counter() timestamp
+
+    @classmethod
+    def from_budget_ms(cls, budget_ms: float) -> "Deadline":
+        """Create a deadline budget_ms from now."""
+        return cls(time.perf_counter() + budget_ms / 1000.0)
+
+    def remaining_ms(self) -> float:
+        """Milliseconds left before the deadline (never negative)."""
+        return max(0.0, (self.expires_at - time.perf_counter()) * 1000)
+
+    def remaining_seconds(self) -> float:
+        """Seconds left before the deadline (never negative)."""
+        return self.remaining_ms() / 1000.0
+
+    @property
+    def expired(self) -> bool:
+        return time.perf_counter() >= self.expires_at
+
+    def reserve(self, reserve_ms: float) -> "Deadline":
+        """Earlier deadline that keeps reserve_ms for work after the call returns."""
+        return Deadline(self.expires_at - reserve_ms / 1000.0)
+
+
+class HedgedRequestScheduler:
+    """
+    Runs outbound AI calls against an absolute deadline.
+
+    Features:
+    - Tracks call latency and hedges with a second request after P90
+    - Cancels the losing request as soon as one succeeds
+    - Caps hedge volume so average spend stays close to one call per request
+    - Gives up immediately when the remaining budget can't fit a call,
+      so callers can serve cached or quick-response answers instead
+    """
+
+    def __init__(
+        self,
+        hedge_percentile: float = 0.9,
+        default_hedge_delay_ms: float = 1200.0,
+        min_hedge_delay_ms: float = 150.0,
+        min_viable_budget_ms: float = 100.0,
+        max_hedge_ratio: float = 0.15,
+        min_samples: int = 20
+    ):
+        self.hedge_percentile = hedge_percentile
+        self.default_hedge_delay_ms = default_hedge_delay_ms
+        self.min_hedge_delay_ms = min_hedge_delay_ms
+        self.min_viable_budget_ms = min_viable_budget_ms
+        self.max_hedge_ratio = max_hedge_ratio
+        self.min_samples = min_samples
+
+        self._latencies_ms: Deque[float] = deque(maxlen=200)
+        self.stats = {
+            'requests': 0,
+            'hedges_sent': 0,
+            'hedge_wins': 0,
+            'deadline_skips': 0,
+            'deadline_misses': 0,
+            'cancelled_requests': 0
+        }
+
+    def record_latency(self, latency_ms: float) -> None:
+        """Record a successful call latency."""
+        self._latencies_ms.append(latency_ms)
+
+    def _latency_percentile(self, percentile: float) -> Optional[float]:
+        """Latency at the given percentile, once enough samples exist."""
+        if len(self._latencies_ms) < self.min_samples:
+            return None
+        sorted_latencies = sorted(self._latencies_ms)
+        return sorted_latencies[min(len(sorted_latencies) - 1, int(len(sorted_latencies) * percentile))]
+
+    def get_hedge_delay_ms(self) -> float:
+        """How long to wait on the primary request before hedging."""
+        p90 = self._latency_percentile(self.hedge_percentile)
+        if p90 is None:
+            return self.default_hedge_delay_ms
+        return max(self.min_hedge_delay_ms, p90)
+
+    def _can_hedge(self) -> bool:
+        """Keep hedged requests to a small share of total requests."""
+        return self.stats['hedges_sent'] < max(1, self.stats['requests'] * self.max_hedge_ratio)
+
+    async def run(
+        self,
+        request_factory: Callable[[Deadline], Awaitable[T]],
+        deadline: Deadline,
+        is_success: Callable[[T], bool] = lambda result: True
+    ) -> Optional[T]:
+        """
+        Run a request with hedging under the deadline.
+
+        Returns the first successful result, the last unsuccessful result if
+        every attempt failed, or None when the deadline can't be met.
+        """
+        self.stats['requests'] += 1
+
+        if deadline.remaining_ms() < self.min_viable_budget_ms:
+            self.stats['deadline_skips'] += 1
+            return None
+
+        started_at: Dict[asyncio.Task, float] = {}
+        pending: Set[asyncio.Task] = set()
+        hedge_task: Optional[asyncio.Task] = None
+        hedge_decided = False
+        last_failure: Optional[T] = None
+
+        def launch() -> asyncio.Task:
+            task = asyncio.ensure_future(request_factory(deadline))
+            started_at[task] = time.perf_counter()
+            pending.add(task)
+            return task
+
+        launch()
+        hedge_at = time.perf_counter() + self.get_hedge_delay_ms() / 1000.0
+
+        try:
+            while pending:
+                now = time.perf_counter()
+                wait_until = deadline.expires_at if hedge_decided else min(deadline.expires_at, hedge_at)
+
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=max(0.0, wait_until - now),
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+
+                for task in done:
+                    pending.discard(task)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        logger.warning(f"AI request attempt failed: {e}")
+                        continue
+
+                    if is_success(result):
+                        self.record_latency((time.perf_counter() - started_at[task]) * 1000)
+                        if task is hedge_task:
+                            self.stats['hedge_wins'] += 1
+                        return result
+                    last_failure = result
+
+                if deadline.expired:
+                    self.stats['deadline_misses'] += 1
+                    return None
+
+                # Primary is slower than usual: send one hedged request
+                if not hedge_decided and time.perf_counter() >= hedge_at:
+                    hedge_decided = True
+                    if pending and deadline.remaining_ms() >= self.min_viable_budget_ms and self._can_hedge():
+                        hedge_task = launch()
+                        self.stats['hedges_sent'] += 1
+
+            return last_failure
+
+        finally:
+            for task in pending:
+                task.cancel()
+                self.stats['cancelled_requests'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get scheduler statistics for monitoring."""
+        requests = self.stats['requests']
+        p90 = self._latency_percentile(0.9)
+        p99 = self._latency_percentile(0.99)
+        return {
+            **self.stats,
+            'hedge_rate': self.stats['hedges_sent'] / requests if requests else 0.0,
+            'hedge_delay_ms': round(self.get_hedge_delay_ms(), 1),
+            'p90_latency_ms': round(p90, 1) if p90 is not None else None,
+            'p99_latency_ms': round(p99, 1) if p99 is not None else None,
+            'latency_samples': len(self._latencies_ms)
+        }
@@ -5,6 +5,8 @@ from datetime import datetime
 import json
 
 from .models import GameSession, Character, Adventure, DiceRoll
+from .ai_intent_classifier import get_intent_classifier
+from .ai_context_builder import AIContextBuilder
 
 
 class AISeerAssistant:
@@ -53,6 +55,8 @@ class AISeerAssistant:
         self._response_times: List[float] = []
         self._cache: Dict[str, Any] = {}
         self._context_memory: Dict[str, List[str]] = {}  # Session-based context
+        self._intent_classifier = get_intent_classifier()
+        self._context_builder = AIContextBuilder()
     
     async def get_seer_advice(
         self,
@@ -135,9 +139,24 @@ class AISeerAssistant:
         # Analyze recent rolls for patterns
         roll_analysis = self._analyze_recent_rolls(recent_rolls)
         
-        # Character status summary
+        # Older rolls are folded into a rolling per-session digest
+        session_state = self._context_builder.record_events(session.id, [
+            {
+                "id": roll.id,
+                "roll_type": getattr(roll.roll_type, "value", roll.roll_type),
+                "total": roll.total,
+                "is_success": roll.is_success
+            }
+            for roll in recent_rolls
+        ])
+        
+        # Character status summary, one entry per character
         character_status = []
+        seen_character_ids = set()
         for char in characters:
+            if char.id in seen_character_ids:
+                continue
+            seen_character_ids.add(char.id)
             status = {
                 "name": char.name,
                 "class": char.character_class,
@@ -154,6 +173,7 @@ class AISeerAssistant:
             "turn_count": len(recent_rolls),
             "characters": character_status,
             "recent_rolls": roll_analysis,
+            "session_digest": session_state.digest(),
             "adventure_context": adventure.title if adventure else None,
             "timestamp": datetime.utcnow().isoformat()
         }
@@ -165,22 +185,12 @@ class AISeerAssistant:
     ) -> Optional[Dict[str, Any]]:
         """Check for pre-computed quick responses."""
         
-        situation_lower = situation.lower()
-        
-        # Pattern matching for common situations
-        if "initiative" in situation_lower or "combat" in situation_lower:
-            return self._format_quick_response("combat_start", context)
-        
-        if "skill check" in situation_lower or "roll" in situation_lower:
-            return self._format_quick_response("skill_check", context)
+        # Ambiguous situations fall through to full advice generation
+        match = self._intent_classifier.classify(situation)
+        if not self._intent_classifier.is_quick(match):
+            return None
         
-        if "confused" in situation_lower or "what do i do" in situation_lower:
-            return self._format_quick_response("player_confused", context)
-        
-        if "stuck" in situation_lower or "stall" in situation_lower:
-            return self._format_quick_response("story_stall", context)
-        
-        return None
+        return self._format_quick_response(match.quick_response_key, context)
     
     def _format_quick_response(
         self, 
@@ -314,7 +324,13 @@ class AISeerAssistant:
         if context["recent_rolls"]["failure_streak"] > 2:
             summary_parts.append("recent failures")
         
-        return ", ".join(summary_parts)
+        summary = ", ".join(summary_parts)
+        
+        # Rolls that have left the recent window, summarized by the context builder
+        if context.get("session_digest"):
+            summary += f". {context['session_digest']}"
+        
+        return summary
     
     def _track_performance(self, elapsed_time: float) -> None:
         """Track response time performance."""
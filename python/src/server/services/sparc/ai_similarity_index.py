@@ -0,0 +1,206 @@
+"""
+Prompt Similarity Index for SPARC AI response caching.
+Finds near-duplicate Seer prompts locally so rephrased questions hit the cache.
+"""
+
+import re
+import hashlib
+import logging
+from typing import Dict, Hashable, List, NamedTuple, Optional, Set, Tuple
+from collections import OrderedDict, defaultdict
+
+logger = logging.getLogger(__name__)
+
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Words that carry no meaning for matching GM questions
+_STOP_WORDS = frozenset({
+    "a", "an", "the", "and", "or", "but", "if", "then", "so", "to", "of", "in",
+    "on", "at", "for", "with", "by", "from", "into", "about", "is", "are", "was",
+    "were", "be", "been", "do", "does", "did", "i", "me", "my", "we", "our", "you",
+    "your", "it", "its", "this", "that", "these", "those", "what", "which", "how",
+    "should", "would", "could", "can", "will", "just", "now", "right", "please",
+    "there", "their", "they", "them", "some", "any", "again", "really", "very"
+})
+
+# Mersenne prime used for the universal hash permutations
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+class SimilarityMatch(NamedTuple):
+    """Best near-duplicate found for a prompt."""
+    key: str
+    score: float
+
+
+class PromptSimilarityIndex:
+    """
+    MinHash/LSH index over normalized prompt token shingles.
+
+    Features:
+    - Stop-word and plural normalization of prompts
+    - Unigram + unordered bigram shingles compared with Jaccard similarity
+    - LSH banding so lookups only verify a handful of candidates
+    - Scoped buckets so prompts only match within the same prompt type/context
+    - Bounded size with oldest-first eviction
+    """
+
+    def __init__(
+        self,
+        num_permutations: int = 64,
+        bands: int = 32,
+        similarity_threshold: float = 0.6,
+        max_entries: int = 5000
+    ):
+        if num_permutations % bands != 0:
+            raise ValueError("num_permutations must be divisible by bands")
+
+        self.num_permutations = num_permutations
+        self.bands = bands
+        self.rows_per_band = num_permutations // bands
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+
+        # Deterministic permutation coefficients so signatures are stable across restarts
+        self._permutations: List[Tuple[int, int]] = []
+        for i in range(num_permutations):
+            seed = hashlib.blake2b(f"sparc-minhash-{i}".encode(), digest_size=16).digest()
+            a = int.from_bytes(seed[:8], "big") % _MERSENNE_PRIME or 1
+            b = int.from_bytes(seed[8:], "big") % _MERSENNE_PRIME
+            self._permutations.append((a, b))
+
+        # key -> (scope, shingles, band hashes)
+        self._entries: "OrderedDict[str, Tuple[Hashable, frozenset, Tuple[int, ...]]]" = OrderedDict()
+        self._buckets: Dict[Tuple[Hashable, int, int], Set[str]] = defaultdict(set)
+
+        self.stats = {
+            'lookups': 0,
+            'matches': 0,
+            'candidates_checked': 0
+        }
+
+    def normalize(self, prompt: str) -> List[str]:
+        """Normalize a prompt into comparable tokens."""
+        tokens = []
+        for token in _TOKEN_PATTERN.findall(prompt.lower()):
+            if token in _STOP_WORDS:
+                continue
+            # Cheap plural folding ("players" == "player", "rolls" == "roll")
+            if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+                token = token[:-1]
+            tokens.append(token)
+        return tokens
+
+    def shingles(self, prompt: str) -> frozenset:
+        """Build unigram and bigram shingles for a prompt."""
+        tokens = self.normalize(prompt)
+        shingle_set = set(tokens)
+        # Bigrams are order-insensitive so "combat rules" matches "rules for combat"
+        shingle_set.update(" ".join(sorted(pair)) for pair in zip(tokens, tokens[1:]))
+        return frozenset(shingle_set)
+
+    def _signature(self, shingle_set: frozenset) -> List[int]:
+        """Compute the MinHash signature for a shingle set."""
+        base_hashes = [
+            int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "big")
+            for s in shingle_set
+        ]
+        return [
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in base_hashes)
+            for a, b in self._permutations
+        ]
+
+    def _band_hashes(self, signature: List[int]) -> Tuple[int, ...]:
+        """Collapse signature rows into one hash per LSH band."""
+        rows = self.rows_per_band
+        return tuple(
+            hash(tuple(signature[band * rows:(band + 1) * rows]))
+            for band in range(self.bands)
+        )
+
+    def add(self, key: str, prompt: str, scope: Hashable = None) -> None:
+        """Index a cached prompt under its cache key."""
+        shingle_set = self.shingles(prompt)
+        if not shingle_set:
+            return
+
+        if key in self._entries:
+            self.remove(key)
+
+        band_hashes = self._band_hashes(self._signature(shingle_set))
+        self._entries[key] = (scope, shingle_set, band_hashes)
+        for band, band_hash in enumerate(band_hashes):
+            self._buckets[(scope, band, band_hash)].add(key)
+
+        # Bound memory by evicting the oldest indexed prompts
+        while len(self._entries) > self.max_entries:
+            oldest_key = next(iter(self._entries))
+            self.remove(oldest_key)
+
+    def remove(self, key: str) -> None:
+        """Remove a prompt from the index."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+
+        scope, _, band_hashes = entry
+        for band, band_hash in enumerate(band_hashes):
+            bucket_key = (scope, band, band_hash)
+            bucket = self._buckets.get(bucket_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[bucket_key]
+
+    def find_similar(
+        self,
+        prompt: str,
+        scope: Hashable = None,
+        threshold: Optional[float] = None,
+        exclude_key: Optional[str] = None
+    ) -> Optional[SimilarityMatch]:
+        """Find the most similar indexed prompt in the same scope above the threshold."""
+        self.stats['lookups'] += 1
+        threshold = self.similarity_threshold if threshold is None else threshold
+
+        shingle_set = self.shingles(prompt)
+        if not shingle_set or not self._entries:
+            return None
+
+        band_hashes = self._band_hashes(self._signature(shingle_set))
+        candidates: Set[str] = set()
+        for band, band_hash in enumerate(band_hashes):
+            candidates.update(self._buckets.get((scope, band, band_hash), ()))
+        candidates.discard(exclude_key)
+
+        best: Optional[SimilarityMatch] = None
+        for candidate in candidates:
+            self.stats['candidates_checked'] += 1
+            candidate_shingles = self._entries[candidate][1]
+            intersection = len(shingle_set & candidate_shingles)
+            score = intersection / len(shingle_set | candidate_shingles)
+            if score >= threshold and (best is None or score > best.score):
+                best = SimilarityMatch(candidate, score)
+
+        if best:
+            self.stats['matches'] += 1
+        return best
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get index statistics for monitoring."""
+        lookups = self.stats['lookups']
+        return {
+            **self.stats,
+            'indexed_prompts': len(self._entries),
+            'bucket_count': len(self._buckets),
+            'match_rate': self.stats['matches'] / lookups if lookups else 0.0,
+            'similarity_threshold': self.similarity_threshold
+        }
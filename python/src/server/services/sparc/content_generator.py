@@ -6,8 +6,12 @@ Provides AI-driven content hooks for procedural adventure elements.
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 from dataclasses import dataclass
+from collections import OrderedDict
 from enum import Enum
+import copy
+import hashlib
 import logging
+import os
 import random
 import json
 from pathlib import Path
@@ -52,6 +56,148 @@ class GenerationRequest:
     player_history: Dict[str, Any]
     scene_metadata: Dict[str, Any]
     customization_hints: List[str]
+    session_id: Optional[str] = None  # Seeds a per-session stream when no explicit seed is given
+    seed: Optional[int] = None
+
+
+TemplateKey = Tuple[ContentType, str, Optional[str]]
+
+DIALOGUE_OPTIONS = {
+    "encouraging": [
+        "Don't worry, {character_name}. Everyone starts somewhere, and you're doing better than you think.",
+        "Take your time with this decision. There's wisdom in careful thought.",
+        "I've seen many adventurers in my time, and the thoughtful ones often succeed where the hasty fail.",
+        "Your caution shows wisdom beyond your years. Trust your instincts."
+    ],
+    "impressed": [
+        "Remarkable! Your approach shows real understanding of the situation.",
+        "I'm impressed by your quick thinking, {character_name}. You have natural talent.",
+        "Your confidence is well-placed. You're handling this like a seasoned adventurer.",
+        "Excellent work! You've clearly been paying attention."
+    ],
+    "supportive": [
+        "You're on the right track, {character_name}. What's your next move?",
+        "Interesting approach. I can see you're thinking this through carefully.",
+        "Good instincts! How do you want to proceed?",
+        "That's a solid plan. Tell me more about how you'll execute it."
+    ]
+}
+INVESTIGATION_DIALOGUE = "Your thorough investigation is paying off. What did you discover?"
+CREATIVE_DIALOGUE = "Creative thinking! I wouldn't have thought of that approach."
+
+REWARD_OPTIONS = {
+    "experience": [
+        "You feel more confident in your abilities",
+        "This experience teaches you valuable lessons",
+        "Your understanding of adventure deepens",
+        "You gain insight into problem-solving"
+    ],
+    "story": [
+        "This becomes a story you'll remember",
+        "You've created a memorable moment",
+        "This adventure adds to your growing legend",
+        "Your actions will be talked about"
+    ],
+    "default": [
+        "Your efforts are well rewarded",
+        "Success brings its own satisfaction",
+        "Your persistence pays off",
+        "You've earned recognition for your efforts"
+    ]
+}
+
+LEARNING_NARRATIVES = [
+    "This doesn't go as planned, but you learn something valuable about {lesson}.",
+    "While this approach doesn't work out, you gain insight into {lesson}.",
+    "This teaches you an important lesson about {lesson} for next time.",
+    "Though unsuccessful, this experience shows you the importance of {lesson}."
+]
+SUCCESS_NARRATIVES = [
+    "Your approach works well, demonstrating your growing understanding of {skill}.",
+    "This success shows your developing skill in {skill}.",
+    "Your {skill} serves you well in this situation.",
+    "This positive outcome reflects your improving {skill}."
+]
+ACTION_LESSONS = {
+    "investigation": "gathering information before acting",
+    "social": "understanding different perspectives",
+    "combat": "thinking tactically",
+    "stealth": "patience and observation",
+    "generic": "considering all your options"
+}
+ACTION_SKILLS = {
+    "investigation": "careful observation",
+    "social": "interpersonal communication",
+    "combat": "tactical thinking",
+    "stealth": "patience and timing",
+    "generic": "problem-solving abilities"
+}
+
+
+class TemplateRegistry:
+    """
+    Generator option lists compiled once and bucketed by (content type, tone, archetype).
+
+    Features:
+    - Options are immutable tuples shared by every request
+    - Context-dependent variants (e.g. dialogue extras) are pre-bucketed at compile time
+    """
+
+    def __init__(self):
+        self._buckets: Dict[TemplateKey, Tuple[str, ...]] = {}
+
+    def register(self, content_type: ContentType, tone: str, options: List[str], archetype: Optional[str] = None):
+        self._buckets[(content_type, tone, archetype)] = tuple(options)
+
+    def options(self, content_type: ContentType, tone: str, archetype: Optional[str] = None) -> Tuple[str, ...]:
+        return self._buckets[(content_type, tone, archetype)]
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    @classmethod
+    def compile(
+        cls,
+        character_archetypes: Dict[str, Dict[str, Any]],
+        environmental_themes: Dict[str, Dict[str, Any]]
+    ) -> "TemplateRegistry":
+        """Build every bucket the generators select from."""
+        registry = cls()
+
+        for tone, options in DIALOGUE_OPTIONS.items():
+            for investigated in (False, True):
+                for creative in (False, True):
+                    extras = [INVESTIGATION_DIALOGUE] if investigated else []
+                    extras += [CREATIVE_DIALOGUE] if creative else []
+                    registry.register(ContentType.NPC_DIALOGUE, _dialogue_bucket(tone, investigated, creative), options + extras)
+        for name, archetype in character_archetypes.items():
+            registry.register(ContentType.NPC_DIALOGUE, "delivery", archetype["speech_patterns"], name)
+
+        for theme, details in environmental_themes.items():
+            registry.register(ContentType.SCENE_DESCRIPTION, "details", details["details"], theme)
+            registry.register(ContentType.SCENE_DESCRIPTION, "sounds", details["sounds"], theme)
+
+        for reward_type, options in REWARD_OPTIONS.items():
+            registry.register(ContentType.REWARD_DESCRIPTION, reward_type, options)
+
+        registry.register(ContentType.CONSEQUENCE_NARRATIVE, "learning", LEARNING_NARRATIVES)
+        registry.register(ContentType.CONSEQUENCE_NARRATIVE, "success", SUCCESS_NARRATIVES)
+        return registry
+
+
+def _dialogue_bucket(tone: str, investigated: bool, creative: bool) -> str:
+    return tone + ("+investigation" if investigated else "") + ("+creative" if creative else "")
+
+
+def _request_inputs(request: GenerationRequest) -> str:
+    """Canonical encoding of everything that influences generated content."""
+    return json.dumps({
+        "content_type": request.content_type.value,
+        "context": request.context,
+        "player_history": request.player_history,
+        "scene_metadata": request.scene_metadata,
+        "customization_hints": request.customization_hints
+    }, sort_keys=True, default=str)
 
 
 class DynamicContentGenerator:
@@ -88,23 +234,80 @@ class DynamicContentGenerator:
         }
         self._load_content_templates()
 
+        # Rendered outputs keyed by (seed, inputs); only seeded requests are cached
+        self.render_cache: "OrderedDict[Tuple[int, str], Dict[str, Any]]" = OrderedDict()
+        self.render_cache_size = int(os.getenv("CONTENT_GENERATOR_CACHE_SIZE", "2048"))
+        self.cache_stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'unseeded': 0
+        }
+
+    def _resolve_seed(self, request: GenerationRequest) -> Tuple[int, bool]:
+        """Seed for a request, and whether it is reproducible (explicit or per-session)."""
+        if request.seed is not None:
+            return request.seed, True
+        if request.session_id is not None:
+            digest = hashlib.sha256(request.session_id.encode()).digest()
+            return int.from_bytes(digest[:8], "big"), True
+        return random.SystemRandom().getrandbits(63), False
+
+    def _request_rng(self, request: GenerationRequest, seed: Optional[int] = None) -> random.Random:
+        """RNG stream for one request, derived from the seed and the request inputs."""
+        if seed is None:
+            seed, _ = self._resolve_seed(request)
+        digest = hashlib.sha256(f"{seed}:{_request_inputs(request)}".encode()).digest()
+        return random.Random(int.from_bytes(digest[:8], "big"))
+
     async def generate_content(
         self,
         request: GenerationRequest
     ) -> Dict[str, Any]:
-        """Generate dynamic content based on request parameters."""
+        """Generate dynamic content; seeded requests are reproducible and cached."""
+        seed, reproducible = self._resolve_seed(request)
+        cache_key = (seed, _request_inputs(request)) if reproducible else None
+
+        if cache_key is not None and cache_key in self.render_cache:
+            self.render_cache.move_to_end(cache_key)
+            self.cache_stats['hits'] += 1
+            return copy.deepcopy(self.render_cache[cache_key])
+
         try:
             generator_method = self._get_generator_method(request.content_type)
-            return await generator_method(request)
+            content = await generator_method(request, rng=self._request_rng(request, seed))
         except Exception as e:
             logger.error(f"Failed to generate content for {request.content_type}: {e}")
             return self._get_fallback_content(request.content_type)
 
+        content["seed"] = seed
+        if cache_key is None:
+            self.cache_stats['unseeded'] += 1
+            return content
+
+        self.cache_stats['misses'] += 1
+        self.render_cache[cache_key] = copy.deepcopy(content)
+        while len(self.render_cache) > self.render_cache_size:
+            self.render_cache.popitem(last=False)
+            self.cache_stats['evictions'] += 1
+        return content
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get render cache statistics for monitoring."""
+        return {
+            **self.cache_stats,
+            'cached_outputs': len(self.render_cache),
+            'max_size': self.render_cache_size,
+            'template_buckets': len(self.templates)
+        }
+
     async def generate_npc_dialogue(
         self,
-        request: GenerationRequest
+        request: GenerationRequest,
+        rng: Optional[random.Random] = None
     ) -> Dict[str, Any]:
         """Generate contextual NPC dialogue."""
+        rng = rng or self._request_rng(request)
         context = request.context
         player_history = request.player_history
         
@@ -113,43 +316,26 @@ class DynamicContentGenerator:
         previous_actions = player_history.get("completed_actions", [])
         
         # Select appropriate archetype
-        archetype = self.character_archetypes.get(npc_type, self.character_archetypes["helpful_villager"])
+        archetype_name = npc_type if npc_type in self.character_archetypes else "helpful_villager"
+        archetype = self.character_archetypes[archetype_name]
         
         # Determine tone based on player confidence
         if confidence_score < 4.0:
             tone = "encouraging"
-            dialogue_options = [
-                "Don't worry, {character_name}. Everyone starts somewhere, and you're doing better than you think.",
-                "Take your time with this decision. There's wisdom in careful thought.",
-                "I've seen many adventurers in my time, and the thoughtful ones often succeed where the hasty fail.",
-                "Your caution shows wisdom beyond your years. Trust your instincts."
-            ]
         elif confidence_score > 7.0:
             tone = "impressed"
-            dialogue_options = [
-                "Remarkable! Your approach shows real understanding of the situation.",
-                "I'm impressed by your quick thinking, {character_name}. You have natural talent.",
-                "Your confidence is well-placed. You're handling this like a seasoned adventurer.",
-                "Excellent work! You've clearly been paying attention."
-            ]
         else:
             tone = "supportive"
-            dialogue_options = [
-                "You're on the right track, {character_name}. What's your next move?",
-                "Interesting approach. I can see you're thinking this through carefully.",
-                "Good instincts! How do you want to proceed?",
-                "That's a solid plan. Tell me more about how you'll execute it."
-            ]
-        
-        # Add context-specific elements
-        if "investigation" in str(previous_actions).lower():
-            dialogue_options.append("Your thorough investigation is paying off. What did you discover?")
         
-        if "creative" in context.get("last_action_type", ""):
-            dialogue_options.append("Creative thinking! I wouldn't have thought of that approach.")
+        # Context-specific lines are pre-bucketed with the tone's options
+        dialogue_options = self.templates.options(ContentType.NPC_DIALOGUE, _dialogue_bucket(
+            tone,
+            "investigation" in str(previous_actions).lower(),
+            "creative" in context.get("last_action_type", "")
+        ))
         
         # Select and customize dialogue
-        base_dialogue = random.choice(dialogue_options)
+        base_dialogue = rng.choice(dialogue_options)
         character_name = context.get("character_name", "adventurer")
         
         customized_dialogue = base_dialogue.replace("{character_name}", character_name)
@@ -159,16 +345,18 @@ class DynamicContentGenerator:
             "tone": tone,
             "speaker": npc_type,
             "personality_notes": archetype["personality"],
-            "delivery_hints": random.choice(archetype["speech_patterns"]),
+            "delivery_hints": rng.choice(self.templates.options(ContentType.NPC_DIALOGUE, "delivery", archetype_name)),
             "context_awareness": True,
             "follow_up_options": self._generate_follow_up_options(tone, context)
         }
 
     async def generate_scene_description(
         self,
-        request: GenerationRequest
+        request: GenerationRequest,
+        rng: Optional[random.Random] = None
     ) -> Dict[str, Any]:
         """Generate dynamic scene descriptions with environmental details."""
+        rng = rng or self._request_rng(request)
         context = request.context
         scene_metadata = request.scene_metadata
         
@@ -178,7 +366,9 @@ class DynamicContentGenerator:
         player_approach = context.get("approach_style", "cautious")
         
         # Get base environmental theme
-        env_theme = self.environmental_themes.get(scene_theme, self.environmental_themes["peaceful_village"])
+        if scene_theme not in self.environmental_themes:
+            scene_theme = "peaceful_village"
+        env_theme = self.environmental_themes[scene_theme]
         
         # Generate time-specific details
         time_details = self._get_time_based_details(time_of_day)
@@ -195,8 +385,8 @@ class DynamicContentGenerator:
             perspective = "The scene unfolds as you take it in"
         
         # Combine elements
-        environmental_details = random.sample(env_theme["details"], 2)
-        ambient_sounds = random.sample(env_theme["sounds"], 2)
+        environmental_details = rng.sample(self.templates.options(ContentType.SCENE_DESCRIPTION, "details", scene_theme), 2)
+        ambient_sounds = rng.sample(self.templates.options(ContentType.SCENE_DESCRIPTION, "sounds", scene_theme), 2)
         
         description = f"{perspective}. {base_atmosphere.capitalize()} fills the air. "
         description += f"{time_details} "
@@ -216,7 +406,8 @@ class DynamicContentGenerator:
 
     async def generate_challenge_variation(
         self,
-        request: GenerationRequest
+        request: GenerationRequest,
+        rng: Optional[random.Random] = None
     ) -> Dict[str, Any]:
         """Generate dynamic challenge variations based on player performance."""
         context = request.context
@@ -260,9 +451,11 @@ class DynamicContentGenerator:
 
     async def generate_reward_description(
         self,
-        request: GenerationRequest
+        request: GenerationRequest,
+        rng: Optional[random.Random] = None
     ) -> Dict[str, Any]:
         """Generate engaging reward descriptions."""
+        rng = rng or self._request_rng(request)
         context = request.context
         player_history = request.player_history
         
@@ -273,29 +466,10 @@ class DynamicContentGenerator:
         confidence_score = player_history.get("confidence_score", 5.0)
         
         # Base reward descriptions
-        if reward_type == "experience":
-            base_rewards = [
-                "You feel more confident in your abilities",
-                "This experience teaches you valuable lessons",
-                "Your understanding of adventure deepens",
-                "You gain insight into problem-solving"
-            ]
-        elif reward_type == "story":
-            base_rewards = [
-                "This becomes a story you'll remember",
-                "You've created a memorable moment",
-                "This adventure adds to your growing legend",
-                "Your actions will be talked about"
-            ]
-        else:
-            base_rewards = [
-                "Your efforts are well rewarded",
-                "Success brings its own satisfaction",
-                "Your persistence pays off",
-                "You've earned recognition for your efforts"
-            ]
+        reward_bucket = reward_type if reward_type in REWARD_OPTIONS else "default"
+        base_rewards = self.templates.options(ContentType.REWARD_DESCRIPTION, reward_bucket)
         
-        base_reward = random.choice(base_rewards)
+        base_reward = rng.choice(base_rewards)
         
         # Add success level modifications
         if success_level == "critical_success":
@@ -328,34 +502,22 @@ class DynamicContentGenerator:
 
     async def generate_consequence_narrative(
         self,
-        request: GenerationRequest
+        request: GenerationRequest,
+        rng: Optional[random.Random] = None
     ) -> Dict[str, Any]:
         """Generate consequence narratives that teach without punishing."""
+        rng = rng or self._request_rng(request)
         context = request.context
         outcome_type = context.get("outcome_type", "partial_success")
         player_action = context.get("player_action", "")
         
         # Focus on learning opportunities rather than punishment
         if outcome_type == "failure" or outcome_type == "critical_failure":
-            learning_narratives = [
-                "This doesn't go as planned, but you learn something valuable about {lesson}.",
-                "While this approach doesn't work out, you gain insight into {lesson}.",
-                "This teaches you an important lesson about {lesson} for next time.",
-                "Though unsuccessful, this experience shows you the importance of {lesson}."
-            ]
-            
-            lessons = {
-                "investigation": "gathering information before acting",
-                "social": "understanding different perspectives",
-                "combat": "thinking tactically",
-                "stealth": "patience and observation",
-                "generic": "considering all your options"
-            }
-            
             action_type = self._categorize_action(player_action)
-            lesson = lessons.get(action_type, lessons["generic"])
+            lesson = ACTION_LESSONS.get(action_type, ACTION_LESSONS["generic"])
             
-            narrative = random.choice(learning_narratives).replace("{lesson}", lesson)
+            learning_narratives = self.templates.options(ContentType.CONSEQUENCE_NARRATIVE, "learning")
+            narrative = rng.choice(learning_narratives).replace("{lesson}", lesson)
             
             return {
                 "narrative": narrative,
@@ -366,25 +528,11 @@ class DynamicContentGenerator:
             }
         else:
             # Success narratives
-            success_narratives = [
-                "Your approach works well, demonstrating your growing understanding of {skill}.",
-                "This success shows your developing skill in {skill}.",
-                "Your {skill} serves you well in this situation.",
-                "This positive outcome reflects your improving {skill}."
-            ]
-            
-            skills = {
-                "investigation": "careful observation",
-                "social": "interpersonal communication",
-                "combat": "tactical thinking",
-                "stealth": "patience and timing",
-                "generic": "problem-solving abilities"
-            }
-            
             action_type = self._categorize_action(player_action)
-            skill = skills.get(action_type, skills["generic"])
+            skill = ACTION_SKILLS.get(action_type, ACTION_SKILLS["generic"])
             
-            narrative = random.choice(success_narratives).replace("{skill}", skill)
+            success_narratives = self.templates.options(ContentType.CONSEQUENCE_NARRATIVE, "success")
+            narrative = rng.choice(success_narratives).replace("{skill}", skill)
             
             return {
                 "narrative": narrative,
@@ -557,7 +705,11 @@ class DynamicContentGenerator:
                 "What are you thinking?"
             ]
 
-    async def _generate_generic_content(self, request: GenerationRequest) -> Dict[str, Any]:
+    async def _generate_generic_content(
+        self,
+        request: GenerationRequest,
+        rng: Optional[random.Random] = None
+    ) -> Dict[str, Any]:
         """Generic content generator for unspecified types."""
         return {
             "content": "Dynamic content generated based on current context.",
@@ -566,10 +718,9 @@ class DynamicContentGenerator:
         }
 
     def _load_content_templates(self):
-        """Load content templates for various generation contexts."""
-        # This would typically load from configuration files
-        # For now, we'll use the methods above which contain the template logic
-        logger.info("Content generation templates loaded")
+        """Compile the option buckets the generators select from."""
+        self.templates = TemplateRegistry.compile(self.character_archetypes, self.environmental_themes)
+        logger.info(f"Content generation templates loaded ({len(self.templates)} buckets)")
 
 
 # Global service instance
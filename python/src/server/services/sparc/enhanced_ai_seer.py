@@ -6,18 +6,25 @@ Provides <3 second contextual GM guidance with fallback strategies.
 import asyncio
 import time
 import logging
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple
 from datetime import datetime
 import random
 
 from .openai_client import get_openai_client
+from .ai_cache_service import get_ai_cache_service
+from .unified_ai_cache import UnifiedAICache, get_unified_ai_cache
+from .ai_request_scheduler import Deadline
+from .ai_admission_controller import RequestPriority
+from .ai_intent_classifier import get_intent_classifier
 
 logger = logging.getLogger(__name__)
 
 
 class EnhancedAISeerService:
-    def __init__(self):
-        self.response_cache: Dict[str, Dict[str, Any]] = {}
+    def __init__(self, response_cache: Optional[UnifiedAICache] = None):
+        # AI responses are cached in the unified cache shared with the other AI layers
+        self.response_cache = response_cache if response_cache is not None else get_unified_ai_cache()
+        self.intent_classifier = get_intent_classifier()
         self.performance_stats = {
             "total_requests": 0,
             "average_response_time": 0.0,
@@ -80,6 +87,14 @@ class EnhancedAISeerService:
             ]
         }
 
+        # Quick responses answering each classifier quick-response intent
+        self.intent_quick_responses = {
+            "combat_start": self.quick_responses["rule_clarification"][1],
+            "skill_check": self.quick_responses["rule_clarification"][0],
+            "player_confused": self.quick_responses["player_help"][0],
+            "story_stall": self.quick_responses["scene_guidance"][0]
+        }
+
         self.rule_database = {
             "dice_rolling": [
                 {
@@ -116,42 +131,33 @@ class EnhancedAISeerService:
         query: str,
         context: Dict[str, Any],
         request_type: str = "general",
-        max_time_ms: int = 3000
+        max_time_ms: int = 3000,
+        priority: Optional[RequestPriority] = None
     ) -> Dict[str, Any]:
         """Generate AI advice with <3 second guarantee."""
         start_time = time.perf_counter()
+        deadline = Deadline.from_budget_ms(max_time_ms)
         
-        # Check cache first
-        cache_key = f"{query}:{request_type}:{str(sorted(context.items()))}"
-        if cache_key in self.response_cache:
-            cached = self.response_cache[cache_key]
-            cached["response_time_ms"] = 50  # Cache hit time
-            cached["from_cache"] = True
-            self._update_performance_stats(50, True, True)
-            return cached
-
         try:
-            # Quick response for common requests
-            if query.lower() in ["help", "what should i do", "i'm stuck", "scene ideas"]:
-                advice = self._get_quick_response(request_type, context)
+            # Quick response for confidently classified common requests
+            request_type, quick_response_key = self._route_query(query, request_type)
+            from_cache = False
+            if quick_response_key:
+                advice = self._get_quick_response(quick_response_key, request_type)
             else:
-                # Generate contextual response
-                advice = await self._generate_contextual_response(query, context, request_type, max_time_ms)
+                # Shared AI cache (including precomputed scene advice), then generate
+                advice = await self._get_ai_cached_advice(query, context, request_type)
+                from_cache = advice is not None
+                if advice is None:
+                    advice = await self._generate_contextual_response(
+                        query, context, request_type, deadline, priority
+                    )
             
             # Calculate response time
             elapsed_ms = int((time.perf_counter() - start_time) * 1000)
             advice["response_time_ms"] = elapsed_ms
             
-            # Cache if response was fast
-            if elapsed_ms < 1000:
-                self.response_cache[cache_key] = advice.copy()
-                # Limit cache size
-                if len(self.response_cache) > 100:
-                    # Remove oldest entry
-                    oldest_key = next(iter(self.response_cache))
-                    del self.response_cache[oldest_key]
-            
-            self._update_performance_stats(elapsed_ms, True, False)
+            self._update_performance_stats(elapsed_ms, True, from_cache)
             return advice
             
         except Exception as e:
@@ -170,7 +176,8 @@ class EnhancedAISeerService:
         query: str,
         context: Dict[str, Any],
         request_type: str,
-        max_time_ms: int
+        deadline: Deadline,
+        priority: Optional[RequestPriority] = None
     ) -> Dict[str, Any]:
         """Generate response using OpenAI with fallback to rule-based logic."""
         
@@ -178,13 +185,15 @@ class EnhancedAISeerService:
         try:
             openai_client = await get_openai_client()
             
-            # Reserve 200ms for processing and fallback if needed
-            ai_timeout_ms = max_time_ms - 200
+            # Reserve 200ms of the deadline for processing and fallback if needed
+            ai_deadline = deadline.reserve(200)
             
             ai_response = await openai_client.generate_contextual_advice(
                 prompt=query,
                 context=context,
-                max_time_ms=ai_timeout_ms
+                max_time_ms=int(ai_deadline.remaining_ms()),
+                deadline=ai_deadline,
+                priority=priority or self._get_request_priority(request_type)
             )
             
             # If AI response is successful and not a fallback, use it
@@ -192,12 +201,117 @@ class EnhancedAISeerService:
                 # Add request type specific enhancements
                 ai_response["request_type"] = request_type
                 ai_response["follow_up_suggestions"] = self._get_contextual_suggestions(request_type, context)
+                
+                ai_cache = await get_ai_cache_service()
+                await ai_cache.cache_response(query, context, ai_response, ai_response.get("response_time_ms", 0))
                 return ai_response
                 
         except Exception as e:
             logger.warning(f"OpenAI integration failed: {str(e)}")
         
-        # Fallback to rule-based responses
+        return self._generate_rule_based_response(query, context, request_type)
+
+    async def stream_contextual_advice(
+        self,
+        query: str,
+        context: Dict[str, Any],
+        request_type: str = "general",
+        max_time_ms: int = 3000
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream AI advice tokens, ending with a "done" event holding the full advice."""
+        start_time = time.perf_counter()
+        
+        request_type, quick_response_key = self._route_query(query, request_type)
+        if quick_response_key:
+            advice = self._get_quick_response(quick_response_key, request_type)
+            advice["response_time_ms"] = int((time.perf_counter() - start_time) * 1000)
+            self._update_performance_stats(advice["response_time_ms"], True, False)
+            yield {"event": "done", "advice": advice}
+            return
+        
+        ai_cache = await get_ai_cache_service()
+        advice = await self._get_ai_cached_advice(query, context, request_type)
+        if advice:
+            advice["response_time_ms"] = int((time.perf_counter() - start_time) * 1000)
+            self._update_performance_stats(advice["response_time_ms"], True, True)
+            yield {"event": "done", "advice": advice}
+            return
+        
+        advice = None
+        try:
+            openai_client = await get_openai_client()
+            
+            # Reserve 200ms for processing and fallback if needed
+            async for event in openai_client.stream_contextual_advice(
+                prompt=query,
+                context=context,
+                max_time_ms=max_time_ms - 200,
+                priority=self._get_request_priority(request_type)
+            ):
+                if event["event"] == "token":
+                    yield event
+                else:
+                    advice = event["advice"]
+                    
+        except Exception as e:
+            logger.warning(f"OpenAI streaming failed: {str(e)}")
+        
+        elapsed_ms = int((time.perf_counter() - start_time) * 1000)
+        if advice and not advice.get("fallback", False) and not advice.get("ai_unavailable", False):
+            advice["request_type"] = request_type
+            advice["follow_up_suggestions"] = self._get_contextual_suggestions(request_type, context)
+            await ai_cache.cache_response(query, context, advice, elapsed_ms)
+        else:
+            advice = self._generate_rule_based_response(query, context, request_type)
+        
+        advice["response_time_ms"] = elapsed_ms
+        self._update_performance_stats(elapsed_ms, True, False)
+        yield {"event": "done", "advice": advice}
+
+    async def _get_ai_cached_advice(
+        self,
+        query: str,
+        context: Dict[str, Any],
+        request_type: str
+    ) -> Optional[Dict[str, Any]]:
+        """Look up advice in the shared AI response cache."""
+        try:
+            ai_cache = await get_ai_cache_service()
+            cached = await ai_cache.get_cached_response(query, context)
+        except Exception as e:
+            logger.warning(f"AI cache lookup failed: {str(e)}")
+            return None
+        
+        if not cached:
+            return None
+        
+        advice = dict(cached)
+        advice["from_cache"] = True
+        # Cached advice may have been generated for another request type
+        advice["request_type"] = request_type
+        advice["follow_up_suggestions"] = self._get_contextual_suggestions(request_type, context)
+        return advice
+
+    def _route_query(self, query: str, request_type: str) -> Tuple[str, Optional[str]]:
+        """Infer the request type of general queries and pick the quick response that answers it, if any."""
+        intent = self.intent_classifier.classify(query)
+        if request_type == "general" and self.intent_classifier.is_confident(intent):
+            request_type = intent.request_type
+        return request_type, intent.quick_response_key if self.intent_classifier.is_quick(intent) else None
+
+    def _get_request_priority(self, request_type: str) -> RequestPriority:
+        """Map Seer request types to outbound AI call priorities."""
+        if request_type == "rule_clarification":
+            return RequestPriority.RULE_CLARIFICATION
+        return RequestPriority.LIVE_ADVICE
+
+    def _generate_rule_based_response(
+        self,
+        query: str,
+        context: Dict[str, Any],
+        request_type: str
+    ) -> Dict[str, Any]:
+        """Generate rule-based advice when AI is unavailable."""
         logger.info(f"Using rule-based fallback for request_type: {request_type}")
         
         if request_type == "scene_guidance":
@@ -273,10 +387,11 @@ class EnhancedAISeerService:
             "follow_up_suggestions": ["Player focus", "Story momentum", "Meaningful choices"]
         }
 
-    def _get_quick_response(self, request_type: str, context: Dict[str, Any]) -> Dict[str, Any]:
-        """Get pre-computed quick response."""
-        responses = self.quick_responses.get(request_type, self.quick_responses["player_help"])
-        response = random.choice(responses).copy()
+    def _get_quick_response(self, quick_response_key: str, request_type: str) -> Dict[str, Any]:
+        """Get the pre-computed quick response for a classified intent."""
+        response = self.intent_quick_responses[quick_response_key].copy()
+        response["type"] = "quick_response"
+        response["request_type"] = request_type
         response["context"] = f"Quick response for {request_type}"
         return response
 
@@ -460,7 +575,8 @@ class EnhancedAISeerService:
             "cache_hit_rate": self.performance_stats["cache_hit_rate"],
             "failure_rate": self.performance_stats["failure_rate"],
             "total_requests": self.performance_stats["total_requests"],
-            "cache_size": len(self.response_cache)
+            "cache_size": len(self.response_cache),
+            "shared_cache": self.response_cache.get_stats()
         }
         
         # Add OpenAI performance stats
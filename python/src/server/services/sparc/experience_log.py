@@ -0,0 +1,176 @@
+"""
+Experience Log for SPARC progression.
+Compact, bounded per-skill experience history: recent columns, raw detail ring and rolling aggregates.
+"""
+
+import time
+from array import array
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+
+OUTCOME_NAMES = (
+    "other",
+    "completed",
+    "success",
+    "critical_success",
+    "partial_success",
+    "failure",
+    "critical_failure",
+    "unknown"
+)
+OUTCOME_CODES = {name: code for code, name in enumerate(OUTCOME_NAMES)}
+
+
+def outcome_code(outcome: str) -> int:
+    """Small integer code for an outcome; unrecognised outcomes share the "other" code."""
+    return OUTCOME_CODES.get(outcome, 0)
+
+
+class ExperienceLog:
+    """
+    Bounded experience history for one skill area.
+
+    Features:
+    - Recent experiences as array columns (timestamp, impact, outcome code), not per-entry dicts
+    - Raw detail (adventure, scene, description) kept only for the last few experiences
+    - Older entries are compacted into running totals once the recent window fills
+    - Aggregates (count, total impact, outcome counts, first/last time) cover the full history
+    """
+
+    __slots__ = (
+        "recent_capacity", "_timestamps", "_impacts", "_outcomes", "_details",
+        "count", "total_impact", "first_at", "last_at", "_outcome_counts"
+    )
+
+    def __init__(self, recent_capacity: int = 64, detail_capacity: int = 8):
+        self.recent_capacity = recent_capacity
+        self._timestamps = array("d")
+        self._impacts = array("f")
+        self._outcomes = array("B")
+        self._details: Deque[Tuple[str, str, str]] = deque(maxlen=detail_capacity)
+
+        self.count = 0
+        self.total_impact = 0.0
+        self.first_at: Optional[float] = None
+        self.last_at: Optional[float] = None
+        self._outcome_counts = array("I", bytes(array("I").itemsize * len(OUTCOME_NAMES)))
+
+    def append(
+        self,
+        impact: float,
+        outcome: str,
+        adventure_id: str = "",
+        scene_id: str = "",
+        description: str = "",
+        timestamp: Optional[float] = None
+    ):
+        """Record one experience."""
+        timestamp = time.time() if timestamp is None else timestamp
+        code = outcome_code(outcome)
+
+        self._timestamps.append(timestamp)
+        self._impacts.append(impact)
+        self._outcomes.append(code)
+        self._details.append((adventure_id, scene_id, description))
+
+        self.count += 1
+        self.total_impact += impact
+        self._outcome_counts[code] += 1
+        if self.first_at is None:
+            self.first_at = timestamp
+        self.last_at = timestamp
+
+        if len(self._timestamps) > self.recent_capacity:
+            self._compact()
+
+    def _compact(self):
+        """Drop the older half of the recent window; the aggregates already include it."""
+        drop = len(self._timestamps) - self.recent_capacity // 2
+        del self._timestamps[:drop]
+        del self._impacts[:drop]
+        del self._outcomes[:drop]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __bool__(self) -> bool:
+        return self.count > 0
+
+    @property
+    def first_timestamp(self) -> Optional[datetime]:
+        return datetime.fromtimestamp(self.first_at) if self.first_at is not None else None
+
+    @property
+    def last_timestamp(self) -> Optional[datetime]:
+        return datetime.fromtimestamp(self.last_at) if self.last_at is not None else None
+
+    @property
+    def average_impact(self) -> float:
+        return self.total_impact / self.count if self.count else 0.0
+
+    def outcome_counts(self) -> Dict[str, int]:
+        """Outcome name -> number of experiences over the full history."""
+        return {OUTCOME_NAMES[code]: total for code, total in enumerate(self._outcome_counts) if total}
+
+    def recent(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Most recent experiences, oldest first; raw detail is included where still retained."""
+        retained = len(self._timestamps)
+        limit = retained if limit is None else min(limit, retained)
+        details = list(self._details)
+        entries = []
+        for offset in range(retained - limit, retained):
+            entry: Dict[str, Any] = {
+                "outcome": OUTCOME_NAMES[self._outcomes[offset]],
+                "impact": self._impacts[offset],
+                "timestamp": datetime.fromtimestamp(self._timestamps[offset])
+            }
+            detail_index = offset - (retained - len(details))
+            if detail_index >= 0:
+                entry["adventure_id"], entry["scene_id"], entry["description"] = details[detail_index]
+            entries.append(entry)
+        return entries
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable form for the progression store."""
+        return {
+            "recent_capacity": self.recent_capacity,
+            "detail_capacity": self._details.maxlen,
+            "timestamps": self._timestamps.tolist(),
+            "impacts": self._impacts.tolist(),
+            "outcomes": [OUTCOME_NAMES[code] for code in self._outcomes],
+            "details": [list(detail) for detail in self._details],
+            "count": self.count,
+            "total_impact": self.total_impact,
+            "first_at": self.first_at,
+            "last_at": self.last_at,
+            "outcome_counts": self.outcome_counts()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ExperienceLog":
+        log = cls(data["recent_capacity"], data["detail_capacity"])
+        log._timestamps.extend(data["timestamps"])
+        log._impacts.extend(data["impacts"])
+        log._outcomes.extend(outcome_code(outcome) for outcome in data["outcomes"])
+        log._details.extend(tuple(detail) for detail in data["details"])
+        log.count = data["count"]
+        log.total_impact = data["total_impact"]
+        log.first_at = data["first_at"]
+        log.last_at = data["last_at"]
+        for outcome, total in data["outcome_counts"].items():
+            log._outcome_counts[outcome_code(outcome)] += total
+        return log
+
+    def summary(self) -> Dict[str, Any]:
+        """Aggregates over the full history."""
+        return {
+            "count": self.count,
+            "total_impact": self.total_impact,
+            "average_impact": self.average_impact,
+            "outcome_counts": self.outcome_counts(),
+            "first_at": self.first_timestamp.isoformat() if self.first_at is not None else None,
+            "last_at": self.last_timestamp.isoformat() if self.last_at is not None else None,
+            "retained": len(self._timestamps)
+        }
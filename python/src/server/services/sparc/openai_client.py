@@ -9,8 +9,14 @@ import time
 import json
 import logging
 import os
-from typing import Dict, List, Optional, Any, Tuple
-from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, List, Optional, Any
+
+from .ai_similarity_index import PromptSimilarityIndex
+from .unified_ai_cache import UnifiedAICache, canonical_cache_key, get_unified_ai_cache
+from .ai_request_scheduler import Deadline, HedgedRequestScheduler
+from .ai_admission_controller import AIAdmissionController, AdmissionConfig, RequestPriority
+from .ai_micro_batcher import AIMicroBatcher, build_batch_prompt, parse_batch_response
+from .ai_context_builder import AIContextBuilder, estimate_tokens
 
 logger = logging.getLogger(__name__)
 
@@ -23,10 +29,20 @@ class OpenAIClientService:
     intelligent AI responses for Game Master assistance.
     """
     
-    def __init__(self):
+    def __init__(self, response_cache: Optional[UnifiedAICache] = None):
         """Initialize OpenAI client with performance monitoring."""
         self.api_key = os.getenv("OPENAI_API_KEY")
-        self.base_url = "https://api.openai.com/v1/chat/completions"
+        self.base_url = os.getenv("OPENAI_API_URL", "https://api.openai.com/v1/chat/completions")
+        
+        # Long-lived HTTP session so requests reuse warm TCP/TLS connections
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_lock = asyncio.Lock()
+        self._connection_limit = 20
+        self._keepalive_timeout = 60  # Seconds an idle connection stays pooled
+        self._dns_cache_ttl = 300
+        self._connections_created = 0
+        self._connections_reused = 0
+        self._phase_timings: Dict[str, List[float]] = {"connect": [], "ttfb": [], "body": []}
         
         # Performance tracking
         self._response_times: List[float] = []
@@ -34,24 +50,46 @@ class OpenAIClientService:
         self._total_requests = 0
         self._cache_hits = 0
         
-        # Response caching for performance
-        self._response_cache: Dict[str, Tuple[Dict[str, Any], datetime]] = {}
+        # Response caching for performance, shared with the other AI layers
+        self._response_cache = response_cache if response_cache is not None else get_unified_ai_cache()
         self._cache_ttl_minutes = 15
+        self._similarity_index = PromptSimilarityIndex(max_entries=200)
+        self._near_duplicate_hits = 0
+        self._deadline_similarity_threshold = 0.4  # Looser match when the deadline can't be met
+        
+        # Deadline-aware hedging of slow requests
+        self._scheduler = HedgedRequestScheduler()
+        
+        # Rate limiting protection: concurrency, RPM/TPM budgets and priorities
+        self._admission = AIAdmissionController(AdmissionConfig.from_env())
         
-        # Rate limiting protection
-        self._last_request_time = 0.0
-        self._min_request_interval = 0.1  # 100ms minimum between requests
+        # Token-budgeted prompt context with per-session event digests
+        self._context_builder = AIContextBuilder(
+            max_prompt_tokens=int(os.getenv("OPENAI_PROMPT_TOKEN_BUDGET", "600"))
+        )
         
         # Model configuration for optimal performance
         self._model = "gpt-3.5-turbo"  # Fastest OpenAI model
         self._max_tokens = 150  # Keep responses concise for speed
         self._temperature = 0.7  # Balanced creativity vs consistency
+        
+        # Optional micro-batching of near-simultaneous prompts at peak load. Batches are sized
+        # so their combined completion fits the batch token cap and still generates within the
+        # live advice deadline
+        self._max_batch_tokens = max(self._max_tokens, int(os.getenv("OPENAI_BATCH_MAX_TOKENS", "450")))
+        self._micro_batcher: Optional[AIMicroBatcher] = None
+        if os.getenv("OPENAI_MICRO_BATCHING", "false").lower() == "true":
+            self._micro_batcher = AIMicroBatcher(
+                self._send_prompt_batch, max_batch_size=self._max_batch_tokens // self._max_tokens
+            )
     
     async def generate_contextual_advice(
         self,
         prompt: str,
         context: Dict[str, Any],
-        max_time_ms: int = 2800  # Leave 200ms buffer for processing
+        max_time_ms: int = 2800,  # Leave 200ms buffer for processing
+        deadline: Optional[Deadline] = None,
+        priority: RequestPriority = RequestPriority.LIVE_ADVICE
     ) -> Dict[str, Any]:
         """
         Generate AI advice with strict timeout enforcement.
@@ -60,17 +98,23 @@ class OpenAIClientService:
             prompt: The user's question or situation
             context: Game context for better responses
             max_time_ms: Maximum response time in milliseconds
+            deadline: Absolute deadline from the caller (overrides max_time_ms)
+            priority: Admission priority for the outbound call
             
         Returns:
             AI response with metadata and performance stats
         """
         start_time = time.perf_counter()
         self._total_requests += 1
+        if deadline is None:
+            deadline = Deadline.from_budget_ms(max_time_ms)
         
         try:
             # Check cache first for performance
             cache_key = self._generate_cache_key(prompt, context)
             cached_response = self._get_cached_response(cache_key)
+            if not cached_response:
+                cached_response = self._get_similar_cached_response(prompt, context, cache_key)
             if cached_response:
                 self._cache_hits += 1
                 elapsed_ms = int((time.perf_counter() - start_time) * 1000)
@@ -86,19 +130,43 @@ class OpenAIClientService:
             
             # Build optimized prompt for fast response
             system_prompt = self._build_system_prompt(context)
-            user_prompt = self._build_user_prompt(prompt, context)
+            user_prompt = self._build_user_prompt(prompt, context, system_prompt)
             
-            # Make API call with timeout
-            timeout_seconds = max_time_ms / 1000.0
-            response = await self._make_openai_request(
-                system_prompt, 
-                user_prompt, 
-                timeout_seconds
+            # Make API call, hedged if it runs slow, bounded by the deadline
+            make_request = self._batched_openai_request if self._micro_batcher else self._admitted_openai_request
+            response = await self._scheduler.run(
+                lambda attempt_deadline: make_request(
+                    system_prompt,
+                    user_prompt,
+                    attempt_deadline,
+                    priority
+                ),
+                deadline,
+                is_success=lambda result: result["success"]
             )
             
+            if response is None or not response["success"]:
+                # Missed deadline, rejected or failed: a looser near-duplicate beats a generic fallback
+                elapsed_ms = int((time.perf_counter() - start_time) * 1000)
+                if response is None:
+                    self._failed_requests += 1
+                cached_response = self._get_similar_cached_response(
+                    prompt, context, cache_key, threshold=self._deadline_similarity_threshold
+                )
+                if cached_response:
+                    cached_response["response_time_ms"] = elapsed_ms
+                    cached_response["from_cache"] = True
+                    cached_response["deadline_fallback"] = True
+                    return cached_response
+            
+            if response is None:
+                logger.warning(f"OpenAI request missed its deadline after {elapsed_ms}ms")
+                return self._get_timeout_fallback(prompt, context, elapsed_ms)
+            
             if response["success"]:
                 # Cache successful response
                 self._cache_response(cache_key, response["data"])
+                self._similarity_index.add(cache_key, prompt, scope=self._get_context_scope(context))
                 
                 elapsed_ms = int((time.perf_counter() - start_time) * 1000)
                 response["data"]["response_time_ms"] = elapsed_ms
@@ -123,70 +191,239 @@ class OpenAIClientService:
             self._failed_requests += 1
             return self._get_error_fallback(prompt, context, str(e), elapsed_ms)
     
-    async def _make_openai_request(
+    async def start(self) -> None:
+        """Create the pooled HTTP session."""
+        await self._get_session()
+    
+    async def warm_up(self) -> bool:
+        """Open a pooled connection to the API so the first request skips DNS/TCP/TLS setup."""
+        if not self.api_key:
+            return False
+        
+        try:
+            session = await self._get_session()
+            timeout = aiohttp.ClientTimeout(total=2.0)
+            async with session.head(self.base_url, timeout=timeout) as response:
+                await response.release()
+            logger.info(f"OpenAI connection pool warmed up ({self._connections_created} connections)")
+            return True
+        except Exception as e:
+            logger.warning(f"OpenAI connection warm-up failed: {e}")
+            return False
+    
+    async def close(self) -> None:
+        """Close the pooled HTTP session."""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the pooled HTTP session, creating it on first use."""
+        if self._session and not self._session.closed:
+            return self._session
+        
+        async with self._session_lock:
+            if self._session is None or self._session.closed:
+                connector = aiohttp.TCPConnector(
+                    limit=self._connection_limit,
+                    keepalive_timeout=self._keepalive_timeout,
+                    ttl_dns_cache=self._dns_cache_ttl,
+                    enable_cleanup_closed=True
+                )
+                self._session = aiohttp.ClientSession(
+                    connector=connector,
+                    trace_configs=[self._build_trace_config()]
+                )
+        return self._session
+    
+    def _build_trace_config(self) -> aiohttp.TraceConfig:
+        """Build request tracing hooks that measure connection setup time."""
+        trace_config = aiohttp.TraceConfig()
+        
+        async def on_connection_create_start(session, ctx, params):
+            ctx.connect_start = time.perf_counter()
+        
+        async def on_connection_create_end(session, ctx, params):
+            self._connections_created += 1
+            phases = ctx.trace_request_ctx
+            if isinstance(phases, dict):
+                phases["connect"] = (time.perf_counter() - ctx.connect_start) * 1000
+        
+        async def on_connection_reuseconn(session, ctx, params):
+            self._connections_reused += 1
+            phases = ctx.trace_request_ctx
+            if isinstance(phases, dict):
+                phases["connect"] = 0.0
+        
+        trace_config.on_connection_create_start.append(on_connection_create_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace_config
+    
+    def _track_phases(self, phases: Dict[str, float]) -> None:
+        """Track per-phase request timings."""
+        for phase, elapsed_ms in phases.items():
+            timings = self._phase_timings.setdefault(phase, [])
+            timings.append(elapsed_ms)
+            if len(timings) > 100:
+                timings.pop(0)
+    
+    def _get_phase_stats(self) -> Dict[str, Dict[str, float]]:
+        """Summarize per-phase timings (connect, time to first byte, first token, body)."""
+        phase_stats = {}
+        for phase, timings in self._phase_timings.items():
+            if not timings:
+                phase_stats[phase] = {"avg_ms": 0.0, "p95_ms": 0.0}
+                continue
+            sorted_timings = sorted(timings)
+            phase_stats[phase] = {
+                "avg_ms": round(sum(sorted_timings) / len(sorted_timings), 2),
+                "p95_ms": round(sorted_timings[int(len(sorted_timings) * 0.95)], 2)
+            }
+        return phase_stats
+    
+    def _estimate_request_tokens(self, system_prompt: str, user_prompt: str, max_tokens: Optional[int] = None) -> int:
+        """Estimate tokens a request will use (prompt ~4 chars/token plus completion)."""
+        return (len(system_prompt) + len(user_prompt)) // 4 + (max_tokens or self._max_tokens)
+    
+    async def _batched_openai_request(
         self,
         system_prompt: str,
         user_prompt: str,
-        timeout_seconds: float
+        deadline: Deadline,
+        priority: RequestPriority
     ) -> Dict[str, Any]:
-        """Make OpenAI API request with timeout."""
-        
-        # Rate limiting protection
-        current_time = time.perf_counter()
-        time_since_last = current_time - self._last_request_time
-        if time_since_last < self._min_request_interval:
-            await asyncio.sleep(self._min_request_interval - time_since_last)
+        """Make an OpenAI API request through the micro-batcher."""
         
-        self._last_request_time = time.perf_counter()
+        content = await self._micro_batcher.submit(system_prompt, user_prompt, deadline, priority)
+        if content is None:
+            return {
+                "success": False,
+                "error": "Micro-batched request failed or missed its deadline"
+            }
         
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
+        return {
+            "success": True,
+            "data": {
+                "type": "ai_generated",
+                "title": "AI Seer Advice",
+                "content": content,
+                "confidence": 0.9,
+                "model": self._model,
+                "batched": True
+            }
         }
+    
+    async def _send_prompt_batch(
+        self,
+        system_prompt: str,
+        user_prompts: List[str],
+        deadline: Deadline,
+        priority: RequestPriority
+    ) -> Optional[List[str]]:
+        """Send a micro-batch as one multi-part request and split the answers."""
+        
+        if len(user_prompts) == 1:
+            response = await self._admitted_openai_request(system_prompt, user_prompts[0], deadline, priority)
+            return [response["data"]["content"]] if response["success"] else None
+        
+        response = await self._admitted_openai_request(
+            system_prompt,
+            build_batch_prompt(user_prompts),
+            deadline,
+            priority,
+            max_tokens=min(self._max_tokens * len(user_prompts), self._max_batch_tokens)
+        )
+        if not response["success"]:
+            return None
         
-        payload = {
-            "model": self._model,
-            "messages": [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            "max_tokens": self._max_tokens,
-            "temperature": self._temperature,
-            "presence_penalty": 0.1,  # Avoid repetition
-            "frequency_penalty": 0.1   # Encourage variety
-        }
+        answers = parse_batch_response(response["data"]["content"], len(user_prompts))
+        if answers is None:
+            logger.warning(f"Could not split micro-batch response into {len(user_prompts)} answers")
+        return answers
+    
+    async def _admitted_openai_request(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        deadline: Deadline,
+        priority: RequestPriority,
+        max_tokens: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Make an OpenAI API request once the admission controller lets it through."""
         
+        estimated_tokens = self._estimate_request_tokens(system_prompt, user_prompt, max_tokens)
+        ticket = await self._admission.acquire(priority, estimated_tokens, deadline)
+        if ticket is None:
+            return {
+                "success": False,
+                "error": "Request rejected by admission control (deadline or rate limit)",
+                "admission_rejected": True
+            }
+        
+        actual_tokens = None
         try:
+            response = await self._make_openai_request(
+                system_prompt, user_prompt, deadline.remaining_seconds(), max_tokens
+            )
+            if response["success"]:
+                actual_tokens = response["data"].get("tokens_used") or None
+            return response
+        finally:
+            self._admission.release(ticket, actual_tokens)
+    
+    async def _make_openai_request(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        timeout_seconds: float,
+        max_tokens: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Make OpenAI API request with timeout."""
+        
+        headers = self._build_request_headers()
+        payload = self._build_request_payload(system_prompt, user_prompt, max_tokens)
+        
+        try:
+            session = await self._get_session()
             timeout = aiohttp.ClientTimeout(total=timeout_seconds)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(
-                    self.base_url,
-                    headers=headers,
-                    json=payload
-                ) as response:
+            phases: Dict[str, float] = {}
+            request_start = time.perf_counter()
+            
+            async with session.post(
+                self.base_url,
+                headers=headers,
+                json=payload,
+                timeout=timeout,
+                trace_request_ctx=phases
+            ) as response:
+                headers_received = time.perf_counter()
+                phases["ttfb"] = (headers_received - request_start) * 1000
+                
+                if response.status == 200:
+                    data = await response.json()
+                    phases["body"] = (time.perf_counter() - headers_received) * 1000
+                    self._track_phases(phases)
+                    content = data["choices"][0]["message"]["content"]
                     
-                    if response.status == 200:
-                        data = await response.json()
-                        content = data["choices"][0]["message"]["content"]
-                        
-                        return {
-                            "success": True,
-                            "data": {
-                                "type": "ai_generated",
-                                "title": "AI Seer Advice",
-                                "content": content.strip(),
-                                "confidence": 0.9,
-                                "model": self._model,
-                                "tokens_used": data.get("usage", {}).get("total_tokens", 0)
-                            }
-                        }
-                    else:
-                        error_data = await response.json()
-                        return {
-                            "success": False,
-                            "error": f"OpenAI API error {response.status}: {error_data}"
+                    return {
+                        "success": True,
+                        "data": {
+                            "type": "ai_generated",
+                            "title": "AI Seer Advice",
+                            "content": content.strip(),
+                            "confidence": 0.9,
+                            "model": self._model,
+                            "tokens_used": data.get("usage", {}).get("total_tokens", 0)
                         }
-                        
+                    }
+                else:
+                    error_data = await response.json(content_type=None)
+                    return {
+                        "success": False,
+                        "error": f"OpenAI API error {response.status}: {error_data}"
+                    }
+                    
         except asyncio.TimeoutError:
             return {
                 "success": False,
@@ -198,6 +435,182 @@ class OpenAIClientService:
                 "error": str(e)
             }
     
+    async def _stream_openai_request(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        timeout_seconds: float
+    ) -> AsyncIterator[str]:
+        """Stream an OpenAI completion, yielding content deltas as SSE chunks arrive."""
+        
+        headers = self._build_request_headers()
+        payload = self._build_request_payload(system_prompt, user_prompt)
+        payload["stream"] = True
+        
+        session = await self._get_session()
+        timeout = aiohttp.ClientTimeout(total=timeout_seconds)
+        phases: Dict[str, float] = {}
+        request_start = time.perf_counter()
+        
+        async with session.post(
+            self.base_url,
+            headers=headers,
+            json=payload,
+            timeout=timeout,
+            trace_request_ctx=phases
+        ) as response:
+            headers_received = time.perf_counter()
+            phases["ttfb"] = (headers_received - request_start) * 1000
+            
+            if response.status != 200:
+                error_data = await response.text()
+                raise RuntimeError(f"OpenAI API error {response.status}: {error_data}")
+            
+            # Server-sent events: one "data: {json}" line per chunk, ending with "data: [DONE]"
+            async for raw_line in response.content:
+                line = raw_line.decode("utf-8").strip()
+                if not line.startswith("data:"):
+                    continue
+                
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                
+                chunk = json.loads(data)
+                choices = chunk.get("choices") or []
+                delta = choices[0].get("delta", {}).get("content") if choices else None
+                if delta:
+                    if "first_token" not in phases:
+                        phases["first_token"] = (time.perf_counter() - request_start) * 1000
+                    yield delta
+            
+            phases["body"] = (time.perf_counter() - headers_received) * 1000
+        
+        self._track_phases(phases)
+    
+    async def stream_contextual_advice(
+        self,
+        prompt: str,
+        context: Dict[str, Any],
+        max_time_ms: int = 2800,
+        priority: RequestPriority = RequestPriority.LIVE_ADVICE
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream AI advice as it is generated.
+        
+        Yields {"event": "token", "content": ...} for each content delta and
+        finishes with {"event": "done", "advice": ...} holding the assembled
+        response, or a fallback response if the stream could not complete.
+        """
+        start_time = time.perf_counter()
+        deadline = Deadline.from_budget_ms(max_time_ms)
+        self._total_requests += 1
+        
+        cache_key = self._generate_cache_key(prompt, context)
+        cached_response = self._get_cached_response(cache_key)
+        if not cached_response:
+            cached_response = self._get_similar_cached_response(prompt, context, cache_key)
+        if cached_response:
+            self._cache_hits += 1
+            elapsed_ms = int((time.perf_counter() - start_time) * 1000)
+            cached_response["response_time_ms"] = elapsed_ms
+            cached_response["from_cache"] = True
+            self._track_performance(elapsed_ms)
+            yield {"event": "done", "advice": cached_response}
+            return
+        
+        if not self.api_key:
+            logger.warning("OpenAI API key not configured, using fallback")
+            yield {"event": "done", "advice": self._get_fallback_response(prompt, context)}
+            return
+        
+        system_prompt = self._build_system_prompt(context)
+        user_prompt = self._build_user_prompt(prompt, context, system_prompt)
+        content_parts: List[str] = []
+        
+        ticket = await self._admission.acquire(
+            priority, self._estimate_request_tokens(system_prompt, user_prompt), deadline
+        )
+        if ticket is None:
+            elapsed_ms = int((time.perf_counter() - start_time) * 1000)
+            self._failed_requests += 1
+            yield {"event": "done", "advice": self._get_timeout_fallback(prompt, context, elapsed_ms)}
+            return
+        
+        try:
+            async for token in self._stream_openai_request(system_prompt, user_prompt, deadline.remaining_seconds()):
+                content_parts.append(token)
+                yield {"event": "token", "content": token}
+                
+        except asyncio.TimeoutError:
+            elapsed_ms = int((time.perf_counter() - start_time) * 1000)
+            logger.warning(f"OpenAI stream timed out after {elapsed_ms}ms")
+            self._failed_requests += 1
+            yield {"event": "done", "advice": self._get_timeout_fallback(prompt, context, elapsed_ms)}
+            return
+            
+        except Exception as e:
+            elapsed_ms = int((time.perf_counter() - start_time) * 1000)
+            logger.error(f"OpenAI stream failed after {elapsed_ms}ms: {str(e)}")
+            self._failed_requests += 1
+            yield {"event": "done", "advice": self._get_error_fallback(prompt, context, str(e), elapsed_ms)}
+            return
+        
+        finally:
+            self._admission.release(ticket)
+        
+        content = "".join(content_parts).strip()
+        elapsed_ms = int((time.perf_counter() - start_time) * 1000)
+        if not content:
+            self._failed_requests += 1
+            yield {
+                "event": "done",
+                "advice": self._get_error_fallback(prompt, context, "Empty streamed response", elapsed_ms)
+            }
+            return
+        
+        advice = {
+            "type": "ai_generated",
+            "title": "AI Seer Advice",
+            "content": content,
+            "confidence": 0.9,
+            "model": self._model,
+            "streamed": True
+        }
+        self._cache_response(cache_key, advice)
+        self._similarity_index.add(cache_key, prompt, scope=self._get_context_scope(context))
+        
+        advice["response_time_ms"] = elapsed_ms
+        advice["from_cache"] = False
+        self._track_performance(elapsed_ms)
+        yield {"event": "done", "advice": advice}
+    
+    def _build_request_headers(self) -> Dict[str, str]:
+        """Build API request headers."""
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+    
+    def _build_request_payload(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        max_tokens: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Build chat completion request payload."""
+        return {
+            "model": self._model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            "max_tokens": max_tokens or self._max_tokens,
+            "temperature": self._temperature,
+            "presence_penalty": 0.1,  # Avoid repetition
+            "frequency_penalty": 0.1   # Encourage variety
+        }
+    
     def _build_system_prompt(self, context: Dict[str, Any]) -> str:
         """Build optimized system prompt for GM assistance."""
         
@@ -224,77 +637,62 @@ Response Format:
         
         return base_prompt
     
-    def _build_user_prompt(self, prompt: str, context: Dict[str, Any]) -> str:
-        """Build optimized user prompt with context."""
-        
-        # Extract relevant context
-        characters = context.get("characters", [])
-        scene_energy = context.get("scene_energy", "medium")
-        player_engagement = context.get("player_engagement", 5)
-        
-        context_parts = []
-        
-        if characters:
-            char_count = len(characters)
-            context_parts.append(f"{char_count} active characters")
-        
-        if player_engagement < 6:
-            context_parts.append("players seem disengaged")
-        elif player_engagement > 8:
-            context_parts.append("players highly engaged")
-        
-        if scene_energy == "low":
-            context_parts.append("scene needs energy")
-        elif scene_energy == "high":
-            context_parts.append("scene has high energy")
-        
-        context_summary = ", ".join(context_parts) if context_parts else "standard situation"
-        
-        return f"Situation: {prompt}\nContext: {context_summary}\n\nWhat should the GM do right now?"
+    def _build_user_prompt(self, prompt: str, context: Dict[str, Any], system_prompt: str = "") -> str:
+        """Build a compact user prompt that fits the per-request token budget."""
+        built = self._context_builder.build_user_prompt(
+            prompt, context, reserved_tokens=estimate_tokens(system_prompt)
+        )
+        return built.text
     
-    def _generate_cache_key(self, prompt: str, context: Dict[str, Any]) -> str:
-        """Generate cache key for response caching."""
-        
-        # Use hash of prompt + relevant context fields
+    def _get_context_scope(self, context: Dict[str, Any]) -> str:
+        """Serialize the context fields that affect the generated advice."""
         relevant_context = {
             "difficulty_level": context.get("difficulty_level", "newcomer"),
             "scene_energy": context.get("scene_energy", "medium"),
             "player_count": len(context.get("characters", [])),
             "engagement_level": "low" if context.get("player_engagement", 5) < 6 else "high"
         }
-        
-        cache_input = f"{prompt}:{json.dumps(relevant_context, sort_keys=True)}"
-        return str(hash(cache_input))
+        return json.dumps(relevant_context, sort_keys=True)
     
-    def _get_cached_response(self, cache_key: str) -> Optional[Dict[str, Any]]:
-        """Get cached response if still valid."""
-        
-        if cache_key not in self._response_cache:
+    def _generate_cache_key(self, prompt: str, context: Dict[str, Any]) -> str:
+        """Generate the canonical cache key shared with the other AI layers."""
+        return canonical_cache_key(prompt, context)
+    
+    def _get_similar_cached_response(
+        self,
+        prompt: str,
+        context: Dict[str, Any],
+        cache_key: str,
+        threshold: Optional[float] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Get a cached response for a near-duplicate prompt in the same context."""
+        
+        match = self._similarity_index.find_similar(
+            prompt,
+            scope=self._get_context_scope(context),
+            threshold=threshold,
+            exclude_key=cache_key
+        )
+        if not match:
             return None
         
-        response, timestamp = self._response_cache[cache_key]
-        
-        # Check if cache is still valid
-        if datetime.now() - timestamp > timedelta(minutes=self._cache_ttl_minutes):
-            del self._response_cache[cache_key]
+        cached_response = self._get_cached_response(match.key)
+        if not cached_response:
+            self._similarity_index.remove(match.key)
             return None
         
-        return response.copy()
+        self._near_duplicate_hits += 1
+        return cached_response
+    
+    def _get_cached_response(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Get cached response if still valid."""
+        return self._response_cache.get(cache_key, layer="openai_client")
     
     def _cache_response(self, cache_key: str, response: Dict[str, Any]) -> None:
         """Cache response for future use."""
-        
-        # Limit cache size
-        if len(self._response_cache) > 100:
-            # Remove oldest entries
-            sorted_items = sorted(
-                self._response_cache.items(),
-                key=lambda x: x[1][1]  # Sort by timestamp
-            )
-            for key, _ in sorted_items[:20]:  # Remove oldest 20%
-                del self._response_cache[key]
-        
-        self._response_cache[cache_key] = (response.copy(), datetime.now())
+        self._response_cache.put(
+            cache_key, response, layer="openai_client", ttl_seconds=self._cache_ttl_minutes * 60
+        )
     
     def _get_fallback_response(
         self,
@@ -389,7 +787,9 @@ Response Format:
                 "p95_response_time_ms": 0,
                 "success_rate": 0.0,
                 "cache_hit_rate": 0.0,
-                "api_available": bool(self.api_key)
+                "api_available": bool(self.api_key),
+                "connection_pool": self._get_connection_pool_stats(),
+                "prompt_size": self._context_builder.get_stats()
             }
         
         sorted_times = sorted(self._response_times)
@@ -406,15 +806,32 @@ Response Format:
             "total_requests": self._total_requests,
             "failed_requests": self._failed_requests,
             "cache_hits": self._cache_hits,
+            "near_duplicate_hits": self._near_duplicate_hits,
             "avg_response_time_ms": int(avg_time * 1000),
             "p95_response_time_ms": int(p95_time * 1000),
             "max_response_time_ms": int(max(sorted_times) * 1000),
             "success_rate": success_rate,
             "cache_hit_rate": cache_hit_rate,
             "cache_size": len(self._response_cache),
+            "shared_cache": self._response_cache.get_stats(),
             "api_available": bool(self.api_key),
             "performance_target_ms": 3000,
-            "model": self._model
+            "model": self._model,
+            "connection_pool": self._get_connection_pool_stats(),
+            "scheduler": self._scheduler.get_stats(),
+            "admission": self._admission.get_stats(),
+            "micro_batching": self._micro_batcher.get_stats() if self._micro_batcher else {"enabled": False},
+            "prompt_size": self._context_builder.get_stats()
+        }
+    
+    def _get_connection_pool_stats(self) -> Dict[str, Any]:
+        """Get connection reuse and per-phase timing statistics."""
+        return {
+            "session_open": bool(self._session and not self._session.closed),
+            "connection_limit": self._connection_limit,
+            "connections_created": self._connections_created,
+            "connections_reused": self._connections_reused,
+            "phase_timings": self._get_phase_stats()
         }
     
     async def health_check(self) -> Dict[str, Any]:
@@ -429,10 +846,11 @@ Response Format:
         
         try:
             # Quick test request with very short timeout
-            test_response = await self._make_openai_request(
+            test_response = await self._admitted_openai_request(
                 "You are a test assistant.",
                 "Say 'OK' if you can respond.",
-                1.0  # 1 second timeout for health check
+                Deadline.from_budget_ms(1000),  # 1 second timeout for health check
+                RequestPriority.BACKGROUND
             )
             
             if test_response["success"]:
@@ -0,0 +1,215 @@
+"""
+Progression Event Pipeline for SPARC RPG.
+Applies progression updates on background workers so tracking requests return as soon as events are queued.
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+import uuid
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from .progression_tracker import AutomaticProgressionTracker, get_progression_tracker
+
+logger = logging.getLogger(__name__)
+
+
+ADVENTURE_COMPLETED = "adventure_completed"
+SCENE_OUTCOME = "scene_outcome"
+EVENT_KINDS = (ADVENTURE_COMPLETED, SCENE_OUTCOME)
+
+
+@dataclass
+class ProgressionJob:
+    """A queued progression event and its processing status."""
+    job_id: str
+    user_id: str
+    kind: str
+    sequence: int
+    payload: Dict[str, Any] = field(repr=False)
+    status: str = "queued"  # queued, completed, failed
+    queued_at: datetime = field(default_factory=datetime.now)
+    completed_at: Optional[datetime] = None
+    revision: Optional[int] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "user_id": self.user_id,
+            "kind": self.kind,
+            "sequence": self.sequence,
+            "status": self.status,
+            "queued_at": self.queued_at.isoformat(),
+            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+            "revision": self.revision,
+            "result": self.result,
+            "error": self.error
+        }
+
+
+def _adventure_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    summary = result["adventure_summary"]
+    return {
+        "progression_update": result["progression_update"],
+        "adventure_summary": {
+            "adventure_id": summary.adventure_id,
+            "title": summary.title,
+            "final_confidence": summary.final_confidence_score,
+            "progress_points": summary.total_progress_points,
+            "completion_time": summary.total_time_minutes,
+            "scenes_completed": f"{summary.scenes_completed}/{summary.total_scenes}"
+        }
+    }
+
+
+class ProgressionEventPipeline:
+    """
+    In-process queue of progression events processed by a pool of worker tasks.
+
+    Features:
+    - Events are sharded by user, so each player's events apply one at a time and in order
+    - Bounded queues apply backpressure instead of growing without limit
+    - Job status (and the resulting progression revision) can be polled by job id
+    - Queued events are drained on shutdown
+    """
+
+    def __init__(
+        self,
+        tracker: AutomaticProgressionTracker,
+        workers: int = 4,
+        queue_size: int = 1000,
+        max_jobs: int = 10000
+    ):
+        self.tracker = tracker
+        self.workers = max(1, workers)
+        self.max_jobs = max_jobs
+        self._queues: List[asyncio.Queue] = [asyncio.Queue(maxsize=queue_size) for _ in range(self.workers)]
+        self._tasks: List[asyncio.Task] = []
+        self._jobs: "OrderedDict[str, ProgressionJob]" = OrderedDict()
+        self._sequence = itertools.count(1)
+
+        self.stats = {
+            'published': 0,
+            'completed': 0,
+            'failed': 0,
+            'jobs_forgotten': 0
+        }
+
+    def _shard(self, user_id: str) -> asyncio.Queue:
+        # Stable hash: every event for a user goes to the same worker
+        return self._queues[zlib.crc32(user_id.encode()) % self.workers]
+
+    async def publish(self, user_id: str, kind: str, payload: Dict[str, Any]) -> ProgressionJob:
+        """Queue a progression event and return its job without waiting for it to apply."""
+        if kind not in EVENT_KINDS:
+            raise ValueError(f"Unknown progression event kind: {kind}")
+        self.start()
+
+        job = ProgressionJob(
+            job_id=uuid.uuid4().hex,
+            user_id=user_id,
+            kind=kind,
+            sequence=next(self._sequence),
+            payload=payload
+        )
+        self._remember(job)
+        await self._shard(user_id).put(job)
+        self.stats['published'] += 1
+        return job
+
+    def get_job(self, job_id: str) -> Optional[ProgressionJob]:
+        """Look up a recent job by id."""
+        return self._jobs.get(job_id)
+
+    def _remember(self, job: ProgressionJob):
+        self._jobs[job.job_id] = job
+        while len(self._jobs) > self.max_jobs:
+            self._jobs.popitem(last=False)
+            self.stats['jobs_forgotten'] += 1
+
+    async def _apply(self, job: ProgressionJob):
+        if job.kind == ADVENTURE_COMPLETED:
+            result = _adventure_result(await self.tracker.track_adventure_completion(
+                job.user_id, job.payload["adventure_data"], job.payload["session_progress"]
+            ))
+        else:
+            result = await self.tracker.track_scene_outcome(
+                job.user_id, job.payload["scene_data"], job.payload["outcome_data"]
+            )
+
+        player = await self.tracker.get_player(job.user_id)
+        job.revision = player.revision if player is not None else None
+        job.result = result
+
+    async def _worker(self, queue: asyncio.Queue):
+        while True:
+            job = await queue.get()
+            try:
+                await self._apply(job)
+                job.status = "completed"
+                self.stats['completed'] += 1
+            except Exception as e:
+                job.status = "failed"
+                job.error = str(e)
+                self.stats['failed'] += 1
+                logger.error(f"Progression event {job.job_id} ({job.kind}) failed for {job.user_id}: {e}")
+            finally:
+                job.completed_at = datetime.now()
+                job.payload = {}
+                queue.task_done()
+
+    async def drain(self):
+        """Wait until every queued event has been applied."""
+        for queue in self._queues:
+            await queue.join()
+
+    def start(self) -> None:
+        """Start the worker tasks."""
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker(queue)) for queue in self._queues]
+
+    async def stop(self) -> None:
+        """Apply queued events, then stop the workers."""
+        if self._tasks:
+            await self.drain()
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pipeline statistics for monitoring."""
+        return {
+            **self.stats,
+            'workers': self.workers,
+            'queued': sum(queue.qsize() for queue in self._queues),
+            'tracked_jobs': len(self._jobs),
+            'running': bool(self._tasks)
+        }
+
+
+# Global progression event pipeline
+_progression_event_pipeline: Optional[ProgressionEventPipeline] = None
+
+
+async def get_progression_event_pipeline() -> ProgressionEventPipeline:
+    """Get the global progression event pipeline instance."""
+    global _progression_event_pipeline
+    if _progression_event_pipeline is None:
+        _progression_event_pipeline = ProgressionEventPipeline(
+            await get_progression_tracker(),
+            workers=int(os.getenv("PROGRESSION_EVENT_WORKERS", "4")),
+            queue_size=int(os.getenv("PROGRESSION_EVENT_QUEUE_SIZE", "1000"))
+        )
+    return _progression_event_pipeline
@@ -0,0 +1,369 @@
+"""
+Fleet Progression Analytics for SPARC RPG.
+Streams stored player progression through mergeable sketches and writes platform-wide summary tables.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import logging
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+
+STREAM_PROGRESSION_SQL = "SELECT data FROM player_progression"
+
+INSERT_RUN_SQL = """
+    INSERT INTO progression_fleet_runs (started_at, finished_at, players_processed)
+    VALUES ($1, $2, $3)
+    RETURNING run_id
+"""
+
+INSERT_STAT_SQL = """
+    INSERT INTO progression_fleet_stats (run_id, section, key, stats)
+    VALUES ($1, $2, $3, $4::jsonb)
+"""
+
+SELECT_LATEST_RUN_SQL = """
+    SELECT run_id, started_at, finished_at, players_processed
+    FROM progression_fleet_runs
+    ORDER BY run_id DESC
+    LIMIT 1
+"""
+
+SELECT_RUN_STATS_SQL = "SELECT section, key, stats FROM progression_fleet_stats WHERE run_id = $1"
+
+# Levels, skill levels and confidence all live on a 0-10 scale
+SCALE_MAX = 10.0
+HISTOGRAM_BUCKETS = 20
+MAX_ADVENTURE_KEYS = 500
+OTHER_KEY = "other"
+
+
+def _counter() -> Dict[str, int]:
+    # Module-level so aggregates returned from worker processes stay picklable
+    return defaultdict(int)
+
+
+class RunningStats:
+    """Count, mean, variance, min and max; merges exactly (parallel Welford)."""
+
+    __slots__ = ("count", "mean", "m2", "minimum", "maximum")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    def merge(self, other: "RunningStats"):
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.minimum, self.maximum = other.minimum, other.maximum
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self.count == 0:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean": round(self.mean, 4),
+            "stddev": round(math.sqrt(self.m2 / self.count), 4),
+            "min": self.minimum,
+            "max": self.maximum
+        }
+
+
+class FixedHistogram:
+    """Fixed-width buckets over the 0-10 scale; merges by adding counts, approximate quantiles."""
+
+    __slots__ = ("counts",)
+
+    def __init__(self):
+        self.counts = [0] * HISTOGRAM_BUCKETS
+
+    def add(self, value: float):
+        bucket = int(min(max(value, 0.0), SCALE_MAX) / SCALE_MAX * HISTOGRAM_BUCKETS)
+        self.counts[min(bucket, HISTOGRAM_BUCKETS - 1)] += 1
+
+    def merge(self, other: "FixedHistogram"):
+        self.counts = [mine + theirs for mine, theirs in zip(self.counts, other.counts)]
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper edge of the bucket holding the q-quantile."""
+        total = sum(self.counts)
+        if total == 0:
+            return None
+        threshold = q * total
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= threshold:
+                return (bucket + 1) * SCALE_MAX / HISTOGRAM_BUCKETS
+        return SCALE_MAX
+
+    def to_dict(self) -> Dict[str, Any]:
+        width = SCALE_MAX / HISTOGRAM_BUCKETS
+        return {
+            "bucket_width": width,
+            "counts": self.counts,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9)
+        }
+
+
+class Distribution:
+    """Histogram plus exact moments for one metric."""
+
+    __slots__ = ("stats", "histogram")
+
+    def __init__(self):
+        self.stats = RunningStats()
+        self.histogram = FixedHistogram()
+
+    def add(self, value: float):
+        self.stats.add(value)
+        self.histogram.add(value)
+
+    def merge(self, other: "Distribution"):
+        self.stats.merge(other.stats)
+        self.histogram.merge(other.histogram)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**self.stats.to_dict(), "histogram": self.histogram.to_dict()}
+
+
+class FleetAggregate:
+    """
+    Platform-wide progression aggregates built one player document at a time.
+
+    Features:
+    - Constant memory in the number of players: only sketches and bounded counters are kept
+    - Mergeable, so chunks can be aggregated in separate processes and combined
+    - Skill level distributions, milestone rates by adventure and confidence by signup cohort
+    """
+
+    def __init__(self):
+        self.players = 0
+        self.overall_level = Distribution()
+        self.skill_levels: Dict[str, Distribution] = defaultdict(Distribution)
+        self.adventure_completions: Dict[str, int] = defaultdict(int)
+        self.adventure_milestones: Dict[str, Dict[str, int]] = defaultdict(_counter)
+        self.cohort_confidence: Dict[str, Distribution] = defaultdict(Distribution)
+        self.cohort_confidence_change: Dict[str, RunningStats] = defaultdict(RunningStats)
+
+    def _adventure_key(self, adventure_id: str) -> str:
+        # Adventure ids come from a finite catalogue; the cap only guards against junk ids
+        if adventure_id in self.adventure_completions or len(self.adventure_completions) < MAX_ADVENTURE_KEYS:
+            return adventure_id
+        return OTHER_KEY
+
+    def add_player(self, document: Dict[str, Any]):
+        """Fold one stored progression document into the aggregates."""
+        self.overall_level.add(document["overall_level"])
+
+        for skill, progress in document["skill_progress"].items():
+            self.skill_levels[skill].add(progress["current_level"])
+
+        for summary in document["adventure_history"]:
+            adventure_key = self._adventure_key(summary["adventure_id"])
+            self.adventure_completions[adventure_key] += 1
+            for milestone in summary["milestones_achieved"]:
+                self.adventure_milestones[adventure_key][milestone] += 1
+
+        cohort = (document.get("created_at") or "unknown")[:7]  # YYYY-MM signup month
+        trend = document["confidence_trend"]
+        for _, confidence in trend:
+            self.cohort_confidence[cohort].add(confidence)
+        if len(trend) >= 2:
+            self.cohort_confidence_change[cohort].add(trend[-1][1] - trend[0][1])
+        self.players += 1
+
+    def merge(self, other: "FleetAggregate") -> "FleetAggregate":
+        """Combine another aggregate into this one."""
+        self.players += other.players
+        self.overall_level.merge(other.overall_level)
+        for skill, distribution in other.skill_levels.items():
+            self.skill_levels[skill].merge(distribution)
+        for adventure_id, completions in other.adventure_completions.items():
+            adventure_key = self._adventure_key(adventure_id)
+            self.adventure_completions[adventure_key] += completions
+            for milestone, count in other.adventure_milestones.get(adventure_id, {}).items():
+                self.adventure_milestones[adventure_key][milestone] += count
+        for cohort, distribution in other.cohort_confidence.items():
+            self.cohort_confidence[cohort].merge(distribution)
+        for cohort, stats in other.cohort_confidence_change.items():
+            self.cohort_confidence_change[cohort].merge(stats)
+        return self
+
+    def to_sections(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Summary rows grouped by section, as written to progression_fleet_stats."""
+        return {
+            "overview": {
+                "players": {"count": self.players},
+                "overall_level": self.overall_level.to_dict()
+            },
+            "skill_levels": {
+                skill: distribution.to_dict() for skill, distribution in self.skill_levels.items()
+            },
+            "adventure_milestones": {
+                adventure_id: {
+                    "completions": completions,
+                    "milestone_rates": {
+                        milestone: round(count / completions, 4)
+                        for milestone, count in self.adventure_milestones.get(adventure_id, {}).items()
+                    }
+                }
+                for adventure_id, completions in self.adventure_completions.items()
+            },
+            "cohort_confidence": {
+                cohort: {
+                    "confidence": distribution.to_dict(),
+                    "confidence_change": self.cohort_confidence_change[cohort].to_dict()
+                }
+                for cohort, distribution in self.cohort_confidence.items()
+            }
+        }
+
+
+def aggregate_documents(documents: Iterable[Any]) -> FleetAggregate:
+    """Aggregate a chunk of progression documents (runs in worker processes)."""
+    aggregate = FleetAggregate()
+    for document in documents:
+        if isinstance(document, str):
+            document = json.loads(document)
+        try:
+            aggregate.add_player(document)
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Skipping malformed progression document: {e}")
+    return aggregate
+
+
+async def stream_progression_documents(pool: asyncpg.Pool, chunk_size: int = 500) -> AsyncIterator[List[Any]]:
+    """Yield stored progression documents in chunks from a server-side cursor."""
+    async with pool.acquire() as connection:
+        async with connection.transaction():
+            chunk: List[Any] = []
+            async for row in connection.cursor(STREAM_PROGRESSION_SQL, prefetch=chunk_size):
+                chunk.append(row['data'])
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+
+
+async def compute_fleet_aggregate(
+    chunks: AsyncIterator[List[Any]],
+    workers: int = 0
+) -> FleetAggregate:
+    """Aggregate streamed chunks, optionally across a process pool."""
+    result = FleetAggregate()
+    if workers <= 0:
+        async for chunk in chunks:
+            result.merge(aggregate_documents(chunk))
+        return result
+
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: List[asyncio.Future] = []
+        async for chunk in chunks:
+            pending.append(loop.run_in_executor(executor, aggregate_documents, chunk))
+            # Bound in-flight chunks so memory stays flat however many players there are
+            if len(pending) >= workers * 2:
+                result.merge(await pending.pop(0))
+        for future in pending:
+            result.merge(await future)
+    return result
+
+
+async def write_fleet_summary(pool: asyncpg.Pool, aggregate: FleetAggregate, started_at: datetime) -> int:
+    """Store one run's summary rows and return the run id."""
+    async with pool.acquire() as connection:
+        async with connection.transaction():
+            run_id = await connection.fetchval(
+                INSERT_RUN_SQL, started_at.astimezone(), datetime.now().astimezone(), aggregate.players
+            )
+            await connection.executemany(INSERT_STAT_SQL, [
+                (run_id, section, key, json.dumps(stats))
+                for section, rows in aggregate.to_sections().items()
+                for key, stats in rows.items()
+            ])
+    return run_id
+
+
+async def run_fleet_analytics(pool: asyncpg.Pool, chunk_size: int = 500, workers: int = 0) -> int:
+    """Stream every stored player through the aggregates and write a summary run."""
+    started_at = datetime.now()
+    aggregate = await compute_fleet_aggregate(stream_progression_documents(pool, chunk_size), workers)
+    run_id = await write_fleet_summary(pool, aggregate, started_at)
+    logger.info(f"Fleet progression analytics run {run_id} processed {aggregate.players} players")
+    return run_id
+
+
+async def load_latest_fleet_summary(pool: asyncpg.Pool) -> Optional[Dict[str, Any]]:
+    """Latest summary run with its rows grouped by section."""
+    run = await pool.fetchrow(SELECT_LATEST_RUN_SQL)
+    if run is None:
+        return None
+
+    sections: Dict[str, Dict[str, Any]] = defaultdict(dict)
+    for row in await pool.fetch(SELECT_RUN_STATS_SQL, run['run_id']):
+        stats = row['stats']
+        sections[row['section']][row['key']] = json.loads(stats) if isinstance(stats, str) else stats
+
+    return {
+        "run_id": run['run_id'],
+        "started_at": run['started_at'].isoformat(),
+        "finished_at": run['finished_at'].isoformat(),
+        "players_processed": run['players_processed'],
+        "sections": dict(sections)
+    }
+
+
+async def _main(args: argparse.Namespace):
+    pool = await asyncpg.create_pool(args.database_url, min_size=1, max_size=2)
+    try:
+        run_id = await run_fleet_analytics(pool, args.chunk_size, args.workers)
+        print(f"Wrote fleet progression analytics run {run_id}")
+    finally:
+        await pool.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compute platform-wide progression analytics")
+    parser.add_argument("--database-url", default=os.getenv("PROGRESSION_DATABASE_URL"))
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes (0 aggregates in-process)")
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("--database-url or PROGRESSION_DATABASE_URL is required")
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(args))
@@ -0,0 +1,263 @@
+"""
+Progression Leaderboard Index for SPARC RPG.
+Maintains ranked player orderings per metric so leaderboard queries never sort the whole player base.
+"""
+
+import random
+import logging
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .progression_models import PlayerProgression, SkillArea
+
+logger = logging.getLogger(__name__)
+
+
+OVERALL_METRIC = "overall"
+DEFAULT_SKILL_LEVEL = 1.0
+DEFAULT_SKILL_CONFIDENCE = 5.0
+
+# Sort keys ascend, so scores are negated to rank the best player first
+RankKey = Tuple[float, float, str]
+
+_MAX_LEVEL = 32
+
+
+class _Node:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key: Optional[RankKey], level: int):
+        self.key = key
+        self.next: List[Optional["_Node"]] = [None] * level
+        # width[i] is the number of level-0 steps skipped by next[i]
+        self.width: List[int] = [1] * level
+
+
+class RankedSkipList:
+    """
+    Indexable skip list of unique sort keys.
+
+    Features:
+    - O(log n) expected insert, remove, rank-of-key and key-at-rank
+    - In-order iteration from any rank for top-K pages
+    """
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        self._rng = rng or random.Random()
+        self._head = _Node(None, _MAX_LEVEL)
+        self._level = 1
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _random_level(self) -> int:
+        level = 1
+        while level < _MAX_LEVEL and self._rng.random() < 0.25:
+            level += 1
+        return level
+
+    def _find_predecessors(self, key: RankKey) -> Tuple[List[_Node], List[int]]:
+        """Rightmost node before key on every level, and its rank."""
+        update: List[_Node] = [self._head] * _MAX_LEVEL
+        ranks = [0] * _MAX_LEVEL
+        node = self._head
+        rank = 0
+        for level in range(self._level - 1, -1, -1):
+            while node.next[level] is not None and node.next[level].key < key:
+                rank += node.width[level]
+                node = node.next[level]
+            update[level] = node
+            ranks[level] = rank
+        return update, ranks
+
+    def insert(self, key: RankKey):
+        """Insert a key; keys must be unique."""
+        update, ranks = self._find_predecessors(key)
+        level = self._random_level()
+        if level > self._level:
+            for i in range(self._level, level):
+                update[i] = self._head
+                ranks[i] = 0
+                self._head.width[i] = self._size + 1
+            self._level = level
+
+        node = _Node(key, level)
+        position = ranks[0] + 1
+        for i in range(level):
+            predecessor = update[i]
+            node.next[i] = predecessor.next[i]
+            predecessor.next[i] = node
+            # Split the predecessor's span around the new node
+            node.width[i] = predecessor.width[i] - (position - 1 - ranks[i])
+            predecessor.width[i] = position - ranks[i]
+        for i in range(level, self._level):
+            update[i].width[i] += 1
+        self._size += 1
+
+    def remove(self, key: RankKey) -> bool:
+        """Remove a key, returning False if it is not present."""
+        update, _ = self._find_predecessors(key)
+        node = update[0].next[0]
+        if node is None or node.key != key:
+            return False
+
+        for i in range(self._level):
+            if update[i].next[i] is node:
+                update[i].width[i] += node.width[i] - 1
+                update[i].next[i] = node.next[i]
+            else:
+                update[i].width[i] -= 1
+        while self._level > 1 and self._head.next[self._level - 1] is None:
+            self._level -= 1
+        self._size -= 1
+        return True
+
+    def rank(self, key: RankKey) -> Optional[int]:
+        """Zero-based position of a key, or None if it is not present."""
+        update, ranks = self._find_predecessors(key)
+        node = update[0].next[0]
+        if node is None or node.key != key:
+            return None
+        return ranks[0]
+
+    def iter_from(self, index: int) -> Iterator[RankKey]:
+        """Iterate keys in order starting at a zero-based position."""
+        if index < 0 or index >= self._size:
+            return
+        node = self._head
+        remaining = index + 1
+        for level in range(self._level - 1, -1, -1):
+            while node.next[level] is not None and node.width[level] <= remaining:
+                remaining -= node.width[level]
+                node = node.next[level]
+        while node is not None:
+            yield node.key
+            node = node.next[0]
+
+
+def overall_rank_key(player: PlayerProgression) -> RankKey:
+    return (-player.overall_level, -float(len(player.milestone_achievements)), player.user_id)
+
+
+def skill_rank_key(player: PlayerProgression, skill_area: SkillArea) -> RankKey:
+    progress = player.skill_progress.get(skill_area)
+    if progress is None:
+        return (-DEFAULT_SKILL_LEVEL, -DEFAULT_SKILL_CONFIDENCE, player.user_id)
+    return (-progress.current_level, -progress.confidence_in_skill, player.user_id)
+
+
+class ProgressionLeaderboard:
+    """
+    Live ranking index over player progressions.
+
+    Features:
+    - One ranked index for overall level and one per skill area
+    - Updated incrementally when a player's progression changes
+    - Top-K pages and rank-of-player lookups in O(log n)
+    - Same ordering as the original full sort: level first, then milestones or skill confidence
+    """
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        self.metrics = [OVERALL_METRIC] + [skill.value for skill in SkillArea]
+        self._indexes: Dict[str, RankedSkipList] = {
+            metric: RankedSkipList(rng) for metric in self.metrics
+        }
+        self._keys: Dict[str, Dict[str, RankKey]] = {metric: {} for metric in self.metrics}
+        self.stats = {
+            'updates': 0,
+            'reindexed': 0,
+            'removals': 0,
+            'queries': 0
+        }
+
+    def __len__(self) -> int:
+        return len(self._keys[OVERALL_METRIC])
+
+    def __contains__(self, user_id: object) -> bool:
+        return user_id in self._keys[OVERALL_METRIC]
+
+    def _rank_keys(self, player: PlayerProgression) -> Dict[str, RankKey]:
+        keys = {OVERALL_METRIC: overall_rank_key(player)}
+        for skill in SkillArea:
+            keys[skill.value] = skill_rank_key(player, skill)
+        return keys
+
+    def _apply(self, user_id: str, keys: Dict[str, RankKey]):
+        self.stats['updates'] += 1
+        for metric, key in keys.items():
+            previous = self._keys[metric].get(user_id)
+            if previous == key:
+                continue
+            if previous is not None:
+                self._indexes[metric].remove(previous)
+            self._indexes[metric].insert(key)
+            self._keys[metric][user_id] = key
+            self.stats['reindexed'] += 1
+
+    def update(self, player: PlayerProgression):
+        """Re-rank a player whose progression changed."""
+        self._apply(player.user_id, self._rank_keys(player))
+
+    def update_from_columns(
+        self,
+        user_id: str,
+        overall_level: float,
+        milestones_count: int,
+        skill_levels: Dict[str, List[float]]
+    ):
+        """Rank a player from stored leaderboard columns without hydrating their progression."""
+        keys = {OVERALL_METRIC: (-overall_level, -float(milestones_count), user_id)}
+        for skill in SkillArea:
+            level, confidence = skill_levels.get(skill.value, (DEFAULT_SKILL_LEVEL, DEFAULT_SKILL_CONFIDENCE))
+            keys[skill.value] = (-level, -confidence, user_id)
+        self._apply(user_id, keys)
+
+    def user_ids(self) -> List[str]:
+        """Every ranked player."""
+        return list(self._keys[OVERALL_METRIC])
+
+    def rebuild(self, players: Dict[str, PlayerProgression]):
+        """Index every player, e.g. after progressions are loaded in bulk."""
+        for player in players.values():
+            self.update(player)
+
+    def remove(self, user_id: str) -> bool:
+        """Drop a player from every index."""
+        if user_id not in self:
+            return False
+        for metric in self.metrics:
+            self._indexes[metric].remove(self._keys[metric].pop(user_id))
+        self.stats['removals'] += 1
+        return True
+
+    def _check_metric(self, metric: str):
+        if metric not in self._indexes:
+            raise ValueError(f"Unknown leaderboard metric: {metric}")
+
+    def top(self, metric: str = OVERALL_METRIC, limit: int = 10, offset: int = 0) -> List[str]:
+        """User ids of the best players for a metric, best first."""
+        self._check_metric(metric)
+        self.stats['queries'] += 1
+        user_ids = []
+        for key in self._indexes[metric].iter_from(offset):
+            if len(user_ids) >= limit:
+                break
+            user_ids.append(key[2])
+        return user_ids
+
+    def rank(self, user_id: str, metric: str = OVERALL_METRIC) -> Optional[int]:
+        """One-based rank of a player for a metric, or None if they are not ranked."""
+        self._check_metric(metric)
+        self.stats['queries'] += 1
+        key = self._keys[metric].get(user_id)
+        if key is None:
+            return None
+        return self._indexes[metric].rank(key) + 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get leaderboard statistics for monitoring."""
+        return {
+            **self.stats,
+            'players_ranked': len(self),
+            'metrics': len(self.metrics)
+        }
@@ -0,0 +1,109 @@
+"""
+Progression data model for SPARC RPG.
+Skill, milestone, adventure summary and player progression types shared by progression services.
+"""
+
+from typing import Dict, List, Optional, Any, Tuple
+from datetime import datetime
+from dataclasses import dataclass, field
+from enum import Enum
+
+from .experience_log import ExperienceLog
+
+
+class SkillArea(Enum):
+    PROBLEM_SOLVING = "problem_solving"
+    SOCIAL_INTERACTION = "social_interaction"
+    CREATIVE_THINKING = "creative_thinking"
+    LEADERSHIP = "leadership"
+    INVESTIGATION = "investigation"
+    EMPATHY = "empathy"
+    STRATEGIC_THINKING = "strategic_thinking"
+    PATIENCE = "patience"
+    COMMUNICATION = "communication"
+    DECISION_MAKING = "decision_making"
+
+
+class ProgressionMilestone(Enum):
+    FIRST_ADVENTURE = "first_adventure"
+    FIRST_SUCCESS = "first_success"
+    CREATIVE_SOLUTION = "creative_solution"
+    HELPED_OTHERS = "helped_others"
+    OVERCAME_CHALLENGE = "overcame_challenge"
+    SHOWED_LEADERSHIP = "showed_leadership"
+    ASKED_FOR_HELP = "asked_for_help"
+    TAUGHT_SOMEONE = "taught_someone"
+    SOLVED_MYSTERY = "solved_mystery"
+    MADE_FRIEND = "made_friend"
+
+
+@dataclass
+class SkillProgress:
+    skill_area: SkillArea
+    current_level: float
+    experiences: ExperienceLog = field(default_factory=ExperienceLog)
+    milestone_achievements: List[str] = field(default_factory=list)
+    last_improvement: Optional[datetime] = None
+    confidence_in_skill: float = 5.0
+    
+    def add_experience(self, adventure_id: str, scene_id: str, outcome: str, impact: float, description: str):
+        """Add a new experience to this skill area."""
+        self.experiences.append(impact, outcome, adventure_id, scene_id, description)
+        
+        # Update current level based on impact
+        self.current_level = min(10.0, max(0.0, self.current_level + impact))
+        self.last_improvement = datetime.now()
+        
+        # Update confidence based on success
+        if outcome in ["success", "critical_success"]:
+            self.confidence_in_skill = min(10.0, self.confidence_in_skill + impact * 0.5)
+        elif outcome in ["failure", "critical_failure"]:
+            self.confidence_in_skill = max(1.0, self.confidence_in_skill - impact * 0.2)
+
+
+@dataclass
+class AdventureSummary:
+    adventure_id: str
+    session_id: str
+    title: str
+    difficulty_level: str
+    completed_at: datetime
+    total_time_minutes: int
+    final_confidence_score: float
+    total_progress_points: int
+    scenes_completed: int
+    total_scenes: int
+    key_decisions: List[Dict[str, Any]]
+    skills_developed: Dict[str, float]
+    milestones_achieved: List[str]
+    learning_outcomes: List[str]
+    memorable_moments: List[str]
+    areas_for_growth: List[str]
+
+
+@dataclass
+class AnalyticsSnapshot:
+    """Progression analytics materialized for one revision of a player's progression."""
+    revision: int
+    etag: str
+    body: Dict[str, Any]
+    computed_at: datetime = field(default_factory=datetime.now)
+
+
+@dataclass
+class PlayerProgression:
+    user_id: str
+    overall_level: float = 1.0
+    total_adventures: int = 0
+    total_play_time_hours: float = 0.0
+    skill_progress: Dict[SkillArea, SkillProgress] = field(default_factory=dict)
+    adventure_history: List[AdventureSummary] = field(default_factory=list)
+    milestone_achievements: Dict[ProgressionMilestone, datetime] = field(default_factory=dict)
+    preferred_play_style: Dict[str, float] = field(default_factory=dict)
+    confidence_trend: List[Tuple[datetime, float]] = field(default_factory=list)
+    social_connections: List[str] = field(default_factory=list)
+    teaching_opportunities: int = 0
+    created_at: datetime = field(default_factory=datetime.now)
+    last_activity: datetime = field(default_factory=datetime.now)
+    revision: int = 0  # Bumped on every tracked event
+    analytics: Optional[AnalyticsSnapshot] = field(default=None, repr=False, compare=False)
@@ -0,0 +1,504 @@
+"""
+Progression Store for SPARC RPG.
+Persists player progression to Postgres with lazy hydration, an LRU of hot players and coalesced writes.
+"""
+
+import asyncio
+import json
+import os
+import time
+import logging
+from collections import OrderedDict
+from dataclasses import asdict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, TypeVar
+
+import asyncpg
+
+from .experience_log import ExperienceLog
+from .progression_models import (
+    AdventureSummary, PlayerProgression, ProgressionMilestone, SkillArea, SkillProgress
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+Mutation = Callable[[PlayerProgression], Awaitable[Any]]
+
+
+# Compare-and-swap batch write: each row carries the version it was based on plus one,
+# and only replaces a stored row still at the base version. Rows that lost a race are
+# missing from RETURNING.
+UPSERT_PROGRESSION_SQL = """
+    INSERT INTO player_progression (
+        user_id, overall_level, milestones_count, skill_levels, data, last_activity, version, updated_at
+    )
+    SELECT user_id, overall_level, milestones_count, skill_levels::jsonb, data::jsonb, last_activity, version, NOW()
+    FROM unnest($1::varchar[], $2::float8[], $3::int[], $4::text[], $5::text[], $6::timestamptz[], $7::bigint[])
+        AS batch(user_id, overall_level, milestones_count, skill_levels, data, last_activity, version)
+    ON CONFLICT (user_id) DO UPDATE SET
+        overall_level = EXCLUDED.overall_level,
+        milestones_count = EXCLUDED.milestones_count,
+        skill_levels = EXCLUDED.skill_levels,
+        data = EXCLUDED.data,
+        last_activity = EXCLUDED.last_activity,
+        version = EXCLUDED.version,
+        updated_at = NOW()
+    WHERE player_progression.version = EXCLUDED.version - 1
+    RETURNING user_id, version
+"""
+
+SELECT_PROGRESSION_SQL = "SELECT data, version FROM player_progression WHERE user_id = $1"
+
+SELECT_VERSION_SQL = "SELECT version FROM player_progression WHERE user_id = $1"
+
+SELECT_RANKINGS_SQL = "SELECT user_id, overall_level, milestones_count, skill_levels FROM player_progression"
+
+DELETE_PROGRESSION_SQL = "DELETE FROM player_progression WHERE user_id = $1"
+
+
+def _time_to_json(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def _time_from_json(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value is not None else None
+
+
+def skill_levels(player: PlayerProgression) -> Dict[str, List[float]]:
+    """Skill area -> [level, confidence], stored alongside the document for leaderboard bootstrap."""
+    return {
+        skill.value: [progress.current_level, progress.confidence_in_skill]
+        for skill, progress in player.skill_progress.items()
+    }
+
+
+def progression_to_dict(player: PlayerProgression) -> Dict[str, Any]:
+    """JSON document for a player's progression."""
+    return {
+        "user_id": player.user_id,
+        "overall_level": player.overall_level,
+        "total_adventures": player.total_adventures,
+        "total_play_time_hours": player.total_play_time_hours,
+        "skill_progress": {
+            skill.value: {
+                "current_level": progress.current_level,
+                "confidence_in_skill": progress.confidence_in_skill,
+                "last_improvement": _time_to_json(progress.last_improvement),
+                "milestone_achievements": progress.milestone_achievements,
+                "experiences": progress.experiences.to_dict()
+            }
+            for skill, progress in player.skill_progress.items()
+        },
+        "adventure_history": [
+            {**asdict(summary), "completed_at": _time_to_json(summary.completed_at)}
+            for summary in player.adventure_history
+        ],
+        "milestone_achievements": {
+            milestone.value: _time_to_json(achieved_at)
+            for milestone, achieved_at in player.milestone_achievements.items()
+        },
+        "preferred_play_style": player.preferred_play_style,
+        "confidence_trend": [[_time_to_json(at), confidence] for at, confidence in player.confidence_trend],
+        "social_connections": player.social_connections,
+        "teaching_opportunities": player.teaching_opportunities,
+        "created_at": _time_to_json(player.created_at),
+        "last_activity": _time_to_json(player.last_activity),
+        "revision": player.revision
+    }
+
+
+def progression_from_dict(data: Dict[str, Any]) -> PlayerProgression:
+    """Rebuild a player's progression from its JSON document."""
+    return PlayerProgression(
+        user_id=data["user_id"],
+        overall_level=data["overall_level"],
+        total_adventures=data["total_adventures"],
+        total_play_time_hours=data["total_play_time_hours"],
+        skill_progress={
+            SkillArea(skill): SkillProgress(
+                skill_area=SkillArea(skill),
+                current_level=progress["current_level"],
+                experiences=ExperienceLog.from_dict(progress["experiences"]),
+                milestone_achievements=list(progress["milestone_achievements"]),
+                last_improvement=_time_from_json(progress["last_improvement"]),
+                confidence_in_skill=progress["confidence_in_skill"]
+            )
+            for skill, progress in data["skill_progress"].items()
+        },
+        adventure_history=[
+            AdventureSummary(**{**summary, "completed_at": _time_from_json(summary["completed_at"])})
+            for summary in data["adventure_history"]
+        ],
+        milestone_achievements={
+            ProgressionMilestone(milestone): _time_from_json(achieved_at)
+            for milestone, achieved_at in data["milestone_achievements"].items()
+        },
+        preferred_play_style=dict(data["preferred_play_style"]),
+        confidence_trend=[(_time_from_json(at), confidence) for at, confidence in data["confidence_trend"]],
+        social_connections=list(data["social_connections"]),
+        teaching_opportunities=data["teaching_opportunities"],
+        created_at=_time_from_json(data["created_at"]),
+        last_activity=_time_from_json(data["last_activity"]),
+        revision=data.get("revision", 0)
+    )
+
+
+def progression_to_row(player: PlayerProgression, base_version: int) -> List[Any]:
+    """One row of UPSERT_PROGRESSION_SQL, written as base_version + 1."""
+    return [
+        player.user_id,
+        player.overall_level,
+        len(player.milestone_achievements),
+        json.dumps(skill_levels(player)),
+        json.dumps(progression_to_dict(player)),
+        player.last_activity.astimezone(),
+        base_version + 1
+    ]
+
+
+def _json_column(value: Any) -> Any:
+    return json.loads(value) if isinstance(value, str) else value
+
+
+class ProgressionStore:
+    """
+    Player progression backed by Postgres.
+
+    Features:
+    - Players hydrate lazily on first access and stay in an LRU of hot players
+    - Writes mark a player dirty; a background flush writes each dirty player once per interval
+    - Clean cached players are revalidated against the stored version so workers converge
+    - Writes are compare-and-swap on the stored version; a player changed by another worker
+      is reloaded and this worker's unwritten events are replayed on top
+    - Memory-only without a pool: players are never evicted, matching the previous behaviour
+    """
+
+    def __init__(
+        self,
+        pool: Optional[asyncpg.Pool] = None,
+        max_resident: int = 10000,
+        flush_interval_seconds: float = 2.0,
+        revalidate_seconds: float = 30.0,
+        flush_batch_size: int = 200
+    ):
+        self.pool = pool
+        self.max_resident = max_resident
+        self.flush_interval_seconds = flush_interval_seconds
+        self.revalidate_seconds = revalidate_seconds
+        self.flush_batch_size = flush_batch_size
+
+        self._resident: "OrderedDict[str, PlayerProgression]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._validated_at: Dict[str, float] = {}
+        self._dirty: Set[str] = set()
+        # Events applied since the last successful write, replayed if that write conflicts
+        self._pending: Dict[str, List[Mutation]] = {}
+        self._task: Optional[asyncio.Task] = None
+        # Called with every player loaded or rebuilt from storage, e.g. to re-rank them
+        self.on_load: Optional[Callable[[PlayerProgression], None]] = None
+        self.stats = {
+            'hits': 0,
+            'hydrations': 0,
+            'revalidations': 0,
+            'refreshed': 0,
+            'misses': 0,
+            'flushes': 0,
+            'rows_written': 0,
+            'coalesced_writes': 0,
+            'flush_failures': 0,
+            'write_conflicts': 0,
+            'evictions': 0
+        }
+
+    def __contains__(self, user_id: object) -> bool:
+        return user_id in self._resident
+
+    def __len__(self) -> int:
+        return len(self._resident)
+
+    def resident_players(self) -> List[PlayerProgression]:
+        """Players currently held in memory."""
+        return list(self._resident.values())
+
+    def _remember(self, player: PlayerProgression, version: int):
+        self._resident[player.user_id] = player
+        self._resident.move_to_end(player.user_id)
+        self._versions[player.user_id] = version
+        self._validated_at[player.user_id] = time.monotonic()
+        self._evict()
+
+    def _forget(self, user_id: str):
+        self._resident.pop(user_id, None)
+        self._versions.pop(user_id, None)
+        self._validated_at.pop(user_id, None)
+        self._dirty.discard(user_id)
+        self._pending.pop(user_id, None)
+
+    def _evict(self):
+        """Drop the least recently used clean players beyond the resident limit."""
+        if self.pool is None:
+            return
+        excess = len(self._resident) - self.max_resident
+        if excess <= 0:
+            return
+        # The most recently used player is the one being served; never evict it
+        for user_id in list(self._resident)[:-1]:
+            if excess <= 0:
+                break
+            if user_id in self._dirty:
+                continue  # flushed by the next checkpoint, evictable after that
+            self._forget(user_id)
+            self.stats['evictions'] += 1
+            excess -= 1
+
+    async def _fetch(self, user_id: str) -> Optional[PlayerProgression]:
+        row = await self.pool.fetchrow(SELECT_PROGRESSION_SQL, user_id)
+        if row is None:
+            return None
+        player = progression_from_dict(_json_column(row['data']))
+        # Another request may have hydrated or changed the player while we waited
+        if user_id not in self._resident or user_id not in self._dirty:
+            self._remember(player, row['version'])
+            if self.on_load is not None:
+                self.on_load(player)
+        return self._resident[user_id]
+
+    async def get(self, user_id: str) -> Optional[PlayerProgression]:
+        """Get a player's progression, hydrating it from the database if needed."""
+        player = self._resident.get(user_id)
+        if player is not None:
+            self._resident.move_to_end(user_id)
+            self.stats['hits'] += 1
+            if (
+                self.pool is None
+                or user_id in self._dirty
+                or time.monotonic() - self._validated_at[user_id] < self.revalidate_seconds
+            ):
+                return player
+            return await self._revalidate(user_id, player)
+
+        if self.pool is None:
+            self.stats['misses'] += 1
+            return None
+
+        try:
+            player = await self._fetch(user_id)
+        except Exception as e:
+            logger.error(f"Failed to load progression for {user_id}: {e}")
+            return None
+        if player is None:
+            self.stats['misses'] += 1
+            return None
+        self.stats['hydrations'] += 1
+        return player
+
+    async def _revalidate(self, user_id: str, player: PlayerProgression) -> PlayerProgression:
+        """Reload a clean cached player if another worker has written a newer version."""
+        self.stats['revalidations'] += 1
+        try:
+            version = await self.pool.fetchval(SELECT_VERSION_SQL, user_id)
+            if version is not None and version != self._versions.get(user_id):
+                refreshed = await self._fetch(user_id)
+                if refreshed is not None:
+                    self.stats['refreshed'] += 1
+                    return refreshed
+        except Exception as e:
+            logger.error(f"Failed to revalidate progression for {user_id}: {e}")
+            return player
+        self._validated_at[user_id] = time.monotonic()
+        return player
+
+    async def get_or_create(self, user_id: str) -> PlayerProgression:
+        """Get a player's progression, starting a new one for unknown players."""
+        player = await self.get(user_id)
+        if player is None:
+            player = PlayerProgression(user_id=user_id)
+            self._remember(player, 0)
+            self._dirty.add(user_id)
+        return player
+
+    async def update(self, user_id: str, mutate: Callable[[PlayerProgression], Awaitable[T]]) -> T:
+        """
+        Apply an event to a player's progression and schedule it to be written.
+        The event is kept until written so it can be replayed if another worker wins the write.
+        """
+        player = await self.get_or_create(user_id)
+        result = await mutate(player)
+
+        current = self._resident.get(user_id)
+        if current is not None and current is not player:
+            # Refreshed or replayed while the event was being applied; apply it to the current copy
+            result = await mutate(current)
+            player = current
+
+        if self.pool is not None:
+            self._pending.setdefault(user_id, []).append(mutate)
+        self.mark_dirty(player)
+        return result
+
+    def mark_dirty(self, player: PlayerProgression):
+        """Record that a player changed; repeated changes before the next flush are written once."""
+        user_id = player.user_id
+        if self._resident.get(user_id) is not player:
+            # Evicted or refreshed while the change was being made; the changed copy wins
+            self._remember(player, self._versions.get(user_id, 0))
+        if user_id in self._dirty:
+            self.stats['coalesced_writes'] += 1
+        self._dirty.add(user_id)
+        self._resident.move_to_end(user_id)
+
+    async def delete(self, user_id: str) -> bool:
+        """Remove a player from memory and the database."""
+        removed = user_id in self._resident
+        self._forget(user_id)
+
+        if self.pool is not None:
+            try:
+                result = await self.pool.execute(DELETE_PROGRESSION_SQL, user_id)
+                removed = removed or result.endswith(" 1")
+            except Exception as e:
+                logger.error(f"Failed to delete progression for {user_id}: {e}")
+        return removed
+
+    def has_unwritten_changes(self, user_id: str) -> bool:
+        """Whether this worker holds changes to a player that are not yet stored."""
+        return user_id in self._dirty or user_id in self._pending
+
+    async def load_rankings(self) -> List[Any]:
+        """Leaderboard columns for every stored player."""
+        if self.pool is None:
+            return []
+        rows = await self.pool.fetch(SELECT_RANKINGS_SQL)
+        return [
+            (row['user_id'], row['overall_level'], row['milestones_count'], _json_column(row['skill_levels']))
+            for row in rows
+        ]
+
+    async def flush(self) -> int:
+        """Write dirty players in batches, returning the number written."""
+        if self.pool is None or not self._dirty:
+            return 0
+
+        written = 0
+        conflicted: List[str] = []
+        while self._dirty:
+            batch = [user_id for user_id in list(self._dirty)[:self.flush_batch_size] if user_id in self._resident]
+            self._dirty.difference_update(batch)
+            if not batch:
+                self._dirty.clear()
+                break
+            base_versions = {user_id: self._versions.get(user_id, 0) for user_id in batch}
+            # Events applied while the write is in flight stay pending for the next write
+            pending_counts = {user_id: len(self._pending.get(user_id, [])) for user_id in batch}
+            rows = [progression_to_row(self._resident[user_id], base_versions[user_id]) for user_id in batch]
+            try:
+                returned = await self.pool.fetch(UPSERT_PROGRESSION_SQL, *map(list, zip(*rows)))
+            except Exception as e:
+                logger.error(f"Progression flush failed for {len(rows)} players: {e}")
+                self._dirty.update(batch)
+                self.stats['flush_failures'] += 1
+                break
+
+            stored = {row['user_id']: row['version'] for row in returned}
+            for user_id in batch:
+                if user_id not in stored:
+                    conflicted.append(user_id)
+                    continue
+                if self._versions.get(user_id) == base_versions[user_id]:
+                    self._versions[user_id] = stored[user_id]
+                pending = self._pending.get(user_id)
+                if pending is not None:
+                    del pending[:pending_counts[user_id]]
+                    if not pending:
+                        del self._pending[user_id]
+            written += len(stored)
+
+        for user_id in conflicted:
+            await self._replay(user_id)
+
+        if written:
+            self.stats['flushes'] += 1
+            self.stats['rows_written'] += written
+            self._evict()
+        return written
+
+    async def _replay(self, user_id: str):
+        """Rebuild a player from the stored row and re-apply this worker's unwritten events."""
+        self.stats['write_conflicts'] += 1
+        try:
+            row = await self.pool.fetchrow(SELECT_PROGRESSION_SQL, user_id)
+        except Exception as e:
+            logger.error(f"Failed to reload progression for {user_id} after a write conflict: {e}")
+            self._dirty.add(user_id)
+            return
+
+        if row is None:
+            # Reset by another worker; the unwritten events start a new progression
+            player, version = PlayerProgression(user_id=user_id), 0
+        else:
+            player, version = progression_from_dict(_json_column(row['data'])), row['version']
+        # Events that arrive while replaying are appended to the same list and replayed too
+        replayed = 0
+        while replayed < len(self._pending.get(user_id, [])):
+            await self._pending[user_id][replayed](player)
+            replayed += 1
+
+        self._remember(player, version)
+        if self.on_load is not None:
+            self.on_load(player)
+        if replayed:
+            self._dirty.add(user_id)
+            logger.info(f"Replayed {replayed} progression events for {user_id} after a write conflict")
+
+    async def _flush_loop(self) -> None:
+        """Flush dirty players on a fixed interval."""
+        while True:
+            await asyncio.sleep(self.flush_interval_seconds)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Progression flush loop failed: {e}")
+
+    def start(self) -> None:
+        """Start the background flush loop."""
+        if self.pool is not None and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """Stop the flush loop and write any remaining changes."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get store statistics for monitoring."""
+        return {
+            **self.stats,
+            'resident_players': len(self._resident),
+            'max_resident': self.max_resident,
+            'dirty_players': len(self._dirty),
+            'persistent': self.pool is not None,
+            'running': self._task is not None and not self._task.done()
+        }
+
+
+async def create_progression_store() -> ProgressionStore:
+    """Build a progression store (PROGRESSION_DATABASE_URL enables Postgres)."""
+    pool = None
+    database_url = os.getenv("PROGRESSION_DATABASE_URL")
+    if database_url:
+        try:
+            pool = await asyncpg.create_pool(database_url, min_size=1, max_size=5, command_timeout=10)
+        except Exception as e:
+            logger.error(f"Progression database unavailable, keeping progression in memory only: {e}")
+
+    return ProgressionStore(
+        pool=pool,
+        max_resident=int(os.getenv("PROGRESSION_CACHE_SIZE", "10000"))
+    )
@@ -5,113 +5,42 @@ Monitors player progress and provides intelligent advancement recommendations.
 
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
-from dataclasses import dataclass, field
-from enum import Enum
 import logging
 import json
 import asyncio
+import hashlib
+import os
+from enum import Enum
 from collections import defaultdict
 
+from .progression_models import (
+    SkillArea, ProgressionMilestone, SkillProgress, AdventureSummary, PlayerProgression, AnalyticsSnapshot
+)
+from .progression_leaderboard import ProgressionLeaderboard
+from .progression_store import ProgressionStore, create_progression_store
+
 logger = logging.getLogger(__name__)
 
 
-class SkillArea(Enum):
-    PROBLEM_SOLVING = "problem_solving"
-    SOCIAL_INTERACTION = "social_interaction"
-    CREATIVE_THINKING = "creative_thinking"
-    LEADERSHIP = "leadership"
-    INVESTIGATION = "investigation"
-    EMPATHY = "empathy"
-    STRATEGIC_THINKING = "strategic_thinking"
-    PATIENCE = "patience"
-    COMMUNICATION = "communication"
-    DECISION_MAKING = "decision_making"
-
-
-class ProgressionMilestone(Enum):
-    FIRST_ADVENTURE = "first_adventure"
-    FIRST_SUCCESS = "first_success"
-    CREATIVE_SOLUTION = "creative_solution"
-    HELPED_OTHERS = "helped_others"
-    OVERCAME_CHALLENGE = "overcame_challenge"
-    SHOWED_LEADERSHIP = "showed_leadership"
-    ASKED_FOR_HELP = "asked_for_help"
-    TAUGHT_SOMEONE = "taught_someone"
-    SOLVED_MYSTERY = "solved_mystery"
-    MADE_FRIEND = "made_friend"
-
-
-@dataclass
-class SkillProgress:
-    skill_area: SkillArea
-    current_level: float
-    experiences: List[Dict[str, Any]] = field(default_factory=list)
-    milestone_achievements: List[str] = field(default_factory=list)
-    last_improvement: Optional[datetime] = None
-    confidence_in_skill: float = 5.0
-    
-    def add_experience(self, adventure_id: str, scene_id: str, outcome: str, impact: float, description: str):
-        """Add a new experience to this skill area."""
-        self.experiences.append({
-            "adventure_id": adventure_id,
-            "scene_id": scene_id,
-            "outcome": outcome,
-            "impact": impact,
-            "description": description,
-            "timestamp": datetime.now()
-        })
-        
-        # Update current level based on impact
-        self.current_level = min(10.0, max(0.0, self.current_level + impact))
-        self.last_improvement = datetime.now()
-        
-        # Update confidence based on success
-        if outcome in ["success", "critical_success"]:
-            self.confidence_in_skill = min(10.0, self.confidence_in_skill + impact * 0.5)
-        elif outcome in ["failure", "critical_failure"]:
-            self.confidence_in_skill = max(1.0, self.confidence_in_skill - impact * 0.2)
-
-
-@dataclass
-class AdventureSummary:
-    adventure_id: str
-    session_id: str
-    title: str
-    difficulty_level: str
-    completed_at: datetime
-    total_time_minutes: int
-    final_confidence_score: float
-    total_progress_points: int
-    scenes_completed: int
-    total_scenes: int
-    key_decisions: List[Dict[str, Any]]
-    skills_developed: Dict[str, float]
-    milestones_achieved: List[str]
-    learning_outcomes: List[str]
-    memorable_moments: List[str]
-    areas_for_growth: List[str]
-
-
-@dataclass
-class PlayerProgression:
-    user_id: str
-    overall_level: float = 1.0
-    total_adventures: int = 0
-    total_play_time_hours: float = 0.0
-    skill_progress: Dict[SkillArea, SkillProgress] = field(default_factory=dict)
-    adventure_history: List[AdventureSummary] = field(default_factory=list)
-    milestone_achievements: Dict[ProgressionMilestone, datetime] = field(default_factory=dict)
-    preferred_play_style: Dict[str, float] = field(default_factory=dict)
-    confidence_trend: List[Tuple[datetime, float]] = field(default_factory=list)
-    social_connections: List[str] = field(default_factory=list)
-    teaching_opportunities: int = 0
-    created_at: datetime = field(default_factory=datetime.now)
-    last_activity: datetime = field(default_factory=datetime.now)
+def _json_safe(value: Any) -> Any:
+    """Convert enum keys and values, and tuples, to their JSON forms."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, dict):
+        return {(key.value if isinstance(key, Enum) else key): _json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(item) for item in value]
+    return value
 
 
 class AutomaticProgressionTracker:
-    def __init__(self):
-        self.player_progressions: Dict[str, PlayerProgression] = {}
+    def __init__(self, store: Optional[ProgressionStore] = None, leaderboard_refresh_seconds: float = 60.0):
+        self.store = store if store is not None else ProgressionStore()
+        self.leaderboard = ProgressionLeaderboard()
+        # Players loaded from storage may have been changed by other workers; rank what was loaded
+        self.store.on_load = self.leaderboard.update
+        self.leaderboard_refresh_seconds = leaderboard_refresh_seconds
+        self._refresh_task: Optional[asyncio.Task] = None
         self.skill_mappings = {
             # Map adventure actions to skill areas
             "investigate": [SkillArea.PROBLEM_SOLVING, SkillArea.INVESTIGATION],
@@ -131,55 +60,57 @@ class AutomaticProgressionTracker:
         session_progress: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Track completion of an adventure and update player progression."""
-        if user_id not in self.player_progressions:
-            self.player_progressions[user_id] = PlayerProgression(user_id=user_id)
-        
-        player = self.player_progressions[user_id]
-        
-        # Create adventure summary
-        adventure_summary = self._create_adventure_summary(adventure_data, session_progress)
-        player.adventure_history.append(adventure_summary)
-        
-        # Update overall progression metrics
-        player.total_adventures += 1
-        player.total_play_time_hours += adventure_summary.total_time_minutes / 60
-        player.last_activity = datetime.now()
-        
-        # Track confidence progression
-        player.confidence_trend.append((datetime.now(), adventure_summary.final_confidence_score))
-        
-        # Update skill progressions
-        skills_developed = await self._analyze_skills_developed(adventure_data, session_progress)
-        for skill_area, impact in skills_developed.items():
-            if skill_area not in player.skill_progress:
-                player.skill_progress[skill_area] = SkillProgress(skill_area=skill_area, current_level=1.0)
+        async def apply(player: PlayerProgression) -> Dict[str, Any]:
+            # Create adventure summary
+            adventure_summary = self._create_adventure_summary(adventure_data, session_progress)
+            player.adventure_history.append(adventure_summary)
+        
+            # Update overall progression metrics
+            player.total_adventures += 1
+            player.total_play_time_hours += adventure_summary.total_time_minutes / 60
+            player.last_activity = datetime.now()
+        
+            # Track confidence progression
+            player.confidence_trend.append((datetime.now(), adventure_summary.final_confidence_score))
+        
+            # Update skill progressions
+            skills_developed = await self._analyze_skills_developed(adventure_data, session_progress)
+            for skill_area, impact in skills_developed.items():
+                if skill_area not in player.skill_progress:
+                    player.skill_progress[skill_area] = SkillProgress(skill_area=skill_area, current_level=1.0)
             
-            player.skill_progress[skill_area].add_experience(
-                adventure_summary.adventure_id,
-                "overall",
-                "completed",
-                impact,
-                f"Completed adventure: {adventure_summary.title}"
-            )
-        
-        # Check for milestone achievements
-        new_milestones = await self._check_milestone_achievements(player, adventure_summary)
-        
-        # Update overall level based on progression
-        player.overall_level = self._calculate_overall_level(player)
-        
-        # Analyze play style preferences
-        player.preferred_play_style = self._analyze_play_style(player)
-        
-        return {
-            "progression_update": {
-                "overall_level": player.overall_level,
-                "new_milestones": new_milestones,
-                "skills_developed": {skill.value: impact for skill, impact in skills_developed.items()},
-                "next_recommendations": await self._generate_recommendations(player)
-            },
-            "adventure_summary": adventure_summary
-        }
+                player.skill_progress[skill_area].add_experience(
+                    adventure_summary.adventure_id,
+                    "overall",
+                    "completed",
+                    impact,
+                    f"Completed adventure: {adventure_summary.title}"
+                )
+        
+            # Check for milestone achievements
+            new_milestones = await self._check_milestone_achievements(player, adventure_summary)
+        
+            # Update overall level based on progression
+            player.overall_level = self._calculate_overall_level(player)
+        
+            # Analyze play style preferences
+            player.preferred_play_style = self._analyze_play_style(player)
+        
+            player.revision += 1
+            await self._materialize_analytics(player)
+            self.leaderboard.update(player)
+        
+            return {
+                "progression_update": {
+                    "overall_level": player.overall_level,
+                    "new_milestones": new_milestones,
+                    "skills_developed": {skill.value: impact for skill, impact in skills_developed.items()},
+                    "next_recommendations": await self._generate_recommendations(player)
+                },
+                "adventure_summary": adventure_summary
+            }
+
+        return await self.store.update(user_id, apply)
 
     async def track_scene_outcome(
         self,
@@ -188,41 +119,95 @@ class AutomaticProgressionTracker:
         outcome_data: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Track individual scene outcomes for granular progression analysis."""
-        if user_id not in self.player_progressions:
-            self.player_progressions[user_id] = PlayerProgression(user_id=user_id)
-        
-        player = self.player_progressions[user_id]
+        async def apply(player: PlayerProgression) -> Dict[str, Any]:
+            # Analyze the scene for skill development
+            skills_used = self._identify_skills_used(scene_data, outcome_data)
         
-        # Analyze the scene for skill development
-        skills_used = self._identify_skills_used(scene_data, outcome_data)
-        
-        for skill_area, impact in skills_used.items():
-            if skill_area not in player.skill_progress:
-                player.skill_progress[skill_area] = SkillProgress(skill_area=skill_area, current_level=1.0)
+            for skill_area, impact in skills_used.items():
+                if skill_area not in player.skill_progress:
+                    player.skill_progress[skill_area] = SkillProgress(skill_area=skill_area, current_level=1.0)
             
-            player.skill_progress[skill_area].add_experience(
-                scene_data.get("adventure_id", "unknown"),
-                scene_data.get("scene_id", "unknown"),
-                outcome_data.get("outcome_type", "unknown"),
-                impact,
-                outcome_data.get("description", "Scene completed")
-            )
-        
-        return {
-            "skills_developed": {skill.value: impact for skill, impact in skills_used.items()},
-            "current_skill_levels": {
-                skill.value: progress.current_level 
-                for skill, progress in player.skill_progress.items()
+                player.skill_progress[skill_area].add_experience(
+                    scene_data.get("adventure_id", "unknown"),
+                    scene_data.get("scene_id", "unknown"),
+                    outcome_data.get("outcome_type", "unknown"),
+                    impact,
+                    outcome_data.get("description", "Scene completed")
+                )
+        
+            player.revision += 1
+            await self._materialize_analytics(player)
+            self.leaderboard.update(player)
+        
+            return {
+                "skills_developed": {skill.value: impact for skill, impact in skills_used.items()},
+                "current_skill_levels": {
+                    skill.value: progress.current_level 
+                    for skill, progress in player.skill_progress.items()
+                }
             }
-        }
+
+        return await self.store.update(user_id, apply)
+
+    async def get_player(self, user_id: str) -> Optional[PlayerProgression]:
+        """Get a player's progression, loading it from storage if it is not cached."""
+        return await self.store.get(user_id)
+
+    async def remove_player(self, user_id: str) -> bool:
+        """Delete a player's progression and drop them from the leaderboard."""
+        removed = await self.store.delete(user_id)
+        self.leaderboard.remove(user_id)
+        return removed
+
+    async def load_leaderboard(self) -> int:
+        """Rank every stored player without hydrating their progression."""
+        rankings = await self.store.load_rankings()
+        stored_user_ids = set()
+        for user_id, overall_level, milestones_count, skill_levels in rankings:
+            stored_user_ids.add(user_id)
+            # This worker's unwritten changes are newer than the stored columns
+            if not self.store.has_unwritten_changes(user_id):
+                self.leaderboard.update_from_columns(user_id, overall_level, milestones_count, skill_levels)
+        
+        # Players removed by other workers
+        if self.store.pool is not None:
+            for user_id in self.leaderboard.user_ids():
+                if user_id not in stored_user_ids and not self.store.has_unwritten_changes(user_id):
+                    self.leaderboard.remove(user_id)
+        return len(rankings)
+
+    async def _leaderboard_refresh_loop(self) -> None:
+        """Re-rank from stored columns so changes written by other workers show up."""
+        while True:
+            await asyncio.sleep(self.leaderboard_refresh_seconds)
+            try:
+                await self.load_leaderboard()
+            except Exception as e:
+                logger.error(f"Leaderboard refresh failed: {e}")
+
+    def start(self) -> None:
+        """Start the store's flush loop and, with shared storage, the leaderboard refresh loop."""
+        self.store.start()
+        if self.store.pool is not None and (self._refresh_task is None or self._refresh_task.done()):
+            self._refresh_task = asyncio.create_task(self._leaderboard_refresh_loop())
+
+    async def stop(self) -> None:
+        """Stop the refresh loop and flush the store."""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+        await self.store.stop()
 
     async def get_player_progression(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Get comprehensive progression data for a player."""
-        if user_id not in self.player_progressions:
+        player = await self.store.get(user_id)
+        if player is None:
             return None
         
-        player = self.player_progressions[user_id]
-        
         return {
             "user_id": player.user_id,
             "overall_level": player.overall_level,
@@ -233,6 +218,7 @@ class AutomaticProgressionTracker:
                     "current_level": progress.current_level,
                     "confidence": progress.confidence_in_skill,
                     "experiences_count": len(progress.experiences),
+                    "experience_summary": progress.experiences.summary(),
                     "last_improvement": progress.last_improvement.isoformat() if progress.last_improvement else None
                 }
                 for skill, progress in player.skill_progress.items()
@@ -263,11 +249,34 @@ class AutomaticProgressionTracker:
 
     async def get_progression_analytics(self, user_id: str) -> Dict[str, Any]:
         """Get detailed analytics about a player's progression."""
-        if user_id not in self.player_progressions:
+        snapshot = await self.get_analytics_snapshot(user_id)
+        if snapshot is None:
             return {"error": "No progression data found"}
+        return snapshot.body
+
+    async def get_analytics_snapshot(self, user_id: str) -> Optional[AnalyticsSnapshot]:
+        """Get the materialized analytics for a player's current revision."""
+        player = await self.store.get(user_id)
+        if player is None:
+            return None
         
-        player = self.player_progressions[user_id]
-        
+        # Players hydrated or refreshed from storage have not been materialized yet
+        if player.analytics is None or player.analytics.revision != player.revision:
+            await self._materialize_analytics(player)
+        return player.analytics
+
+    async def _materialize_analytics(self, player: PlayerProgression):
+        """Recompute a player's analytics after a tracked event and stamp them with the revision."""
+        body = _json_safe(await self._compute_progression_analytics(player))
+        digest = hashlib.sha1(json.dumps(body, sort_keys=True).encode()).hexdigest()
+        player.analytics = AnalyticsSnapshot(
+            revision=player.revision,
+            etag=f'"{digest}"',
+            body=body
+        )
+
+    async def _compute_progression_analytics(self, player: PlayerProgression) -> Dict[str, Any]:
+        """Derive analytics from a player's full progression."""
         # Calculate various analytics
         skill_growth_rates = self._calculate_skill_growth_rates(player)
         adventure_preferences = self._analyze_adventure_preferences(player)
@@ -600,10 +609,7 @@ class AutomaticProgressionTracker:
                 continue
             
             # Calculate growth over time
-            first_experience = progress.experiences[0]
-            last_experience = progress.experiences[-1]
-            
-            time_diff = (last_experience["timestamp"] - first_experience["timestamp"]).total_seconds() / 3600  # hours
+            time_diff = (progress.experiences.last_at - progress.experiences.first_at) / 3600  # hours
             level_diff = progress.current_level - 1.0  # Assuming starting level of 1.0
             
             if time_diff > 0:
@@ -640,6 +646,17 @@ class AutomaticProgressionTracker:
             "theme_preferences": [theme for theme, _ in preferred_themes[:3]]
         }
 
+    def _analyze_play_style(self, player: PlayerProgression) -> Dict[str, float]:
+        """Share of the player's experiences spent in each skill area."""
+        total_experiences = sum(len(progress.experiences) for progress in player.skill_progress.values())
+        if not total_experiences:
+            return {}
+
+        return {
+            skill.value: round(len(progress.experiences) / total_experiences, 3)
+            for skill, progress in player.skill_progress.items()
+        }
+
     def _calculate_learning_velocity(self, player: PlayerProgression) -> float:
         """Calculate how quickly the player learns and improves."""
         if player.total_play_time_hours < 1.0:
@@ -761,7 +778,7 @@ class AutomaticProgressionTracker:
         for milestone_name, progress in milestone_progress.items():
             if progress >= 50.0:
                 milestone_info = self._get_milestone_info(milestone_name)
-                upcoming.append(milestone_info)
+                upcoming.append({"milestone": milestone_name, **milestone_info})
         
         return sorted(upcoming, key=lambda x: milestone_progress[x["milestone"]], reverse=True)
 
@@ -818,5 +835,8 @@ async def get_progression_tracker() -> AutomaticProgressionTracker:
     """Get the global progression tracker instance."""
     global _progression_tracker
     if _progression_tracker is None:
-        _progression_tracker = AutomaticProgressionTracker()
+        _progression_tracker = AutomaticProgressionTracker(
+            store=await create_progression_store(),
+            leaderboard_refresh_seconds=float(os.getenv("PROGRESSION_LEADERBOARD_REFRESH_SECONDS", "60"))
+        )
     return _progression_tracker
\ No newline at end of file
@@ -0,0 +1,159 @@
+"""
+Tutorial Analytics Aggregates for SPARC.
+Maintains tutorial completion, timing and confidence statistics incrementally as tutorial events occur.
+"""
+
+import math
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Optional
+
+
+class QuantileSketch:
+    """
+    Streaming quantile sketch with bounded relative error (DDSketch-style log buckets).
+
+    Features:
+    - Quantiles are within relative_accuracy of the true value
+    - Memory grows with the log of the value range, not the number of samples
+    """
+
+    def __init__(self, relative_accuracy: float = 0.02):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = defaultdict(int)
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        if value <= 0:
+            self.zero_count += 1
+        else:
+            self.buckets[math.ceil(math.log(value) / self._log_gamma)] += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate value at quantile q (0-1)."""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                # Midpoint of the bucket (gamma^(i-1), gamma^i] in relative terms
+                return 2 * self.gamma ** index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def summary(self, quantiles: Iterable[float] = (0.5, 0.9, 0.99)) -> Dict[str, Any]:
+        """Count, mean and selected percentiles, rounded for API responses."""
+        result: Dict[str, Any] = {"count": self.count, "mean": _round(self.mean)}
+        for q in quantiles:
+            result[f"p{round(q * 100)}"] = _round(self.quantile(q))
+        return result
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 2) if value is not None else None
+
+
+class TutorialAnalytics:
+    """
+    Incrementally maintained tutorial and onboarding analytics.
+
+    Features:
+    - Updated on each tutorial step, completion and onboarding milestone
+    - Completion time, per-step time and confidence percentiles from streaming sketches
+    - Reads cost the same however many users have taken the tutorial
+    """
+
+    def __init__(self, confidence_target_percentage: float = 80.0):
+        self.confidence_target_percentage = confidence_target_percentage
+
+        self.tutorials_started = 0
+        self.tutorials_completed = 0
+        self.confident_users = 0
+        self.ready_to_gm = 0
+        self.completion_minutes = QuantileSketch()
+        self.step_minutes: Dict[str, QuantileSketch] = defaultdict(QuantileSketch)
+        self.confidence_percentage = QuantileSketch()
+        self.area_scores: Dict[str, QuantileSketch] = defaultdict(QuantileSketch)
+
+        self.onboarding_users = 0
+        self.onboarding_stages: Dict[str, int] = defaultdict(int)
+        self.onboarding_milestones: Dict[str, int] = defaultdict(int)
+
+        self._snapshot: Optional[Dict[str, Any]] = None
+
+    def record_tutorial_started(self):
+        self.tutorials_started += 1
+        self._snapshot = None
+
+    def record_step(self, step: str, minutes: float):
+        self.step_minutes[step].add(minutes)
+        self._snapshot = None
+
+    def record_tutorial_completed(self, total_minutes: float, confidence: Dict[str, Any]):
+        """Record a finished tutorial with its final confidence rating."""
+        self.tutorials_completed += 1
+        self.completion_minutes.add(total_minutes)
+        self.confidence_percentage.add(confidence["confidence_percentage"])
+        for area, breakdown in confidence["area_breakdown"].items():
+            self.area_scores[area].add(breakdown["score"])
+        if confidence["meets_target"]:
+            self.confident_users += 1
+        if confidence["ready_to_gm"]:
+            self.ready_to_gm += 1
+        self._snapshot = None
+
+    def record_onboarding_user(self, stage: str):
+        self.onboarding_users += 1
+        self.onboarding_stages[stage] += 1
+        self._snapshot = None
+
+    def record_onboarding_milestone(self, milestone: str, previous_stage: str, current_stage: str):
+        self.onboarding_milestones[milestone] += 1
+        if previous_stage != current_stage:
+            self.onboarding_stages[previous_stage] -= 1
+            self.onboarding_stages[current_stage] += 1
+        self._snapshot = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current analytics, rebuilt only after new events."""
+        if self._snapshot is not None:
+            return self._snapshot
+
+        if self.tutorials_completed == 0:
+            self._snapshot = {"message": "No completed tutorials yet"}
+            return self._snapshot
+
+        avg_completion_time = self.completion_minutes.mean
+        self._snapshot = {
+            "total_tutorials_started": self.tutorials_started,
+            "total_tutorials_completed": self.tutorials_completed,
+            "completion_rate": self.tutorials_completed / self.tutorials_started if self.tutorials_started else 0,
+            "avg_completion_time_minutes": avg_completion_time,
+            "completion_time_minutes": self.completion_minutes.summary(),
+            "target_completion_time": 10,
+            "meets_time_target": avg_completion_time <= 12,  # 2 minute buffer
+            "step_time_minutes": {step: sketch.summary() for step, sketch in self.step_minutes.items()},
+            "confidence_percentage": self.confidence_percentage.summary((0.1, 0.5, 0.9)),
+            "confidence_area_scores": {area: sketch.summary((0.5,)) for area, sketch in self.area_scores.items()},
+            "confident_users": self.confident_users,
+            "confident_rate": self.confident_users / self.tutorials_completed,
+            "meets_confidence_target": (
+                self.confidence_percentage.quantile(0.5) >= self.confidence_target_percentage
+            ),
+            "ready_to_gm": self.ready_to_gm,
+            "onboarding_users_tracked": self.onboarding_users,
+            "onboarding_stages": dict(self.onboarding_stages),
+            "onboarding_milestones": dict(self.onboarding_milestones)
+        }
+        return self._snapshot
@@ -0,0 +1,104 @@
+"""
+Precompiled Tutorial Content for SPARC.
+Serializes static tutorial step content and scenarios once into JSON bytes with strong ETags.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, is_dataclass
+from typing import Any, Dict, Optional
+
+from .tutorial_service import SEER_SCENARIOS, STEP_CONTENT, UNKNOWN_STEP_CONTENT, TutorialStep
+
+
+@dataclass(frozen=True)
+class StaticPayload:
+    """An encoded JSON response body with its validators."""
+    body: bytes
+    etag: str
+    cache_control: str
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"ETag": self.etag, "Cache-Control": self.cache_control}
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """Whether an If-None-Match header already names this payload."""
+        if not if_none_match:
+            return False
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in candidates or self.etag in candidates
+
+
+def _encode_default(value: Any) -> Any:
+    if is_dataclass(value):
+        return asdict(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def compile_payload(data: Dict[str, Any], cache_control: str) -> StaticPayload:
+    """Encode a response once; the ETag is a hash of the exact bytes served."""
+    body = json.dumps(data, default=_encode_default, separators=(",", ":")).encode()
+    return StaticPayload(body=body, etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"', cache_control=cache_control)
+
+
+class TutorialContentCatalog:
+    """
+    Tutorial step content and practice scenarios as ready-to-send responses.
+
+    Features:
+    - Compiled once per process; routes return the bytes without re-encoding
+    - Strong ETags derived from content, so every worker and CDN edge agrees
+    - Public Cache-Control so the content can be cached outside the API
+    """
+
+    def __init__(self, max_age_seconds: int = 3600):
+        cache_control = f"public, max-age={max_age_seconds}"
+
+        self.steps: Dict[TutorialStep, StaticPayload] = {
+            step: compile_payload({
+                "success": True,
+                "step": step.value,
+                "content": STEP_CONTENT.get(step, UNKNOWN_STEP_CONTENT)
+            }, cache_control)
+            for step in TutorialStep
+        }
+        self.scenario_list = compile_payload({
+            "success": True,
+            "scenarios": [
+                {
+                    "id": scenario.id,
+                    "title": scenario.title,
+                    "description": scenario.description,
+                    "difficulty_level": scenario.difficulty_level,
+                    "time_limit_minutes": scenario.time_limit_minutes,
+                    "character_count": len(scenario.player_characters)
+                }
+                for scenario in SEER_SCENARIOS
+            ]
+        }, cache_control)
+        self.scenarios: Dict[str, StaticPayload] = {
+            scenario.id: compile_payload({"success": True, "scenario": asdict(scenario)}, cache_control)
+            for scenario in SEER_SCENARIOS
+        }
+
+    def step(self, step: TutorialStep) -> StaticPayload:
+        return self.steps[step]
+
+    def scenario(self, scenario_id: str) -> Optional[StaticPayload]:
+        return self.scenarios.get(scenario_id)
+
+
+# Global compiled tutorial content
+_tutorial_content: Optional[TutorialContentCatalog] = None
+
+
+def get_tutorial_content() -> TutorialContentCatalog:
+    """Get the compiled tutorial content, compiling it on first use."""
+    global _tutorial_content
+    if _tutorial_content is None:
+        _tutorial_content = TutorialContentCatalog(
+            max_age_seconds=int(os.getenv("TUTORIAL_CONTENT_MAX_AGE_SECONDS", "3600"))
+        )
+    return _tutorial_content
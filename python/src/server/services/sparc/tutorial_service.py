@@ -11,6 +11,8 @@ import json
 import logging
 from uuid import uuid4
 
+from .tutorial_analytics import TutorialAnalytics
+
 logger = logging.getLogger(__name__)
 
 
@@ -80,7 +82,7 @@ class OnboardingMetrics:
     last_activity: Optional[datetime] = None
 
 
-@dataclass
+@dataclass(frozen=True)
 class TutorialScenario:
     """Practice scenario for tutorial."""
     id: str
@@ -95,6 +97,249 @@ class TutorialScenario:
     difficulty_level: int  # 1-5
 
 
+def _build_seer_scenarios() -> List[TutorialScenario]:
+    """Build the practice scenarios for the Seer tutorial."""
+    return [
+        TutorialScenario(
+            id="tavern_encounter",
+            title="The Tavern Introduction",
+            description="Your first scene - players meet in a tavern and get their first quest.",
+            setup="Four adventurers sit around a wooden table in the Crimson Drake tavern. A hooded figure approaches with urgent news.",
+            player_characters=[
+                {"name": "Aria", "class": "warrior", "hp": "18/18", "personality": "Bold and direct"},
+                {"name": "Finn", "class": "wizard", "hp": "12/12", "personality": "Curious and cautious"},
+                {"name": "Luna", "class": "rogue", "hp": "15/15", "personality": "Suspicious and witty"},
+                {"name": "Marcus", "class": "cleric", "hp": "16/16", "personality": "Kind and diplomatic"}
+            ],
+            decision_points=[
+                {
+                    "situation": "The hooded figure says 'I need brave souls for a dangerous task.'",
+                    "player_reactions": ["Aria wants to know more", "Finn examines the figure", "Luna checks for threats", "Marcus offers healing"],
+                    "seer_choices": ["Reveal the quest", "Ask for dice rolls", "Describe the figure"]
+                },
+                {
+                    "situation": "Players ask about reward and danger level.",
+                    "guidance": "This is when you set stakes and build excitement",
+                    "seer_choices": ["Offer specific gold amount", "Describe the danger vaguely", "Let players negotiate"]
+                }
+            ],
+            expected_actions=[
+                "Describe the scene setting mood",
+                "Respond to player questions",
+                "Call for dice rolls when appropriate",
+                "Advance the story based on outcomes"
+            ],
+            success_criteria={
+                "scene_description": "Vivid tavern atmosphere",
+                "player_engagement": "All players get spotlight time",
+                "dice_usage": "At least 2 dice rolls called",
+                "story_progression": "Quest accepted and direction established"
+            },
+            time_limit_minutes=8,
+            difficulty_level=2
+        ),
+        
+        TutorialScenario(
+            id="combat_basics",
+            title="First Combat Encounter",
+            description="Handle a simple combat with bandits - practice turn order and dice mechanics.",
+            setup="Two bandits ambush the party on a forest road. Initiative needs to be rolled.",
+            player_characters=[
+                {"name": "Thora", "class": "paladin", "hp": "20/20", "weapon": "Sword and shield"},
+                {"name": "Zara", "class": "ranger", "hp": "17/17", "weapon": "Longbow"},
+                {"name": "Pip", "class": "rogue", "hp": "14/14", "weapon": "Twin daggers"}
+            ],
+            decision_points=[
+                {
+                    "situation": "Combat begins - what do you do first?",
+                    "correct_action": "Roll initiative for all combatants",
+                    "common_mistakes": ["Forgetting initiative", "Not establishing turn order"]
+                },
+                {
+                    "situation": "Player asks 'Can I attack twice?'",
+                    "guidance": "Explain SPARC's simple action system",
+                    "correct_response": "One action per turn in SPARC - attack OR special ability"
+                }
+            ],
+            expected_actions=[
+                "Roll initiative and establish turn order",
+                "Guide players through attack rolls",
+                "Apply damage and track HP",
+                "Describe combat outcomes vividly"
+            ],
+            success_criteria={
+                "initiative_managed": "Turn order established correctly",
+                "dice_mechanics": "Attack rolls handled properly",
+                "hp_tracking": "Damage applied accurately",
+                "pacing": "Combat completed in reasonable time"
+            },
+            time_limit_minutes=6,
+            difficulty_level=3
+        )
+    ]
+
+
+def _build_step_content(seer_scenarios: Tuple[TutorialScenario, ...]) -> Dict[TutorialStep, Dict[str, Any]]:
+    """Build the content for every tutorial step."""
+    content_map = {
+        TutorialStep.WELCOME: {
+            "title": "Welcome to SPARC Seer Training!",
+            "content": "In the next 10 minutes, you'll learn everything you need to run amazing SPARC adventures. SPARC is designed to be simple - perfect for your first time as a Game Master!",
+            "duration_minutes": 0.5,
+            "key_points": [
+                "SPARC uses only 6-sided dice",
+                "Players have 4 simple stats: STR, DEX, INT, CHA", 
+                "Your job is to describe scenes and guide the story",
+                "The AI Assistant will help you with rules and ideas"
+            ],
+            "next_action": "Let's start with the basic rules..."
+        },
+        
+        TutorialStep.BASIC_RULES: {
+            "title": "SPARC Rules in 90 Seconds",
+            "content": "SPARC is intentionally simple. Here's everything players need to know:",
+            "duration_minutes": 1.5,
+            "key_points": [
+                "Roll 1d6 + stat vs difficulty (usually 8-16)",
+                "Combat: roll attack vs defense, deal damage",
+                "Special abilities: each character has one per adventure",
+                "Heroic saves: 3 per character to reroll failures"
+            ],
+            "interactive_element": "Try rolling dice with different difficulties",
+            "success_criteria": "Understand basic dice mechanics"
+        },
+        
+        TutorialStep.CHARACTER_SHEETS: {
+            "title": "Understanding Character Sheets", 
+            "content": "Each player has a simple character sheet. Let's explore what everything means:",
+            "duration_minutes": 1.0,
+            "demo_character": {
+                "name": "Tutorial Hero",
+                "class": "warrior", 
+                "stats": {"str": 6, "dex": 4, "int": 2, "cha": 3},
+                "hp": "18/18",
+                "special_ability": "Battle Fury",
+                "heroic_saves": "3/3"
+            },
+            "key_points": [
+                "Higher stats are better (1-6 scale)",
+                "HP represents health and stamina",
+                "Special abilities are powerful but limited",
+                "Players choose when to use heroic saves"
+            ]
+        },
+        
+        TutorialStep.DICE_ROLLING: {
+            "title": "Managing Dice Rolls",
+            "content": "When and how to call for dice rolls - this is your most important skill!",
+            "duration_minutes": 2.0,
+            "scenarios": [
+                {
+                    "situation": "Player wants to climb a wall",
+                    "call": "Roll STR vs difficulty 10",
+                    "why": "Physical challenge with clear success/failure"
+                },
+                {
+                    "situation": "Player asks what they see in a room",
+                    "call": "Just describe it - no roll needed",
+                    "why": "Basic perception doesn't need dice"
+                },
+                {
+                    "situation": "Player tries to persuade the king",
+                    "call": "Roll CHA vs difficulty 14",
+                    "why": "High stakes social challenge"
+                }
+            ],
+            "key_principles": [
+                "Only roll when outcome is uncertain",
+                "Set difficulty before rolling",
+                "Describe results dramatically"
+            ]
+        },
+        
+        TutorialStep.SCENE_MANAGEMENT: {
+            "title": "Bringing Scenes to Life",
+            "content": "Your words paint the world. Learn to describe scenes that engage all the senses:",
+            "duration_minutes": 1.5,
+            "examples": [
+                {
+                    "bland": "You're in a tavern.",
+                    "vivid": "Warm firelight flickers across weathered oak tables. The air smells of roasted meat and ale, while a bard's lute mingles with hushed conversations."
+                },
+                {
+                    "bland": "There are some bandits.",
+                    "vivid": "Three rough-looking figures step from behind trees, leather armor creaking. Their leader grins, revealing gold teeth as he hefts a notched axe."
+                }
+            ],
+            "techniques": [
+                "Use 2-3 sensory details per scene",
+                "Give NPCs one memorable trait", 
+                "Ask players what their characters do",
+                "Build on player descriptions"
+            ]
+        },
+        
+        TutorialStep.TURN_ORDER: {
+            "title": "Managing Turn Order & Initiative",
+            "content": "Keep the game flowing smoothly with good turn management:",
+            "duration_minutes": 1.0,
+            "key_points": [
+                "Roll initiative for combat (1d6 + DEX)",
+                "Outside combat, spotlight different players",
+                "Use the 'popcorn' method - let players pass initiative",
+                "Don't let anyone dominate the conversation"
+            ],
+            "interactive_demo": "Practice managing a 4-player initiative order"
+        },
+        
+        TutorialStep.AI_ASSISTANT: {
+            "title": "Using Your AI Seer Assistant",
+            "content": "You have a powerful AI assistant to help with rules, ideas, and situations:",
+            "duration_minutes": 1.0,
+            "features": [
+                "Ask about any rule - get instant clarification",
+                "Request scene suggestions when stuck",
+                "Get tactical advice for combat balance",
+                "Generate NPC names and personalities"
+            ],
+            "sample_prompts": [
+                "What should happen next in this scene?",
+                "How does grappling work?",
+                "Suggest some complications for this quest",
+                "Is this encounter too hard for level 1 characters?"
+            ],
+            "interactive_element": "Try asking the AI assistant a few questions"
+        },
+        
+        TutorialStep.PRACTICE_SCENARIO: {
+            "title": "Practice Session: The Tavern",
+            "content": "Time to put it all together! Run a short practice scenario with simulated players.",
+            "duration_minutes": 3.0,
+            "scenario": seer_scenarios[0],  # Tavern encounter
+            "guidance": [
+                "Start by describing the tavern scene",
+                "Introduce the hooded figure with mystery",
+                "Call for dice rolls when players investigate",
+                "End with the quest hook established"
+            ],
+            "evaluation_criteria": [
+                "Scene description quality",
+                "Player engagement",
+                "Dice roll timing",
+                "Story progression"
+            ]
+        }
+    }
+    
+    return content_map
+
+
+# Built once at import and shared by every service instance; treat as read-only
+SEER_SCENARIOS: Tuple[TutorialScenario, ...] = tuple(_build_seer_scenarios())
+STEP_CONTENT: Dict[TutorialStep, Dict[str, Any]] = _build_step_content(SEER_SCENARIOS)
+UNKNOWN_STEP_CONTENT: Dict[str, Any] = {"title": "Unknown Step", "content": ""}
+
+
 class SPARCTutorialService:
     """
     Comprehensive tutorial and onboarding service for SPARC.
@@ -108,13 +353,16 @@ class SPARCTutorialService:
     
     def __init__(self):
         # Tutorial scenarios
-        self.seer_scenarios = self._initialize_seer_scenarios()
+        self.seer_scenarios = SEER_SCENARIOS
         self.player_tutorials = self._initialize_player_tutorials()
         
         # Active tutorial sessions
         self.active_tutorials: Dict[str, TutorialProgress] = {}
         self.onboarding_tracking: Dict[str, OnboardingMetrics] = {}
         
+        # Aggregates updated as tutorial events occur
+        self.analytics = TutorialAnalytics()
+        
         # Confidence thresholds
         self.confidence_targets = {
             ConfidenceArea.RULES_KNOWLEDGE: 7,  # Target: 7/10
@@ -125,87 +373,6 @@ class SPARCTutorialService:
             ConfidenceArea.TECHNICAL_COMFORT: 7  # Target: 7/10
         }
     
-    def _initialize_seer_scenarios(self) -> List[TutorialScenario]:
-        """Initialize practice scenarios for Seer tutorial."""
-        return [
-            TutorialScenario(
-                id="tavern_encounter",
-                title="The Tavern Introduction",
-                description="Your first scene - players meet in a tavern and get their first quest.",
-                setup="Four adventurers sit around a wooden table in the Crimson Drake tavern. A hooded figure approaches with urgent news.",
-                player_characters=[
-                    {"name": "Aria", "class": "warrior", "hp": "18/18", "personality": "Bold and direct"},
-                    {"name": "Finn", "class": "wizard", "hp": "12/12", "personality": "Curious and cautious"},
-                    {"name": "Luna", "class": "rogue", "hp": "15/15", "personality": "Suspicious and witty"},
-                    {"name": "Marcus", "class": "cleric", "hp": "16/16", "personality": "Kind and diplomatic"}
-                ],
-                decision_points=[
-                    {
-                        "situation": "The hooded figure says 'I need brave souls for a dangerous task.'",
-                        "player_reactions": ["Aria wants to know more", "Finn examines the figure", "Luna checks for threats", "Marcus offers healing"],
-                        "seer_choices": ["Reveal the quest", "Ask for dice rolls", "Describe the figure"]
-                    },
-                    {
-                        "situation": "Players ask about reward and danger level.",
-                        "guidance": "This is when you set stakes and build excitement",
-                        "seer_choices": ["Offer specific gold amount", "Describe the danger vaguely", "Let players negotiate"]
-                    }
-                ],
-                expected_actions=[
-                    "Describe the scene setting mood",
-                    "Respond to player questions",
-                    "Call for dice rolls when appropriate",
-                    "Advance the story based on outcomes"
-                ],
-                success_criteria={
-                    "scene_description": "Vivid tavern atmosphere",
-                    "player_engagement": "All players get spotlight time",
-                    "dice_usage": "At least 2 dice rolls called",
-                    "story_progression": "Quest accepted and direction established"
-                },
-                time_limit_minutes=8,
-                difficulty_level=2
-            ),
-            
-            TutorialScenario(
-                id="combat_basics",
-                title="First Combat Encounter",
-                description="Handle a simple combat with bandits - practice turn order and dice mechanics.",
-                setup="Two bandits ambush the party on a forest road. Initiative needs to be rolled.",
-                player_characters=[
-                    {"name": "Thora", "class": "paladin", "hp": "20/20", "weapon": "Sword and shield"},
-                    {"name": "Zara", "class": "ranger", "hp": "17/17", "weapon": "Longbow"},
-                    {"name": "Pip", "class": "rogue", "hp": "14/14", "weapon": "Twin daggers"}
-                ],
-                decision_points=[
-                    {
-                        "situation": "Combat begins - what do you do first?",
-                        "correct_action": "Roll initiative for all combatants",
-                        "common_mistakes": ["Forgetting initiative", "Not establishing turn order"]
-                    },
-                    {
-                        "situation": "Player asks 'Can I attack twice?'",
-                        "guidance": "Explain SPARC's simple action system",
-                        "correct_response": "One action per turn in SPARC - attack OR special ability"
-                    }
-                ],
-                expected_actions=[
-                    "Roll initiative and establish turn order",
-                    "Guide players through attack rolls",
-                    "Apply damage and track HP",
-                    "Describe combat outcomes vividly"
-                ],
-                success_criteria={
-                    "initiative_managed": "Turn order established correctly",
-                    "dice_mechanics": "Attack rolls handled properly",
-                    "hp_tracking": "Damage applied accurately",
-                    "pacing": "Combat completed in reasonable time"
-                },
-                time_limit_minutes=6,
-                difficulty_level=3
-            )
-        ]
-    
     def _initialize_player_tutorials(self) -> Dict[str, Any]:
         """Initialize player tutorial content."""
         return {
@@ -245,6 +412,7 @@ class SPARCTutorialService:
         )
         
         self.active_tutorials[user_id] = progress
+        self.analytics.record_tutorial_started()
         logger.info(f"Started Seer tutorial for user {user_id}")
         return progress
     
@@ -271,6 +439,7 @@ class SPARCTutorialService:
         # Calculate step duration
         step_start = progress.step_start_times.get(completed_step.value, now)
         step_duration = (now - step_start).total_seconds() / 60.0
+        self.analytics.record_step(completed_step.value, step_duration)
         
         # Store step-specific data
         if step_data:
@@ -285,8 +454,13 @@ class SPARCTutorialService:
         
         if current_index >= len(step_order) - 1:
             # Tutorial complete
+            first_completion = progress.completed_at is None
             progress.completed_at = now
             progress.total_time_minutes = (now - progress.started_at).total_seconds() / 60.0
+            if first_completion:
+                self.analytics.record_tutorial_completed(
+                    progress.total_time_minutes, await self.calculate_confidence_rating(user_id)
+                )
             return True, None
         
         next_step = step_order[current_index + 1]
@@ -297,157 +471,7 @@ class SPARCTutorialService:
     
     def get_step_content(self, step: TutorialStep) -> Dict[str, Any]:
         """Get content for a tutorial step."""
-        content_map = {
-            TutorialStep.WELCOME: {
-                "title": "Welcome to SPARC Seer Training!",
-                "content": "In the next 10 minutes, you'll learn everything you need to run amazing SPARC adventures. SPARC is designed to be simple - perfect for your first time as a Game Master!",
-                "duration_minutes": 0.5,
-                "key_points": [
-                    "SPARC uses only 6-sided dice",
-                    "Players have 4 simple stats: STR, DEX, INT, CHA", 
-                    "Your job is to describe scenes and guide the story",
-                    "The AI Assistant will help you with rules and ideas"
-                ],
-                "next_action": "Let's start with the basic rules..."
-            },
-            
-            TutorialStep.BASIC_RULES: {
-                "title": "SPARC Rules in 90 Seconds",
-                "content": "SPARC is intentionally simple. Here's everything players need to know:",
-                "duration_minutes": 1.5,
-                "key_points": [
-                    "Roll 1d6 + stat vs difficulty (usually 8-16)",
-                    "Combat: roll attack vs defense, deal damage",
-                    "Special abilities: each character has one per adventure",
-                    "Heroic saves: 3 per character to reroll failures"
-                ],
-                "interactive_element": "Try rolling dice with different difficulties",
-                "success_criteria": "Understand basic dice mechanics"
-            },
-            
-            TutorialStep.CHARACTER_SHEETS: {
-                "title": "Understanding Character Sheets", 
-                "content": "Each player has a simple character sheet. Let's explore what everything means:",
-                "duration_minutes": 1.0,
-                "demo_character": {
-                    "name": "Tutorial Hero",
-                    "class": "warrior", 
-                    "stats": {"str": 6, "dex": 4, "int": 2, "cha": 3},
-                    "hp": "18/18",
-                    "special_ability": "Battle Fury",
-                    "heroic_saves": "3/3"
-                },
-                "key_points": [
-                    "Higher stats are better (1-6 scale)",
-                    "HP represents health and stamina",
-                    "Special abilities are powerful but limited",
-                    "Players choose when to use heroic saves"
-                ]
-            },
-            
-            TutorialStep.DICE_ROLLING: {
-                "title": "Managing Dice Rolls",
-                "content": "When and how to call for dice rolls - this is your most important skill!",
-                "duration_minutes": 2.0,
-                "scenarios": [
-                    {
-                        "situation": "Player wants to climb a wall",
-                        "call": "Roll STR vs difficulty 10",
-                        "why": "Physical challenge with clear success/failure"
-                    },
-                    {
-                        "situation": "Player asks what they see in a room",
-                        "call": "Just describe it - no roll needed",
-                        "why": "Basic perception doesn't need dice"
-                    },
-                    {
-                        "situation": "Player tries to persuade the king",
-                        "call": "Roll CHA vs difficulty 14",
-                        "why": "High stakes social challenge"
-                    }
-                ],
-                "key_principles": [
-                    "Only roll when outcome is uncertain",
-                    "Set difficulty before rolling",
-                    "Describe results dramatically"
-                ]
-            },
-            
-            TutorialStep.SCENE_MANAGEMENT: {
-                "title": "Bringing Scenes to Life",
-                "content": "Your words paint the world. Learn to describe scenes that engage all the senses:",
-                "duration_minutes": 1.5,
-                "examples": [
-                    {
-                        "bland": "You're in a tavern.",
-                        "vivid": "Warm firelight flickers across weathered oak tables. The air smells of roasted meat and ale, while a bard's lute mingles with hushed conversations."
-                    },
-                    {
-                        "bland": "There are some bandits.",
-                        "vivid": "Three rough-looking figures step from behind trees, leather armor creaking. Their leader grins, revealing gold teeth as he hefts a notched axe."
-                    }
-                ],
-                "techniques": [
-                    "Use 2-3 sensory details per scene",
-                    "Give NPCs one memorable trait", 
-                    "Ask players what their characters do",
-                    "Build on player descriptions"
-                ]
-            },
-            
-            TutorialStep.TURN_ORDER: {
-                "title": "Managing Turn Order & Initiative",
-                "content": "Keep the game flowing smoothly with good turn management:",
-                "duration_minutes": 1.0,
-                "key_points": [
-                    "Roll initiative for combat (1d6 + DEX)",
-                    "Outside combat, spotlight different players",
-                    "Use the 'popcorn' method - let players pass initiative",
-                    "Don't let anyone dominate the conversation"
-                ],
-                "interactive_demo": "Practice managing a 4-player initiative order"
-            },
-            
-            TutorialStep.AI_ASSISTANT: {
-                "title": "Using Your AI Seer Assistant",
-                "content": "You have a powerful AI assistant to help with rules, ideas, and situations:",
-                "duration_minutes": 1.0,
-                "features": [
-                    "Ask about any rule - get instant clarification",
-                    "Request scene suggestions when stuck",
-                    "Get tactical advice for combat balance",
-                    "Generate NPC names and personalities"
-                ],
-                "sample_prompts": [
-                    "What should happen next in this scene?",
-                    "How does grappling work?",
-                    "Suggest some complications for this quest",
-                    "Is this encounter too hard for level 1 characters?"
-                ],
-                "interactive_element": "Try asking the AI assistant a few questions"
-            },
-            
-            TutorialStep.PRACTICE_SCENARIO: {
-                "title": "Practice Session: The Tavern",
-                "content": "Time to put it all together! Run a short practice scenario with simulated players.",
-                "duration_minutes": 3.0,
-                "scenario": self.seer_scenarios[0],  # Tavern encounter
-                "guidance": [
-                    "Start by describing the tavern scene",
-                    "Introduce the hooded figure with mystery",
-                    "Call for dice rolls when players investigate",
-                    "End with the quest hook established"
-                ],
-                "evaluation_criteria": [
-                    "Scene description quality",
-                    "Player engagement",
-                    "Dice roll timing",
-                    "Story progression"
-                ]
-            }
-        }
-        
-        return content_map.get(step, {"title": "Unknown Step", "content": ""})
+        return STEP_CONTENT.get(step, UNKNOWN_STEP_CONTENT)
     
     async def evaluate_scenario_performance(
         self,
@@ -603,8 +627,10 @@ class SPARCTutorialService:
                 total_play_time_minutes=0.0,
                 milestone_achievements=[]
             )
+            self.analytics.record_onboarding_user(OnboardingStage.NEW_USER.value)
         
         metrics = self.onboarding_tracking[user_id]
+        previous_stage = metrics.current_stage
         metrics.milestone_achievements.append(milestone)
         metrics.last_activity = datetime.now(timezone.utc)
         
@@ -636,34 +662,12 @@ class SPARCTutorialService:
                     metrics.current_stage = OnboardingStage.SESSION_COMPLETED
                     metrics.stage_timestamps[OnboardingStage.SESSION_COMPLETED.value] = datetime.now(timezone.utc)
         
+        self.analytics.record_onboarding_milestone(milestone, previous_stage.value, metrics.current_stage.value)
         logger.info(f"Onboarding milestone '{milestone}' tracked for user {user_id}")
     
     def get_tutorial_analytics(self) -> Dict[str, Any]:
         """Get analytics on tutorial effectiveness."""
-        completed_tutorials = [t for t in self.active_tutorials.values() if t.completed_at]
-        
-        if not completed_tutorials:
-            return {"message": "No completed tutorials yet"}
-        
-        # Calculate metrics
-        completion_times = [t.total_time_minutes for t in completed_tutorials]
-        avg_completion_time = sum(completion_times) / len(completion_times)
-        
-        # Confidence ratings
-        confident_users = 0
-        for user_id in [t.user_id for t in completed_tutorials]:
-            confidence_data = asyncio.create_task(self.calculate_confidence_rating(user_id))
-            # This would need to be awaited properly in real implementation
-            
-        return {
-            "total_tutorials_started": len(self.active_tutorials),
-            "total_tutorials_completed": len(completed_tutorials),
-            "completion_rate": len(completed_tutorials) / len(self.active_tutorials) if self.active_tutorials else 0,
-            "avg_completion_time_minutes": avg_completion_time,
-            "target_completion_time": 10,
-            "meets_time_target": avg_completion_time <= 12,  # 2 minute buffer
-            "onboarding_users_tracked": len(self.onboarding_tracking)
-        }
+        return self.analytics.snapshot()
 
 
 # Global tutorial service instance
@@ -0,0 +1,236 @@
+"""
+Unified AI Response Cache for SPARC Seer Assistant.
+One LRU store with canonical keys shared by every AI caching layer.
+"""
+
+import json
+import hashlib
+import os
+import re
+import time
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, asdict, field
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Normalize case, whitespace and trailing punctuation of a prompt."""
+    return _WHITESPACE_PATTERN.sub(" ", prompt.lower()).strip().rstrip("?!.")
+
+
+def canonical_context_scope(context: Dict[str, Any]) -> Dict[str, Any]:
+    """The context fields that change generated advice."""
+    engagement = context.get("player_engagement", 5)
+    return {
+        "difficulty_level": context.get("difficulty_level", "newcomer"),
+        "scene_energy": context.get("scene_energy", "medium"),
+        "player_count": context.get("player_count") or len(context.get("characters", [])),
+        "engagement_level": "low" if engagement < 6 else "high" if engagement > 8 else "normal",
+        "current_scene": context.get("current_scene")
+    }
+
+
+def canonical_cache_key(prompt: str, context: Dict[str, Any]) -> str:
+    """Derive the cache key every AI layer uses for a prompt in a context."""
+    scope = json.dumps(canonical_context_scope(context), sort_keys=True, default=str)
+    return hashlib.sha256(f"{normalize_prompt(prompt)}|{scope}".encode()).hexdigest()[:32]
+
+
+@dataclass
+class AICacheEntry:
+    """A cached AI response with bookkeeping for eviction and ranking."""
+    value: Dict[str, Any]
+    layer: str
+    created_at: float
+    last_used: float
+    size_bytes: int
+    expires_at: Optional[float] = None
+    hits: int = 0
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.time() >= self.expires_at
+
+
+class UnifiedAICache:
+    """
+    Single AI response cache shared by the OpenAI client, the Seer and the
+    AI response cache service.
+
+    Features:
+    - Canonical key derivation so identical prompts hit from any layer
+    - O(1) LRU eviction bounded by entry count and memory size
+    - Per-entry TTL; rewriting a live entry never extends its expiry
+    - Shared hit/miss statistics broken down by calling layer
+    - Export/restore for snapshots across restarts
+    """
+
+    def __init__(self, max_entries: int = 2000, max_bytes: int = 8 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._entries: "OrderedDict[str, AICacheEntry]" = OrderedDict()
+        self._total_bytes = 0
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'writes': 0,
+            'evictions': 0,
+            'expirations': 0
+        }
+        self._layer_stats: Dict[str, Dict[str, int]] = {}
+
+    def _record(self, layer: str, outcome: str) -> None:
+        self.stats[outcome] += 1
+        layer_stats = self._layer_stats.setdefault(layer, {'hits': 0, 'misses': 0, 'writes': 0})
+        layer_stats[outcome] += 1
+
+    def get_entry(self, key: str, layer: str) -> Optional[AICacheEntry]:
+        """Look up an entry, marking it most recently used."""
+        entry = self._entries.get(key)
+        if entry is not None and entry.expired:
+            self.remove(key)
+            self.stats['expirations'] += 1
+            entry = None
+
+        if entry is None:
+            self._record(layer, 'misses')
+            return None
+
+        self._entries.move_to_end(key)
+        entry.hits += 1
+        entry.last_used = time.time()
+        self._record(layer, 'hits')
+        return entry
+
+    def get(self, key: str, layer: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached response, returning a copy callers may modify."""
+        entry = self.get_entry(key, layer)
+        return dict(entry.value) if entry is not None else None
+
+    def put(
+        self,
+        key: str,
+        value: Dict[str, Any],
+        layer: str,
+        ttl_seconds: Optional[float] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Store a response, evicting least recently used entries if over budget."""
+        now = time.time()
+        existing = self._entries.get(key)
+        hits = existing.hits if existing is not None else 0
+        expires_at = now + ttl_seconds if ttl_seconds else None
+        if existing is not None and not existing.expired and existing.expires_at is not None:
+            # Another layer cached this key with a shorter lifetime; keep it
+            expires_at = min(existing.expires_at, expires_at or existing.expires_at)
+        self.remove(key)
+
+        entry = AICacheEntry(
+            value=dict(value),
+            layer=layer,
+            created_at=now,
+            last_used=now,
+            # Serialized response plus a fixed allowance for entry overhead
+            size_bytes=len(json.dumps(value, default=str)) + 256,
+            expires_at=expires_at,
+            hits=hits,
+            metadata=dict(metadata or {})
+        )
+        self._entries[key] = entry
+        self._total_bytes += entry.size_bytes
+        self._record(layer, 'writes')
+
+        while self._entries and (len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self._total_bytes -= evicted.size_bytes
+            self.stats['evictions'] += 1
+
+    def remove(self, key: str) -> bool:
+        """Drop an entry."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._total_bytes -= entry.size_bytes
+        return True
+
+    def remove_where(self, predicate: Callable[[AICacheEntry], bool]) -> int:
+        """Drop every entry matching a predicate (maintenance, not the hot path)."""
+        keys = [key for key, entry in self._entries.items() if predicate(entry)]
+        for key in keys:
+            self.remove(key)
+        return len(keys)
+
+    def export(self, limit: int, rank_key: Optional[Callable[[AICacheEntry], float]] = None) -> List[Dict[str, Any]]:
+        """Export the hottest entries, most recently used first unless ranked otherwise."""
+        entries = [(key, entry) for key, entry in reversed(self._entries.items()) if not entry.expired]
+        if rank_key is not None:
+            entries.sort(key=lambda item: rank_key(item[1]), reverse=True)
+        return [{'key': key, **asdict(entry)} for key, entry in entries[:limit]]
+
+    def restore(self, entries: List[Dict[str, Any]]) -> int:
+        """Restore exported entries, skipping expired or malformed ones."""
+        restored = 0
+        # Insert coldest first so the hottest end up most recently used
+        for data in reversed(entries):
+            try:
+                data = dict(data)
+                key = data.pop('key')
+                entry = AICacheEntry(**data)
+            except (KeyError, TypeError) as e:
+                logger.warning(f"Skipping unreadable AI cache entry: {e}")
+                continue
+            if entry.expired:
+                continue
+
+            self.remove(key)
+            self._entries[key] = entry
+            self._total_bytes += entry.size_bytes
+            restored += 1
+
+        while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._total_bytes -= evicted.size_bytes
+            self.stats['evictions'] += 1
+        return restored
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get shared cache statistics for monitoring."""
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {
+            **self.stats,
+            'hit_rate': self.stats['hits'] / lookups if lookups else 0.0,
+            'size': len(self._entries),
+            'bytes': self._total_bytes,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'by_layer': {layer: dict(stats) for layer, stats in self._layer_stats.items()}
+        }
+
+
+# Global unified AI cache
+_unified_ai_cache: Optional[UnifiedAICache] = None
+
+
+def get_unified_ai_cache() -> UnifiedAICache:
+    """Get or create the unified AI response cache."""
+    global _unified_ai_cache
+    if _unified_ai_cache is None:
+        _unified_ai_cache = UnifiedAICache(
+            max_entries=int(os.getenv("AI_CACHE_MAX_ENTRIES", "2000")),
+            max_bytes=int(os.getenv("AI_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))
+        )
+    return _unified_ai_cache
@@ -0,0 +1,15 @@
+"""
+Shared test fixtures for the SPARC server tests.
+"""
+
+import pytest
+
+from src.server.services.sparc import unified_ai_cache
+
+
+@pytest.fixture(autouse=True)
+def fresh_unified_ai_cache():
+    """Give every test its own process-wide AI response cache."""
+    unified_ai_cache._unified_ai_cache = None
+    yield
+    unified_ai_cache._unified_ai_cache = None
@@ -0,0 +1,182 @@
+"""
+Tests for the adventure compiler.
+Validates scene graph indexing, validation, compiled documents and markdown import.
+"""
+
+import json
+
+import pytest
+
+from src.server.services.sparc.adventure_compiler import (
+    AdventureCompileError, CompiledAdventure, DEFAULT_MARKDOWN_DIR, _node_to_scene, compile_adventure,
+    compile_adventures, import_markdown_adventures, import_node_markdown, template_to_dict, write_compiled_adventure
+)
+from src.server.services.sparc.adventure_loader import AdventureLoader
+from src.server.services.sparc.adventure_models import (
+    AdventureScene, AdventureTemplate, DifficultyLevel, OutcomeType, SceneOutcome, SceneType
+)
+from src.server.services.sparc.adventure_service import AdventureContentService
+
+
+def make_scene(scene_id, targets=()):
+    return AdventureScene(
+        id=scene_id,
+        title=scene_id.title(),
+        scene_type=SceneType.EXPLORATION,
+        description="",
+        setup_text="",
+        decision_prompt="What do you do?",
+        available_actions=[{"id": target, "text": target} for target in targets],
+        outcomes={
+            target: SceneOutcome(OutcomeType.SUCCESS, "Done", "Onward", target, 10, 0.5)
+            for target in targets
+        },
+        time_estimate_minutes=5,
+        difficulty_hints=[],
+        gm_notes="",
+        required_dice_rolls=[]
+    )
+
+
+def make_template(scenes, template_id="test_adventure"):
+    return AdventureTemplate(
+        id=template_id,
+        title="Test Adventure",
+        description="",
+        theme="test",
+        difficulty_level=DifficultyLevel.NEWCOMER,
+        total_time_minutes=30,
+        target_players=2,
+        scenes=scenes,
+        learning_objectives=[],
+        required_materials=[],
+        success_criteria={}
+    )
+
+
+class TestCompileAdventure:
+    """Test graph compilation and validation."""
+
+    def test_graph_is_indexed(self):
+        """Scenes are indexed by id with default next scenes and adjacency."""
+        compiled = compile_adventure(make_template([
+            make_scene("start", ["end"]), make_scene("middle"), make_scene("end")
+        ]))
+
+        assert compiled.get_scene("middle").id == "middle"
+        assert compiled.default_next == {"start": "middle", "middle": "end", "end": None}
+        assert compiled.adjacency["start"] == ("middle", "end")
+        assert compiled.reachable == {"start", "middle", "end"}
+
+    def test_unknown_targets_fall_through(self):
+        """Outcomes leading to missing scenes resolve to the default next scene."""
+        compiled = compile_adventure(make_template([make_scene("start", ["missing"]), make_scene("end")]))
+
+        assert compiled.next_scene_id("start", "missing") == "end"
+        assert compiled.next_scene_id("end", None) is None
+        assert "unknown scene missing" in compiled.warnings[0]
+
+        with pytest.raises(AdventureCompileError):
+            compile_adventure(make_template([make_scene("start", ["missing"]), make_scene("end")]), strict=True)
+
+    def test_invalid_templates_are_rejected(self):
+        """Empty adventures, duplicate scenes and duplicate adventures fail to compile."""
+        with pytest.raises(AdventureCompileError):
+            compile_adventure(make_template([]))
+        with pytest.raises(AdventureCompileError):
+            compile_adventure(make_template([make_scene("start"), make_scene("start")]))
+        with pytest.raises(AdventureCompileError):
+            compile_adventures([make_template([make_scene("a")]), make_template([make_scene("b")])])
+
+    def test_compiled_document_round_trip(self, tmp_path):
+        """Compiled documents restore the template and the precomputed graph."""
+        compiled = compile_adventure(make_template([make_scene("start", ["missing"]), make_scene("end")]))
+        path = tmp_path / "test_adventure.json"
+        write_compiled_adventure(compiled, path)
+
+        restored = CompiledAdventure.from_dict(json.loads(path.read_text()))
+
+        assert restored.to_dict() == compiled.to_dict()
+        assert template_to_dict(restored.template) == template_to_dict(compiled.template)
+
+
+class TestMarkdownImport:
+    """Test importing chopped adventure node files."""
+
+    def test_thief_chase_import(self):
+        """Nodes become scenes with connections as actions."""
+        pytest.importorskip("yaml")
+        template = import_node_markdown(DEFAULT_MARKDOWN_DIR / "city" / "thief-chase-nodes.md")
+        compiled = compile_adventure(template, strict=True)
+
+        assert template.id == "thief_chase"
+        assert compiled.start_scene_id == "start_01"
+        assert compiled.get_scene("start_01").scene_type == SceneType.INTRODUCTION
+        assert compiled.get_scene("search_bandits").required_dice_rolls[0]["type"] == "intelligence"
+        assert compiled.get_scene("search_bandits").required_dice_rolls[0]["difficulty"] == 12
+        assert set(compiled.get_scene("authorities_01").outcomes) == {"success", "failure"}
+        assert "quest_complete" in compiled.reachable
+
+    def test_node_checks_map_onto_sparc_scale(self):
+        """d6 target numbers and tabletop attributes become SPARC difficulties and stats."""
+        def node(**properties):
+            return {"node_id": "check", "title": "Check", "properties": properties}
+
+        rolls = [
+            _node_to_scene(node(stat="Grace", difficulty=4), {}, 5).required_dice_rolls[0],
+            _node_to_scene(node(stat="Might"), {}, 5).required_dice_rolls[0]
+        ]
+
+        assert [(roll["type"], roll["difficulty"]) for roll in rolls] == [("dexterity", 14), ("strength", 12)]
+        with pytest.raises(AdventureCompileError):
+            _node_to_scene(node(stat="Luck", difficulty=3), {}, 5)
+        with pytest.raises(AdventureCompileError):
+            _node_to_scene(node(stat="Wit", difficulty=15), {}, 5)
+
+    def test_import_writes_loadable_documents(self, tmp_path):
+        """Imported node files become compiled documents the loader serves."""
+        pytest.importorskip("yaml")
+        assert import_markdown_adventures(DEFAULT_MARKDOWN_DIR, tmp_path) == 1
+
+        loader = AdventureLoader(tmp_path)
+
+        assert loader["thief_chase"].start_scene_id == "start_01"
+
+
+@pytest.mark.asyncio
+class TestServiceTransitions:
+    """Test the adventure service on compiled adventures."""
+
+    async def test_missing_scene_outcome_advances(self):
+        """Outcomes pointing at unwritten scenes advance instead of stranding the session."""
+        service = AdventureContentService()
+        await service.start_adventure("session-1", "haunted_mill")
+
+        result = await service.process_scene_outcome("session-1", "investigate_immediately")
+
+        assert result["next_scene_id"] == "mill_exterior_prepared"
+        assert (await service.get_current_scene("session-1"))["scene"]["id"] == "mill_exterior_prepared"
+
+    async def test_imported_scene_eases_for_struggling_players(self):
+        """Struggling players get easier checks in imported adventures, never harder ones."""
+        service = AdventureContentService()
+        progress = await service.start_adventure("session-1", "thief_chase")
+        progress.current_scene_id = "search_bandits"
+        stored = service.adventure_loader["thief_chase"].get_scene("search_bandits").required_dice_rolls[0]
+
+        progress.confidence_score = 2.0
+        struggling = (await service.get_current_scene("session-1"))["scene"]["required_dice_rolls"][0]
+
+        assert stored["difficulty"] == 12
+        assert struggling["difficulty"] == 10
+        assert struggling["type"] == "intelligence"
+
+    async def test_rolls_without_numeric_difficulty_render(self):
+        """Checks without a numeric difficulty are left alone by the difficulty bands."""
+        service = AdventureContentService()
+        scene = make_scene("start")
+        scene.required_dice_rolls = [{"type": "intelligence", "difficulty": None}]
+
+        adjusted = service._adjust_scene_difficulty(scene, "struggling")
+
+        assert adjusted.required_dice_rolls == [{"type": "intelligence", "difficulty": None}]
@@ -0,0 +1,96 @@
+"""
+Tests for batch adventure content generation.
+Validates concurrent bundles, partial failures, timeouts and missing sessions.
+"""
+
+import asyncio
+
+import pytest
+
+from src.server.services.sparc.adventure_service import AdventureContentService
+
+
+SCENE_BUNDLE = [
+    {"id": "npc", "content_type": "npc_dialogue", "context": {}},
+    {"id": "description", "content_type": "scene_description", "context": {"focus_area": "mill"}},
+    {"id": "reward", "content_type": "reward_description", "context": {"points": 15}},
+    {"id": "consequence", "content_type": "consequence_narrative", "context": {"outcome_type": "success"}}
+]
+
+
+@pytest.mark.asyncio
+class TestContentBatch:
+    """Test generating a scene's content bundle in one call."""
+
+    async def test_bundle_generates_every_item(self):
+        """All items succeed and come back in request order."""
+        service = AdventureContentService()
+        await service.start_adventure("session-1", "haunted_mill")
+
+        batch = await service.generate_content_batch("session-1", SCENE_BUNDLE)
+
+        assert batch["complete"] and batch["failed"] == 0
+        assert [result["id"] for result in batch["results"]] == ["npc", "description", "reward", "consequence"]
+        assert batch["results"][1]["content"]["emphasis"] == "mill"
+        assert batch["results"][2]["content"]["mechanical_benefit"] == "+15 progress points"
+        assert "narrative" in batch["results"][3]["content"]
+
+    async def test_partial_failure(self):
+        """An unknown content type fails its item only."""
+        service = AdventureContentService()
+        await service.start_adventure("session-1", "haunted_mill")
+
+        batch = await service.generate_content_batch("session-1", [
+            {"content_type": "npc_dialogue"},
+            {"content_type": "plot_twist"}
+        ])
+
+        assert batch["succeeded"] == 1 and batch["failed"] == 1
+        assert not batch["complete"]
+        assert batch["results"][1] == {
+            "index": 1, "id": None, "content_type": "plot_twist",
+            "success": False, "error": "Unknown content type: plot_twist"
+        }
+
+    async def test_items_run_concurrently_with_timeout(self):
+        """Slow items run side by side and time out individually."""
+        service = AdventureContentService()
+        service.content_timeout_seconds = 0.2
+        await service.start_adventure("session-1", "haunted_mill")
+
+        async def slow_description(progress, context):
+            await asyncio.sleep(context["delay"])
+            return {"description": "slow"}
+
+        service._generate_scene_description = slow_description
+
+        started = asyncio.get_running_loop().time()
+        batch = await service.generate_content_batch("session-1", [
+            {"content_type": "scene_description", "context": {"delay": 0.1}},
+            {"content_type": "scene_description", "context": {"delay": 0.1}},
+            {"content_type": "scene_description", "context": {"delay": 1.0}}
+        ])
+        elapsed = asyncio.get_running_loop().time() - started
+
+        assert elapsed < 0.5
+        assert [result["success"] for result in batch["results"]] == [True, True, False]
+        assert batch["results"][2]["error"] == "Content generation timed out"
+
+    async def test_missing_session(self):
+        """Batches for unknown sessions are rejected as a whole."""
+        service = AdventureContentService()
+
+        with pytest.raises(ValueError):
+            await service.generate_content_batch("missing", SCENE_BUNDLE)
+
+    async def test_consequence_is_seeded_by_session(self):
+        """Consequence narratives replay for the same session and inputs."""
+        service = AdventureContentService()
+        await service.start_adventure("session-1", "haunted_mill")
+        item = [{"content_type": "consequence_narrative", "context": {"outcome_type": "failure"}}]
+
+        first = await service.generate_content_batch("session-1", item)
+        second = await service.generate_content_batch("session-1", item)
+
+        assert first["results"][0]["content"] == second["results"][0]["content"]
+        assert service.content_generator.get_cache_stats()['hits'] == 1
@@ -0,0 +1,125 @@
+"""
+Tests for the data-driven adventure loader.
+Validates lazy loading, the LRU, hot reload and schema validation.
+"""
+
+import json
+import os
+
+import pytest
+
+from src.server.services.sparc.adventure_loader import AdventureLoader, DEFAULT_ADVENTURE_DIR
+from src.server.services.sparc.adventure_service import AdventureContentService
+
+
+def write_adventure(directory, adventure_id, title="Test Adventure", scenes=("start", "end"), mtime=None):
+    path = directory / f"{adventure_id}.json"
+    path.write_text(json.dumps({
+        "id": adventure_id,
+        "title": title,
+        "difficulty_level": "newcomer",
+        "scenes": [{"id": scene_id, "title": scene_id.title(), "scene_type": "exploration"} for scene_id in scenes]
+    }))
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+
+@pytest.fixture
+def loader(tmp_path):
+    return AdventureLoader(tmp_path, max_cached=2, reload_check_seconds=0)
+
+
+class TestAdventureLoader:
+    """Test loading adventures from definition files."""
+
+    def test_loads_on_first_use(self, tmp_path, loader):
+        """Files are indexed up front but parsed only when requested."""
+        write_adventure(tmp_path, "alpha")
+        write_adventure(tmp_path, "beta")
+
+        assert set(loader) == {"alpha", "beta"}
+        assert loader.get_stats()['cached'] == 0
+
+        assert loader["alpha"].start_scene_id == "start"
+        assert loader.templates["alpha"].title == "Test Adventure"
+        assert loader.stats['loads'] == 1
+
+    def test_lru_bounds_cached_adventures(self, tmp_path, loader):
+        """Least recently used adventures are evicted and reloaded on demand."""
+        for adventure_id in ("alpha", "beta", "gamma"):
+            write_adventure(tmp_path, adventure_id)
+            loader.get(adventure_id)
+
+        assert loader.get_stats()['cached'] == 2
+        assert loader.stats['evictions'] == 1
+        assert loader.get("alpha") is not None
+        assert loader.stats['loads'] == 4
+
+    def test_hot_reload(self, tmp_path, loader):
+        """Changed, new and deleted files are picked up without a restart."""
+        path = write_adventure(tmp_path, "alpha", mtime=1_000_000)
+        assert loader["alpha"].template.title == "Test Adventure"
+
+        write_adventure(tmp_path, "alpha", title="Revised", mtime=2_000_000)
+        write_adventure(tmp_path, "beta")
+
+        assert loader["alpha"].template.title == "Revised"
+        assert loader.stats['reloads'] == 1
+        assert "beta" in loader
+
+        path.unlink()
+        assert "alpha" not in loader
+        assert loader.get("alpha") is None
+
+    def test_invalid_edit_keeps_last_good_version(self, tmp_path, loader):
+        """A broken file is reported while the previous version stays in service."""
+        path = write_adventure(tmp_path, "alpha", mtime=1_000_000)
+        loader.get("alpha")
+
+        path.write_text('{"id": "alpha", "title": "Broken", "scenes": [{"id": "start"}]}')
+        os.utime(path, (2_000_000, 2_000_000))
+
+        assert loader["alpha"].template.title == "Test Adventure"
+        assert loader.stats['errors'] == 1
+
+    def test_rejects_invalid_definitions(self, tmp_path, loader):
+        """Definitions must match the schema and their file name."""
+        write_adventure(tmp_path, "empty", scenes=())
+        (tmp_path / "renamed.json").write_text(json.dumps({
+            "id": "other", "title": "Other", "scenes": [{"id": "start", "title": "Start", "scene_type": "social"}]
+        }))
+
+        assert loader.get("empty") is None
+        assert loader.get("renamed") is None
+        with pytest.raises(KeyError):
+            loader["renamed"]
+
+    def test_yaml_definitions(self, tmp_path, loader):
+        """YAML files are loaded when PyYAML is installed."""
+        pytest.importorskip("yaml")
+        (tmp_path / "alpha.yaml").write_text(
+            "id: alpha\ntitle: From YAML\nscenes:\n  - id: start\n    title: Start\n    scene_type: introduction\n"
+        )
+
+        assert loader["alpha"].template.title == "From YAML"
+
+
+class TestBundledAdventures:
+    """Test the adventures shipped with the server."""
+
+    def test_bundled_adventures_load(self):
+        """Every shipped definition validates and compiles."""
+        loader = AdventureLoader(DEFAULT_ADVENTURE_DIR)
+
+        assert {"haunted_mill", "dragons_riddle", "merchants_dilemma"} <= set(loader)
+        assert all(loader.get(adventure_id) is not None for adventure_id in loader)
+        assert loader.stats['errors'] == 0
+
+    def test_service_uses_loader(self, loader, tmp_path):
+        """The adventure service serves templates from its loader."""
+        write_adventure(tmp_path, "alpha")
+        service = AdventureContentService(adventure_loader=loader)
+
+        assert list(service.adventure_templates) == ["alpha"]
+        assert service.adventure_templates["alpha"].scenes[0].id == "start"
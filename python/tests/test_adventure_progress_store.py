@@ -0,0 +1,206 @@
+"""
+Tests for the adventure progress store.
+Validates batched checkpoints, idle eviction, lazy reloads and active session listing.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.server.services.sparc.adventure_models import AdventureProgress, OutcomeType
+from src.server.services.sparc.adventure_progress_store import (
+    AdventureProgressStore, UPSERT_PROGRESS_SQL, progress_from_row
+)
+from src.server.services.sparc.adventure_service import AdventureContentService
+
+
+COLUMNS = [
+    'session_id', 'adventure_id', 'current_scene_id', 'completed_scenes', 'scene_outcomes',
+    'total_progress_points', 'confidence_score', 'time_spent_minutes', 'started_at',
+    'last_activity', 'player_notes', 'gm_interventions', 'is_completed', 'player_count'
+]
+
+
+class FakePool:
+    """In-memory stand-in for an asyncpg pool running the store's queries."""
+
+    def __init__(self):
+        self.rows = {}
+        self.batches = []
+        self.fail = False
+
+    async def executemany(self, query, rows):
+        assert query == UPSERT_PROGRESS_SQL
+        if self.fail:
+            raise ConnectionError("database down")
+        self.batches.append(len(rows))
+        for row in rows:
+            self.rows[row[0]] = dict(zip(COLUMNS, row))
+
+    async def fetchrow(self, query, session_id):
+        return self.rows.get(session_id)
+
+    async def fetch(self, query, cutoff, limit):
+        rows = [row for row in self.rows.values() if row['last_activity'] > cutoff]
+        return sorted(rows, key=lambda row: row['last_activity'], reverse=True)[:limit]
+
+    async def execute(self, query, session_id):
+        return "DELETE 1" if self.rows.pop(session_id, None) is not None else "DELETE 0"
+
+
+def make_progress(session_id, minutes_ago=0):
+    now = datetime.now() - timedelta(minutes=minutes_ago)
+    return AdventureProgress(
+        session_id=session_id,
+        adventure_id="haunted_mill",
+        current_scene_id="mill_approach",
+        completed_scenes=["intro"],
+        scene_outcomes={"intro": OutcomeType.SUCCESS},
+        total_progress_points=10,
+        confidence_score=5.5,
+        time_spent_minutes=0,
+        started_at=now,
+        last_activity=now,
+        player_notes=[],
+        gm_interventions=0,
+        is_completed=False
+    )
+
+
+@pytest.mark.asyncio
+class TestAdventureProgressStore:
+    """Test the progress working set and its database checkpoints."""
+
+    async def test_memory_only_store(self):
+        """Without a database, progress lives in memory and checkpoints are no-ops."""
+        store = AdventureProgressStore()
+        store.add(make_progress("s1"))
+
+        assert (await store.get("s1")).current_scene_id == "mill_approach"
+        assert await store.get("missing") is None
+        assert await store.checkpoint() == 0
+
+    async def test_checkpoint_batches_dirty_sessions(self):
+        """Dirty sessions are upserted in batches and only once per change."""
+        pool = FakePool()
+        store = AdventureProgressStore(pool=pool, checkpoint_batch_size=2)
+        for index in range(5):
+            store.add(make_progress(f"s{index}"))
+
+        assert await store.checkpoint() == 5
+        assert sorted(pool.batches) == [1, 2, 2]
+        assert await store.checkpoint() == 0
+
+        store.mark_dirty(await store.get("s3"))
+        assert await store.checkpoint() == 1
+
+    async def test_failed_checkpoint_keeps_sessions_dirty(self):
+        """A failed flush is retried and blocks eviction of unsaved sessions."""
+        pool = FakePool()
+        pool.fail = True
+        store = AdventureProgressStore(pool=pool, idle_timeout_seconds=0)
+        store.add(make_progress("s1"))
+
+        assert await store.evict_idle() == 0
+        assert "s1" in store
+        assert store.get_stats()['checkpoint_failures'] >= 1
+
+        pool.fail = False
+        assert await store.evict_idle() == 1
+
+    async def test_evicted_sessions_reload_lazily(self):
+        """Idle sessions are checkpointed, evicted and restored on next access."""
+        pool = FakePool()
+        store = AdventureProgressStore(pool=pool, idle_timeout_seconds=0)
+        store.add(make_progress("s1"))
+
+        assert await store.evict_idle() == 1
+        assert "s1" not in store
+
+        progress = await store.get("s1")
+        assert progress.scene_outcomes == {"intro": OutcomeType.SUCCESS}
+        assert progress.completed_scenes == ["intro"]
+        assert "s1" in store
+        assert store.get_stats()['reloads'] == 1
+
+    async def test_sessions_used_during_eviction_checkpoint_stay_resident(self):
+        """A session fetched while eviction awaits its checkpoint is not dropped."""
+        pool = FakePool()
+        store = AdventureProgressStore(pool=pool, idle_timeout_seconds=0)
+        store.add(make_progress("s1"))
+        store.add(make_progress("s2"))
+        executemany = pool.executemany
+
+        async def executemany_then_fetch(query, rows):
+            await executemany(query, rows)
+            await store.get("s1")
+
+        pool.executemany = executemany_then_fetch
+
+        assert await store.evict_idle() == 1
+        assert "s1" in store
+        assert "s2" not in store
+
+    async def test_mark_dirty_restores_evicted_session(self):
+        """Changes made to a session evicted mid-update are kept and checkpointed."""
+        pool = FakePool()
+        store = AdventureProgressStore(pool=pool, idle_timeout_seconds=0)
+        store.add(make_progress("s1"))
+        progress = await store.get("s1")
+        await store.evict_idle()
+
+        progress.current_scene_id = "mill_interior"
+        store.mark_dirty(progress)
+
+        assert "s1" in store
+        assert await store.checkpoint() == 1
+        assert pool.rows["s1"]["current_scene_id"] == "mill_interior"
+
+    async def test_memory_only_eviction_drops_sessions(self):
+        """Without a database, abandoned sessions are still evicted."""
+        store = AdventureProgressStore(idle_timeout_seconds=0)
+        store.add(make_progress("s1"))
+
+        assert await store.evict_idle() == 1
+        assert await store.get("s1") is None
+        assert store.get_stats()['dropped_without_database'] == 1
+
+    async def test_list_active_merges_memory_and_database(self):
+        """Active sessions come from memory and the database, most recent first."""
+        pool = FakePool()
+        store = AdventureProgressStore(pool=pool, idle_timeout_seconds=0)
+        store.add(make_progress("evicted", minutes_ago=10))
+        await store.evict_idle()
+        store.add(make_progress("stale", minutes_ago=300))
+        store.add(make_progress("recent", minutes_ago=1))
+
+        active = await store.list_active(max_idle_minutes=120)
+
+        assert [progress.session_id for progress in active] == ["recent", "evicted"]
+        assert len(await store.list_active(max_idle_minutes=120, limit=1)) == 1
+
+    async def test_delete_removes_checkpointed_rows(self):
+        """Deleting a session removes it from memory and the database."""
+        pool = FakePool()
+        store = AdventureProgressStore(pool=pool)
+        store.add(make_progress("s1"))
+        await store.checkpoint()
+
+        assert await store.delete("s1") is True
+        assert "s1" not in pool.rows
+        assert await store.get("s1") is None
+        assert await store.delete("s1") is False
+
+    async def test_service_checkpoints_scene_outcomes(self):
+        """Scene outcomes processed by the service reach the database."""
+        pool = FakePool()
+        service = AdventureContentService(progress_store=AdventureProgressStore(pool=pool))
+        await service.start_adventure("session-1", "haunted_mill")
+        await service.progress_store.checkpoint()
+
+        result = await service.process_scene_outcome("session-1", "investigate_immediately")
+        await service.progress_store.checkpoint()
+
+        restored = progress_from_row(pool.rows["session-1"])
+        assert restored.current_scene_id == result["next_scene_id"]
+        assert len(restored.completed_scenes) == 1
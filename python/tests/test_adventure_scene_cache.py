@@ -0,0 +1,83 @@
+"""
+Tests for the adventure scene transition cache.
+Validates rendered scene reuse, prewarming and non-mutating difficulty adjustment.
+"""
+
+import pytest
+
+from src.server.services.sparc.adventure_service import AdventureContentService
+
+
+@pytest.mark.asyncio
+class TestSceneTransitionCache:
+    """Test cached scene rendering in the adventure service."""
+
+    async def test_scene_fetch_is_cached(self):
+        """Repeated fetches of a scene reuse the rendered payload."""
+        service = AdventureContentService()
+        await service.start_adventure("session-1", "haunted_mill")
+
+        first = await service.get_current_scene("session-1")
+        second = await service.get_current_scene("session-1")
+
+        assert first["scene"] is second["scene"]
+        assert service.get_scene_cache_stats()['hits'] == 1
+
+    async def test_sessions_share_rendered_scenes(self):
+        """Sessions in the same band and party size share cache entries."""
+        service = AdventureContentService()
+        await service.start_adventure("session-1", "haunted_mill")
+        await service.start_adventure("session-2", "haunted_mill")
+        await service.start_adventure("session-3", "haunted_mill", player_count=5)
+
+        first = await service.get_current_scene("session-1")
+        second = await service.get_current_scene("session-2")
+        large_party = await service.get_current_scene("session-3")
+
+        assert first["scene"] is second["scene"]
+        assert large_party["scene"] is not first["scene"]
+        assert large_party["scene"] == first["scene"]
+
+    async def test_next_scenes_are_prewarmed(self):
+        """Processing an outcome renders the next scene and its successors."""
+        service = AdventureContentService()
+        await service.start_adventure("session-1", "haunted_mill")
+
+        result = await service.process_scene_outcome("session-1", "investigate_immediately")
+        compiled = service.adventure_loader["haunted_mill"]
+        cached_scenes = {key[1] for key in service.scene_transition_cache}
+
+        assert result["next_scene_id"] in cached_scenes
+        assert set(compiled.adjacency[result["next_scene_id"]]) <= cached_scenes
+
+        await service.get_current_scene("session-1")
+        assert service.get_scene_cache_stats()['hits'] == 1
+        assert service.get_scene_cache_stats()['misses'] == 0
+
+    async def test_difficulty_adjustment_does_not_mutate_template(self):
+        """Struggling players get easier rolls without changing the shared scene."""
+        service = AdventureContentService()
+        progress = await service.start_adventure("session-1", "haunted_mill")
+        scene = service.adventure_loader["haunted_mill"].get_scene("mill_exterior_prepared")
+        progress.current_scene_id = scene.id
+        progress.confidence_score = 2.0
+
+        for _ in range(3):
+            service.scene_transition_cache.clear()
+            payload = (await service.get_current_scene("session-1"))["scene"]
+
+        assert payload["required_dice_rolls"][0]["difficulty"] == 10
+        assert len(payload["difficulty_hints"]) == len(scene.difficulty_hints) + 2
+        assert scene.required_dice_rolls[0]["difficulty"] == 12
+
+    async def test_cache_is_bounded(self):
+        """The oldest rendered scenes are evicted past the configured size."""
+        service = AdventureContentService()
+        service.scene_cache_size = 2
+        await service.start_adventure("session-1", "haunted_mill")
+        await service.get_current_scene("session-1")
+
+        await service.process_scene_outcome("session-1", "investigate_immediately")
+
+        assert len(service.scene_transition_cache) == 2
+        assert service.get_scene_cache_stats()['evictions'] > 0
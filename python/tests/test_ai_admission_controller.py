@@ -0,0 +1,123 @@
+"""
+Tests for admission control of outbound AI calls.
+Validates concurrency limits, rate budgets, priorities and fail-fast behavior.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from src.server.services.sparc.ai_admission_controller import (
+    AIAdmissionController, AdmissionConfig, RequestPriority, TokenBucket
+)
+from src.server.services.sparc.ai_request_scheduler import Deadline
+
+
+class TestTokenBucket:
+    """Test token bucket refill math."""
+
+    def test_consume_and_wait_time(self):
+        """An empty bucket reports the time needed to refill."""
+        bucket = TokenBucket(capacity_per_minute=60)  # 1 token per second
+        bucket.consume(60)
+
+        assert 0.9 < bucket.time_until_available(1) <= 1.0
+
+    def test_refund_caps_at_capacity(self):
+        """Refunds never overfill the bucket."""
+        bucket = TokenBucket(capacity_per_minute=100)
+        bucket.consume(10)
+        bucket.refund(50)
+
+        assert bucket.tokens <= 100
+
+
+@pytest.mark.asyncio
+class TestAIAdmissionController:
+    """Test admission control of AI calls."""
+
+    async def test_concurrency_limit_queues_requests(self):
+        """Requests beyond the concurrency limit wait for a release."""
+        controller = AIAdmissionController(AdmissionConfig(max_concurrent_requests=1))
+        first = await controller.acquire(RequestPriority.LIVE_ADVICE, 100, Deadline.from_budget_ms(2000))
+
+        waiter = asyncio.create_task(
+            controller.acquire(RequestPriority.LIVE_ADVICE, 100, Deadline.from_budget_ms(2000))
+        )
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+
+        controller.release(first)
+        second = await waiter
+
+        assert second is not None
+        assert second.queued_ms > 0
+        assert controller.in_flight == 1
+
+    async def test_live_advice_admitted_before_content_generation(self):
+        """Higher priority waiters are admitted first."""
+        controller = AIAdmissionController(AdmissionConfig(max_concurrent_requests=1))
+        held = await controller.acquire(RequestPriority.LIVE_ADVICE, 100, Deadline.from_budget_ms(2000))
+        order = []
+
+        async def wait_for(priority):
+            ticket = await controller.acquire(priority, 100, Deadline.from_budget_ms(2000))
+            order.append(priority)
+            await asyncio.sleep(0.01)
+            controller.release(ticket)
+
+        background = asyncio.create_task(wait_for(RequestPriority.BACKGROUND))
+        await asyncio.sleep(0)
+        live = asyncio.create_task(wait_for(RequestPriority.LIVE_ADVICE))
+        await asyncio.sleep(0)
+
+        controller.release(held)
+        await asyncio.gather(background, live)
+
+        assert order == [RequestPriority.LIVE_ADVICE, RequestPriority.BACKGROUND]
+
+    async def test_fails_fast_when_deadline_too_close(self):
+        """Requests that can't be served before their deadline are rejected immediately."""
+        controller = AIAdmissionController(AdmissionConfig(max_concurrent_requests=1))
+        await controller.acquire(RequestPriority.LIVE_ADVICE, 100, Deadline.from_budget_ms(2000))
+
+        start = time.perf_counter()
+        ticket = await controller.acquire(RequestPriority.LIVE_ADVICE, 100, Deadline.from_budget_ms(100))
+
+        assert ticket is None
+        assert (time.perf_counter() - start) < 0.01
+        assert controller.stats['rejected_deadline'] == 1
+
+    async def test_token_budget_rejects_when_refill_exceeds_deadline(self):
+        """Exhausted tokens-per-minute budget rejects requests it can't refill in time."""
+        controller = AIAdmissionController(AdmissionConfig(tokens_per_minute=600))
+        await controller.acquire(RequestPriority.LIVE_ADVICE, 600, Deadline.from_budget_ms(2000))
+
+        ticket = await controller.acquire(RequestPriority.LIVE_ADVICE, 300, Deadline.from_budget_ms(2000))
+
+        assert ticket is None
+
+    async def test_queue_wait_times_out_to_rejection(self):
+        """Queued requests give up before their deadline passes."""
+        controller = AIAdmissionController(AdmissionConfig(max_concurrent_requests=1))
+        await controller.acquire(RequestPriority.LIVE_ADVICE, 100, Deadline.from_budget_ms(2000))
+
+        start = time.perf_counter()
+        ticket = await controller.acquire(RequestPriority.BACKGROUND, 100, Deadline.from_budget_ms(300))
+
+        assert ticket is None
+        assert (time.perf_counter() - start) < 0.3
+        assert controller.get_stats()['queue_depth'] == 0
+
+    async def test_queue_time_metrics(self):
+        """Queue times are reported per priority class."""
+        controller = AIAdmissionController()
+        ticket = await controller.acquire(RequestPriority.LIVE_ADVICE, 100, Deadline.from_budget_ms(2000))
+        controller.release(ticket, actual_tokens=40)
+
+        stats = controller.get_stats()
+
+        assert stats['admitted'] == 1
+        assert stats['in_flight'] == 0
+        assert 'live_advice' in stats['queue_time_by_priority']
@@ -0,0 +1,139 @@
+"""
+Tests for offline Seer advice precomputation.
+Validates the scene walk, warm-tier file round trip and warm-tier cache hits.
+"""
+
+import pytest
+
+from src.server.services.sparc.adventure_service import AdventureContentService
+from src.server.services.sparc.ai_advice_precompute import (
+    SeerAdvicePrecomputeJob, write_warm_tier, load_warm_tier_entries
+)
+from src.server.services.sparc.ai_cache_service import AIResponseCacheService
+
+
+class StubSeer:
+    """Seer stand-in that answers every query, using rule-based advice for some scenes."""
+
+    def __init__(self, rule_based_scenes=()):
+        self.rule_based_scenes = set(rule_based_scenes)
+        self.calls = []
+
+    async def generate_contextual_advice(self, query, context, request_type, max_time_ms, priority):
+        self.calls.append((query, context["current_scene"], priority))
+        if context["current_scene"] in self.rule_based_scenes:
+            # Shape of EnhancedAISeerService._generate_scene_advice, which carries no fallback flag
+            return {
+                "type": "scene_guidance",
+                "title": "Scene Management Advice",
+                "content": "Players seem disengaged. Try adding an immediate choice or exciting development.",
+                "context": f"Scene: {context['current_scene']}, Engagement: 5/10",
+                "confidence": 0.8,
+                "follow_up_suggestions": ["Add sudden complication"],
+                "response_time_ms": 2900
+            }
+        return {
+            "type": "ai_generated",
+            "content": f"Advice for {context['current_scene']}",
+            "response_time_ms": 1800,
+            "from_cache": False
+        }
+
+
+@pytest.fixture
+def adventure_service():
+    return AdventureContentService()
+
+
+class TestPrecomputeRequests:
+    """Test the scene × action × outcome × party walk."""
+
+    def test_walks_every_scene_and_party_size(self, adventure_service):
+        """Every scene gets requests for each party size."""
+        job = SeerAdvicePrecomputeJob(adventure_service, StubSeer(), party_sizes=(2, 4))
+        requests = job.build_requests()
+
+        scene_ids = {
+            scene.id for template in adventure_service.adventure_templates.values() for scene in template.scenes
+        }
+        assert {request.scene_id for request in requests} == scene_ids
+        assert {request.party_size for request in requests} == {2, 4}
+        assert all(request.context["current_scene"] == request.scene_id for request in requests)
+
+    def test_actions_and_outcomes_become_queries(self, adventure_service):
+        """Each available action yields an action and an outcome query."""
+        job = SeerAdvicePrecomputeJob(adventure_service, StubSeer(), party_sizes=(2,))
+        template = adventure_service.adventure_templates["haunted_mill"]
+        scene = template.scenes[0]
+
+        queries = job._scene_queries(scene)
+
+        assert len(queries) == 3 + 2 * len(scene.available_actions)
+        assert any("ask villagers about the mill" in query for query in queries)
+
+    def test_missing_file_loads_nothing(self, tmp_path):
+        """A missing warm-tier file is not an error."""
+        assert load_warm_tier_entries(tmp_path / "missing.json.gz") == []
+
+
+@pytest.mark.asyncio
+class TestWarmTier:
+    """Test generating, storing and serving precomputed advice."""
+
+    async def test_run_skips_rule_based_advice(self, adventure_service):
+        """Only model-generated advice is written to the warm tier."""
+        seer = StubSeer(rule_based_scenes={"intro_village"})
+        job = SeerAdvicePrecomputeJob(adventure_service, seer, party_sizes=(2,))
+
+        entries = await job.run()
+
+        assert entries
+        assert all(entry["scene_id"] != "intro_village" for entry in entries)
+        assert job.stats['skipped_not_ai'] > 0
+        assert "response_time_ms" not in entries[0]["response"]
+
+    async def test_warm_tier_round_trip_and_hit(self, adventure_service, tmp_path):
+        """Written entries load into the cache and serve rephrased live prompts."""
+        job = SeerAdvicePrecomputeJob(adventure_service, StubSeer(), party_sizes=(3,))
+        path = tmp_path / "warm.json.gz"
+        write_warm_tier(await job.run(), path)
+
+        cache = AIResponseCacheService()
+        loaded = cache.load_warm_tier(load_warm_tier_entries(path))
+
+        response = await cache.get_cached_response(
+            "what should happen next in the village of millhaven",
+            {"adventure_id": "haunted_mill", "current_scene": "intro_village", "characters": [{}, {}, {}]}
+        )
+
+        assert loaded == len(job.build_requests())
+        assert response["content"] == "Advice for intro_village"
+        assert cache.performance_stats['warm_tier_hits'] == 1
+
+    async def test_warm_tier_scoped_by_party_size(self, adventure_service, tmp_path):
+        """Advice precomputed for one party size is not served to another."""
+        job = SeerAdvicePrecomputeJob(adventure_service, StubSeer(), party_sizes=(2,))
+        cache = AIResponseCacheService()
+        cache.load_warm_tier(await job.run())
+
+        response = await cache.get_cached_response(
+            "What should happen next in The Village of Millhaven?",
+            {"adventure_id": "haunted_mill", "current_scene": "intro_village", "player_count": 5}
+        )
+
+        assert response is None
+
+    async def test_warm_tier_scoped_by_adventure(self, adventure_service):
+        """Advice is not served to another adventure or to contexts without an adventure."""
+        job = SeerAdvicePrecomputeJob(adventure_service, StubSeer(), party_sizes=(2,))
+        cache = AIResponseCacheService()
+        cache.load_warm_tier(await job.run())
+        prompt = "What should happen next in The Village of Millhaven?"
+
+        assert await cache.get_cached_response(
+            prompt, {"adventure_id": "other_adventure", "current_scene": "intro_village", "player_count": 2}
+        ) is None
+        assert await cache.get_cached_response(prompt, {"current_scene": "intro_village", "player_count": 2}) is None
+        assert await cache.get_cached_response(
+            prompt, {"adventure_id": "haunted_mill", "current_scene": "intro_village", "player_count": 2}
+        ) is not None
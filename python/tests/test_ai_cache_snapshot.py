@@ -0,0 +1,95 @@
+"""
+Tests for AI cache snapshot and restore.
+Validates relevance-ranked snapshots and round trips across restarts.
+"""
+
+import time
+
+import pytest
+
+from src.server.services.sparc.ai_cache_service import AIResponseCacheService
+from src.server.services.sparc.ai_cache_snapshot import AICacheSnapshotter
+from src.server.services.sparc.openai_client import OpenAIClientService
+from src.server.services.sparc.unified_ai_cache import UnifiedAICache
+
+
+def make_snapshotter(tmp_path, cache=None, **kwargs) -> AICacheSnapshotter:
+    cache = cache or UnifiedAICache()
+    return AICacheSnapshotter(
+        cache,
+        path=tmp_path / "snapshot.json.gz",
+        rank_key=AIResponseCacheService(hot_cache=cache).entry_relevance,
+        **kwargs
+    )
+
+
+class TestAICacheSnapshotter:
+    """Test snapshot and restore of the AI cache."""
+
+    def test_round_trip_restores_entries(self, tmp_path):
+        """Entries saved before a restart are served by a fresh client after it."""
+        before = make_snapshotter(tmp_path)
+        client = OpenAIClientService(response_cache=before.cache)
+        key = client._generate_cache_key("Describe the fog", {"characters": [{}, {}]})
+        client._cache_response(key, {"content": "Cold mist curls around the mill"})
+        before.cache.put("rules", {"content": "Roll 1d6 + stat"}, layer="ai_cache", metadata={'prompt_type': 'rule_clarification'})
+
+        assert before.save() == 2
+
+        after = make_snapshotter(tmp_path)
+        restarted_client = OpenAIClientService(response_cache=after.cache)
+
+        assert after.restore() == 2
+        assert restarted_client._get_cached_response(key) == {"content": "Cold mist curls around the mill"}
+        assert after.cache.get_entry("rules", layer="ai_cache").metadata['prompt_type'] == 'rule_clarification'
+
+    def test_snapshot_keeps_hottest_entries(self, tmp_path):
+        """Only the most relevant entries are snapshotted."""
+        snapshotter = make_snapshotter(tmp_path, max_entries=1)
+        snapshotter.cache.put("hot", {"content": "new"}, layer="ai_cache")
+        for _ in range(5):
+            snapshotter.cache.get("hot", layer="ai_cache")
+        snapshotter.cache.put("cold", {"content": "old"}, layer="ai_cache")
+        snapshotter.cache.get_entry("cold", layer="ai_cache").created_at -= 12 * 3600
+
+        entries = snapshotter.collect()["entries"]
+
+        assert [entry["key"] for entry in entries] == ["hot"]
+
+    def test_restore_skips_expired_entries(self, tmp_path):
+        """Entries past their TTL are not restored."""
+        before = make_snapshotter(tmp_path)
+        before.cache.put("expiring", {"content": "old"}, layer="openai_client", ttl_seconds=60)
+        before.save()
+
+        snapshot_entries = before.collect()["entries"]
+        snapshot_entries[0]["expires_at"] = time.time() - 1
+        after = make_snapshotter(tmp_path)
+
+        assert after.cache.restore(snapshot_entries) == 0
+        assert "expiring" not in after.cache
+
+    def test_missing_or_corrupt_snapshot_restores_nothing(self, tmp_path):
+        """Boot proceeds with an empty cache when there is no usable snapshot."""
+        snapshotter = make_snapshotter(tmp_path)
+        assert snapshotter.restore() == 0
+
+        snapshotter.path.write_bytes(b"not gzip")
+        assert snapshotter.restore() == 0
+
+
+@pytest.mark.asyncio
+class TestSnapshotLoop:
+    """Test the background snapshot task."""
+
+    async def test_stop_writes_final_snapshot(self, tmp_path):
+        """Stopping the loop writes a snapshot even before the first interval."""
+        snapshotter = make_snapshotter(tmp_path, interval_seconds=3600)
+        snapshotter.cache.put("advice", {"content": "Ask each player"}, layer="seer")
+
+        snapshotter.start()
+        assert snapshotter.get_stats()['running']
+        await snapshotter.stop()
+
+        assert snapshotter.path.exists()
+        assert snapshotter.stats['snapshots_written'] == 1
@@ -0,0 +1,87 @@
+"""
+Tests for token-budgeted AI prompt building.
+Validates session digests, character dedup and budget enforcement.
+"""
+
+from src.server.services.sparc.ai_context_builder import AIContextBuilder, estimate_tokens, summarize_characters
+from src.server.services.sparc.openai_client import OpenAIClientService
+
+
+def make_rolls(count, start=0):
+    return [
+        {"id": f"roll-{i}", "roll_type": "attack", "total": 7, "is_success": i % 2 == 0}
+        for i in range(start, start + count)
+    ]
+
+
+class TestContextBuilder:
+    """Test prompt compaction."""
+
+    def test_plain_context_matches_simple_prompt(self):
+        """Requests without session detail keep the compact baseline format."""
+        built = AIContextBuilder().build_user_prompt("Goblins attack", {"player_engagement": 4})
+
+        assert built.text == (
+            "Situation: Goblins attack\nContext: players seem disengaged\n\nWhat should the GM do right now?"
+        )
+        assert built.dropped_sections == []
+
+    def test_older_events_are_digested_per_session(self):
+        """Events beyond the recent window are summarized, and re-sent events count once."""
+        builder = AIContextBuilder(recent_event_limit=3)
+        builder.build_user_prompt("What now?", {"session_id": "s1", "recent_rolls": make_rolls(5)})
+
+        built = builder.build_user_prompt("What now?", {"session_id": "s1", "recent_rolls": make_rolls(6)})
+
+        assert "Earlier: 3 events (3 rolls)" in built.text
+        assert built.text.count("attack roll") == 3 + 3  # recent window plus digest highlights
+        assert builder.stats['events_digested'] == 3
+
+    def test_repeated_characters_are_deduplicated(self):
+        """Duplicate character entries produce one descriptor."""
+        characters = [
+            {"id": "c1", "name": "Aria", "class": "cleric", "hp_percentage": 0.4},
+            {"id": "c1", "name": "Aria", "class": "cleric", "hp_percentage": 0.4},
+            {"id": "c2", "name": "Bram", "class": "warrior"}
+        ]
+
+        assert summarize_characters(characters) == ["Aria (cleric, 40% HP)", "Bram (warrior)"]
+
+    def test_prompt_stays_within_budget(self):
+        """Low-priority sections shrink or drop to respect the token budget."""
+        builder = AIContextBuilder(max_prompt_tokens=60)
+        context = {
+            "session_id": "s1",
+            "characters": [{"id": f"c{i}", "name": f"Hero number {i}", "class": "ranger"} for i in range(8)],
+            "recent_events": [f"A long description of event {i} at the mill" for i in range(20)]
+        }
+
+        built = builder.build_user_prompt("The party argues about the map", context)
+
+        assert built.tokens <= 60
+        assert built.dropped_sections
+        assert "Situation: The party argues about the map" in built.text
+        assert builder.get_stats()['prompts_compacted'] == 1
+
+    def test_system_prompt_counts_against_budget(self):
+        """Reserved system prompt tokens are part of the recorded prompt size."""
+        builder = AIContextBuilder(max_prompt_tokens=600)
+        built = builder.build_user_prompt("Help", {}, reserved_tokens=200)
+
+        assert built.tokens == estimate_tokens(built.text) + 200
+        assert builder.get_stats()['max_prompt_tokens'] == built.tokens
+
+
+class TestClientPromptMetrics:
+    """Test prompt size reporting in the OpenAI client."""
+
+    def test_prompt_size_in_performance_stats(self):
+        """The client records the size of every prompt it builds."""
+        client = OpenAIClientService()
+        system_prompt = client._build_system_prompt({})
+        client._build_user_prompt("Goblins attack", {"characters": [{"name": "Aria"}]}, system_prompt)
+
+        stats = client.get_performance_stats()["prompt_size"]
+
+        assert stats['prompts_built'] == 1
+        assert stats['avg_prompt_tokens'] > estimate_tokens(system_prompt)
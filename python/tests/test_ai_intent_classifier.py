@@ -0,0 +1,113 @@
+"""
+Tests for the precompiled AI intent classifier.
+Validates intent routing, confidence scoring and quick-response decisions.
+"""
+
+import pytest
+
+from src.server.services.sparc.ai_cache_service import AIResponseCacheService, AIPromptType
+from src.server.services.sparc.ai_intent_classifier import IntentClassifier
+from src.server.services.sparc.enhanced_ai_seer import EnhancedAISeerService
+
+
+@pytest.fixture
+def classifier():
+    return IntentClassifier()
+
+
+class TestIntentClassifier:
+    """Test single-pass intent classification."""
+
+    @pytest.mark.parametrize("query, quick_response_key", [
+        ("combat", "combat_start"),
+        ("Roll for initiative", "combat_start"),
+        ("skill check", "skill_check"),
+        ("players confused", "player_confused"),
+        ("I'm stuck!", "story_stall"),
+        ("help", "player_confused")
+    ])
+    def test_common_situations_route_to_quick_responses(self, classifier, query, quick_response_key):
+        """Short, unambiguous queries map to their quick response."""
+        match = classifier.classify(query)
+
+        assert match.quick_response_key == quick_response_key
+        assert classifier.is_quick(match)
+
+    def test_competing_intents_are_not_confident(self, classifier):
+        """Queries that hit several intents equally go to the model."""
+        match = classifier.classify("Players seem stuck in combat")
+
+        assert match.confidence < classifier.confidence_threshold
+        assert not classifier.is_quick(match)
+
+    def test_long_query_with_one_cue_goes_to_model(self, classifier):
+        """A single keyword in a detailed question doesn't trigger canned advice."""
+        match = classifier.classify("How should I handle the goblin ambush during combat near the river?")
+
+        assert match.intent == "combat_start"
+        assert not classifier.is_quick(match)
+
+    def test_partially_covered_query_goes_to_model(self, classifier):
+        """Confident matches with words no cue explains are not answered from a quick response."""
+        match = classifier.classify("Goblins attack the bridge")
+
+        assert match.confidence >= classifier.confidence_threshold
+        assert match.covered_words < match.content_words
+        assert not classifier.is_quick(match)
+
+    def test_longest_phrase_wins(self, classifier):
+        """Multi-word cues take precedence over their single-word parts."""
+        match = classifier.classify("what do i do")
+
+        assert match.intent == "player_confused"
+        assert match.scores == {"player_confused": 3.0}
+
+    def test_unmatched_query(self, classifier):
+        """Queries without cues have zero confidence and the general type."""
+        match = classifier.classify("Test query 1")
+
+        assert match.intent is None
+        assert match.request_type == "general"
+        assert match.confidence == 0.0
+
+
+class TestIntentRouting:
+    """Test services routing through the shared classifier."""
+
+    def test_prompt_type_classification(self):
+        """Cache prompt types come from the classifier, preferring earlier rules on ties."""
+        cache = AIResponseCacheService()
+
+        assert cache._classify_prompt_type("What are the basic rules for combat?", {}) == AIPromptType.RULE_CLARIFICATION
+        assert cache._classify_prompt_type("Suggest tactical options", {}) == AIPromptType.TACTICAL_ADVICE
+        assert cache._classify_prompt_type("Tell me about the old mill", {}) == AIPromptType.STORY_CONTINUATION
+
+    def test_general_requests_take_classified_type(self):
+        """General requests are typed from the query when the match is confident."""
+        seer = EnhancedAISeerService()
+
+        assert seer._route_query("skill check", "general") == ("rule_clarification", "skill_check")
+        assert seer._route_query("skill check", "player_help") == ("player_help", "skill_check")
+        assert seer._route_query("Tell me about the old mill", "general") == ("general", None)
+
+    @pytest.mark.asyncio
+    async def test_seer_quick_response(self):
+        """Confident quick intents are answered without calling the model."""
+        seer = EnhancedAISeerService()
+
+        advice = await seer.generate_contextual_advice("stuck", {}, request_type="scene_guidance")
+
+        assert advice["type"] == "quick_response"
+        assert advice["request_type"] == "scene_guidance"
+        assert advice["title"] == "Add Scene Energy"
+
+    @pytest.mark.asyncio
+    async def test_quick_response_follows_intent(self):
+        """The quick response answers the matched intent, not just the request type."""
+        seer = EnhancedAISeerService()
+
+        combat = await seer.generate_contextual_advice("Roll for initiative", {}, request_type="rule_clarification")
+        dice = await seer.generate_contextual_advice("skill check", {}, request_type="rule_clarification")
+
+        assert combat["title"] == "Combat Flow"
+        assert dice["title"] == "Basic Dice Rolling"
@@ -0,0 +1,143 @@
+"""
+Tests for micro-batching of AI Seer prompts.
+Validates batching windows, demultiplexing and per-request deadlines.
+"""
+
+import asyncio
+
+import pytest
+
+from src.server.services.sparc.ai_micro_batcher import (
+    AIMicroBatcher, build_batch_prompt, parse_batch_response
+)
+from src.server.services.sparc.ai_request_scheduler import Deadline
+
+
+class TestBatchPrompt:
+    """Test multi-part prompt building and parsing."""
+
+    def test_prompt_numbers_each_situation(self):
+        """Each user prompt appears as a numbered situation."""
+        prompt = build_batch_prompt(["Goblins attack", "Players are lost"])
+
+        assert "1. Goblins attack" in prompt
+        assert "2. Players are lost" in prompt
+        assert "JSON array of 2 strings" in prompt
+
+    def test_parse_handles_code_fences(self):
+        """Fenced JSON arrays are accepted."""
+        content = '```json\n["Roll initiative.", "Offer a clue."]\n```'
+
+        assert parse_batch_response(content, 2) == ["Roll initiative.", "Offer a clue."]
+
+    def test_parse_rejects_count_mismatch(self):
+        """Responses with the wrong number of answers are rejected."""
+        assert parse_batch_response('["Only one"]', 2) is None
+        assert parse_batch_response("not json", 1) is None
+
+
+@pytest.mark.asyncio
+class TestAIMicroBatcher:
+    """Test the micro-batcher."""
+
+    async def test_concurrent_prompts_share_one_batch(self):
+        """Prompts arriving within the window are sent together and demultiplexed."""
+        batches = []
+
+        async def send_batch(system_prompt, user_prompts, deadline, priority):
+            batches.append(list(user_prompts))
+            return [f"answer to {prompt}" for prompt in user_prompts]
+
+        batcher = AIMicroBatcher(send_batch, window_ms=20)
+        deadline = Deadline.from_budget_ms(1000)
+
+        answers = await asyncio.gather(*[
+            batcher.submit("system", f"prompt {i}", deadline) for i in range(3)
+        ])
+
+        assert answers == ["answer to prompt 0", "answer to prompt 1", "answer to prompt 2"]
+        assert len(batches) == 1
+        assert batcher.get_stats()['avg_batch_size'] == 3
+
+    async def test_different_system_prompts_batch_separately(self):
+        """Only prompts with the same system prompt are combined."""
+        batches = []
+
+        async def send_batch(system_prompt, user_prompts, deadline, priority):
+            batches.append(system_prompt)
+            return ["ok"] * len(user_prompts)
+
+        batcher = AIMicroBatcher(send_batch, window_ms=10)
+        deadline = Deadline.from_budget_ms(1000)
+
+        await asyncio.gather(
+            batcher.submit("newcomer", "a", deadline),
+            batcher.submit("experienced", "b", deadline)
+        )
+
+        assert sorted(batches) == ["experienced", "newcomer"]
+
+    async def test_full_batch_flushes_immediately(self):
+        """Reaching max batch size dispatches without waiting for the window."""
+        async def send_batch(system_prompt, user_prompts, deadline, priority):
+            return ["ok"] * len(user_prompts)
+
+        batcher = AIMicroBatcher(send_batch, window_ms=5000, max_batch_size=2)
+        deadline = Deadline.from_budget_ms(1000)
+
+        answers = await asyncio.wait_for(
+            asyncio.gather(batcher.submit("s", "a", deadline), batcher.submit("s", "b", deadline)),
+            timeout=0.5
+        )
+
+        assert answers == ["ok", "ok"]
+
+    async def test_request_gives_up_at_its_own_deadline(self):
+        """A waiter with a short deadline returns None without failing the batch."""
+        async def send_batch(system_prompt, user_prompts, deadline, priority):
+            await asyncio.sleep(0.2)
+            return ["ok"] * len(user_prompts)
+
+        batcher = AIMicroBatcher(send_batch, window_ms=10)
+
+        short, long = await asyncio.gather(
+            batcher.submit("s", "a", Deadline.from_budget_ms(50)),
+            batcher.submit("s", "b", Deadline.from_budget_ms(1000))
+        )
+
+        assert short is None
+        assert long == "ok"
+        assert batcher.stats['deadline_expired'] == 1
+
+    async def test_failed_batch_resolves_all_waiters(self):
+        """A batch failure resolves every member with None."""
+        async def send_batch(system_prompt, user_prompts, deadline, priority):
+            raise RuntimeError("provider error")
+
+        batcher = AIMicroBatcher(send_batch, window_ms=10)
+        deadline = Deadline.from_budget_ms(1000)
+
+        answers = await asyncio.gather(batcher.submit("s", "a", deadline), batcher.submit("s", "b", deadline))
+
+        assert answers == [None, None]
+        assert batcher.stats['failed_batches'] == 1
+
+    async def test_cancelled_requests_are_not_sent(self):
+        """Callers cancelled before the flush, like losing hedges, are dropped from the batch."""
+        batches = []
+
+        async def send_batch(system_prompt, user_prompts, deadline, priority):
+            batches.append(list(user_prompts))
+            return ["ok"] * len(user_prompts)
+
+        batcher = AIMicroBatcher(send_batch, window_ms=30)
+        deadline = Deadline.from_budget_ms(1000)
+
+        loser = asyncio.ensure_future(batcher.submit("s", "hedge", deadline))
+        winner = asyncio.ensure_future(batcher.submit("s", "primary", deadline))
+        await asyncio.sleep(0)
+        loser.cancel()
+
+        assert await winner == "ok"
+        assert batches == [["primary"]]
+        assert batcher.stats['dropped_requests'] == 1
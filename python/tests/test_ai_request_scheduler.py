@@ -0,0 +1,146 @@
+"""
+Tests for the deadline-aware AI request scheduler.
+Validates hedging, loser cancellation and deadline fallbacks.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from src.server.services.sparc.ai_request_scheduler import Deadline, HedgedRequestScheduler
+from src.server.services.sparc.openai_client import OpenAIClientService
+
+
+@pytest.mark.asyncio
+class TestHedgedRequestScheduler:
+    """Test hedged request scheduling."""
+
+    async def test_fast_request_is_not_hedged(self):
+        """Requests finishing before the hedge delay run once."""
+        scheduler = HedgedRequestScheduler(default_hedge_delay_ms=200)
+        calls = []
+
+        async def request(deadline):
+            calls.append(deadline)
+            return {"success": True}
+
+        result = await scheduler.run(request, Deadline.from_budget_ms(1000))
+
+        assert result == {"success": True}
+        assert len(calls) == 1
+        assert scheduler.stats['hedges_sent'] == 0
+
+    async def test_slow_request_is_hedged_and_loser_cancelled(self):
+        """A slow primary triggers a hedge; the winner cancels the loser."""
+        scheduler = HedgedRequestScheduler(default_hedge_delay_ms=50)
+        attempts = []
+        cancelled = []
+
+        async def request(deadline):
+            attempt = len(attempts)
+            attempts.append(attempt)
+            try:
+                await asyncio.sleep(0.5 if attempt == 0 else 0.01)
+            except asyncio.CancelledError:
+                cancelled.append(attempt)
+                raise
+            return {"success": True, "attempt": attempt}
+
+        start = time.perf_counter()
+        result = await scheduler.run(request, Deadline.from_budget_ms(1000))
+        await asyncio.sleep(0)
+
+        assert result["attempt"] == 1
+        assert (time.perf_counter() - start) < 0.3
+        assert cancelled == [0]
+        assert scheduler.stats['hedge_wins'] == 1
+
+    async def test_deadline_miss_returns_none(self):
+        """Requests that can't finish in time give up at the deadline."""
+        scheduler = HedgedRequestScheduler(default_hedge_delay_ms=50)
+
+        async def request(deadline):
+            await asyncio.sleep(1)
+            return {"success": True}
+
+        start = time.perf_counter()
+        result = await scheduler.run(request, Deadline.from_budget_ms(200))
+
+        assert result is None
+        assert (time.perf_counter() - start) < 0.3
+        assert scheduler.stats['deadline_misses'] == 1
+
+    async def test_exhausted_budget_skips_call(self):
+        """No call is made when the budget can't fit one."""
+        scheduler = HedgedRequestScheduler()
+        calls = []
+
+        async def request(deadline):
+            calls.append(deadline)
+            return {"success": True}
+
+        result = await scheduler.run(request, Deadline.from_budget_ms(10))
+
+        assert result is None
+        assert calls == []
+        assert scheduler.stats['deadline_skips'] == 1
+
+    async def test_hedge_delay_tracks_p90(self):
+        """Hedge delay follows observed P90 latency."""
+        scheduler = HedgedRequestScheduler(min_samples=10)
+        for latency in range(100, 1100, 100):
+            scheduler.record_latency(latency)
+
+        assert scheduler.get_hedge_delay_ms() == 1000
+
+
+@pytest.mark.asyncio
+class TestOpenAIClientDeadline:
+    """Test deadline handling in the OpenAI client."""
+
+    async def test_missed_deadline_serves_similar_cached_answer(self):
+        """A missed deadline answers from a looser cache match."""
+        client = OpenAIClientService()
+        client.api_key = "test-key"
+        context = {"difficulty_level": "newcomer"}
+        cache_key = client._generate_cache_key("How does initiative work in combat?", context)
+        client._cache_response(cache_key, {"content": "Highest roll acts first."})
+        client._similarity_index.add(
+            cache_key, "How does initiative work in combat?", scope=client._get_context_scope(context)
+        )
+
+        response = await client.generate_contextual_advice(
+            "how does initiative work during combat with goblins",
+            context,
+            deadline=Deadline.from_budget_ms(0)
+        )
+
+        assert response["content"] == "Highest roll acts first."
+        assert response["deadline_fallback"]
+
+    async def test_admission_rejection_serves_similar_cached_answer(self):
+        """A rejected request also answers from a looser cache match."""
+        client = OpenAIClientService()
+        client.api_key = "test-key"
+        client._micro_batcher = None
+        context = {"difficulty_level": "newcomer"}
+        cache_key = client._generate_cache_key("How does initiative work in combat?", context)
+        client._cache_response(cache_key, {"content": "Highest roll acts first."})
+        client._similarity_index.add(
+            cache_key, "How does initiative work in combat?", scope=client._get_context_scope(context)
+        )
+
+        async def rejected(*args):
+            return {"success": False, "error": "OpenAI admission queue full", "admission_rejected": True}
+
+        client._admitted_openai_request = rejected
+
+        response = await client.generate_contextual_advice(
+            "how does initiative work during combat with goblins",
+            context,
+            deadline=Deadline.from_budget_ms(5000)
+        )
+
+        assert response["content"] == "Highest roll acts first."
+        assert response["deadline_fallback"]
@@ -0,0 +1,128 @@
+"""
+Tests for SPARC AI response caching.
+Validates near-duplicate prompt reuse across the AI cache layers.
+"""
+
+import pytest
+
+from src.server.services.cache_service import PerformanceCacheService, CacheConfig
+from src.server.services.sparc.ai_cache_service import AIResponseCacheService, AIPromptType
+from src.server.services.sparc.ai_similarity_index import PromptSimilarityIndex
+from src.server.services.sparc.openai_client import OpenAIClientService
+
+
+@pytest.fixture
+def ai_cache():
+    """AI cache backed by the in-memory fallback cache."""
+    service = AIResponseCacheService()
+    service.cache_service = PerformanceCacheService(CacheConfig())
+    return service
+
+
+class TestPromptSimilarityIndex:
+    """Test the MinHash/LSH prompt index."""
+
+    def test_rephrased_prompt_matches(self):
+        """Rephrasings of the same question should match."""
+        index = PromptSimilarityIndex()
+        index.add("combat", "How do I run combat for new players?", scope="rules")
+
+        match = index.find_similar("how should I run combat with new players", scope="rules")
+
+        assert match is not None
+        assert match.key == "combat"
+        assert match.score >= index.similarity_threshold
+
+    def test_unrelated_prompt_does_not_match(self):
+        """Different questions should not match."""
+        index = PromptSimilarityIndex()
+        index.add("combat", "How do I run combat for new players?", scope="rules")
+
+        assert index.find_similar("What treasure is in the haunted mill?", scope="rules") is None
+
+    def test_matches_are_scoped(self):
+        """Identical prompts in different scopes should not match."""
+        index = PromptSimilarityIndex()
+        index.add("scene-1", "What should happen next in this scene?", scope="scene_1")
+
+        assert index.find_similar("What should happen next in this scene?", scope="scene_2") is None
+        assert index.find_similar("What should happen next in this scene?", scope="scene_1") is not None
+
+    def test_index_is_bounded(self):
+        """Oldest prompts are evicted past max_entries."""
+        index = PromptSimilarityIndex(max_entries=2)
+        index.add("a", "explain initiative order")
+        index.add("b", "explain skill check difficulty")
+        index.add("c", "explain damage and healing")
+
+        assert len(index) == 2
+        assert "a" not in index
+
+
+@pytest.mark.asyncio
+class TestAIResponseCacheSimilarity:
+    """Test near-duplicate lookups in the AI response cache."""
+
+    async def test_near_duplicate_prompt_hits_cache(self, ai_cache):
+        """A rephrased rules question should reuse the cached response."""
+        response = {"title": "Combat Basics", "content": "Roll initiative, then act in order."}
+        await ai_cache.cache_response(
+            "What are the basic rules for combat?", {}, response, 1800,
+            prompt_type=AIPromptType.RULE_CLARIFICATION
+        )
+
+        cached = await ai_cache.get_cached_response(
+            "what are the basic combat rules", {}, prompt_type=AIPromptType.RULE_CLARIFICATION
+        )
+
+        assert cached == response
+        assert ai_cache.performance_stats['near_duplicate_hits'] == 1
+
+    async def test_near_duplicate_respects_prompt_type(self, ai_cache):
+        """Similar prompts of another prompt type should not be served."""
+        await ai_cache.cache_response(
+            "What are the basic rules for combat?", {}, {"content": "rules"}, 1800,
+            prompt_type=AIPromptType.RULE_CLARIFICATION
+        )
+
+        cached = await ai_cache.get_cached_response(
+            "what are the basic combat rules", {"combat_state": "round_1"},
+            prompt_type=AIPromptType.TACTICAL_ADVICE
+        )
+
+        assert cached is None
+
+    async def test_similarity_threshold_is_configurable(self):
+        """A strict threshold disables fuzzy matching."""
+        service = AIResponseCacheService(similarity_threshold=1.0)
+        service.cache_service = PerformanceCacheService(CacheConfig())
+        await service.cache_response(
+            "What are the basic rules for combat?", {}, {"content": "rules"}, 1800,
+            prompt_type=AIPromptType.RULE_CLARIFICATION
+        )
+
+        cached = await service.get_cached_response(
+            "what are the basic combat rules", {}, prompt_type=AIPromptType.RULE_CLARIFICATION
+        )
+
+        assert cached is None
+
+
+class TestOpenAIClientSimilarity:
+    """Test near-duplicate lookups in the OpenAI client cache."""
+
+    def test_similar_prompt_served_from_cache(self):
+        """Rephrased advice requests in the same context reuse the response."""
+        client = OpenAIClientService()
+        context = {"difficulty_level": "newcomer", "characters": [{"name": "Aria"}]}
+        cache_key = client._generate_cache_key("The players seem stuck in the mill", context)
+        client._cache_response(cache_key, {"content": "Introduce a clue"})
+        client._similarity_index.add(
+            cache_key, "The players seem stuck in the mill", scope=client._get_context_scope(context)
+        )
+
+        other_key = client._generate_cache_key("players seem stuck at the mill", context)
+        cached = client._get_similar_cached_response("players seem stuck at the mill", context, other_key)
+
+        assert cached == {"content": "Introduce a clue"}
+        assert client._near_duplicate_hits == 1
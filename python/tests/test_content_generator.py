@@ -0,0 +1,105 @@
+"""
+Tests for the dynamic content generator.
+Validates compiled template buckets, seeded reproducible generation and the render cache.
+"""
+
+import pytest
+
+from src.server.services.sparc.content_generator import (
+    ContentType, DynamicContentGenerator, GenerationRequest
+)
+
+
+def make_request(content_type, session_id=None, seed=None, **context):
+    return GenerationRequest(
+        content_type=content_type,
+        context=context,
+        player_history={"confidence_score": 3.0, "completed_actions": ["investigation"]},
+        scene_metadata={"theme": "haunted_mill"},
+        customization_hints=[],
+        session_id=session_id,
+        seed=seed
+    )
+
+
+class TestTemplateRegistry:
+    """Test the compiled template buckets."""
+
+    def test_buckets_compiled_at_startup(self):
+        """Dialogue variants, archetype delivery and theme details are pre-bucketed."""
+        templates = DynamicContentGenerator().templates
+
+        encouraging = templates.options(ContentType.NPC_DIALOGUE, "encouraging")
+        with_extras = templates.options(ContentType.NPC_DIALOGUE, "encouraging+investigation+creative")
+        assert len(with_extras) == len(encouraging) + 2
+        assert "uses old sayings" in templates.options(ContentType.NPC_DIALOGUE, "delivery", "village_elder")
+        assert "old machinery" in templates.options(ContentType.SCENE_DESCRIPTION, "details", "haunted_mill")
+        assert isinstance(encouraging, tuple)
+
+
+@pytest.mark.asyncio
+class TestSeededGeneration:
+    """Test reproducible generation and caching."""
+
+    async def test_same_seed_reproduces_output(self):
+        """Identical seeded requests render identical content across generators."""
+        first = await DynamicContentGenerator().generate_content(
+            make_request(ContentType.SCENE_DESCRIPTION, seed=42)
+        )
+        second = await DynamicContentGenerator().generate_content(
+            make_request(ContentType.SCENE_DESCRIPTION, seed=42)
+        )
+
+        assert first == second
+        assert first["seed"] == 42
+
+    async def test_session_seeds_differ_between_sessions(self):
+        """Sessions get their own streams; across many requests outputs diverge."""
+        generator = DynamicContentGenerator()
+        outputs = set()
+        for index in range(20):
+            content = await generator.generate_content(
+                make_request(ContentType.NPC_DIALOGUE, session_id=f"session-{index}", npc_type="village_elder")
+            )
+            outputs.add((content["dialogue"], content["delivery_hints"]))
+
+        assert len(outputs) > 1
+
+    async def test_seeded_requests_hit_render_cache(self):
+        """Repeated seeded requests are served from the LRU as copies."""
+        generator = DynamicContentGenerator()
+        request = make_request(ContentType.REWARD_DESCRIPTION, session_id="session-1", reward_type="story")
+
+        first = await generator.generate_content(request)
+        first["description"] = "mutated"
+        second = await generator.generate_content(request)
+
+        assert second["description"] != "mutated"
+        assert generator.get_cache_stats()['hits'] == 1
+        assert generator.get_cache_stats()['misses'] == 1
+
+    async def test_unseeded_requests_are_not_cached(self):
+        """Requests without a seed or session are generated fresh and return their seed."""
+        generator = DynamicContentGenerator()
+        content = await generator.generate_content(
+            make_request(ContentType.CONSEQUENCE_NARRATIVE, outcome_type="failure", player_action="search")
+        )
+
+        assert "gathering information" in content["narrative"]
+        assert generator.get_cache_stats()['unseeded'] == 1
+        assert len(generator.render_cache) == 0
+
+        replay = await generator.generate_content(make_request(
+            ContentType.CONSEQUENCE_NARRATIVE, seed=content["seed"], outcome_type="failure", player_action="search"
+        ))
+        assert replay == content
+
+    async def test_render_cache_is_bounded(self):
+        """The least recently used outputs are evicted past the size limit."""
+        generator = DynamicContentGenerator()
+        generator.render_cache_size = 3
+        for seed in range(5):
+            await generator.generate_content(make_request(ContentType.CHALLENGE_VARIATION, seed=seed))
+
+        assert len(generator.render_cache) == 3
+        assert generator.get_cache_stats()['evictions'] == 2
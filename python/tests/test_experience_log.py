@@ -0,0 +1,73 @@
+"""
+Tests for the compact experience log.
+Validates bounded retention, aggregates and skill progress integration.
+"""
+
+import pytest
+
+from src.server.services.sparc.experience_log import ExperienceLog
+from src.server.services.sparc.progression_models import PlayerProgression, SkillArea, SkillProgress
+from src.server.services.sparc.progression_tracker import AutomaticProgressionTracker
+
+
+class TestExperienceLog:
+    """Test the experience log columns and aggregates."""
+
+    def test_retention_is_bounded(self):
+        """Old experiences are compacted while aggregates keep the full history."""
+        log = ExperienceLog(recent_capacity=8, detail_capacity=3)
+        for index in range(100):
+            log.append(0.5, "success" if index % 2 else "failure", "mill", f"scene-{index}", "", timestamp=1000.0 + index)
+
+        assert len(log) == 100
+        assert log.total_impact == pytest.approx(50.0)
+        assert log.outcome_counts() == {"success": 50, "failure": 50}
+        assert log.first_at == 1000.0
+        assert log.last_at == 1099.0
+        assert log.summary()["retained"] <= 8
+
+    def test_recent_includes_retained_detail(self):
+        """Recent entries carry raw detail only for the newest experiences."""
+        log = ExperienceLog(recent_capacity=8, detail_capacity=2)
+        for index in range(5):
+            log.append(0.1 * index, "partial_success", "mill", f"scene-{index}", f"note {index}", timestamp=float(index))
+
+        recent = log.recent()
+
+        assert [entry["timestamp"].timestamp() for entry in recent] == [0.0, 1.0, 2.0, 3.0, 4.0]
+        assert "scene_id" not in recent[2]
+        assert [entry["scene_id"] for entry in recent[3:]] == ["scene-3", "scene-4"]
+        assert recent[-1]["outcome"] == "partial_success"
+        assert len(log.recent(2)) == 2
+
+    def test_unrecognised_outcomes_share_a_code(self):
+        """Free-form outcomes are counted as other."""
+        log = ExperienceLog()
+        log.append(0.2, "surprising twist")
+
+        assert log.outcome_counts() == {"other": 1}
+
+
+class TestSkillProgressExperiences:
+    """Test skill progress on the experience log."""
+
+    def test_add_experience_records_to_log(self):
+        """Skill experiences update the log and the skill level."""
+        progress = SkillProgress(skill_area=SkillArea.EMPATHY, current_level=1.0)
+        progress.add_experience("mill", "intro", "success", 0.5, "Comforted the miller")
+
+        assert len(progress.experiences) == 1
+        assert progress.experiences.recent()[0]["description"] == "Comforted the miller"
+        assert progress.current_level == 1.5
+
+    def test_growth_rates_use_log_timestamps(self):
+        """Growth rates read the first and last experience times from the log."""
+        player = PlayerProgression(user_id="player-1")
+        progress = SkillProgress(skill_area=SkillArea.EMPATHY, current_level=3.0)
+        progress.experiences.append(0.5, "success", timestamp=0.0)
+        progress.experiences.append(0.5, "success", timestamp=7200.0)
+        player.skill_progress[SkillArea.EMPATHY] = progress
+
+        rates = AutomaticProgressionTracker()._calculate_skill_growth_rates(player)
+
+        assert rates[SkillArea.EMPATHY] == pytest.approx(1.0)
@@ -0,0 +1,187 @@
+"""
+Transport tests for the OpenAI client.
+Runs the client against a local stub server to validate connection pooling.
+"""
+
+import asyncio
+import json
+import re
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from src.server.services.sparc.openai_client import OpenAIClientService
+from src.server.services.sparc.enhanced_ai_seer import EnhancedAISeerService
+
+
+async def _chat_completion(request):
+    """Stub chat completions endpoint."""
+    payload = await request.json()
+    if payload.get("stream"):
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        for token in ["Roll", " initiative", "."]:
+            chunk = {"choices": [{"delta": {"content": token}}]}
+            await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+    user_content = payload["messages"][-1]["content"]
+    if "numbered GM situations" in user_content:
+        situations = re.findall(r"^(\d+)\. ", user_content, re.MULTILINE)
+        answers = [f"Answer {number}" for number in situations]
+        return web.json_response({"choices": [{"message": {"content": json.dumps(answers)}}]})
+
+    return web.json_response({
+        "choices": [{"message": {"content": " Roll initiative. "}}],
+        "usage": {"total_tokens": 12}
+    })
+
+
+async def _head(request):
+    """Stub HEAD used by the connection warm-up."""
+    return web.Response(headers={"Content-Length": "0"})
+
+
+@pytest_asyncio.fixture
+async def stub_server():
+    """Local stub of the chat completions API on a random port."""
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", _chat_completion)
+    app.router.add_route("HEAD", "/v1/chat/completions", _head)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}/v1/chat/completions"
+    await runner.cleanup()
+
+
+@pytest_asyncio.fixture
+async def client(stub_server):
+    """OpenAI client pointed at the stub server."""
+    service = OpenAIClientService()
+    service.api_key = "test-key"
+    service.base_url = stub_server
+    yield service
+    await service.close()
+
+
+@pytest.mark.asyncio
+class TestOpenAIConnectionPool:
+    """Test pooled connections and phase timing."""
+
+    async def test_requests_reuse_pooled_connection(self, client):
+        """Sequential requests should share one keep-alive connection."""
+        for _ in range(3):
+            response = await client._make_openai_request("system", "user", 2.0)
+            assert response["success"]
+            assert response["data"]["content"] == "Roll initiative."
+
+        pool = client.get_performance_stats()["connection_pool"]
+        assert pool["session_open"]
+        assert pool["connections_created"] == 1
+        assert pool["connections_reused"] == 2
+
+    async def test_warm_up_opens_connection(self, client):
+        """Warm-up should leave a connection ready for the first request."""
+        assert await client.warm_up()
+
+        await client._make_openai_request("system", "user", 2.0)
+
+        pool = client.get_performance_stats()["connection_pool"]
+        assert pool["connections_created"] == 1
+        assert pool["connections_reused"] == 1
+
+    async def test_phase_timings_reported(self, client):
+        """Connect, TTFB and body timings should be tracked."""
+        await client._make_openai_request("system", "user", 2.0)
+
+        phases = client.get_performance_stats()["connection_pool"]["phase_timings"]
+        assert set(phases) == {"connect", "ttfb", "body"}
+        assert phases["ttfb"]["avg_ms"] > 0
+
+    async def test_session_recreated_after_close(self, client):
+        """Closing the client should not break later requests."""
+        await client._make_openai_request("system", "user", 2.0)
+        await client.close()
+
+        response = await client._make_openai_request("system", "user", 2.0)
+
+        assert response["success"]
+
+
+@pytest.mark.asyncio
+class TestOpenAIStreaming:
+    """Test streamed advice over server-sent events."""
+
+    async def test_stream_yields_tokens_then_done(self, client):
+        """Tokens arrive incrementally and the final event has the full advice."""
+        events = [event async for event in client.stream_contextual_advice("Goblins attack", {})]
+
+        tokens = [event["content"] for event in events if event["event"] == "token"]
+        assert tokens == ["Roll", " initiative", "."]
+        assert events[-1]["event"] == "done"
+        assert events[-1]["advice"]["content"] == "Roll initiative."
+        assert "first_token" in client.get_performance_stats()["connection_pool"]["phase_timings"]
+
+    async def test_streamed_response_is_cached(self, client):
+        """A repeated prompt should be served from cache without streaming."""
+        [event async for event in client.stream_contextual_advice("Goblins attack", {})]
+
+        events = [event async for event in client.stream_contextual_advice("Goblins attack", {})]
+
+        assert len(events) == 1
+        assert events[0]["advice"]["from_cache"]
+
+    async def test_stream_falls_back_on_error(self, client):
+        """Stream failures end with fallback advice."""
+        client.base_url = client.base_url.replace("/v1/chat/completions", "/missing")
+
+        events = [event async for event in client.stream_contextual_advice("Goblins attack", {})]
+
+        assert len(events) == 1
+        assert events[0]["event"] == "done"
+        assert events[0]["advice"]["fallback"]
+
+    async def test_seer_stream_keeps_rule_based_fallback(self, monkeypatch):
+        """Without an API key the Seer stream still ends with rule-based advice."""
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        seer = EnhancedAISeerService()
+
+        events = [
+            event async for event in seer.stream_contextual_advice(
+                "The rogue wants to pick the lock", {}, request_type="rule_clarification"
+            )
+        ]
+
+        assert events[-1]["event"] == "done"
+        assert events[-1]["advice"]["type"] == "rule_clarification"
+        assert "response_time_ms" in events[-1]["advice"]
+
+
+@pytest.mark.asyncio
+class TestOpenAIMicroBatching:
+    """Test micro-batched advice requests against the stub."""
+
+    async def test_concurrent_advice_sent_as_one_request(self, client, monkeypatch):
+        """Concurrent prompts share one upstream request and get their own answers."""
+        monkeypatch.setenv("OPENAI_MICRO_BATCHING", "true")
+        batching_client = OpenAIClientService()
+        batching_client.api_key = client.api_key
+        batching_client.base_url = client.base_url
+
+        try:
+            responses = await asyncio.gather(*[
+                batching_client.generate_contextual_advice(f"Situation {i}", {}) for i in range(3)
+            ])
+        finally:
+            await batching_client.close()
+
+        assert sorted(response["content"] for response in responses) == ["Answer 1", "Answer 2", "Answer 3"]
+        stats = batching_client.get_performance_stats()
+        assert stats["micro_batching"]["batches_sent"] == 1
+        assert stats["admission"]["admitted"] == 1
@@ -0,0 +1,77 @@
+"""
+Tests for materialized progression analytics.
+Validates snapshots are computed on write, versioned and stable between events.
+"""
+
+import json
+
+import pytest
+
+from src.server.services.sparc.progression_store import (
+    ProgressionStore, progression_from_dict, progression_to_dict
+)
+from src.server.services.sparc.progression_tracker import AutomaticProgressionTracker
+
+
+SCENE = {"adventure_id": "haunted_mill", "scene_id": "intro", "action_taken": "help the miller"}
+OUTCOME = {"outcome_type": "success", "description": "Comforted the miller"}
+
+
+@pytest.mark.asyncio
+class TestMaterializedAnalytics:
+    """Test analytics snapshots on the progression tracker."""
+
+    async def test_snapshot_is_materialized_on_write(self):
+        """Tracking an event stores analytics for the new revision."""
+        tracker = AutomaticProgressionTracker()
+        await tracker.track_scene_outcome("player-1", SCENE, OUTCOME)
+        player = await tracker.get_player("player-1")
+
+        assert player.revision == 1
+        assert player.analytics.revision == 1
+        assert player.analytics.body["progression_summary"]["skills_developed"] == len(player.skill_progress)
+        json.dumps(player.analytics.body)  # enum keys and values are already converted
+
+    async def test_reads_serve_the_same_snapshot(self):
+        """Reads between events return the stored snapshot without recomputing."""
+        tracker = AutomaticProgressionTracker()
+        await tracker.track_scene_outcome("player-1", SCENE, OUTCOME)
+
+        first = await tracker.get_analytics_snapshot("player-1")
+        second = await tracker.get_analytics_snapshot("player-1")
+
+        assert first is second
+        assert await tracker.get_progression_analytics("player-1") is first.body
+
+    async def test_etag_changes_with_progression(self):
+        """A tracked event that changes analytics changes the ETag."""
+        tracker = AutomaticProgressionTracker()
+        await tracker.track_scene_outcome("player-1", SCENE, OUTCOME)
+        before = await tracker.get_analytics_snapshot("player-1")
+
+        await tracker.track_scene_outcome("player-1", SCENE, OUTCOME)
+        after = await tracker.get_analytics_snapshot("player-1")
+
+        assert after.revision == before.revision + 1
+        assert after.etag != before.etag
+
+    async def test_etag_is_stable_across_workers(self):
+        """Workers materializing the same revision agree on the ETag."""
+        tracker = AutomaticProgressionTracker()
+        await tracker.track_scene_outcome("player-1", SCENE, OUTCOME)
+        player = await tracker.get_player("player-1")
+
+        other_worker = AutomaticProgressionTracker(store=ProgressionStore())
+        copy = progression_from_dict(progression_to_dict(player))
+        other_worker.store.mark_dirty(copy)
+        snapshot = await other_worker.get_analytics_snapshot("player-1")
+
+        assert copy.revision == player.revision
+        assert snapshot.etag == player.analytics.etag
+
+    async def test_unknown_player_has_no_snapshot(self):
+        """Players without progression have no analytics."""
+        tracker = AutomaticProgressionTracker()
+
+        assert await tracker.get_analytics_snapshot("nobody") is None
+        assert await tracker.get_progression_analytics("nobody") == {"error": "No progression data found"}
@@ -0,0 +1,96 @@
+"""
+Tests for the progression event pipeline.
+Validates immediate acknowledgement, per-user ordering, failure reporting and draining on stop.
+"""
+
+import pytest
+
+from src.server.services.sparc.progression_events import (
+    ADVENTURE_COMPLETED, SCENE_OUTCOME, ProgressionEventPipeline
+)
+from src.server.services.sparc.progression_tracker import AutomaticProgressionTracker
+
+
+SCENE = {
+    "scene_data": {"adventure_id": "haunted_mill", "scene_id": "intro", "action_taken": "investigate"},
+    "outcome_data": {"outcome_type": "success", "description": "Found the clue"}
+}
+COMPLETION = {
+    "adventure_data": {"adventure_id": "haunted_mill", "title": "The Haunted Mill", "scenes": [{}, {}]},
+    "session_progress": {"session_id": "s", "time_spent_minutes": 45, "confidence_score": 6.5, "completed_scenes": ["a"]}
+}
+
+
+@pytest.mark.asyncio
+class TestProgressionEventPipeline:
+    """Test queued progression updates."""
+
+    async def test_publish_acknowledges_before_applying(self):
+        """Publishing returns a queued job; the update lands once workers run."""
+        tracker = AutomaticProgressionTracker()
+        pipeline = ProgressionEventPipeline(tracker, workers=2)
+
+        job = await pipeline.publish("player-1", ADVENTURE_COMPLETED, COMPLETION)
+        assert job.status == "queued"
+        assert await tracker.get_player("player-1") is None
+
+        await pipeline.drain()
+        assert job.status == "completed"
+        assert job.revision == 1
+        assert job.result["adventure_summary"]["title"] == "The Haunted Mill"
+        assert (await tracker.get_player("player-1")).total_adventures == 1
+        await pipeline.stop()
+
+    async def test_events_apply_in_order_per_user(self):
+        """Each player's events apply in publish order, with increasing revisions."""
+        tracker = AutomaticProgressionTracker()
+        pipeline = ProgressionEventPipeline(tracker, workers=3)
+
+        jobs = []
+        for _ in range(5):
+            for user_id in ["player-1", "player-2", "player-3"]:
+                jobs.append(await pipeline.publish(user_id, SCENE_OUTCOME, SCENE))
+        await pipeline.drain()
+
+        for user_id in ["player-1", "player-2", "player-3"]:
+            revisions = [job.revision for job in jobs if job.user_id == user_id]
+            assert revisions == [1, 2, 3, 4, 5]
+        await pipeline.stop()
+
+    async def test_failed_event_is_reported(self):
+        """A malformed event fails its job without stopping the worker."""
+        tracker = AutomaticProgressionTracker()
+        pipeline = ProgressionEventPipeline(tracker, workers=1)
+
+        bad = await pipeline.publish("player-1", ADVENTURE_COMPLETED, {"adventure_data": {}})
+        good = await pipeline.publish("player-1", SCENE_OUTCOME, SCENE)
+        await pipeline.drain()
+
+        assert bad.status == "failed" and bad.error
+        assert good.status == "completed"
+        assert pipeline.get_stats()['failed'] == 1
+        await pipeline.stop()
+
+    async def test_stop_drains_queued_events(self):
+        """Stopping applies everything already queued."""
+        tracker = AutomaticProgressionTracker()
+        pipeline = ProgressionEventPipeline(tracker, workers=2)
+        for _ in range(3):
+            await pipeline.publish("player-1", SCENE_OUTCOME, SCENE)
+
+        await pipeline.stop()
+
+        assert (await tracker.get_player("player-1")).revision == 3
+        assert not pipeline.get_stats()['running']
+
+    async def test_unknown_kind_and_job_lookup(self):
+        """Unknown event kinds are rejected and jobs can be looked up by id."""
+        pipeline = ProgressionEventPipeline(AutomaticProgressionTracker())
+
+        with pytest.raises(ValueError):
+            await pipeline.publish("player-1", "level_up", {})
+
+        job = await pipeline.publish("player-1", SCENE_OUTCOME, SCENE)
+        assert pipeline.get_job(job.job_id) is job
+        assert pipeline.get_job("missing") is None
+        await pipeline.stop()
@@ -0,0 +1,119 @@
+"""
+Tests for fleet progression analytics.
+Validates sketch merging, document aggregation and serial/parallel agreement.
+"""
+
+import random
+import statistics
+
+import pytest
+
+from src.server.services.sparc.progression_fleet_analytics import (
+    FleetAggregate, RunningStats, aggregate_documents, compute_fleet_aggregate
+)
+from src.server.services.sparc.progression_store import progression_to_dict
+from src.server.services.sparc.progression_tracker import AutomaticProgressionTracker
+
+
+def make_document(index: int):
+    rng = random.Random(index)
+    return {
+        "overall_level": rng.uniform(1, 9),
+        "skill_progress": {
+            "investigation": {"current_level": rng.uniform(1, 10)},
+            "combat": {"current_level": rng.uniform(1, 10)}
+        },
+        "adventure_history": [
+            {"adventure_id": "haunted_mill", "milestones_achieved": ["first_adventure"] if index % 2 else []}
+        ],
+        "confidence_trend": [["2026-01-01T00:00:00", 4.0], ["2026-02-01T00:00:00", 4.0 + index % 3]],
+        "created_at": f"2026-0{1 + index % 3}-15T00:00:00"
+    }
+
+
+async def chunked(documents, size):
+    for start in range(0, len(documents), size):
+        yield documents[start:start + size]
+
+
+class TestFleetSketches:
+    """Test mergeable sketches and aggregation."""
+
+    def test_running_stats_merge_matches_single_pass(self):
+        """Merged partial statistics equal statistics over all values."""
+        rng = random.Random(1)
+        values = [rng.uniform(0, 10) for _ in range(35)]
+        left, right = RunningStats(), RunningStats()
+        for value in values[:13]:
+            left.add(value)
+        for value in values[13:]:
+            right.add(value)
+        left.merge(right)
+
+        assert left.count == len(values)
+        assert left.mean == pytest.approx(statistics.fmean(values))
+        assert left.to_dict()["stddev"] == pytest.approx(statistics.pstdev(values), abs=1e-4)
+        assert (left.minimum, left.maximum) == (min(values), max(values))
+
+    def test_aggregate_documents(self):
+        """Skill distributions, milestone rates and cohorts are built from documents."""
+        aggregate = aggregate_documents([make_document(i) for i in range(10)] + [{"broken": True}])
+        sections = aggregate.to_sections()
+
+        assert aggregate.players == 10  # malformed documents are skipped
+        assert sections["skill_levels"]["investigation"]["count"] == 10
+        assert sum(sections["skill_levels"]["combat"]["histogram"]["counts"]) == 10
+        assert sections["adventure_milestones"]["haunted_mill"] == {
+            "completions": 10, "milestone_rates": {"first_adventure": 0.5}
+        }
+        assert set(sections["cohort_confidence"]) == {"2026-01", "2026-02", "2026-03"}
+        assert sections["cohort_confidence"]["2026-01"]["confidence_change"]["mean"] == 0.0
+
+    def test_merge_matches_single_aggregate(self):
+        """Aggregating in chunks and merging equals one pass."""
+        documents = [make_document(i) for i in range(40)]
+        merged = FleetAggregate()
+        for start in range(0, 40, 7):
+            merged.merge(aggregate_documents(documents[start:start + 7]))
+
+        assert _rounded(merged) == _rounded(aggregate_documents(documents))
+
+
+def _rounded(aggregate):
+    sections = aggregate.to_sections()
+    return {
+        "players": sections["overview"]["players"],
+        "histogram": sections["overview"]["overall_level"]["histogram"]["counts"],
+        "mean": round(sections["overview"]["overall_level"]["mean"], 3),
+        "milestones": sections["adventure_milestones"],
+        "cohorts": sorted(sections["cohort_confidence"])
+    }
+
+
+@pytest.mark.asyncio
+class TestFleetPipeline:
+    """Test streaming aggregation over tracked players."""
+
+    async def test_stored_documents_aggregate(self):
+        """Documents written by the progression store feed the aggregates."""
+        tracker = AutomaticProgressionTracker()
+        await tracker.track_adventure_completion(
+            "player-1",
+            {"adventure_id": "haunted_mill", "title": "The Haunted Mill", "scenes": [{}]},
+            {"session_id": "s", "time_spent_minutes": 30, "confidence_score": 6.0, "completed_scenes": ["a"]}
+        )
+        document = progression_to_dict(await tracker.get_player("player-1"))
+
+        aggregate = await compute_fleet_aggregate(chunked([document], 10))
+
+        assert aggregate.players == 1
+        assert aggregate.adventure_completions["haunted_mill"] == 1
+
+    async def test_parallel_matches_serial(self):
+        """Process-pool aggregation produces the same summary as in-process aggregation."""
+        documents = [make_document(i) for i in range(60)]
+
+        serial = await compute_fleet_aggregate(chunked(documents, 8))
+        parallel = await compute_fleet_aggregate(chunked(documents, 8), workers=2)
+
+        assert _rounded(parallel) == _rounded(serial)
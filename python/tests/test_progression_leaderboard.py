@@ -0,0 +1,124 @@
+"""
+Tests for the progression leaderboard index.
+Validates the ranked skip list and incremental leaderboard maintenance.
+"""
+
+import random
+
+import pytest
+
+from src.server.services.sparc.progression_leaderboard import (
+    OVERALL_METRIC, ProgressionLeaderboard, RankedSkipList
+)
+from src.server.services.sparc.progression_models import (
+    PlayerProgression, ProgressionMilestone, SkillArea, SkillProgress
+)
+from src.server.services.sparc.progression_tracker import AutomaticProgressionTracker
+
+
+def make_player(user_id, level, milestones=0, skills=None):
+    player = PlayerProgression(user_id=user_id, overall_level=level)
+    for milestone in list(ProgressionMilestone)[:milestones]:
+        player.milestone_achievements[milestone] = player.created_at
+    for skill_area, (skill_level, confidence) in (skills or {}).items():
+        player.skill_progress[skill_area] = SkillProgress(
+            skill_area=skill_area, current_level=skill_level, confidence_in_skill=confidence
+        )
+    return player
+
+
+class TestRankedSkipList:
+    """Test the indexable skip list against a sorted list."""
+
+    def test_random_operations_match_sorted_list(self):
+        """Inserts, removals, ranks and pages agree with a plain sorted list."""
+        rng = random.Random(7)
+        skip_list = RankedSkipList(random.Random(11))
+        expected = []
+
+        for step in range(2000):
+            if expected and rng.random() < 0.4:
+                key = expected.pop(rng.randrange(len(expected)))
+                assert skip_list.remove(key)
+            else:
+                key = (rng.randint(0, 50) * -1.0, rng.random(), f"user-{step}")
+                skip_list.insert(key)
+                expected.append(key)
+                expected.sort()
+
+        assert len(skip_list) == len(expected)
+        for index in range(0, len(expected), 37):
+            assert skip_list.rank(expected[index]) == index
+            assert list(skip_list.iter_from(index))[:5] == expected[index:index + 5]
+        assert list(skip_list.iter_from(0)) == expected
+        assert skip_list.rank((1.0, 0.0, "missing")) is None
+        assert not skip_list.remove((1.0, 0.0, "missing"))
+        assert list(skip_list.iter_from(len(expected))) == []
+
+
+class TestProgressionLeaderboard:
+    """Test leaderboard ordering and maintenance."""
+
+    def test_overall_ordering_breaks_ties_on_milestones(self):
+        """Players rank by level, then milestone count."""
+        leaderboard = ProgressionLeaderboard()
+        for player in [make_player("a", 3.0), make_player("b", 5.0), make_player("c", 3.0, milestones=2)]:
+            leaderboard.update(player)
+
+        assert leaderboard.top(OVERALL_METRIC, limit=3) == ["b", "c", "a"]
+        assert leaderboard.rank("a") == 3
+        assert leaderboard.top(OVERALL_METRIC, limit=2, offset=1) == ["c", "a"]
+
+    def test_skill_ordering_uses_defaults_for_untrained_skills(self):
+        """Players without a skill rank with the default level and confidence."""
+        leaderboard = ProgressionLeaderboard()
+        leaderboard.update(make_player("trained", 1.0, skills={SkillArea.EMPATHY: (4.0, 6.0)}))
+        leaderboard.update(make_player("weak", 1.0, skills={SkillArea.EMPATHY: (0.5, 2.0)}))
+        leaderboard.update(make_player("untrained", 1.0))
+
+        assert leaderboard.top(SkillArea.EMPATHY.value) == ["trained", "untrained", "weak"]
+
+    def test_updates_move_players(self):
+        """Re-ranking a player moves them without duplicating entries."""
+        leaderboard = ProgressionLeaderboard()
+        player = make_player("a", 1.0)
+        leaderboard.update(player)
+        leaderboard.update(make_player("b", 2.0))
+
+        player.overall_level = 9.0
+        leaderboard.update(player)
+
+        assert leaderboard.top() == ["a", "b"]
+        assert len(leaderboard) == 2
+
+        assert leaderboard.remove("a")
+        assert leaderboard.top() == ["b"]
+        assert leaderboard.rank("a") is None
+
+    def test_unknown_metric_is_rejected(self):
+        """Queries for metrics that are not indexed raise."""
+        with pytest.raises(ValueError):
+            ProgressionLeaderboard().top("juggling")
+
+
+@pytest.mark.asyncio
+class TestTrackerLeaderboard:
+    """Test that tracking keeps the leaderboard current."""
+
+    async def test_tracking_updates_leaderboard(self):
+        """Scene tracking ranks players and removal drops them."""
+        tracker = AutomaticProgressionTracker()
+        await tracker.track_scene_outcome(
+            "player-1",
+            {"adventure_id": "haunted_mill", "scene_id": "intro", "action_taken": "investigate"},
+            {"outcome_type": "success", "description": "Found the clue"}
+        )
+        await tracker.track_scene_outcome("player-0", {}, {})
+
+        assert len(tracker.leaderboard) == 2
+        assert tracker.leaderboard.rank("player-1", SkillArea.INVESTIGATION.value) == 1
+        assert tracker.leaderboard.rank("player-0", SkillArea.INVESTIGATION.value) == 2
+
+        assert await tracker.remove_player("player-1")
+        assert "player-1" not in tracker.leaderboard
+        assert not await tracker.remove_player("player-1")
@@ -0,0 +1,237 @@
+"""
+Tests for the progression store.
+Validates document round trips, lazy hydration, coalesced writes, LRU eviction, revalidation
+and compare-and-swap writes from several workers.
+"""
+
+import json
+
+import pytest
+
+from src.server.services.sparc.progression_models import ProgressionMilestone, SkillArea
+from src.server.services.sparc.progression_store import (
+    ProgressionStore, UPSERT_PROGRESSION_SQL, progression_from_dict, progression_to_dict
+)
+from src.server.services.sparc.progression_tracker import AutomaticProgressionTracker
+
+
+class FakePool:
+    """In-memory stand-in for an asyncpg pool running the store's queries."""
+
+    def __init__(self):
+        self.rows = {}
+        self.batches = []
+
+    def _upsert(self, rows):
+        """Write rows whose version is one past the stored version, returning the ones written."""
+        self.batches.append([row[0] for row in rows])
+        written = []
+        for user_id, overall_level, milestones_count, skill_levels, data, last_activity, version in rows:
+            if version != (self.rows[user_id]['version'] if user_id in self.rows else 0) + 1:
+                continue
+            self.rows[user_id] = {
+                'user_id': user_id,
+                'overall_level': overall_level,
+                'milestones_count': milestones_count,
+                'skill_levels': skill_levels,
+                'data': data,
+                'version': version
+            }
+            written.append({'user_id': user_id, 'version': version})
+        return written
+
+    async def fetchrow(self, query, user_id):
+        return self.rows.get(user_id)
+
+    async def fetchval(self, query, user_id):
+        row = self.rows.get(user_id)
+        return row['version'] if row else None
+
+    async def fetch(self, query, *columns):
+        if query == UPSERT_PROGRESSION_SQL:
+            return self._upsert(list(zip(*columns)))
+        return list(self.rows.values())
+
+    async def execute(self, query, user_id):
+        return "DELETE 1" if self.rows.pop(user_id, None) is not None else "DELETE 0"
+
+
+SCENE = {"adventure_id": "haunted_mill", "scene_id": "intro", "action_taken": "investigate"}
+OUTCOME = {"outcome_type": "success", "description": "Found the clue"}
+
+
+async def track_completion(tracker, user_id):
+    return await tracker.track_adventure_completion(
+        user_id,
+        {"adventure_id": "haunted_mill", "title": "The Haunted Mill", "scenes": [{}, {}]},
+        {"session_id": "session-1", "time_spent_minutes": 45, "confidence_score": 6.5, "completed_scenes": ["a", "b"]}
+    )
+
+
+@pytest.mark.asyncio
+class TestProgressionStore:
+    """Test the progression store and its use by the tracker."""
+
+    async def test_document_round_trip(self):
+        """Progression documents restore skills, milestones, trend and history."""
+        tracker = AutomaticProgressionTracker()
+        await tracker.track_scene_outcome("player-1", SCENE, OUTCOME)
+        await track_completion(tracker, "player-1")
+        player = await tracker.get_player("player-1")
+
+        restored = progression_from_dict(progression_to_dict(player))
+
+        assert progression_to_dict(restored) == progression_to_dict(player)
+        assert ProgressionMilestone.FIRST_ADVENTURE in restored.milestone_achievements
+        assert restored.skill_progress[SkillArea.INVESTIGATION].experiences.count == 1
+        assert restored.adventure_history[0].title == "The Haunted Mill"
+
+    async def test_writes_are_coalesced_per_player(self):
+        """Several updates before a flush are written as one row."""
+        pool = FakePool()
+        tracker = AutomaticProgressionTracker(store=ProgressionStore(pool=pool))
+        for _ in range(3):
+            await tracker.track_scene_outcome("player-1", SCENE, OUTCOME)
+        await tracker.track_scene_outcome("player-2", SCENE, OUTCOME)
+
+        assert await tracker.store.flush() == 2
+        assert sorted(pool.batches[0]) == ["player-1", "player-2"]
+        assert tracker.store.get_stats()['coalesced_writes'] >= 2
+        assert await tracker.store.flush() == 0
+
+    async def test_lru_evicts_clean_players_and_hydrates_lazily(self):
+        """Cold players leave memory once flushed and reload on next access."""
+        pool = FakePool()
+        store = ProgressionStore(pool=pool, max_resident=2)
+        tracker = AutomaticProgressionTracker(store=store)
+        for user_id in ["player-1", "player-2", "player-3"]:
+            await tracker.track_scene_outcome(user_id, SCENE, OUTCOME)
+
+        assert len(store) == 3  # dirty players are kept until written
+        await store.flush()
+        assert len(store) == 2
+        assert "player-1" not in store
+
+        player = await tracker.get_player("player-1")
+        assert player.skill_progress[SkillArea.INVESTIGATION].experiences.count == 1
+        assert store.get_stats()['hydrations'] == 1
+
+    async def test_revalidation_picks_up_other_workers(self):
+        """A clean cached player is refreshed when the stored version moves on."""
+        pool = FakePool()
+        worker_a = AutomaticProgressionTracker(store=ProgressionStore(pool=pool, revalidate_seconds=0))
+        worker_b = AutomaticProgressionTracker(store=ProgressionStore(pool=pool, revalidate_seconds=0))
+        await worker_a.track_scene_outcome("player-1", SCENE, OUTCOME)
+        await worker_a.store.flush()
+        assert (await worker_b.get_player("player-1")).total_adventures == 0
+
+        await track_completion(worker_a, "player-1")
+        await worker_a.store.flush()
+
+        assert (await worker_b.get_player("player-1")).total_adventures == 1
+        assert worker_b.store.get_stats()['refreshed'] == 1
+
+    async def test_leaderboard_loads_from_stored_columns(self):
+        """A new worker ranks stored players without hydrating them."""
+        pool = FakePool()
+        writer = AutomaticProgressionTracker(store=ProgressionStore(pool=pool))
+        await track_completion(writer, "player-1")
+        await writer.track_scene_outcome("player-2", SCENE, OUTCOME)
+        await writer.store.flush()
+
+        reader = AutomaticProgressionTracker(store=ProgressionStore(pool=pool))
+        assert await reader.load_leaderboard() == 2
+
+        assert reader.leaderboard.top() == writer.leaderboard.top()
+        assert reader.leaderboard.top(SkillArea.INVESTIGATION.value) == ["player-2", "player-1"]
+        assert len(reader.store) == 0
+
+    async def test_remove_player_deletes_stored_row(self):
+        """Resetting a player removes their stored progression."""
+        pool = FakePool()
+        tracker = AutomaticProgressionTracker(store=ProgressionStore(pool=pool))
+        await tracker.track_scene_outcome("player-1", SCENE, OUTCOME)
+        await tracker.store.flush()
+
+        assert await tracker.remove_player("player-1")
+        assert pool.rows == {}
+        assert await tracker.get_player("player-1") is None
+
+    async def test_stale_worker_replays_events_instead_of_overwriting(self):
+        """Interleaved events on two workers are all kept; the stale write is retried on fresh data."""
+        pool = FakePool()
+        worker_a = AutomaticProgressionTracker(store=ProgressionStore(pool=pool))
+        worker_b = AutomaticProgressionTracker(store=ProgressionStore(pool=pool))
+        await worker_a.track_scene_outcome("player-1", SCENE, OUTCOME)
+        await worker_a.store.flush()
+        await worker_b.get_player("player-1")
+
+        # worker_b's cached copy is now stale
+        await track_completion(worker_a, "player-1")
+        await worker_a.store.flush()
+        await worker_b.track_scene_outcome("player-1", SCENE, OUTCOME)
+
+        assert await worker_b.store.flush() == 0
+        assert worker_b.store.get_stats()['write_conflicts'] == 1
+        assert await worker_b.store.flush() == 1
+
+        stored = progression_from_dict(json.loads(pool.rows["player-1"]['data']))
+        assert pool.rows["player-1"]['version'] == 3
+        assert stored.revision == 3
+        assert stored.total_adventures == 1
+        assert stored.skill_progress[SkillArea.INVESTIGATION].experiences.count == 2
+        assert await worker_b.store.flush() == 0
+
+    async def test_replay_after_stored_row_deleted(self):
+        """Events on a worker whose player was reset elsewhere start a new progression."""
+        pool = FakePool()
+        worker_a = AutomaticProgressionTracker(store=ProgressionStore(pool=pool))
+        worker_b = AutomaticProgressionTracker(store=ProgressionStore(pool=pool))
+        await worker_a.track_scene_outcome("player-1", SCENE, OUTCOME)
+        await worker_a.store.flush()
+        await worker_b.get_player("player-1")
+
+        await worker_a.remove_player("player-1")
+        await worker_b.track_scene_outcome("player-1", SCENE, OUTCOME)
+        await worker_b.store.flush()
+        await worker_b.store.flush()
+
+        stored = progression_from_dict(json.loads(pool.rows["player-1"]['data']))
+        assert pool.rows["player-1"]['version'] == 1
+        assert stored.revision == 1
+
+    async def test_hydration_reranks_players_changed_elsewhere(self):
+        """A worker's leaderboard follows players it loads after another worker wrote them."""
+        pool = FakePool()
+        worker_a = AutomaticProgressionTracker(store=ProgressionStore(pool=pool, revalidate_seconds=0))
+        worker_b = AutomaticProgressionTracker(store=ProgressionStore(pool=pool, revalidate_seconds=0))
+        await worker_a.track_scene_outcome("player-1", SCENE, OUTCOME)
+        await worker_a.store.flush()
+        await worker_b.load_leaderboard()
+        await worker_b.get_player("player-1")
+
+        for _ in range(3):
+            await worker_a.track_scene_outcome("player-1", SCENE, OUTCOME)
+        await worker_a.store.flush()
+        await worker_b.get_player("player-1")
+
+        metric = SkillArea.INVESTIGATION.value
+        assert worker_b.leaderboard._keys[metric]["player-1"] == worker_a.leaderboard._keys[metric]["player-1"]
+
+    async def test_leaderboard_reload_picks_up_writes_and_removals(self):
+        """Reloading rankings adds, re-ranks and drops players written by other workers."""
+        pool = FakePool()
+        worker_a = AutomaticProgressionTracker(store=ProgressionStore(pool=pool))
+        worker_b = AutomaticProgressionTracker(store=ProgressionStore(pool=pool))
+        await worker_a.track_scene_outcome("player-1", SCENE, OUTCOME)
+        await worker_a.track_scene_outcome("player-2", SCENE, OUTCOME)
+        await worker_a.store.flush()
+        await worker_b.load_leaderboard()
+        await worker_b.track_scene_outcome("player-3", SCENE, OUTCOME)
+
+        await track_completion(worker_a, "player-2")
+        await worker_a.remove_player("player-1")
+        await worker_a.store.flush()
+        await worker_b.load_leaderboard()
+
+        assert worker_b.leaderboard.top() == ["player-2", "player-3"]
@@ -0,0 +1,110 @@
+"""
+Tests for incremental tutorial analytics.
+Validates the quantile sketch and that tutorial events keep aggregates current.
+"""
+
+import random
+
+import pytest
+
+from src.server.services.sparc.tutorial_analytics import QuantileSketch
+from src.server.services.sparc.tutorial_service import SPARCTutorialService, TutorialStep
+
+
+async def complete_tutorial(service, user_id, rating):
+    await service.start_seer_tutorial(user_id)
+    for step in TutorialStep:
+        step_data = {"ratings": {"rules_knowledge": rating}} if step == TutorialStep.CONFIDENCE_CHECK else None
+        await service.advance_tutorial_step(user_id, step, step_data)
+
+
+class TestQuantileSketch:
+    """Test the streaming quantile sketch."""
+
+    def test_quantiles_within_relative_accuracy(self):
+        """Percentiles stay within the configured relative error."""
+        rng = random.Random(7)
+        values = sorted(rng.lognormvariate(2, 0.6) for _ in range(5000))
+        sketch = QuantileSketch(relative_accuracy=0.02)
+        for value in values:
+            sketch.add(value)
+
+        for q in (0.5, 0.9, 0.99):
+            exact = values[int(q * (len(values) - 1))]
+            assert sketch.quantile(q) == pytest.approx(exact, rel=0.02)
+        assert len(sketch.buckets) < 200
+
+    def test_zero_and_empty(self):
+        """Zero values are counted and empty sketches report nothing."""
+        sketch = QuantileSketch()
+        assert sketch.quantile(0.5) is None
+        sketch.add(0.0)
+        sketch.add(0.0)
+        sketch.add(10.0)
+
+        assert sketch.quantile(0.5) == 0.0
+        assert sketch.quantile(1.0) == pytest.approx(10.0, rel=0.02)
+
+
+@pytest.mark.asyncio
+class TestTutorialAnalytics:
+    """Test analytics maintained by the tutorial service."""
+
+    async def test_no_completed_tutorials(self):
+        """Analytics report no completions until a tutorial finishes."""
+        service = SPARCTutorialService()
+        await service.start_seer_tutorial("seer-1")
+
+        assert service.get_tutorial_analytics() == {"message": "No completed tutorials yet"}
+
+    async def test_completions_update_aggregates(self):
+        """Completions, step timings and confidence are aggregated as steps advance."""
+        service = SPARCTutorialService()
+        await complete_tutorial(service, "seer-1", 9)
+        await complete_tutorial(service, "seer-2", 3)
+        await service.start_seer_tutorial("seer-3")
+
+        analytics = service.get_tutorial_analytics()
+
+        assert analytics["total_tutorials_started"] == 3
+        assert analytics["total_tutorials_completed"] == 2
+        assert analytics["completion_rate"] == pytest.approx(2 / 3)
+        assert analytics["completion_time_minutes"]["count"] == 2
+        assert analytics["step_time_minutes"]["welcome"]["count"] == 2
+        assert analytics["confidence_percentage"]["count"] == 2
+        assert analytics["confidence_area_scores"]["rules_knowledge"]["count"] == 2
+
+    async def test_repeat_completion_counted_once(self):
+        """Advancing a finished tutorial again does not count a second completion."""
+        service = SPARCTutorialService()
+        await complete_tutorial(service, "seer-1", 8)
+        await service.advance_tutorial_step("seer-1", TutorialStep.COMPLETION)
+
+        assert service.get_tutorial_analytics()["total_tutorials_completed"] == 1
+
+    async def test_onboarding_stages_follow_milestones(self):
+        """Onboarding stage counts move with each user's stage."""
+        service = SPARCTutorialService()
+        await complete_tutorial(service, "seer-1", 8)
+        await service.track_onboarding_milestone("player-1", "character_created")
+        await service.track_onboarding_milestone("player-2", "character_created")
+        await service.track_onboarding_milestone("player-2", "session_joined")
+
+        analytics = service.get_tutorial_analytics()
+
+        assert analytics["onboarding_users_tracked"] == 2
+        assert analytics["onboarding_stages"] == {
+            "new_user": 0, "character_created": 1, "first_session_joined": 1
+        }
+        assert analytics["onboarding_milestones"] == {"character_created": 2, "session_joined": 1}
+
+    async def test_snapshot_reused_between_events(self):
+        """Reads between events return the same snapshot."""
+        service = SPARCTutorialService()
+        await complete_tutorial(service, "seer-1", 8)
+
+        first = service.get_tutorial_analytics()
+        assert service.get_tutorial_analytics() is first
+
+        await service.start_seer_tutorial("seer-2")
+        assert service.get_tutorial_analytics() is not first
@@ -0,0 +1,64 @@
+"""
+Tests for precompiled tutorial content.
+Validates encoded payloads match the tutorial data and carry stable validators.
+"""
+
+import json
+
+from src.server.services.sparc.tutorial_content import TutorialContentCatalog, compile_payload
+from src.server.services.sparc.tutorial_service import (
+    SEER_SCENARIOS, SPARCTutorialService, TutorialStep
+)
+
+
+class TestTutorialContent:
+    """Test the compiled tutorial content catalog."""
+
+    def test_step_payloads_match_service_content(self):
+        """Every step is compiled, including steps without dedicated content."""
+        catalog = TutorialContentCatalog()
+        service = SPARCTutorialService()
+
+        welcome = json.loads(catalog.step(TutorialStep.WELCOME).body)
+        assert welcome == {"success": True, "step": "welcome", "content": service.get_step_content(TutorialStep.WELCOME)}
+
+        practice = json.loads(catalog.step(TutorialStep.PRACTICE_SCENARIO).body)
+        assert practice["content"]["scenario"]["id"] == "tavern_encounter"
+
+        assert json.loads(catalog.step(TutorialStep.COMPLETION).body)["content"]["title"] == "Unknown Step"
+
+    def test_scenario_payloads(self):
+        """Scenario list and details are compiled once per scenario."""
+        catalog = TutorialContentCatalog()
+
+        listing = json.loads(catalog.scenario_list.body)["scenarios"]
+        assert [scenario["id"] for scenario in listing] == [scenario.id for scenario in SEER_SCENARIOS]
+        assert listing[0]["character_count"] == 4
+
+        details = json.loads(catalog.scenario("combat_basics").body)["scenario"]
+        assert details["difficulty_level"] == 3
+        assert catalog.scenario("missing") is None
+
+    def test_etags_are_strong_and_deterministic(self):
+        """Independently compiled catalogs agree on ETags; different content differs."""
+        first, second = TutorialContentCatalog(), TutorialContentCatalog(max_age_seconds=60)
+        payload = first.step(TutorialStep.WELCOME)
+
+        assert payload.etag == second.step(TutorialStep.WELCOME).etag
+        assert payload.etag.startswith('"') and not payload.etag.startswith('W/')
+        assert payload.etag != first.step(TutorialStep.BASIC_RULES).etag
+        assert payload.headers["Cache-Control"] == "public, max-age=3600"
+
+    def test_if_none_match(self):
+        """Conditional requests match the ETag, lists of ETags and wildcards."""
+        payload = compile_payload({"a": 1}, "public, max-age=60")
+
+        assert payload.matches(payload.etag)
+        assert payload.matches(f'"other", {payload.etag}')
+        assert payload.matches("*")
+        assert not payload.matches('"other"')
+        assert not payload.matches(None)
+
+    def test_scenarios_shared_across_services(self):
+        """Service instances share the scenarios built at import."""
+        assert SPARCTutorialService().seer_scenarios is SPARCTutorialService().seer_scenarios
@@ -0,0 +1,110 @@
+"""
+Tests for the unified AI response cache.
+Validates canonical keys, LRU eviction and sharing between AI layers.
+"""
+
+import time
+
+import pytest
+
+from src.server.services.cache_service import PerformanceCacheService, CacheConfig
+from src.server.services.sparc.ai_cache_service import AIResponseCacheService
+from src.server.services.sparc.openai_client import OpenAIClientService
+from src.server.services.sparc.unified_ai_cache import UnifiedAICache, canonical_cache_key
+
+
+class TestCanonicalKey:
+    """Test canonical cache key derivation."""
+
+    def test_formatting_differences_share_a_key(self):
+        """Case, spacing and trailing punctuation don't change the key."""
+        context = {"difficulty_level": "newcomer", "characters": [{}, {}]}
+
+        assert canonical_cache_key("How does combat work?", context) == canonical_cache_key(
+            "  how does   combat work", context
+        )
+
+    def test_irrelevant_context_is_ignored(self):
+        """Only context fields that shape the advice affect the key."""
+        base = {"difficulty_level": "newcomer", "player_count": 2}
+
+        assert canonical_cache_key("help", base) == canonical_cache_key("help", {**base, "session_id": "abc"})
+        assert canonical_cache_key("help", base) != canonical_cache_key("help", {**base, "player_count": 5})
+
+
+class TestUnifiedAICache:
+    """Test the shared LRU store."""
+
+    def test_evicts_least_recently_used(self):
+        """The entry unused for longest is evicted first."""
+        cache = UnifiedAICache(max_entries=2)
+        cache.put("a", {"content": "a"}, layer="test")
+        cache.put("b", {"content": "b"}, layer="test")
+        cache.get("a", layer="test")
+        cache.put("c", {"content": "c"}, layer="test")
+
+        assert "a" in cache and "c" in cache
+        assert "b" not in cache
+        assert cache.stats['evictions'] == 1
+
+    def test_byte_budget_bounds_memory(self):
+        """Large responses evict older entries to stay under the byte budget."""
+        cache = UnifiedAICache(max_bytes=2000)
+        for i in range(5):
+            cache.put(str(i), {"content": "x" * 500}, layer="test")
+
+        assert cache.get_stats()['bytes'] <= 2000
+        assert "4" in cache
+
+    def test_expired_entries_miss(self):
+        """Entries past their TTL are dropped on lookup."""
+        cache = UnifiedAICache()
+        cache.put("a", {"content": "a"}, layer="test", ttl_seconds=60)
+        cache.get_entry("a", layer="test").expires_at = time.time() - 1
+
+        assert cache.get("a", layer="test") is None
+        assert cache.stats['expirations'] == 1
+
+    def test_rewrite_keeps_shorter_ttl(self):
+        """Writing a live key again without a TTL, or with a longer one, doesn't extend it."""
+        cache = UnifiedAICache()
+        cache.put("a", {"content": "a"}, layer="openai_client", ttl_seconds=900)
+        expires_at = cache.get_entry("a", layer="test").expires_at
+
+        cache.put("a", {"content": "a"}, layer="ai_cache")
+        assert cache.get_entry("a", layer="test").expires_at == expires_at
+        cache.put("a", {"content": "a"}, layer="ai_cache", ttl_seconds=3600)
+        assert cache.get_entry("a", layer="test").expires_at == expires_at
+        cache.put("a", {"content": "a"}, layer="openai_client", ttl_seconds=60)
+        assert cache.get_entry("a", layer="test").expires_at < expires_at
+
+    def test_returned_values_are_copies(self):
+        """Callers can annotate responses without altering the cache."""
+        cache = UnifiedAICache()
+        cache.put("a", {"content": "a"}, layer="test")
+        cache.get("a", layer="test")["from_cache"] = True
+
+        assert cache.get("a", layer="test") == {"content": "a"}
+
+
+@pytest.mark.asyncio
+class TestSharedAcrossLayers:
+    """Test that AI layers hit each other's entries."""
+
+    async def test_client_response_hits_in_ai_cache_service(self):
+        """A response cached by the OpenAI client is served by the AI cache service."""
+        shared = UnifiedAICache()
+        client = OpenAIClientService(response_cache=shared)
+        ai_cache = AIResponseCacheService(hot_cache=shared)
+        ai_cache.cache_service = PerformanceCacheService(CacheConfig())
+        context = {"difficulty_level": "newcomer", "characters": [{}, {}, {}]}
+
+        client._cache_response(
+            client._generate_cache_key("The goblins flee. What now?", context), {"content": "Give chase"}
+        )
+        cached = await ai_cache.get_cached_response("the goblins flee. what now", context)
+
+        assert cached == {"content": "Give chase"}
+        stats = shared.get_stats()
+        assert stats['by_layer']['openai_client']['writes'] == 1
+        assert stats['by_layer']['ai_cache']['hits'] == 1